@@ -0,0 +1,70 @@
+"""Hot column indexes
+
+Revision ID: 3e8d0b5c2a61
+Revises: 5c1f3a9e7b24
+Create Date: 2026-10-17 15:12:41.208315
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3e8d0b5c2a61'
+down_revision = '5c1f3a9e7b24'
+
+
+DUES_INVOICE_TABLES = [
+    'dues15invoices',
+    'dues16invoices',
+    'dues17invoices',
+    'dues18invoices',
+    'dues19invoices',
+    'dues20invoices',
+    'dues21invoices',
+]
+
+INDEXES = [
+    ('ix_members_membership_number', 'members', ['membership_number']),
+    ('ix_members_email', 'members', ['email']),
+    ('ix_members_membership_loss_date', 'members', ['membership_loss_date']),
+    (
+        'ix_members_membership_accepted_date',
+        'members',
+        ['membership_accepted', 'membership_date'],
+    ),
+    ('ix_members_shares_shares_id', 'members_shares', ['shares_id']),
+    ('ix_GeneralAssembly_number', 'GeneralAssembly', ['number']),
+    (
+        'ix_GeneralAssemblyInvitation_member_id',
+        'GeneralAssemblyInvitation',
+        ['member_id'],
+    ),
+    (
+        'ix_GeneralAssemblyInvitation_token',
+        'GeneralAssemblyInvitation',
+        ['token'],
+    ),
+] + [
+    ('ix_{0}_{1}'.format(table, column), table, [column])
+    for table in DUES_INVOICE_TABLES
+    for column in ['member_id', 'token']
+]
+
+
+def upgrade():
+    """
+    Upgrade the database by creating the indexes for the columns used by
+    frequent lookups, filters and joins.
+    """
+    # pylint: disable=no-member
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    """
+    Downgrade the database by dropping the indexes of frequently used
+    columns.
+    """
+    # pylint: disable=no-member
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table)
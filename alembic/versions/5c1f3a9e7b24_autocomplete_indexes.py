@@ -0,0 +1,39 @@
+"""Autocomplete indexes
+
+Revision ID: 5c1f3a9e7b24
+Revises: 8a105d4fa89d
+Create Date: 2026-10-17 11:02:17.504811
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5c1f3a9e7b24'
+down_revision = '8a105d4fa89d'
+
+
+def upgrade():
+    """
+    Upgrade the database by creating the indexes for the prefix search of
+    reference codes and last names.
+    """
+    # pylint: disable=no-member
+    op.create_index('ix_members_lastname', 'members', ['lastname'])
+    # Expression indexes are created by plain SQL as they are not supported
+    # by all alembic versions.
+    op.execute(
+        'CREATE INDEX ix_members_email_confirm_code_lower '
+        'ON members (lower(email_confirm_code))')
+    op.execute(
+        'CREATE INDEX ix_members_lastname_lower '
+        'ON members (lower(lastname))')
+
+
+def downgrade():
+    """
+    Downgrade the database by dropping the prefix search indexes.
+    """
+    # pylint: disable=no-member
+    op.drop_index('ix_members_lastname_lower', 'members')
+    op.drop_index('ix_members_email_confirm_code_lower', 'members')
+    op.drop_index('ix_members_lastname', 'members')
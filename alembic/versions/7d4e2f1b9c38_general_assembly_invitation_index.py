@@ -0,0 +1,34 @@
+"""General assembly invitation index
+
+Revision ID: 7d4e2f1b9c38
+Revises: 3e8d0b5c2a61
+Create Date: 2026-10-17 17:41:09.328154
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7d4e2f1b9c38'
+down_revision = '3e8d0b5c2a61'
+
+
+def upgrade():
+    """
+    Upgrade the database by creating the index for the lookup of the
+    invitation of a member to a general assembly.
+    """
+    # pylint: disable=no-member
+    op.create_index(
+        'ix_GeneralAssemblyInvitation_general_assembly_id_member_id',
+        'GeneralAssemblyInvitation',
+        ['general_assembly_id', 'member_id'])
+
+
+def downgrade():
+    """
+    Downgrade the database by dropping the general assembly invitation index.
+    """
+    # pylint: disable=no-member
+    op.drop_index(
+        'ix_GeneralAssemblyInvitation_general_assembly_id_member_id',
+        'GeneralAssemblyInvitation')
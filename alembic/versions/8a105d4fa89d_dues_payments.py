@@ -0,0 +1,144 @@
+"""Dues payments
+
+Revision ID: 8a105d4fa89d
+Revises: add781aa3e94
+Create Date: 2026-10-17 10:12:41.318204
+"""
+
+from decimal import Decimal
+
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy.types as types
+from sqlalchemy.orm import Session
+
+# revision identifiers, used by Alembic.
+revision = '8a105d4fa89d'
+down_revision = 'add781aa3e94'
+
+
+class SqliteDecimal(types.TypeDecorator):
+    """
+    Type decorator for persisting Decimal (currency values)
+
+    TODO: Use standard SQLAlchemy Decimal
+    when a database is used which supports it.
+    """
+    impl = types.String
+
+    def load_dialect_impl(self, dialect):
+        return dialect.type_descriptor(types.VARCHAR(100))
+
+    def process_bind_param(self, value, dialect):
+        if value is not None:
+            return str(value)
+        else:
+            return None
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value != '':
+            return Decimal(value)
+        else:
+            return None
+
+
+DUES_YEARS = [2015, 2016, 2017, 2018, 2019, 2020, 2021]
+
+
+def upgrade():
+    """
+    Upgrade the database by creating the dues payment ledger table and filling
+    it from the dues payment fields of the members table.
+
+    All members with a payment date are taken over including those whose
+    dues are not marked as paid, as the monthly statistics count them.
+    """
+    # pylint: disable=no-member
+    op.create_table(
+        'dues_payments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False),
+        sa.Column('membership_number', sa.Integer(), nullable=True),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('account', sa.Unicode(length=255), nullable=True),
+        sa.Column('reference', sa.Unicode(length=255), nullable=True),
+        sa.Column('date', sa.Date(), nullable=True),
+        sa.Column(
+            'amount',
+            SqliteDecimal(length=12, collation=2),
+            nullable=True),
+        sa.Column('paid', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('member_id', 'year')
+    )
+    op.create_index(
+        'ix_dues_payments_membership_number',
+        'dues_payments',
+        ['membership_number'])
+    op.create_index(
+        'ix_dues_payments_account',
+        'dues_payments',
+        ['account'])
+    op.create_index(
+        'ix_dues_payments_date',
+        'dues_payments',
+        ['date'])
+
+    bind = op.get_bind()
+    session = Session(bind=bind)
+    for year in DUES_YEARS:
+        session.execute("""
+            insert into
+                dues_payments
+                (
+                    member_id
+                    ,
+                    membership_number
+                    ,
+                    year
+                    ,
+                    account
+                    ,
+                    reference
+                    ,
+                    date
+                    ,
+                    amount
+                    ,
+                    paid
+                )
+            select
+                id as member_id
+                ,
+                membership_number
+                ,
+                {year} as year
+                ,
+                'Membership dues {year}' as account
+                ,
+                dues{yy}_token as reference
+                ,
+                substr(dues{yy}_paid_date, 1, 10) as date
+                ,
+                dues{yy}_amount_paid as amount
+                ,
+                coalesce(dues{yy}_paid, 0) as paid
+            from
+                members
+            where
+                dues{yy}_paid_date is not NULL
+            """.format(year=year, yy=str(year)[2:]))
+    session.flush()
+    session.commit()
+
+
+def downgrade():
+    """
+    Downgrade the database by dropping the dues payment ledger table.
+    """
+    # pylint: disable=no-member
+    op.drop_index('ix_dues_payments_date', 'dues_payments')
+    op.drop_index('ix_dues_payments_account', 'dues_payments')
+    op.drop_index('ix_dues_payments_membership_number', 'dues_payments')
+    op.drop_table('dues_payments')
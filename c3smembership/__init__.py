@@ -11,6 +11,8 @@ from pyramid.config import Configurator
 from pyramid_beaker import session_factory_from_settings
 from sqlalchemy import engine_from_config
 
+from c3smembership.cache import configure_cache
+from c3smembership.gnupg_encrypt import configure_gnupg
 from c3smembership.data.model.base import Base
 from c3smembership.security import (
     Root,
@@ -61,6 +63,8 @@ def main(global_config, **settings):
     # pylint: disable=unused-argument
     engine = engine_from_config(settings, 'sqlalchemy.')
     Base.metadata.bind = engine
+    configure_cache(settings)
+    configure_gnupg(settings)
 
     session_factory = session_factory_from_settings(settings)
     authn_policy = AuthTktAuthenticationPolicy(
@@ -286,15 +286,15 @@ def _get_year_invoice_number(year, member):
     # TODO: This is only a workaround until the data model has been cleaned up
     # and there is an extra table to record dues per year and member.
     year_invoice_number = {
-        2015: member.dues15_invoice_no,
-        2016: member.dues16_invoice_no,
-        2017: member.dues17_invoice_no,
-        2018: member.dues18_invoice_no,
-        2019: member.dues19_invoice_no,
-        2020: member.dues20_invoice_no,
-        2021: member.dues21_invoice_no,
+        2015: 'dues15_invoice_no',
+        2016: 'dues16_invoice_no',
+        2017: 'dues17_invoice_no',
+        2018: 'dues18_invoice_no',
+        2019: 'dues19_invoice_no',
+        2020: 'dues20_invoice_no',
+        2021: 'dues21_invoice_no',
     }
-    return year_invoice_number[year]
+    return getattr(member, year_invoice_number[year])
 
 
 def _invoice_calculated(year, member):
@@ -304,12 +304,12 @@ def _invoice_calculated(year, member):
     # TODO: This is only a workaround until the data model has been cleaned up
     # and there is an extra table to record dues per year and member.
     year_invoice_calculated = {
-        2015: member.dues15_invoice,
-        2016: member.dues16_invoice,
-        2017: member.dues17_invoice,
-        2018: member.dues18_invoice,
-        2019: member.dues19_invoice,
-        2020: member.dues20_invoice,
-        2021: member.dues21_invoice,
+        2015: 'dues15_invoice',
+        2016: 'dues16_invoice',
+        2017: 'dues17_invoice',
+        2018: 'dues18_invoice',
+        2019: 'dues19_invoice',
+        2020: 'dues20_invoice',
+        2021: 'dues21_invoice',
     }
-    return year_invoice_calculated[year]
+    return getattr(member, year_invoice_calculated[year])
@@ -3,8 +3,15 @@
 Offers functionality to archive invoices.
 """
 
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
 import os
 import shutil
+import uuid
+
+import transaction
+
+from c3smembership.data.model.base import DBSession
 
 
 class DuesInvoiceArchiving(object):
@@ -64,14 +71,100 @@ class DuesInvoiceArchiving(object):
         missing_invoices = self.get_missing_invoices(year)
         generated_files = []
         for invoice in missing_invoices[:invoice_count]:
-            pdf_file = self._generate_invoice_pdf(invoice, year)
-            shutil.copyfile(
-                pdf_file.name,
-                self._get_archive_filename(invoice)
-            )
+            self._archive_invoice(invoice, year)
             generated_files.append(invoice.invoice_no_string)
         return generated_files
 
+    def archive_missing_invoices(self, years=None, workers=None,
+                                 progress=None):
+        """
+        Generates and archives all invoices which have not yet been archived
+        in parallel.
+
+        The PDF generation runs pdflatex in a separate process for each
+        invoice. The invoices are therefore generated by a pool of worker
+        threads each waiting for its own pdflatex process so that the
+        generation uses all CPU cores. Only the invoice numbers are passed to
+        the worker threads which load the invoices in their own database
+        sessions.
+
+        Args:
+            years: Optional. The list of years for which missing invoices are
+                generated. Defaults to all configured years.
+            workers: Integer. Optional. The number of invoices generated in
+                parallel. Defaults to the number of CPU cores.
+            progress: Optional. A Python callable which is called with the
+                invoice number of each archived invoice.
+
+        Returns:
+            An array of invoice numbers which were generated and archived in
+            the order of their completion.
+        """
+        if years is None:
+            years = self.get_configured_years()
+        tasks = [
+            (year, invoice.invoice_no)
+            for year in years
+            for invoice in self.get_missing_invoices(year)]
+        if not tasks:
+            return []
+
+        # pylint: disable=bare-except
+        pool = ThreadPool(min(workers or cpu_count(), len(tasks)))
+        generated_files = []
+        try:
+            for invoice_no_string in pool.imap_unordered(
+                    self._archive_invoice_task, tasks):
+                generated_files.append(invoice_no_string)
+                if progress is not None:
+                    progress(invoice_no_string)
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+        return generated_files
+
+    def _archive_invoice_task(self, task):
+        """
+        Archive the invoice of the task tuple of year and invoice number
+
+        The invoice is loaded in the database session of the worker thread
+        which is removed afterwards as sessions must not be shared between
+        threads.
+        """
+        year, invoice_number = task
+        try:
+            invoice = self._dues_invoice_repository.get_by_number(
+                invoice_number, year)
+            self._archive_invoice(invoice, year)
+            return invoice.invoice_no_string
+        finally:
+            transaction.abort()
+            DBSession.remove()
+
+    def _archive_invoice(self, invoice, year):
+        """
+        Generate the invoice PDF and store it atomically in the archive
+
+        The PDF is copied to a temporary file in the archive directory which
+        is then renamed to the archive filename. An invoice is therefore
+        either archived completely or not at all.
+        """
+        # pylint: disable=bare-except
+        pdf_file = self._generate_invoice_pdf(invoice, year)
+        archive_filename = self._get_archive_filename(invoice)
+        temporary_filename = '{0}.{1}.tmp'.format(
+            archive_filename, uuid.uuid4().hex)
+        try:
+            shutil.copyfile(pdf_file.name, temporary_filename)
+            os.rename(temporary_filename, archive_filename)
+        except:
+            if os.path.exists(temporary_filename):
+                os.remove(temporary_filename)
+            raise
+
     def _generate_invoice_pdf(self, invoice, year):
         """
         Generate the PDF depending on the type
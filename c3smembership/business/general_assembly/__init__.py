@@ -152,14 +152,7 @@ class GeneralAssemblyInvitation(object):
             ValueError: In case at least one of the  invitation subjects and
                 texts is empty.
         """
-        if general_assembly.date < self.date.today():
-            raise ValueError('The general assembly occurred in the past.')
-
-        if not general_assembly.invitation_subject_en \
-                or not general_assembly.invitation_text_en \
-                or not general_assembly.invitation_subject_de \
-                or not general_assembly.invitation_text_de:
-            raise ValueError('Invitation subjects and texts must be entered.')
+        self.validate_invitation(general_assembly)
 
         if not member.is_member(general_assembly.date):
             raise ValueError(
@@ -180,6 +173,28 @@ class GeneralAssemblyInvitation(object):
             token,
         )
 
+    def validate_invitation(self, general_assembly):
+        """
+        Validate that invitations can be sent for the general assembly
+
+        Args:
+            general_assembly: The general assembly for which invitations are
+                sent.
+
+        Raises:
+            ValueError: In case the general assembly is in the past.
+            ValueError: In case at least one of the  invitation subjects and
+                texts is empty.
+        """
+        if general_assembly.date < self.date.today():
+            raise ValueError('The general assembly occurred in the past.')
+
+        if not general_assembly.invitation_subject_en \
+                or not general_assembly.invitation_text_en \
+                or not general_assembly.invitation_subject_de \
+                or not general_assembly.invitation_text_de:
+            raise ValueError('Invitation subjects and texts must be entered.')
+
     def get_member_invitation(self, member, general_assembly_number):
         """
         Get the invitation of the member for the general assembly
@@ -206,10 +221,15 @@ class GeneralAssemblyInvitation(object):
             because the membership period does not cover the general assembly
             date.
         """
-        invitations = self.get_member_invitations(member)
-        for invitation in invitations:
-            if invitation['number'] == general_assembly_number:
-                return invitation
+        invitation = self._general_assembly_repository \
+            .get_member_invitation(
+                member.membership_number,
+                general_assembly_number)
+        if invitation is None or \
+                not self._applies_to_member(invitation, member):
+            return None
+        invitation['can_invite'] = self._can_invite(invitation)
+        return invitation
 
     def get_member_invitations(self, member):
         """
@@ -240,15 +260,65 @@ class GeneralAssemblyInvitation(object):
                 member.membership_date,
                 member.membership_loss_date)
         for general_assembly_invitation in general_assembly_invitations:
-            # only invite if
-            general_assembly_invitation['can_invite'] = (
-                # not invited yet and
-                not general_assembly_invitation['flag'] and
-                # assembly is not in the past
-                general_assembly_invitation['date'] >= self.date.today())
+            general_assembly_invitation['can_invite'] = self._can_invite(
+                general_assembly_invitation)
 
         return general_assembly_invitations
 
+    def get_members_invitation(self, members, general_assembly_number):
+        """
+        Get the invitations of the members for the general assembly
+
+        In contrast to calling get_member_invitation for each member the
+        invitations of all members are retrieved at once.
+
+        Args:
+            members: The members for which the invitations are returned.
+            general_assembly_number: Integer. The number of the general
+                assembly for which the members' invitations are returned.
+
+        Returns:
+            A dictionary mapping the membership numbers of the members to their
+            invitations as returned by get_member_invitation.
+        """
+        invitations = self._general_assembly_repository \
+            .get_members_invitation(
+                [member.membership_number for member in members],
+                general_assembly_number)
+        result = {}
+        for member in members:
+            invitation = invitations.get(member.membership_number)
+            if invitation is not None and \
+                    self._applies_to_member(invitation, member):
+                invitation['can_invite'] = self._can_invite(invitation)
+            else:
+                invitation = None
+            result[member.membership_number] = invitation
+        return result
+
+    @classmethod
+    def _applies_to_member(cls, general_assembly_invitation, member):
+        """
+        Check whether the membership period covers the general assembly date
+        """
+        assembly_date = general_assembly_invitation['date']
+        return (
+            (member.membership_date is None or
+             assembly_date >= member.membership_date) and
+            (member.membership_loss_date is None or
+             assembly_date <= member.membership_loss_date))
+
+    def _can_invite(self, general_assembly_invitation):
+        """
+        Check whether an invitation can be sent for the general assembly
+        """
+        # only invite if
+        return (
+            # not invited yet and
+            not general_assembly_invitation['flag'] and
+            # assembly is not in the past
+            general_assembly_invitation['date'] >= self.date.today())
+
     def get_next_number(self):
         """
         Get the next general assembly number
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Invitation campaigns inviting many members to a general assembly at once.
+"""
+
+from collections import namedtuple
+import random
+import re
+import string
+
+from c3smembership.mail_utils import (
+    get_email_footer,
+    get_salutation,
+)
+
+
+InvitationMessage = namedtuple('InvitationMessage', [
+    'membership_number',
+    'recipient',
+    'subject',
+    'body',
+])
+"""
+An invitation email rendered for a member.
+
+- membership_number: The membership number of the invited member.
+- recipient: The email address of the invited member.
+- subject: The subject of the invitation email.
+- body: The body of the invitation email.
+"""
+
+
+class InvitationTemplate(object):
+    """
+    Invitation text which is parsed once and rendered for many members.
+
+    The invitation texts contain the fields salutation, invitation_url and
+    footer in Python format string syntax. Fields which are the same for all
+    members like the footer are substituted when the template is created while
+    the other fields are substituted when rendering the text for a member.
+
+    Texts using other replacement fields than plain names, e.g. positional
+    fields, attribute access, indexing or nested format specifications, are
+    not parsed but formatted by str.format on rendering like before.
+    """
+
+    _formatter = string.Formatter()
+    _FIELD_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+    def __init__(self, text, **fields):
+        """
+        Initialise the InvitationTemplate object
+
+        Args:
+            text: String. The invitation text in Python format string syntax.
+            fields: The field values which are the same for all members.
+        """
+        self._text = None
+        self._fields = fields
+        self._parts = []
+        parsed_text = list(self._formatter.parse(text))
+        if not all(
+                self._is_plain_field(field_name, format_spec)
+                for _, field_name, format_spec, _ in parsed_text):
+            self._text = text
+            return
+        for literal_text, field_name, format_spec, conversion in parsed_text:
+            if literal_text:
+                self._parts.append(literal_text)
+            if field_name is None:
+                continue
+            if field_name in fields:
+                self._parts.append(
+                    self._format(fields[field_name], format_spec, conversion))
+            else:
+                self._parts.append((field_name, format_spec, conversion))
+
+    def render(self, **fields):
+        """
+        Render the invitation text
+
+        Args:
+            fields: The field values of the member.
+
+        Raises:
+            KeyError: In case a field of the invitation text is not specified.
+        """
+        if self._text is not None:
+            all_fields = dict(self._fields)
+            all_fields.update(fields)
+            return self._text.format(**all_fields)
+        return u''.join([
+            part if isinstance(part, basestring)
+            else self._format(fields[part[0]], part[1], part[2])
+            for part in self._parts])
+
+    @classmethod
+    def _is_plain_field(cls, field_name, format_spec):
+        """
+        Check whether the replacement field only references a field by its
+        name
+
+        Literal text without a replacement field is considered plain as well.
+        """
+        if field_name is None:
+            return True
+        return cls._FIELD_NAME.match(field_name) is not None \
+            and '{' not in format_spec
+
+    @classmethod
+    def _format(cls, value, format_spec, conversion):
+        """
+        Format the field value like str.format does
+        """
+        return cls._formatter.format_field(
+            cls._formatter.convert_field(value, conversion), format_spec)
+
+
+class InvitationCampaign(object):
+    """
+    Invite all eligible members to a general assembly at once
+
+    Sending invitations one by one checks the membership, reads the invitation
+    and general assembly and sends the email for each member. The campaign
+    instead selects all invitees in one query, stores their invitations in
+    bulk and renders the German and English invitation texts once. The
+    rendered messages are then handed to a delivery stage.
+
+    All of this happens within the current transaction so that the
+    invitations are only stored if the transaction is committed.
+    """
+
+    _TOKEN_CHARACTERS = string.ascii_lowercase + string.digits
+    _TOKEN_LENGTH = 15
+
+    def __init__(self, general_assembly_invitation,
+                 general_assembly_repository):
+        """
+        Initialise the InvitationCampaign object
+
+        Args:
+            general_assembly_invitation: The GeneralAssemblyInvitation object
+                validating the general assembly invitation business rules.
+            general_assembly_repository: The GeneralAssemblyRepository class.
+        """
+        self._general_assembly_invitation = general_assembly_invitation
+        self._general_assembly_repository = general_assembly_repository
+        self._random = random.SystemRandom()
+
+    def invite_members(self, general_assembly_number, invitation_url_factory,
+                       deliver, invitees_count=None):
+        """
+        Invite the members which have not been invited yet
+
+        Args:
+            general_assembly_number: Integer. The number of the general
+                assembly to which the members are invited.
+            invitation_url_factory: A callable accepting the token and the
+                email address of the member and returning the invitation URL.
+            deliver: A callable accepting a list of InvitationMessage objects
+                and delivering them.
+            invitees_count: Integer. Optional. The number of members invited
+                at maximum. If not specified, all eligible members are invited.
+
+        Returns:
+            The list of InvitationMessage objects handed to the delivery.
+
+        Raises:
+            ValueError: In case the general assembly does not exist.
+            ValueError: In case the general assembly is in the past.
+            ValueError: In case at least one of the  invitation subjects and
+                texts is empty.
+        """
+        general_assembly = self._general_assembly_repository \
+            .get_general_assembly(general_assembly_number)
+        if general_assembly is None:
+            raise ValueError('The general assembly does not exist.')
+        self._general_assembly_invitation.validate_invitation(
+            general_assembly)
+
+        invitees = self._general_assembly_repository.get_invitees(
+            general_assembly_number, invitees_count)
+        if not invitees:
+            return []
+
+        templates = self._get_templates(general_assembly)
+        tokens = self._make_random_tokens(len(invitees))
+        self._general_assembly_repository.invite_members(
+            general_assembly_number,
+            [
+                (member.membership_number, token)
+                for member, token in zip(invitees, tokens)
+            ])
+
+        messages = []
+        for member, token in zip(invitees, tokens):
+            subject, template = templates[
+                'de' if member.locale == 'de' else 'en']
+            messages.append(InvitationMessage(
+                membership_number=member.membership_number,
+                recipient=member.email,
+                subject=subject,
+                body=template.render(
+                    salutation=get_salutation(member),
+                    invitation_url=invitation_url_factory(
+                        token, member.email))))
+        deliver(messages)
+        return messages
+
+    @classmethod
+    def _get_templates(cls, general_assembly):
+        """
+        Get the invitation subjects and templates by locale
+        """
+        return {
+            'de': (
+                general_assembly.invitation_subject_de,
+                InvitationTemplate(
+                    general_assembly.invitation_text_de,
+                    footer=get_email_footer('de'))),
+            'en': (
+                general_assembly.invitation_subject_en,
+                InvitationTemplate(
+                    general_assembly.invitation_text_en,
+                    footer=get_email_footer('en'))),
+        }
+
+    def _make_random_tokens(self, count):
+        """
+        Generate distinct random tokens used to verify the members for API
+        access by the ticketing application
+        """
+        tokens = []
+        generated = set()
+        while len(tokens) < count:
+            token = u''.join(
+                self._random.choice(self._TOKEN_CHARACTERS)
+                for _ in range(self._TOKEN_LENGTH))
+            if token not in generated:
+                generated.add(token)
+                tokens.append(token)
+        return tokens
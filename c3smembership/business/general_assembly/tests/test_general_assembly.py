@@ -73,62 +73,135 @@ class GeneralAssemblyInvitationTest(TestCase):
         """
         Test the get_member_invitation method
 
-        Verify that it returns the general assembly with the correct number
-        from the list it got from the get_member_invitations method.
+        Verify that it returns the invitation retrieved by the
+        get_member_invitation repository method with the can_invite flag and
+        None if the membership does not cover the general assembly date.
         """
         date_dummy = mock.Mock()
-        date_dummy.today.side_effect = [
-            date(2018, 9, 16),
-            date(2018, 9, 16),
-            date(2018, 9, 16),
-            date(2018, 9, 16),
-        ]
+        date_dummy.today.return_value = date(2018, 9, 16)
 
         member = mock.Mock()
         member.membership_number = 'membership number'
-        member.membership_date = 'membership date'
-        member.membership_loss_date = 'membership loss date'
+        member.membership_date = date(2018, 1, 1)
+        member.membership_loss_date = None
 
         general_assembly_repository = mock.Mock()
-        general_assembly_repository.get_member_invitations.side_effect = [
-            # First method call
-            [
-                # In the past and not invited => no invitation
-                {
-                    'flag': False,
-                    'date': date(2018, 9, 15),
-                    'number': 1,
-                },
-                # In the past and invited => no invitation
-                {
-                    'flag': True,
-                    'date': date(2018, 9, 15),
-                    'number': 2,
-                },
-            ],
-            # Second method call
-            [
-                # In the past and not invited => no invitation
-                {
-                    'flag': False,
-                    'date': date(2018, 9, 15),
-                    'number': 1,
-                },
-                # In the past and invited => no invitation
-                {
-                    'flag': True,
-                    'date': date(2018, 9, 15),
-                    'number': 2,
-                },
-            ],
+        general_assembly_repository.get_member_invitation.side_effect = [
+            # In the past and not invited => no invitation
+            {
+                'flag': False,
+                'date': date(2018, 9, 15),
+                'number': 1,
+            },
+            # In the future and invited => no invitation
+            {
+                'flag': True,
+                'date': date(2018, 9, 17),
+                'number': 2,
+            },
+            # In the future and not invited => invitation
+            {
+                'flag': False,
+                'date': date(2018, 9, 17),
+                'number': 3,
+            },
+            # Before the membership => None
+            {
+                'flag': False,
+                'date': date(2017, 12, 31),
+                'number': 4,
+            },
+            # General assembly not existing => None
+            None,
         ]
 
         gai = GeneralAssemblyInvitation(general_assembly_repository)
         gai.date = date_dummy
         invitation = gai.get_member_invitation(member, 1)
+        general_assembly_repository.get_member_invitation.assert_called_with(
+            'membership number', 1)
         self.assertEqual(invitation['number'], 1)
+        self.assertEqual(invitation['can_invite'], False)
         invitation = gai.get_member_invitation(member, 2)
         self.assertEqual(invitation['number'], 2)
+        self.assertEqual(invitation['can_invite'], False)
+        invitation = gai.get_member_invitation(member, 3)
+        self.assertEqual(invitation['number'], 3)
+        self.assertEqual(invitation['can_invite'], True)
+        self.assertIsNone(gai.get_member_invitation(member, 4))
+        self.assertIsNone(gai.get_member_invitation(member, 5))
+
+        # Membership lost before the general assembly => None
+        member.membership_loss_date = date(2018, 9, 16)
+        general_assembly_repository.get_member_invitation.side_effect = [{
+            'flag': False,
+            'date': date(2018, 9, 17),
+            'number': 3,
+        }]
+        self.assertIsNone(gai.get_member_invitation(member, 3))
+
+    def test_get_members_invitation(self):
+        """
+        Test the get_members_invitation method
+
+        Verify that it returns the invitations of all members with the
+        can_invite flag and None for members whose membership does not cover
+        the general assembly date.
+        """
+        date_dummy = mock.Mock()
+        date_dummy.today.return_value = date(2018, 9, 16)
+
+        def create_member(membership_number, membership_date,
+                          membership_loss_date=None):
+            member = mock.Mock()
+            member.membership_number = membership_number
+            member.membership_date = membership_date
+            member.membership_loss_date = membership_loss_date
+            return member
+
+        members = [
+            # Not invited => invitation
+            create_member('member1', date(2018, 1, 1)),
+            # Invited => no invitation
+            create_member('member2', None),
+            # Membership starting after the assembly => None
+            create_member('member3', date(2019, 1, 1)),
+            # Membership lost before the assembly => None
+            create_member('member4', date(2017, 1, 1), date(2018, 9, 30)),
+            # Not in repository => None
+            create_member('member5', date(2017, 1, 1)),
+            # Membership lost at assembly date => invitation
+            create_member('member6', date(2017, 1, 1), date(2018, 10, 1)),
+        ]
+
+        general_assembly_repository = mock.Mock()
+        general_assembly_repository.get_members_invitation.return_value = {
+            'member1': {'flag': False, 'date': date(2018, 10, 1)},
+            'member2': {'flag': True, 'date': date(2018, 10, 1)},
+            'member3': {'flag': False, 'date': date(2018, 10, 1)},
+            'member4': {'flag': False, 'date': date(2018, 10, 1)},
+            'member6': {'flag': False, 'date': date(2018, 10, 1)},
+        }
+
+        gai = GeneralAssemblyInvitation(general_assembly_repository)
+        gai.date = date_dummy
+        invitations = gai.get_members_invitation(members, 3)
+
+        general_assembly_repository.get_members_invitation.assert_called_with(
+            ['member1', 'member2', 'member3', 'member4', 'member5', 'member6'],
+            3)
+        self.assertEqual(len(invitations), 6)
+        self.assertEqual(invitations['member1']['can_invite'], True)
+        self.assertEqual(invitations['member2']['can_invite'], False)
+        self.assertEqual(invitations['member3'], None)
+        self.assertEqual(invitations['member4'], None)
+        self.assertEqual(invitations['member5'], None)
+        self.assertEqual(invitations['member6']['can_invite'], True)
+
+        # In the past => no invitation
+        date_dummy.today.return_value = date(2018, 10, 2)
+        invitations = gai.get_members_invitation(members[:1], 3)
+        self.assertEqual(invitations['member1']['can_invite'], False)
 
     def test_invite_member(self):
         """
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Test the c3smembership.business.general_assembly.invitation_campaign module
+"""
+
+from datetime import date
+from unittest import TestCase
+
+import mock
+
+from c3smembership.business.general_assembly import \
+    GeneralAssembly as GeneralAssemblyBusiness
+from c3smembership.business.general_assembly.invitation_campaign import (
+    InvitationCampaign,
+    InvitationTemplate,
+)
+
+
+class InvitationTemplateTest(TestCase):
+    """
+    Test the InvitationTemplate class
+    """
+
+    def test_render(self):
+        """
+        Test the render method
+
+        Verify that the rendered text equals the text formatted by str.format.
+        """
+        texts = [
+            u'Hallo {salutation}!\n\n{invitation_url}\n\n{footer}',
+            u'{{escaped}} {salutation!r} {invitation_url:>10}{footer}',
+            u'No fields at all',
+            u'',
+        ]
+        for text in texts:
+            template = InvitationTemplate(text, footer=u'Viele Grüße')
+            self.assertEqual(
+                template.render(
+                    salutation=u'Jöhn Doe',
+                    invitation_url=u'http://example.com'),
+                text.format(
+                    salutation=u'Jöhn Doe',
+                    invitation_url=u'http://example.com',
+                    footer=u'Viele Grüße'))
+
+        # Field values are not parsed as format strings
+        template = InvitationTemplate(u'{footer} {salutation}', footer=u'{x}')
+        self.assertEqual(template.render(salutation=u'{y}'), u'{x} {y}')
+
+    def test_render_complex_fields(self):
+        """
+        Test that texts with fields str.format resolves beyond plain names
+        are rendered like str.format does
+        """
+        member = mock.Mock(salutation=u'Jöhn Doe')
+        template = InvitationTemplate(
+            u'{member.salutation} {footer!r:>8} {urls[de]}', footer=u'Bye')
+        self.assertEqual(
+            template.render(
+                member=member, urls={u'de': u'http://example.com'}),
+            u"Jöhn Doe   u'Bye' http://example.com")
+
+        template = InvitationTemplate(
+            u'{salutation:{width}}|', footer=u'Bye')
+        self.assertEqual(
+            template.render(salutation=u'John', width=6), u'John  |')
+
+        template = InvitationTemplate(u'{0} {salutation}')
+        with self.assertRaises(IndexError):
+            template.render(salutation=u'John')
+
+    def test_render_missing_field(self):
+        """
+        Test that the render method raises a KeyError for missing fields
+        """
+        template = InvitationTemplate(u'{salutation} {unknown}')
+        with self.assertRaises(KeyError):
+            template.render(salutation=u'John Doe')
+
+
+class InvitationCampaignTest(TestCase):
+    """
+    Test the InvitationCampaign class
+    """
+
+    @classmethod
+    def _create_member(cls, membership_number, locale):
+        member = mock.Mock()
+        member.membership_number = membership_number
+        member.email = u'{0}@example.com'.format(membership_number)
+        member.locale = locale
+        member.is_legalentity = False
+        member.firstname = u'First{0}'.format(membership_number)
+        member.lastname = u'Last{0}'.format(membership_number)
+        return member
+
+    def setUp(self):
+        self.general_assembly = GeneralAssemblyBusiness(
+            3, u'Assembly', date(2018, 12, 1),
+            u'Invitation', u'Hello {salutation}, {invitation_url}',
+            u'Einladung', u'Hallo {salutation}, {invitation_url}')
+        self.general_assembly_invitation = mock.Mock()
+        self.repository = mock.Mock()
+        self.repository.get_general_assembly.return_value = \
+            self.general_assembly
+        self.repository.get_invitees.return_value = [
+            self._create_member(u'1', u'de'),
+            self._create_member(u'2', u'en'),
+            self._create_member(u'3', u'fr'),
+        ]
+        self.deliver = mock.Mock()
+        self.campaign = InvitationCampaign(
+            self.general_assembly_invitation, self.repository)
+
+    @classmethod
+    def _make_url(cls, token, email):
+        return u'http://example.com/{0}/{1}'.format(token, email)
+
+    def test_invite_members(self):
+        """
+        Test the invite_members method
+
+        1. Verify that the invitations are stored with distinct tokens.
+        2. Verify the messages rendered by locale.
+        3. Verify that the messages are delivered.
+        """
+        messages = self.campaign.invite_members(
+            3, self._make_url, self.deliver)
+
+        self.repository.get_general_assembly.assert_called_with(3)
+        self.general_assembly_invitation.validate_invitation \
+            .assert_called_with(self.general_assembly)
+        self.repository.get_invitees.assert_called_with(3, None)
+
+        # 1. Verify that the invitations are stored with distinct tokens
+        self.assertEqual(self.repository.invite_members.call_count, 1)
+        general_assembly_number, invitations = \
+            self.repository.invite_members.call_args[0]
+        self.assertEqual(general_assembly_number, 3)
+        self.assertEqual(
+            [membership_number for membership_number, _ in invitations],
+            [u'1', u'2', u'3'])
+        tokens = [token for _, token in invitations]
+        self.assertEqual(len(set(tokens)), 3)
+        for token in tokens:
+            self.assertEqual(len(token), 15)
+
+        # 2. Verify the messages rendered by locale
+        self.assertEqual(len(messages), 3)
+        self.assertEqual(messages[0].membership_number, u'1')
+        self.assertEqual(messages[0].recipient, u'1@example.com')
+        self.assertEqual(messages[0].subject, u'Einladung')
+        self.assertEqual(
+            messages[0].body,
+            u'Hallo First1 Last1, http://example.com/{0}/1@example.com'
+            .format(tokens[0]))
+        self.assertEqual(messages[1].subject, u'Invitation')
+        self.assertEqual(
+            messages[1].body,
+            u'Hello First2 Last2, http://example.com/{0}/2@example.com'
+            .format(tokens[1]))
+        self.assertEqual(messages[2].subject, u'Invitation')
+
+        # 3. Verify that the messages are delivered
+        self.deliver.assert_called_once_with(messages)
+
+    def test_invite_members_count(self):
+        """
+        Test that the number of invitees is passed to the repository
+        """
+        self.campaign.invite_members(3, self._make_url, self.deliver, 2)
+        self.repository.get_invitees.assert_called_with(3, 2)
+
+    def test_invite_members_no_invitees(self):
+        """
+        Test that nothing is stored and delivered without invitees
+        """
+        self.repository.get_invitees.return_value = []
+        messages = self.campaign.invite_members(
+            3, self._make_url, self.deliver)
+        self.assertEqual(messages, [])
+        self.assertFalse(self.repository.invite_members.called)
+        self.assertFalse(self.deliver.called)
+
+    def test_invite_members_invalid(self):
+        """
+        Test that nothing is stored and delivered for invalid invitations
+
+        1. General assembly does not exist
+        2. Invitation not valid
+        """
+        # 1. General assembly does not exist
+        self.repository.get_general_assembly.return_value = None
+        with self.assertRaises(ValueError) as raise_context:
+            self.campaign.invite_members(3, self._make_url, self.deliver)
+        self.assertEqual(
+            str(raise_context.exception),
+            'The general assembly does not exist.')
+
+        # 2. Invitation not valid
+        self.repository.get_general_assembly.return_value = \
+            self.general_assembly
+        self.general_assembly_invitation.validate_invitation.side_effect = \
+            ValueError('The general assembly occurred in the past.')
+        with self.assertRaises(ValueError) as raise_context:
+            self.campaign.invite_members(3, self._make_url, self.deliver)
+        self.assertEqual(
+            str(raise_context.exception),
+            'The general assembly occurred in the past.')
+
+        self.assertFalse(self.repository.get_invitees.called)
+        self.assertFalse(self.repository.invite_members.called)
+        self.assertFalse(self.deliver.called)
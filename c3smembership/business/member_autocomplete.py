@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Provides the autocompletion of member reference codes and names.
+
+The autocompletion is served from an in-memory index of the reference codes
+and names of all members. The index is built lazily on first use and rebuilt
+after it was invalidated, e.g. because members changed, or after it reached
+its maximum age.
+
+Built indexes are kept in the cache so that processes sharing a cache backend
+build the index once for all of them.
+"""
+
+from bisect import bisect_left
+from datetime import (
+    datetime,
+    timedelta,
+)
+import threading
+import uuid
+
+from c3smembership.cache import cached
+
+
+class _MemberNameIndex(object):
+    """
+    Immutable snapshot of the sorted reference codes and names of members.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, member_names, built):
+        """
+        Initialises the _MemberNameIndex object.
+
+        Args:
+            member_names: An iterable of tuples of reference code, last name
+                and first name.
+            built: The datetime.datetime at which the index was built.
+        """
+        self.version = uuid.uuid4().hex
+        self.built = built
+        codes = []
+        people = []
+        for code, lastname, firstname in member_names:
+            if code is None:
+                continue
+            codes.append(code)
+            if lastname is not None:
+                key = u'{0} {1}, {2}'.format(
+                    code, lastname, firstname or u'')
+                people.append((lastname, firstname or u'', code, key))
+        # The first element of the entries is matched and the last element is
+        # the value returned.
+        self.codes = sorted((code,) for code in codes)
+        self.codes_lower = sorted((code.lower(), code) for code in codes)
+        self.people = sorted(people)
+        self.people_lower = sorted(
+            (person[0].lower(),) + person for person in people)
+
+
+class MemberAutocomplete(object):
+    """
+    Provides the autocompletion of member reference codes and names.
+    """
+
+    # For dependency injection
+    datetime = datetime
+
+    def __init__(self, member_repository, max_age=timedelta(minutes=5)):
+        """
+        Initialises the MemberAutocomplete object.
+
+        Each process keeps its own copy of the index which is only
+        invalidated by changes of the current process. The maximum age limits
+        how long changes made by other processes remain invisible.
+
+        Args:
+            member_repository: The member repository object used to access
+                member data.
+            max_age: Optional. A datetime.timedelta after which the index is
+                rebuilt. Defaults to five minutes.
+        """
+        self._member_repository = member_repository
+        self._max_age = max_age
+        self._index = None
+        self._lock = threading.Lock()
+        self._cached_index = cached(
+            duration_provider=self._get_max_age,
+            max_size=1,
+            name='member_autocomplete_index')(self._build_index)
+
+    def invalidate(self):
+        """
+        Invalidates the index so that it is rebuilt on next use.
+        """
+        with self._lock:
+            self._index = None
+            self._cached_index.expire_cache()
+
+    def get_version(self):
+        """
+        Gets the version of the index.
+
+        The version changes whenever the index is rebuilt and can be used to
+        identify the state of the autocompletion results, e.g. as ETag.
+
+        Returns:
+            A string identifying the current index.
+        """
+        return self._get_index().version
+
+    def get_matching_codes(self, prefix, limit=20, case_sensitive=True):
+        """
+        Gets the reference codes starting with the prefix.
+
+        Args:
+            prefix: The prefix the codes must start with.
+            limit: Optional. The maximum number of codes returned. Defaults to
+                20.
+            case_sensitive: Optional. Boolean indicating whether the prefix is
+                matched case sensitive. Defaults to True.
+
+        Returns:
+            A list of reference codes sorted alphabetically.
+        """
+        index = self._get_index()
+        if case_sensitive:
+            return self._find_prefix(index.codes, prefix, limit)
+        return self._find_prefix(index.codes_lower, prefix.lower(), limit)
+
+    def get_matching_people(self, prefix, limit=20, case_sensitive=True):
+        """
+        Gets the members of which the last name starts with the prefix.
+
+        Args:
+            prefix: The prefix the last names must start with.
+            limit: Optional. The maximum number of entries returned. Defaults
+                to 20.
+            case_sensitive: Optional. Boolean indicating whether the prefix is
+                matched case sensitive. Defaults to True.
+
+        Returns:
+            A dictionary mapping each entry of the form
+            "code lastname, firstname" to itself.
+        """
+        index = self._get_index()
+        if case_sensitive:
+            keys = self._find_prefix(index.people, prefix, limit)
+        else:
+            keys = self._find_prefix(
+                index.people_lower, prefix.lower(), limit)
+        return dict((key, key) for key in keys)
+
+    @classmethod
+    def _find_prefix(cls, entries, prefix, limit):
+        """
+        Finds the entries starting with the prefix.
+
+        Binary search finds the first matching entry. As the entries are
+        sorted, all other matching entries follow it directly.
+
+        Args:
+            entries: A sorted list of tuples of which the first element is
+                matched against the prefix and the last element is the value.
+            prefix: The prefix the first element of the entries must start
+                with.
+            limit: The maximum number of values returned.
+
+        Returns:
+            A list of the values of the matching entries.
+        """
+        values = []
+        position = bisect_left(entries, (prefix,))
+        while position < len(entries) and len(values) < limit:
+            entry = entries[position]
+            if not entry[0].startswith(prefix):
+                break
+            values.append(entry[-1])
+            position += 1
+        return values
+
+    def _get_index(self):
+        """
+        Gets the current index and builds it if necessary.
+
+        The index is built while holding the lock so that concurrent requests
+        wait for one build instead of building the index several times.
+        """
+        index = self._index
+        now = self.datetime.now()
+        if self._is_valid(index, now):
+            return index
+        with self._lock:
+            index = self._index
+            if not self._is_valid(index, now):
+                index = self._cached_index()
+                if not self._is_valid(index, now):
+                    self._cached_index.expire_cache()
+                    index = self._cached_index()
+                self._index = index
+            return index
+
+    def _build_index(self):
+        """
+        Builds the index from the member data.
+        """
+        return _MemberNameIndex(
+            self._member_repository.get_member_names(),
+            self.datetime.now())
+
+    def _get_max_age(self):
+        """
+        Gets the maximum age of the index.
+        """
+        return self._max_age
+
+    def _is_valid(self, index, now):
+        """
+        Checks whether the index exists and has not reached its maximum age.
+        """
+        return index is not None and now < index.built + self._max_age
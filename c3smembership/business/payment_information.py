@@ -59,6 +59,68 @@ class PaymentInformation(object):
             from_date,
             to_date)
 
+    # pylint: disable=too-many-arguments
+    def get_payments_page(
+            self, page_number, page_size, sort_property='date',
+            sort_direction='asc', from_date=None, to_date=None):
+        """
+        Gets the payments for a page filtered by dates together with the total
+        number of payments matching the filter.
+
+        Args:
+            page_number: The number of the page of payments to be returned.
+            page_size: The size of the pages of payments.
+            sort_property: Optional. A string representing the payment property
+                by which the payment list is sorted. The default sort property
+                is "date".
+            sort_direction: Optional. A string representing the sort direction,
+                either "asc" for ascending sorting or "desc" for descending
+                sorting. The default sort direction is ascending.
+            from_date: Optional. The earliest payment date. All older payments
+                are filtered.
+            to_date: Optional. The latest payment date. All younger payments
+                are filtered.
+
+        Returns:
+            A tuple of the list of payments of the page and an integer
+            representing the total number of payments matching the filter.
+        """
+        return self._payment_repository.get_payments_page(
+            page_number,
+            page_size,
+            sort_property,
+            sort_direction,
+            from_date,
+            to_date)
+
+    def iterate_payments(
+            self, sort_property='date', sort_direction='asc', from_date=None,
+            to_date=None):
+        """
+        Iterates all payments filtered by dates without loading them into
+        memory at once.
+
+        Args:
+            sort_property: Optional. A string representing the payment property
+                by which the payments are sorted. The default sort property is
+                "date".
+            sort_direction: Optional. A string representing the sort direction,
+                either "asc" for ascending sorting or "desc" for descending
+                sorting. The default sort direction is ascending.
+            from_date: Optional. The earliest payment date. All older payments
+                are filtered.
+            to_date: Optional. The latest payment date. All younger payments
+                are filtered.
+
+        Returns:
+            A generator of payments.
+        """
+        return self._payment_repository.iterate_payments(
+            sort_property,
+            sort_direction,
+            from_date,
+            to_date)
+
     def get_payment_count(self, from_date=None, to_date=None):
         """
         Gets the count of payments of which the payment date is not older than
@@ -103,6 +103,25 @@ class ShareInformation(object):
             membership_number,
             effective_date)
 
+    def get_member_share_counts(
+            self, effective_date=None, membership_numbers=None):
+        """
+        Gets the number of shares of members on the effective date.
+
+        Args:
+            effective_date: Optional. The date for which the number of shares
+                is calculated.
+            membership_numbers: Optional. The membership numbers of the
+                members for which the number of shares is calculated. If not
+                specified the number of shares is calculated for all members.
+
+        Returns:
+            A dictionary mapping membership numbers to the number of shares.
+        """
+        return self.share_repository.get_member_share_counts(
+            effective_date,
+            membership_numbers)
+
     def get_member_shares(self, membership_number):
         """
         Gets the share of a members.
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Provides statistical figures of the membership data.
+"""
+
+from collections import namedtuple
+from datetime import date
+
+from c3smembership.cache import cached
+
+
+StatisticsSnapshot = namedtuple('StatisticsSnapshot', [
+    'datasets',
+    'afm_shares_unpaid',
+    'afm_shares_paid',
+    'share_count',
+    'members_accepted',
+    'non_accepted',
+    'nonmember_listing',
+    'duplicates',
+    'natural_persons',
+    'legal_entities',
+    'normal',
+    'investing',
+    'other_features',
+    'membership_lost',
+    'membership_numbers',
+    'highest_membership_number',
+    'next_membership_number',
+    'countries',
+    'country_counts',
+    'dues_stats',
+    'staff_count',
+    'data_version',
+    'last_modified',
+])
+"""
+The statistical figures at one point in time.
+
+The member counters are described at StatisticsRepository.get_member_counts.
+Additionally, the snapshot contains:
+
+- share_count: The number of shares of members.
+- next_membership_number: The next free membership number.
+- country_counts: A list of tuples of country and number of entries sorted
+  descending by number of entries.
+- dues_stats: A dictionary mapping the dues years to their monthly statistics
+  as returned by DuesInvoiceRepository.get_monthly_stats.
+- staff_count: The number of staff accounts.
+- data_version: The data version the figures were calculated for.
+- last_modified: The UTC datetime.datetime of the last change of the data
+  version.
+"""
+
+
+# pylint: disable=too-few-public-methods
+class StatisticsInformation(object):
+    """
+    Provides statistical figures of the membership data.
+    """
+
+    def __init__(
+            self, statistics_repository, dues_invoice_repository,
+            share_repository, data_version_repository):
+        """
+        Initialises the StatisticsInformation object.
+
+        Args:
+            statistics_repository: The statistics repository object used to
+                aggregate member data.
+            dues_invoice_repository: The dues invoice repository object used
+                to aggregate dues data.
+            share_repository: The share repository object used to count
+                shares.
+            data_version_repository: The data version repository object used
+                to identify the state of the data for caching.
+        """
+        self._statistics_repository = statistics_repository
+        self._dues_invoice_repository = dues_invoice_repository
+        self._share_repository = share_repository
+        self._data_version_repository = data_version_repository
+        # The data version is part of the cache key so that values of older
+        # data versions are evicted as least recently used.
+        self._cached_statistics = cached(max_size=4)(
+            self._calculate_statistics)
+
+    def get_data_version(self):
+        """
+        Gets the data version the statistics depend on.
+
+        Returns:
+            A tuple of a string identifying the data version and the UTC
+            datetime.datetime of its last change.
+        """
+        return self._data_version_repository.get_data_version()
+
+    def get_cached_statistics(self):
+        """
+        Gets the statistical figures as of today from the cache.
+
+        The figures are calculated once per data version and day.
+
+        Returns:
+            A StatisticsSnapshot.
+        """
+        data_version, last_modified = self.get_data_version()
+        return self._cached_statistics(
+            date.today(), data_version, last_modified)
+
+    def get_statistics(self, effective_date=None):
+        """
+        Gets the statistical figures.
+
+        Args:
+            effective_date: Optional. The date for which the membership status
+                is evaluated. If not specified the system date is used.
+
+        Returns:
+            A StatisticsSnapshot.
+        """
+        data_version, last_modified = self.get_data_version()
+        return self._calculate_statistics(
+            effective_date, data_version, last_modified)
+
+    def _calculate_statistics(
+            self, effective_date, data_version, last_modified):
+        """
+        Calculates the statistical figures.
+
+        The data version must be retrieved before the calculation so that
+        changes during the calculation result in a newer data version.
+        """
+        member_counts = self._statistics_repository.get_member_counts(
+            effective_date)
+        return StatisticsSnapshot(
+            share_count=self._share_repository.get_share_count(
+                effective_date),
+            next_membership_number=member_counts[
+                'highest_membership_number'] + 1,
+            country_counts=self._statistics_repository.get_country_counts(),
+            dues_stats=self._dues_invoice_repository
+            .get_monthly_stats_by_year(),
+            staff_count=self._statistics_repository.get_staff_count(),
+            data_version=data_version,
+            last_modified=last_modified,
+            **member_counts)
@@ -3,11 +3,28 @@
 Test the c3smembership.business.dues_invoice_archiving package
 """
 
+from datetime import date
+from decimal import Decimal
+import os
+import shutil
+import tempfile
+import threading
 from unittest import TestCase
 
 import mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import object_session
+import transaction
 
 from c3smembership.business.dues_invoice_archiving import DuesInvoiceArchiving
+from c3smembership.data.model.base import (
+    Base,
+    DBSession,
+)
+from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.data.model.base.dues15invoice import Dues15Invoice
+from c3smembership.data.repository.dues_invoice_repository import \
+    DuesInvoiceRepository
 
 
 class DuesInvoiceArchivingTest(TestCase):
@@ -23,12 +40,24 @@ class DuesInvoiceArchivingTest(TestCase):
         Prepare invoices, file mocks and patch system methods
         """
         self.invoices = [
-            mock.Mock(invoice_no_string='Dues15-0001', is_reversal=False),
-            mock.Mock(invoice_no_string='Dues15-0002', is_reversal=True),
-            mock.Mock(invoice_no_string='Dues15-0003', is_reversal=False),
-            mock.Mock(invoice_no_string='Dues15-0004', is_reversal=False),
-            mock.Mock(invoice_no_string='Dues15-0005', is_reversal=False),
-            mock.Mock(invoice_no_string='Dues15-0006', is_reversal=False),
+            mock.Mock(
+                invoice_no=1, invoice_no_string='Dues15-0001',
+                is_reversal=False),
+            mock.Mock(
+                invoice_no=2, invoice_no_string='Dues15-0002',
+                is_reversal=True),
+            mock.Mock(
+                invoice_no=3, invoice_no_string='Dues15-0003',
+                is_reversal=False),
+            mock.Mock(
+                invoice_no=4, invoice_no_string='Dues15-0004',
+                is_reversal=False),
+            mock.Mock(
+                invoice_no=5, invoice_no_string='Dues15-0005',
+                is_reversal=False),
+            mock.Mock(
+                invoice_no=6, invoice_no_string='Dues15-0006',
+                is_reversal=False),
         ]
         file1 = mock.Mock()
         type(file1).name = mock.PropertyMock(return_value='tmp1.pdf')
@@ -54,6 +83,9 @@ class DuesInvoiceArchivingTest(TestCase):
         self.makedirs_patcher = mock.patch('os.makedirs')
         self.makedirs_mock = self.makedirs_patcher.start()
 
+        self.rename_patcher = mock.patch('os.rename')
+        self.rename_mock = self.rename_patcher.start()
+
     @classmethod
     def create_make_invoice(cls, files=None):
         """
@@ -90,6 +122,27 @@ class DuesInvoiceArchivingTest(TestCase):
         dues_invoice_repo_mock.get_all.side_effect = invoices
         return dues_invoice_repo_mock
 
+    def assert_archived(self, archived_files):
+        """
+        Assert that the files were copied to temporary files in the archive
+        which were renamed to the archive filenames
+
+        Args:
+            archived_files: Array of tuples of the generated and archive
+                filenames.
+        """
+        copies = self.copyfile_mock.call_args_list
+        renames = self.rename_mock.call_args_list
+        self.assertEqual(len(copies), len(archived_files))
+        self.assertEqual(len(renames), len(archived_files))
+        for copy, rename, (source, target) in zip(
+                copies, renames, archived_files):
+            temporary_filename = copy[0][1]
+            self.assertEqual(copy[0][0], source)
+            self.assertTrue(temporary_filename.startswith(target + '.'))
+            self.assertTrue(temporary_filename.endswith('.tmp'))
+            self.assertEqual(rename, mock.call(temporary_filename, target))
+
     def test_generate_missing_invoice_pdfs(self):
         """
         Test generating missing invoice PDF files
@@ -130,11 +183,11 @@ class DuesInvoiceArchivingTest(TestCase):
             ['Dues15-0001', 'Dues15-0002', 'Dues15-0003', 'Dues15-0005']
         )
         self.isdir_mock.assert_called_with('/tmp/invoices/archive')
-        self.copyfile_mock.assert_has_calls([
-            mock.call('tmp1.pdf', '/tmp/invoices/archive/Dues15-0001.pdf'),
-            mock.call('tmp2.pdf', '/tmp/invoices/archive/Dues15-0002.pdf'),
-            mock.call('tmp3.pdf', '/tmp/invoices/archive/Dues15-0003.pdf'),
-            mock.call('tmp4.pdf', '/tmp/invoices/archive/Dues15-0005.pdf'),
+        self.assert_archived([
+            ('tmp1.pdf', '/tmp/invoices/archive/Dues15-0001.pdf'),
+            ('tmp2.pdf', '/tmp/invoices/archive/Dues15-0002.pdf'),
+            ('tmp3.pdf', '/tmp/invoices/archive/Dues15-0003.pdf'),
+            ('tmp4.pdf', '/tmp/invoices/archive/Dues15-0005.pdf'),
         ])
         make_invoice_mock.assert_has_calls([
             mock.call(self.invoices[0]),
@@ -165,6 +218,85 @@ class DuesInvoiceArchivingTest(TestCase):
 
         self.assertEqual(len(generated_files), 3)
 
+    def test_archive_missing_invoices(self):
+        """
+        Test archiving all missing invoices in parallel
+
+        1. Test archiving the missing invoices of all configured years
+        2. Test no missing invoices
+        """
+        # 1. Test archiving the missing invoices of all configured years
+        self.isfile_mock.side_effect = lambda filename: \
+            filename.endswith('Dues15-0002.pdf')
+        dues_invoices_mock = mock.Mock()
+        dues_invoices_mock.get_all.side_effect = lambda years: {
+            2015: self.invoices[:3],
+            2016: self.invoices[3:],
+        }[years[0]]
+        dues_invoices_mock.get_by_number.side_effect = \
+            lambda invoice_number, year: self.invoices[invoice_number - 1]
+        files = dict(zip(
+            [invoice.invoice_no_string for invoice in self.invoices[2:]],
+            self.files[1:]))
+        files['Dues15-0001'] = self.files[0]
+        make_invoice_mock = mock.Mock(
+            side_effect=lambda invoice: files[invoice.invoice_no_string])
+        make_reversal_mock = mock.Mock()
+        progress_mock = mock.Mock()
+
+        archiving = DuesInvoiceArchiving(
+            dues_invoices_mock,
+            '/tmp/invoices/archive'
+        )
+        archiving.configure_year(2015, make_invoice_mock, make_reversal_mock)
+        archiving.configure_year(2016, make_invoice_mock, make_reversal_mock)
+        generated_files = archiving.archive_missing_invoices(
+            workers=3, progress=progress_mock)
+
+        expected_files = [
+            'Dues15-0001', 'Dues15-0003', 'Dues15-0004', 'Dues15-0005',
+            'Dues15-0006']
+        self.assertEqual(sorted(generated_files), expected_files)
+        self.assertEqual(
+            sorted(call[0][0] for call in progress_mock.call_args_list),
+            expected_files)
+        self.assertEqual(make_invoice_mock.call_count, 5)
+        make_reversal_mock.assert_not_called()
+        dues_invoices_mock.get_by_number.assert_any_call(4, 2016)
+        self.assertEqual(
+            sorted(call[0][1] for call in self.rename_mock.call_args_list),
+            ['/tmp/invoices/archive/{0}.pdf'.format(invoice_no_string)
+             for invoice_no_string in expected_files])
+
+        # 2. Test no missing invoices
+        self.isfile_mock.side_effect = None
+        self.isfile_mock.return_value = True
+        self.assertEqual(archiving.archive_missing_invoices(), [])
+
+    def test_archive_missing_invoices_failure(self):
+        """
+        Test that errors are raised and leave no temporary files
+        """
+        self.isfile_mock.return_value = False
+        dues15_invoices_mock = mock.Mock()
+        dues15_invoices_mock.get_all.return_value = [self.invoices[0]]
+        dues15_invoices_mock.get_by_number.return_value = self.invoices[0]
+        make_invoice_mock = self.create_make_invoice([self.files[0]])
+        self.rename_mock.side_effect = OSError('Disk full')
+
+        archiving = DuesInvoiceArchiving(
+            dues15_invoices_mock,
+            '/tmp/invoices/archive'
+        )
+        archiving.configure_year(2015, make_invoice_mock, mock.Mock())
+        with mock.patch('os.path.exists') as exists_mock, \
+                mock.patch('os.remove') as remove_mock:
+            exists_mock.return_value = True
+            with self.assertRaises(OSError):
+                archiving.archive_missing_invoices()
+        temporary_filename = self.copyfile_mock.call_args[0][1]
+        remove_mock.assert_called_once_with(temporary_filename)
+
     def test_archive_directory_creation(self):
         """
         Test that the archive directory is created if it does not exist
@@ -257,3 +389,101 @@ class DuesInvoiceArchivingTest(TestCase):
         self.isfile_patcher.stop()
         self.copyfile_patcher.stop()
         self.makedirs_patcher.stop()
+        self.rename_patcher.stop()
+
+
+class DuesInvoiceArchivingDatabaseTest(TestCase):
+    """
+    Test archiving invoices in parallel with a database
+    """
+
+    def setUp(self):
+        """
+        Set up a database file shared by the worker threads with a member and
+        its invoices
+        """
+        self.directory = tempfile.mkdtemp()
+        self.engine = create_engine('sqlite:///{0}'.format(
+            os.path.join(self.directory, 'test.db')))
+        DBSession.remove()
+        DBSession.configure(bind=self.engine)
+        Base.metadata.create_all(self.engine)
+        with transaction.manager:
+            member = C3sMember(
+                firstname=u'SomeFirstnäme',
+                lastname=u'SomeLastnäme',
+                email=u'member@example.com',
+                address1=u'addr one',
+                address2=u'addr two',
+                postcode=u'12345',
+                city=u'Footown Mäh',
+                country=u'Foocountry',
+                locale=u'DE',
+                date_of_birth=date.today(),
+                email_is_confirmed=False,
+                email_confirm_code=u'ABCDEFGFOO',
+                password=u'arandompassword',
+                date_of_submission=date.today(),
+                membership_type=u'normal',
+                member_of_colsoc=True,
+                name_of_colsoc=u'GEMA',
+                num_shares=35,
+            )
+            DBSession.add(member)
+            DBSession.flush()
+            for invoice_number in range(1, 7):
+                DBSession.add(Dues15Invoice(
+                    invoice_no=invoice_number,
+                    invoice_no_string=u'dues15-{0:04d}'.format(
+                        invoice_number),
+                    invoice_date=date(2015, 10, 1),
+                    invoice_amount=Decimal('50'),
+                    member_id=member.id,
+                    membership_no=member.membership_number,
+                    email=member.email,
+                    token=u'TOKEN{0}'.format(invoice_number)))
+
+    def tearDown(self):
+        transaction.abort()
+        DBSession.remove()
+        self.engine.dispose()
+        shutil.rmtree(self.directory)
+
+    def test_archive_missing_invoices(self):
+        """
+        Test that the workers load the invoices in their own database sessions
+        which are removed afterwards
+
+        The generator accesses the database like the PDF generation does.
+        """
+        lock = threading.Lock()
+        calls = []
+
+        def make_invoice(invoice):
+            member = C3sMember.get_by_id(invoice.member_id)
+            pdf_file = tempfile.NamedTemporaryFile(dir=self.directory)
+            pdf_file.write(member.email.encode('utf-8'))
+            pdf_file.flush()
+            with lock:
+                calls.append((invoice, object_session(invoice), pdf_file))
+            return pdf_file
+
+        archiving = DuesInvoiceArchiving(
+            DuesInvoiceRepository, os.path.join(self.directory, 'archive'))
+        archiving.configure_year(2015, make_invoice, mock.Mock())
+        caller_session = DBSession()
+        self.assertEqual(len(archiving.get_missing_invoices(2015)), 6)
+
+        generated_files = archiving.archive_missing_invoices(workers=3)
+
+        self.assertEqual(
+            sorted(generated_files),
+            [u'dues15-{0:04d}'.format(number) for number in range(1, 7)])
+        self.assertEqual(archiving.get_missing_invoices(2015), [])
+        self.assertEqual(len(calls), 6)
+        for invoice, session, pdf_file in calls:
+            self.assertIsNotNone(session)
+            self.assertIsNot(session, caller_session)
+            # The session of the worker was removed
+            self.assertIsNone(object_session(invoice))
+            pdf_file.close()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Tests the c3smembership.business.member_autocomplete package.
+"""
+
+from datetime import (
+    datetime,
+    timedelta,
+)
+from unittest import TestCase
+
+import mock
+
+from c3smembership.business.member_autocomplete import MemberAutocomplete
+
+
+class MemberAutocompleteTest(TestCase):
+    """
+    Tests the MemberAutocomplete class.
+    """
+
+    def setUp(self):
+        self.member_repository_mock = mock.Mock()
+        self.member_repository_mock.get_member_names.return_value = [
+            (u'ABCDEF', u'Smith', u'Jane'),
+            (u'ABDEFG', u'smithers', u'John'),
+            (u'abcxyz', u'Jones', u'Cassandra'),
+            (u'BCDEFG', u'Smith', u'Adam'),
+            (None, u'Nocode', u'Nora'),
+            (u'NONAME', None, None),
+        ]
+
+    def test_get_matching_codes(self):
+        """
+        Test the get_matching_codes method.
+        """
+        autocomplete = MemberAutocomplete(self.member_repository_mock)
+
+        self.assertEqual(
+            autocomplete.get_matching_codes(u'AB'), [u'ABCDEF', u'ABDEFG'])
+        self.assertEqual(
+            autocomplete.get_matching_codes(u'AB', limit=1), [u'ABCDEF'])
+        self.assertEqual(
+            autocomplete.get_matching_codes(u'abc', case_sensitive=False),
+            [u'ABCDEF', u'abcxyz'])
+        self.assertEqual(autocomplete.get_matching_codes(u'X'), [])
+        self.assertEqual(len(autocomplete.get_matching_codes(u'')), 5)
+
+        # The index is only built once
+        self.assertEqual(
+            self.member_repository_mock.get_member_names.call_count, 1)
+
+    def test_get_matching_people(self):
+        """
+        Test the get_matching_people method.
+        """
+        autocomplete = MemberAutocomplete(self.member_repository_mock)
+
+        self.assertEqual(
+            autocomplete.get_matching_people(u'Smi'),
+            {
+                u'BCDEFG Smith, Adam': u'BCDEFG Smith, Adam',
+                u'ABCDEF Smith, Jane': u'ABCDEF Smith, Jane',
+            })
+        self.assertEqual(
+            autocomplete.get_matching_people(u'Smi', limit=1),
+            {u'BCDEFG Smith, Adam': u'BCDEFG Smith, Adam'})
+        self.assertEqual(
+            sorted(autocomplete.get_matching_people(
+                u'smith', case_sensitive=False).keys()),
+            [
+                u'ABCDEF Smith, Jane',
+                u'ABDEFG smithers, John',
+                u'BCDEFG Smith, Adam',
+            ])
+        self.assertEqual(autocomplete.get_matching_people(u'Nocode'), {})
+
+    def test_invalidate(self):
+        """
+        Test that the index is rebuilt after invalidation.
+        """
+        autocomplete = MemberAutocomplete(self.member_repository_mock)
+        version = autocomplete.get_version()
+        self.assertEqual(autocomplete.get_version(), version)
+
+        self.member_repository_mock.get_member_names.return_value = [
+            (u'ZZZZZZ', u'Zeta', u'Zoe'),
+        ]
+        self.assertEqual(autocomplete.get_matching_codes(u'Z'), [])
+
+        autocomplete.invalidate()
+        self.assertEqual(autocomplete.get_matching_codes(u'Z'), [u'ZZZZZZ'])
+        self.assertNotEqual(autocomplete.get_version(), version)
+        self.assertEqual(
+            self.member_repository_mock.get_member_names.call_count, 2)
+
+    def test_max_age(self):
+        """
+        Test that the index is rebuilt after reaching its maximum age.
+        """
+        autocomplete = MemberAutocomplete(
+            self.member_repository_mock, timedelta(minutes=1))
+        autocomplete.datetime = mock.Mock()
+        autocomplete.datetime.now.return_value = datetime(2019, 1, 1, 0, 0, 0)
+        version = autocomplete.get_version()
+
+        autocomplete.datetime.now.return_value = datetime(2019, 1, 1, 0, 0, 59)
+        self.assertEqual(autocomplete.get_version(), version)
+
+        autocomplete.datetime.now.return_value = datetime(2019, 1, 1, 0, 1, 0)
+        self.assertNotEqual(autocomplete.get_version(), version)
+        self.assertEqual(
+            self.member_repository_mock.get_member_names.call_count, 2)
@@ -33,3 +33,38 @@ class PaymentInformationTest(TestCase):
         self.assertEqual(payments, 'get_payments result')
         self.assertTrue(payment_repository_mock.get_payments.called_with((
             'page_number', 'page_size', 'from_date', 'to_date')))
+
+    def test_get_payments_page(self):
+        """
+        Test the get_payments_page method.
+        """
+        payment_repository_mock = mock.Mock()
+        payment_repository_mock.get_payments_page.side_effect = [
+            ('get_payments_page result', 123)]
+
+        payment_information = PaymentInformation(payment_repository_mock)
+
+        payments, total = payment_information.get_payments_page(
+            'page_number', 'page_size', 'sort_property', 'sort_direction',
+            'from_date', 'to_date')
+
+        self.assertEqual(payments, 'get_payments_page result')
+        self.assertEqual(total, 123)
+        payment_repository_mock.get_payments_page.assert_called_with(
+            'page_number', 'page_size', 'sort_property', 'sort_direction',
+            'from_date', 'to_date')
+
+    def test_get_payment_count(self):
+        """
+        Test the get_payment_count method.
+        """
+        payment_repository_mock = mock.Mock()
+        payment_repository_mock.get_payment_count.side_effect = [123]
+
+        payment_information = PaymentInformation(payment_repository_mock)
+
+        count = payment_information.get_payment_count('from_date', 'to_date')
+
+        self.assertEqual(count, 123)
+        payment_repository_mock.get_payment_count.assert_called_with(
+            'from_date', 'to_date')
@@ -89,6 +89,27 @@ class ShareInformationTest(TestCase):
         share_repository_mock.get_member_share_count.assert_called_with(
             'WXYZ6789', date(2017, 7, 20))
 
+    def test_get_member_share_counts(self):
+        share_repository_mock = mock.Mock()
+        share_repository_mock.get_member_share_counts.side_effect = [
+            'get_member_share_counts result 1',
+            'get_member_share_counts result 2']
+
+        share_information = ShareInformation(share_repository_mock)
+
+        self.assertEqual(
+            share_information.get_member_share_counts(),
+            'get_member_share_counts result 1')
+        share_repository_mock.get_member_share_counts.assert_called_with(
+            None, None)
+
+        self.assertEqual(
+            share_information.get_member_share_counts(
+                date(2017, 7, 20), ['ABCD1234', 'WXYZ6789']),
+            'get_member_share_counts result 2')
+        share_repository_mock.get_member_share_counts.assert_called_with(
+            date(2017, 7, 20), ['ABCD1234', 'WXYZ6789'])
+
     def test_get(self):
         share_repository_mock = mock.Mock()
         share_repository_mock.get.side_effect = ['get result']
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Tests the c3smembership.business.statistics package.
+"""
+
+from datetime import (
+    date,
+    datetime,
+)
+from unittest import TestCase
+
+import mock
+
+from c3smembership.business.statistics import StatisticsInformation
+
+
+class StatisticsInformationTest(TestCase):
+    """
+    Tests the StatisticsInformation class.
+    """
+
+    @classmethod
+    def _create_statistics_information(cls, data_version_repository_mock):
+        """
+        Create a StatisticsInformation object with repository mocks.
+        """
+        statistics_repository_mock = mock.Mock()
+        statistics_repository_mock.get_member_counts.return_value = {
+            'datasets': 7,
+            'afm_shares_unpaid': 14,
+            'afm_shares_paid': 12,
+            'members_accepted': 4,
+            'non_accepted': 2,
+            'nonmember_listing': 2,
+            'duplicates': 1,
+            'natural_persons': 3,
+            'legal_entities': 1,
+            'normal': 2,
+            'investing': 1,
+            'other_features': 1,
+            'membership_lost': 1,
+            'membership_numbers': 5,
+            'highest_membership_number': 41,
+            'countries': 3,
+        }
+        statistics_repository_mock.get_country_counts.return_value = [
+            (u'DE', 5), (u'AT', 2)]
+        statistics_repository_mock.get_staff_count.return_value = 2
+        dues_invoice_repository_mock = mock.Mock()
+        dues_invoice_repository_mock.get_monthly_stats_by_year.return_value = \
+            {2021: []}
+        share_repository_mock = mock.Mock()
+        share_repository_mock.get_share_count.return_value = 123
+        return (
+            StatisticsInformation(
+                statistics_repository_mock,
+                dues_invoice_repository_mock,
+                share_repository_mock,
+                data_version_repository_mock),
+            statistics_repository_mock,
+            share_repository_mock)
+
+    def test_get_statistics(self):
+        """
+        Test the get_statistics method.
+        """
+        data_version_repository_mock = mock.Mock()
+        data_version_repository_mock.get_data_version.return_value = (
+            u'abc-1', datetime(2021, 3, 4, 5, 6, 7))
+        statistics_information, statistics_repository_mock, \
+            share_repository_mock = self._create_statistics_information(
+                data_version_repository_mock)
+        effective_date = date(2021, 3, 4)
+        statistics = statistics_information.get_statistics(effective_date)
+
+        statistics_repository_mock.get_member_counts.assert_called_with(
+            effective_date)
+        share_repository_mock.get_share_count.assert_called_with(
+            effective_date)
+        self.assertEqual(statistics.datasets, 7)
+        self.assertEqual(statistics.members_accepted, 4)
+        self.assertEqual(statistics.highest_membership_number, 41)
+        self.assertEqual(statistics.next_membership_number, 42)
+        self.assertEqual(statistics.share_count, 123)
+        self.assertEqual(statistics.country_counts, [(u'DE', 5), (u'AT', 2)])
+        self.assertEqual(statistics.dues_stats, {2021: []})
+        self.assertEqual(statistics.staff_count, 2)
+        self.assertEqual(statistics.data_version, u'abc-1')
+        self.assertEqual(
+            statistics.last_modified, datetime(2021, 3, 4, 5, 6, 7))
+
+    def test_get_cached_statistics(self):
+        """
+        Test the get_cached_statistics method.
+
+        1. Get the statistics twice for the same data version and verify that
+           they are calculated once.
+        2. Change the data version and verify that the statistics are
+           calculated again.
+        """
+        data_version_repository_mock = mock.Mock()
+        data_version_repository_mock.get_data_version.return_value = (
+            u'abc-1', datetime(2021, 3, 4, 5, 6, 7))
+        statistics_information, statistics_repository_mock, _ = \
+            self._create_statistics_information(data_version_repository_mock)
+
+        # 1. Get the statistics twice for the same data version
+        statistics = statistics_information.get_cached_statistics()
+        self.assertEqual(statistics.data_version, u'abc-1')
+        statistics = statistics_information.get_cached_statistics()
+        self.assertEqual(statistics.data_version, u'abc-1')
+        self.assertEqual(
+            statistics_repository_mock.get_member_counts.call_count, 1)
+        statistics_repository_mock.get_member_counts.assert_called_with(
+            date.today())
+
+        # 2. Change the data version
+        data_version_repository_mock.get_data_version.return_value = (
+            u'abc-2', datetime(2021, 3, 4, 5, 6, 8))
+        statistics = statistics_information.get_cached_statistics()
+        self.assertEqual(statistics.data_version, u'abc-2')
+        self.assertEqual(
+            statistics.last_modified, datetime(2021, 3, 4, 5, 6, 8))
+        self.assertEqual(
+            statistics_repository_mock.get_member_counts.call_count, 2)
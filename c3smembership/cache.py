@@ -29,13 +29,46 @@ Example:
     Filling cache by executing my_func()
 
     'my_func result'
+
+By default, each cache keeps its values in the memory of the process. Several
+processes can share their cached values and the data version counters by
+configuring a shared backend in the settings:
+
+    c3smembership.cache.backend = sqlite
+    c3smembership.cache.path = %(here)s/cache.sqlite
+
+The values cached by a shared backend must be picklable.
 """
 
+from collections import (
+    namedtuple,
+    OrderedDict,
+)
 from datetime import (
     timedelta,
     datetime,
 )
+import cPickle as pickle
 import hashlib
+import inspect
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+
+CacheMetrics = namedtuple(
+    'CacheMetrics', ['hits', 'misses', 'evictions', 'size', 'max_size'])
+"""
+The metrics of a cache.
+
+- hits: The number of calls answered from the cache.
+- misses: The number of calls executing the wrapped function.
+- evictions: The number of values dropped because the cache was full.
+- size: The number of currently cached values.
+- max_size: The maximum number of cached values or None if unbounded.
+"""
 
 
 class CacheWrapper(object):
@@ -65,6 +98,15 @@ class CacheWrapper(object):
         """
         self._cache.expire_cache()
 
+    def get_metrics(self):
+        """
+        Get the cache metrics
+
+        Returns:
+            A CacheMetrics tuple.
+        """
+        return self._cache.get_metrics()
+
 
 def default_duration_provider():
     """
@@ -77,12 +119,18 @@ class Cache(object):
     """
     Cache decorator
     """
-    # pylint: disable=too-few-public-methods
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
 
     # For dependency injection
     datetime = datetime
 
-    def __init__(self, duration_provider=default_duration_provider):
+    # The marker is a constant so that keys are identified across processes
+    # by shared backends.
+    _KWARGS_MARKER = '<kwargs>'
+
+    def __init__(
+            self, duration_provider=default_duration_provider, max_size=128,
+            name=None, key_provider=None):
         """
         Initialize the Cache object
 
@@ -91,19 +139,41 @@ class Cache(object):
         in order to be able to change the cache duration during runtime from
         configuration or for testing.
 
-        The cache duration starts counting with the first call and does not
-        depend on the arguments of the call.
+        The cache duration starts counting for each combination of arguments
+        with the call caching its value.
+
+        If the cache is full the least recently used value is dropped.
+
+        The wrapped function is executed at most once at a time per
+        combination of arguments within a process. Concurrent calls with the
+        same arguments wait for the value instead of executing the function
+        as well.
 
         Args:
             duration_provider: Optional, defaults to four hours. A method
                 returning a datetime.timedelta specifying the duration the
                 cache is used until refreshed.
+            max_size: Optional, defaults to 128. The maximum number of cached
+                values. None for an unbounded cache.
+            name: Optional, defaults to the module and name of the wrapped
+                function. The name identifies the values of the cache in a
+                shared backend.
+            key_provider: Optional, defaults to using all arguments. A
+                callable receiving the arguments of the call and returning
+                the cache key. It allows passing arguments which the value
+                does not depend on, e.g. a request.
         """
         self._duration_provider = duration_provider
-        self._expiration = None
-        self._last_cached = None
+        self._key_provider = key_provider
+        self._max_size = max_size
+        self._name = name
         self._wrapped = None
-        self._cache = {}
+        self._backend = None
+        self._lock = threading.Lock()
+        self._fill_locks = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
 
     def __call__(self, wrapped):
         """
@@ -117,34 +187,133 @@ class Cache(object):
             caching.
         """
         self._wrapped = wrapped
+        if self._name is None:
+            self._name = self._get_name(wrapped)
         return CacheWrapper(self)
 
     def expire_cache(self):
         """
-        Expire the cache
+        Expire the cache and drop the cached values
+        """
+        self._get_backend().clear()
+
+    def get_metrics(self):
+        """
+        Get the cache metrics
+
+        The counters only cover the calls of the current process.
+
+        Returns:
+            A CacheMetrics tuple.
         """
-        self._last_cached = None
+        size = self._get_backend().get_size()
+        with self._lock:
+            return CacheMetrics(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=size,
+                max_size=self._max_size)
 
     def wrapper(self, *args, **kwargs):
         """
         Cache the wrapped function
         """
-        cache_key = self._hash(args, kwargs)
+        if self._key_provider is None:
+            cache_key = self._build_key(args, kwargs)
+        else:
+            cache_key = self._key_provider(*args, **kwargs)
         cache_duration = self._duration_provider()
         now = self.datetime.now()
 
-        is_cached = cache_key in self._cache
-        is_expired = self._last_cached is None or \
-            now > self._last_cached + cache_duration
-
-        if is_cached and not is_expired:
-            return self._cache[cache_key]
-        else:
-            cache_value = self._wrapped(*args, **kwargs)
-            self._cache[cache_key] = cache_value
-            self._last_cached = now
+        # The backend is accessed without holding the lock so that slow
+        # backends do not serialise all calls of the process.
+        is_cached, cache_value = self._get(cache_key, now, cache_duration)
+        if is_cached:
+            return cache_value
+        with self._lock:
+            fill_lock = self._fill_locks.setdefault(
+                cache_key, threading.Lock())
+
+        with fill_lock:
+            # Another thread might have filled the cache in the meantime.
+            is_cached, cache_value = self._get(cache_key, now, cache_duration)
+            if is_cached:
+                return cache_value
+            with self._lock:
+                self._misses += 1
+            try:
+                cache_value = self._wrapped(*args, **kwargs)
+                evictions = self._get_backend().set(
+                    cache_key, cache_value, now)
+                with self._lock:
+                    self._evictions += evictions
+            finally:
+                with self._lock:
+                    if self._fill_locks.get(cache_key) is fill_lock:
+                        del self._fill_locks[cache_key]
             return cache_value
 
+    def _get(self, cache_key, now, cache_duration):
+        """
+        Get the cached value if it is not expired
+
+        Returns:
+            A tuple of a boolean indicating whether a current value is cached
+            and the cached value.
+        """
+        entry = self._get_backend().get(cache_key)
+        if entry is None:
+            return False, None
+        cache_value, cached_at = entry
+        if now > cached_at + cache_duration:
+            return False, None
+        with self._lock:
+            self._hits += 1
+        return True, cache_value
+
+    def _get_backend(self):
+        """
+        Get the backend storing the cached values
+
+        The backend is created on first use so that caches declared at import
+        time use the backend configured later on.
+        """
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = _backend_factory(
+                        self._name, self._max_size)
+        return self._backend
+
+    @classmethod
+    def _get_name(cls, wrapped):
+        """
+        Get the name of the wrapped function including its module and class
+        """
+        names = [getattr(wrapped, '__module__', None)]
+        if inspect.ismethod(wrapped):
+            names.append(wrapped.im_class.__name__)
+        names.append(getattr(wrapped, '__name__', None))
+        return '.'.join(str(name) for name in names if name is not None)
+
+    @classmethod
+    def _build_key(cls, args, kwargs):
+        """
+        Build the cache key from the args and kwargs passed to the function
+
+        The arguments are used as the key if they are hashable. Otherwise,
+        the representations of the arguments are hashed.
+        """
+        cache_key = args
+        if kwargs:
+            cache_key += (cls._KWARGS_MARKER,) + tuple(sorted(kwargs.items()))
+        try:
+            hash(cache_key)
+        except TypeError:
+            return cls._hash(args, kwargs)
+        return cache_key
+
     @classmethod
     def _hash(cls, args, kwargs):
         """
@@ -164,5 +333,470 @@ class Cache(object):
             result_hash.update(hashlib.sha1(repr(value)).digest())
         return result_hash.digest()
 
+
+class MemoryCacheBackend(object):
+    """
+    Cache backend keeping the values in the memory of the process
+    """
+
+    def __init__(self, name, max_size):
+        """
+        Initialize the MemoryCacheBackend object
+
+        Args:
+            name: The name of the cache.
+            max_size: The maximum number of cached values or None if
+                unbounded.
+        """
+        self._name = name
+        self._max_size = max_size
+        # Maps the cache key to a tuple of the value and its caching time in
+        # the order of usage, least recently used first.
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key):
+        """
+        Get the cached value and mark it as recently used
+
+        Returns:
+            A tuple of the cached value and the datetime.datetime it was
+            cached at or None if no value is cached.
+        """
+        with self._lock:
+            entry = self._values.pop(cache_key, None)
+            if entry is not None:
+                self._values[cache_key] = entry
+            return entry
+
+    def set(self, cache_key, cache_value, cached_at):
+        """
+        Cache the value and evict the least recently used values if the cache
+        is full
+
+        Returns:
+            The number of evicted values.
+        """
+        with self._lock:
+            self._values.pop(cache_key, None)
+            self._values[cache_key] = (cache_value, cached_at)
+            evictions = 0
+            if self._max_size is not None:
+                while len(self._values) > self._max_size:
+                    self._values.popitem(last=False)
+                    evictions += 1
+            return evictions
+
+    def clear(self):
+        """
+        Drop all cached values
+        """
+        with self._lock:
+            self._values.clear()
+
+    def get_size(self):
+        """
+        Get the number of cached values
+        """
+        return len(self._values)
+
+
+class _SqliteConnection(object):
+    """
+    Provides one connection per thread to an SQLite cache file
+
+    All connections are tracked so that they can be closed by close_all.
+    """
+
+    _connections = threading.local()
+    _all_connections = []
+    _all_connections_lock = threading.Lock()
+    _generation = 0
+
+    def __init__(self, path):
+        """
+        Initialize the _SqliteConnection object
+
+        Args:
+            path: The path of the SQLite file.
+        """
+        self._path = path
+
+    def get(self):
+        """
+        Get the connection of the current thread and create the tables if
+        necessary
+        """
+        connections = self._connections.__dict__
+        generation, connection = connections.get(self._path, (None, None))
+        if connection is None or generation != self._generation:
+            # The connection is only used by the current thread but may be
+            # closed by close_all from another thread.
+            connection = sqlite3.connect(
+                self._path, timeout=30, isolation_level=None,
+                check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache_values ('
+                'name TEXT NOT NULL, '
+                'cache_key TEXT NOT NULL, '
+                'cache_value BLOB NOT NULL, '
+                'used REAL NOT NULL, '
+                'PRIMARY KEY (name, cache_key))')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS counters ('
+                'name TEXT NOT NULL PRIMARY KEY, '
+                'token TEXT NOT NULL, '
+                'value INTEGER NOT NULL, '
+                'modified REAL NOT NULL)')
+            with self._all_connections_lock:
+                self._all_connections.append(connection)
+                connections[self._path] = (self._generation, connection)
+        return connection
+
+    @classmethod
+    def close_all(cls):
+        """
+        Close the connections of all threads
+
+        Threads open new connections on their next use.
+        """
+        with cls._all_connections_lock:
+            connections = cls._all_connections
+            cls._all_connections = []
+            cls._generation += 1
+        for connection in connections:
+            connection.close()
+
+
+class SqliteCacheBackend(object):
+    """
+    Cache backend sharing the values between processes in an SQLite file
+
+    The values are pickled. Cache keys are identified by the SHA-1 of their
+    serialisation as created by _serialize_key.
+    """
+
+    def __init__(self, name, max_size, path):
+        """
+        Initialize the SqliteCacheBackend object
+
+        Args:
+            name: The name of the cache identifying its values in the file.
+            max_size: The maximum number of cached values or None if
+                unbounded.
+            path: The path of the SQLite file.
+        """
+        self._name = name
+        self._max_size = max_size
+        self._connection = _SqliteConnection(path)
+
+    def get(self, cache_key):
+        """
+        Get the cached value and mark it as recently used
+
+        Returns:
+            A tuple of the cached value and the datetime.datetime it was
+            cached at or None if no value is cached.
+        """
+        connection = self._connection.get()
+        key = self._hash_key(cache_key)
+        row = connection.execute(
+            'SELECT cache_value FROM cache_values '
+            'WHERE name = ? AND cache_key = ?',
+            (self._name, key)).fetchone()
+        if row is None:
+            return None
+        connection.execute(
+            'UPDATE cache_values SET used = ? '
+            'WHERE name = ? AND cache_key = ?',
+            (time.time(), self._name, key))
+        return pickle.loads(str(row[0]))
+
+    def set(self, cache_key, cache_value, cached_at):
+        """
+        Cache the value and evict the least recently used values if the cache
+        is full
+
+        Returns:
+            The number of evicted values.
+        """
+        connection = self._connection.get()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute(
+                'INSERT OR REPLACE INTO cache_values '
+                '(name, cache_key, cache_value, used) VALUES (?, ?, ?, ?)',
+                (
+                    self._name,
+                    self._hash_key(cache_key),
+                    sqlite3.Binary(pickle.dumps(
+                        (cache_value, cached_at), pickle.HIGHEST_PROTOCOL)),
+                    time.time()))
+            evictions = 0
+            if self._max_size is not None:
+                evictions = connection.execute(
+                    'DELETE FROM cache_values WHERE name = ? '
+                    'AND cache_key NOT IN ('
+                    'SELECT cache_key FROM cache_values WHERE name = ? '
+                    'ORDER BY used DESC, rowid DESC LIMIT ?)',
+                    (self._name, self._name, self._max_size)).rowcount
+            connection.execute('COMMIT')
+        except:
+            connection.execute('ROLLBACK')
+            raise
+        return evictions
+
+    def clear(self):
+        """
+        Drop all cached values of the cache for all processes
+        """
+        self._connection.get().execute(
+            'DELETE FROM cache_values WHERE name = ?', (self._name,))
+
+    def get_size(self):
+        """
+        Get the number of cached values
+        """
+        return self._connection.get().execute(
+            'SELECT COUNT(*) FROM cache_values WHERE name = ?',
+            (self._name,)).fetchone()[0]
+
+    @classmethod
+    def _hash_key(cls, cache_key):
+        """
+        Hash the cache key to identify it across processes
+        """
+        return hashlib.sha1(_serialize_key(cache_key)).hexdigest()
+
+
+class MemoryCounter(object):
+    """
+    Counter held in the memory of the process
+    """
+
+    def __init__(self, name):
+        """
+        Initialize the MemoryCounter object
+
+        Args:
+            name: The name of the counter.
+        """
+        self._name = name
+        # The token distinguishes the counters of different processes and
+        # process runs.
+        self._token = uuid.uuid4().hex
+        self._value = 0
+        self._modified = datetime.utcnow()
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Get the counter value
+
+        Returns:
+            A tuple of a string identifying the counter value and the UTC
+            datetime.datetime of its last change. Before the first change the
+            creation of the counter is used as the last change.
+        """
+        with self._lock:
+            return (
+                u'{0}-{1}'.format(self._token, self._value),
+                self._modified)
+
+    def increment(self):
+        """
+        Increment the counter value
+        """
+        with self._lock:
+            self._value += 1
+            self._modified = datetime.utcnow()
+
+
+class SqliteCounter(object):
+    """
+    Counter shared between processes in an SQLite file
+    """
+
+    def __init__(self, name, path):
+        """
+        Initialize the SqliteCounter object
+
+        Args:
+            name: The name of the counter.
+            path: The path of the SQLite file.
+        """
+        self._name = name
+        self._connection = _SqliteConnection(path)
+
+    def get(self):
+        """
+        Get the counter value
+
+        Returns:
+            A tuple of a string identifying the counter value and the UTC
+            datetime.datetime of its last change. Before the first change the
+            creation of the counter is used as the last change.
+        """
+        connection = self._connection.get()
+        row = connection.execute(
+            'SELECT token, value, modified FROM counters WHERE name = ?',
+            (self._name,)).fetchone()
+        if row is None:
+            self._create(connection)
+            return self.get()
+        token, value, modified = row
+        return (
+            u'{0}-{1}'.format(token, value),
+            datetime.utcfromtimestamp(modified))
+
+    def increment(self):
+        """
+        Increment the counter value
+        """
+        connection = self._connection.get()
+        self._create(connection)
+        connection.execute(
+            'UPDATE counters SET value = value + 1, modified = ? '
+            'WHERE name = ?',
+            (time.time(), self._name))
+
+    def _create(self, connection):
+        """
+        Create the counter if it does not exist yet
+        """
+        connection.execute(
+            'INSERT OR IGNORE INTO counters (name, token, value, modified) '
+            'VALUES (?, ?, 0, ?)',
+            (self._name, uuid.uuid4().hex, time.time()))
+
+
+def _serialize_key(cache_key):
+    """
+    Serialise the cache key to a string which is the same in all processes
+
+    Tuples, lists and dictionaries are serialised item by item, all other
+    values by their type name and representation. Keys identified across
+    processes must therefore only contain values of which the representation
+    does not depend on the process, e.g. no object addresses.
+
+    Args:
+        cache_key: The cache key.
+
+    Returns:
+        The serialised key as a byte string.
+    """
+    if isinstance(cache_key, (tuple, list)):
+        return '{0}({1})'.format(
+            type(cache_key).__name__,
+            ','.join(_serialize_key(item) for item in cache_key))
+    if isinstance(cache_key, dict):
+        return 'dict({0})'.format(','.join(
+            '{0}:{1}'.format(_serialize_key(key), _serialize_key(value))
+            for key, value in sorted(cache_key.items())))
+    return '{0}:{1}'.format(type(cache_key).__name__, repr(cache_key))
+
+
+def close_connections():
+    """
+    Close the connections of the shared SQLite backend
+
+    The connections are reopened on next use.
+    """
+    _SqliteConnection.close_all()
+
+
+def _create_memory_backend(name, max_size):
+    """
+    Create a MemoryCacheBackend
+    """
+    return MemoryCacheBackend(name, max_size)
+
+
+_backend_factory = _create_memory_backend
+_counter_factory = MemoryCounter
+_counters = {}
+_counters_lock = threading.Lock()
+
+
+def get_counter(name):
+    """
+    Get the counter of the given name from the configured backend
+
+    Counters identify the state of shared data, e.g. as part of cache keys.
+    The memory backend provides a counter per process while the shared
+    backends provide a counter per host.
+
+    Args:
+        name: The name of the counter.
+
+    Returns:
+        An object providing the get and increment methods of MemoryCounter.
+    """
+    with _counters_lock:
+        counter = _counters.get(name)
+        if counter is None:
+            counter = _counter_factory(name)
+            _counters[name] = counter
+        return counter
+
+
+def configure_cache(settings):
+    """
+    Configure the cache backend from the settings
+
+    The settings are:
+
+    - c3smembership.cache.backend: Optional, defaults to "memory". Either
+      "memory" to keep the cached values in each process or "sqlite" to share
+      them between processes in an SQLite file.
+    - c3smembership.cache.path: The path of the SQLite file. Required for the
+      "sqlite" backend.
+
+    Caches only pick up the backend on their first use. The cache should
+    therefore be configured before serving requests.
+
+    Args:
+        settings: The application settings dictionary.
+
+    Raises:
+        ValueError: If the backend is unknown or the path of the SQLite file
+            is missing.
+    """
+    # pylint: disable=global-statement
+    global _backend_factory, _counter_factory
+    backend = settings.get('c3smembership.cache.backend', 'memory').strip()
+    if backend == 'memory':
+        backend_factory = _create_memory_backend
+        counter_factory = MemoryCounter
+    elif backend == 'sqlite':
+        path = settings.get('c3smembership.cache.path', '').strip()
+        if not path:
+            raise ValueError(
+                'The setting c3smembership.cache.path is required for the '
+                'sqlite cache backend.')
+        path = os.path.abspath(path)
+
+        def backend_factory(name, max_size):
+            """
+            Create an SqliteCacheBackend
+            """
+            return SqliteCacheBackend(name, max_size, path)
+
+        def counter_factory(name):
+            """
+            Create an SqliteCounter
+            """
+            return SqliteCounter(name, path)
+    else:
+        raise ValueError(
+            'Unknown cache backend "{0}".'.format(backend))
+    with _counters_lock:
+        _backend_factory = backend_factory
+        _counter_factory = counter_factory
+        _counters.clear()
+    close_connections()
+
+
 # pylint: disable=invalid-name
 cached = Cache
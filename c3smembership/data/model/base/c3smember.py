@@ -19,6 +19,7 @@ from sqlalchemy import (
     DateTime,
     distinct,
     ForeignKey,
+    Index,
     Integer,
     or_,
     not_,
@@ -28,8 +29,12 @@ from sqlalchemy import (
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from sqlalchemy.orm import (
+    deferred,
+    load_only,
     relationship,
-    synonym
+    synonym,
+    undefer,
+    undefer_group,
 )
 
 from c3smembership.data.model.base import (
@@ -39,6 +44,7 @@ from c3smembership.data.model.base import (
     DBSession,
     hash_password,
 )
+from c3smembership.data.model.base.dues_payment import DuesPayment
 from c3smembership.data.model.base.shares import Shares
 
 
@@ -88,8 +94,63 @@ class C3sMember(Base):
     * legal entities (we had a form on dead wood)
 
     Some attributes have been added over time to cater for different needs.
+
+    Columns which are only needed on detail pages are deferred in groups and
+    loaded on first access of one of the group's attributes:
+
+    * address: address1, address2, postcode and city
+    * application: the dates, reminders and comments of the application
+      workflow
+    * dues15 to dues21: the dues columns of one year
+
+    Queries for several members use undefer_group for the groups they need or
+    load_only for listings. Queries for a single member load all columns.
     """
     __tablename__ = 'members'
+
+    MEMBER_LISTING_COLUMNS = (
+        'id',
+        'firstname',
+        'lastname',
+        'email',
+        'is_legalentity',
+        'membership_type',
+        'membership_accepted',
+        'membership_date',
+        'membership_number',
+        'membership_loss_date',
+        'num_shares',
+        'certificate_email',
+        'certificate_email_date',
+        'dues21_invoice',
+        'dues21_invoice_date',
+    )
+    """The columns rendered by the membership listing."""
+
+    APPLICANT_LISTING_COLUMNS = (
+        'id',
+        'firstname',
+        'lastname',
+        'email',
+        'email_is_confirmed',
+        'email_confirm_mail_date',
+        'date_of_submission',
+        'membership_type',
+        'membership_accepted',
+        'num_shares',
+        'signature_received',
+        'signature_received_date',
+        'signature_confirmed',
+        'payment_received',
+        'payment_received_date',
+        'payment_confirmed',
+        'sent_signature_reminder',
+        'sent_signature_reminder_date',
+        'sent_payment_reminder',
+        'sent_payment_reminder_date',
+    )
+    """The columns rendered by the listing of membership applicants."""
+
     # pylint: disable=invalid-name
     id = Column(Integer, primary_key=True)
     """technical id. / number in table (integer, primary key)"""
@@ -100,9 +161,9 @@ class C3sMember(Base):
     """
     firstname = Column(Unicode(255))
     """given name(s) of person"""
-    lastname = Column(Unicode(255))
+    lastname = Column(Unicode(255), index=True)
     """last name of person"""
-    email = Column(Unicode(255))
+    email = Column(Unicode(255), index=True)
     """email address of person
     """
     _password = Column('password', Unicode(60))
@@ -114,13 +175,13 @@ class C3sMember(Base):
     """timestamp of password persistence (time of submission)
     """
     # pass_reset_token = Column(Unicode(255))
-    address1 = Column(Unicode(255))
+    address1 = deferred(Column(Unicode(255)), group='address')
     """Street & Number"""
-    address2 = Column(Unicode(255))
+    address2 = deferred(Column(Unicode(255)), group='address')
     """Address continued"""
-    postcode = Column(Unicode(255))
+    postcode = deferred(Column(Unicode(255)), group='address')
     """Postal Code"""
-    city = Column(Unicode(255))
+    city = deferred(Column(Unicode(255)), group='address')
     """City or Place"""
     country = Column(Unicode(255))
     """Country"""
@@ -140,8 +201,8 @@ class C3sMember(Base):
     """
     email_confirm_token = Column(Unicode(255), unique=True)  # token
     '''Unicode'''
-    email_confirm_mail_date = Column(
-        DateTime(), default=datetime(1970, 1, 1))
+    email_confirm_mail_date = deferred(
+        Column(DateTime(), default=datetime(1970, 1, 1)), group='application')
     # duplicate entries // people submitting at different times
     is_duplicate = Column(Boolean, default=False)
     """boolean
@@ -178,19 +239,20 @@ class C3sMember(Base):
 
     * Has the signature been received?
     """
-    signature_received_date = Column(
-        DateTime(), default=datetime(1970, 1, 1))
+    signature_received_date = deferred(
+        Column(DateTime(), default=datetime(1970, 1, 1)), group='application')
     """datetime
 
     * the date and time this application was submitted
     """
-    signature_confirmed = Column(Boolean, default=False)
+    signature_confirmed = deferred(
+        Column(Boolean, default=False), group='application')
     """Boolean
 
     * Has reception of signed form been confirmed?
     """
-    signature_confirmed_date = Column(
-        DateTime(), default=datetime(1970, 1, 1))
+    signature_confirmed_date = deferred(
+        Column(DateTime(), default=datetime(1970, 1, 1)), group='application')
     """datetime
 
     * the date and time arrival of signed form was confirmed per email
@@ -200,19 +262,20 @@ class C3sMember(Base):
 
     * Has the payment been received?
     """
-    payment_received_date = Column(
-        DateTime(), default=datetime(1970, 1, 1))
+    payment_received_date = deferred(
+        Column(DateTime(), default=datetime(1970, 1, 1)), group='application')
     """datetime
 
     * the date and time payment for this application was received
     """
-    payment_confirmed = Column(Boolean, default=False)
+    payment_confirmed = deferred(
+        Column(Boolean, default=False), group='application')
     """Boolean
 
     * Has the payment been confirmed?
     """
-    payment_confirmed_date = Column(
-        DateTime(), default=datetime(1970, 1, 1))
+    payment_confirmed_date = deferred(
+        Column(DateTime(), default=datetime(1970, 1, 1)), group='application')
     """datetime
 
     * the date and time this application was confirmed per email
@@ -230,31 +293,44 @@ class C3sMember(Base):
       by the board of directors -- and the relevant date of approval
       has been entered into the system by staff.
     """
+    # dues payment ledger
+    dues_payments = relationship(
+        DuesPayment,
+        backref='member',
+        cascade='all, delete-orphan',
+    )
+    """relation
+
+    * dues payment ledger records of the member, one per dues year. They are
+      kept in sync with the payment fields by the set_duesNN_payment methods.
+    """
     # reminders
-    sent_signature_reminder = Column(Integer, default=0)
+    sent_signature_reminder = deferred(
+        Column(Integer, default=0), group='application')
     """Integer
 
     * stores how many signature reminders have been sent out
     """
-    sent_signature_reminder_date = Column(
-        DateTime(), default=datetime(1970, 1, 1))
+    sent_signature_reminder_date = deferred(
+        Column(DateTime(), default=datetime(1970, 1, 1)), group='application')
     """DateTime
 
     * stores *when* the last signature reminder was sent out
     """
-    sent_payment_reminder = Column(Integer, default=0)
+    sent_payment_reminder = deferred(
+        Column(Integer, default=0), group='application')
     """Integer
 
     * stores how many payment reminders have been sent out
     """
-    sent_payment_reminder_date = Column(
-        DateTime(), default=datetime(1970, 1, 1))
+    sent_payment_reminder_date = deferred(
+        Column(DateTime(), default=datetime(1970, 1, 1)), group='application')
     """DateTime
 
     * stores *when* the last payment reminder was sent out
     """
     # comment
-    accountant_comment = Column(Unicode(255))
+    accountant_comment = deferred(Column(Unicode(255)), group='application')
     # membership information
     membership_type = Column(Unicode(255))
     """Unicode
@@ -285,7 +361,7 @@ class C3sMember(Base):
 
     Date of membership approval by the board.
     """
-    membership_number = Column(Integer())
+    membership_number = Column(Integer(), index=True)
     """Integer
 
     * Membership Number given upon approval.
@@ -293,7 +369,7 @@ class C3sMember(Base):
     # ## loss of membership
     # the date on which the membership terminates, i.e. the date of
     # membership and the day after which the membership does no longer exist
-    membership_loss_date = Column(Date())
+    membership_loss_date = Column(Date(), index=True)
     # the membership can be lost upon:
     # - resignation
     # - expulsion
@@ -303,8 +379,9 @@ class C3sMember(Base):
     membership_loss_type = Column(Unicode(255))
 
     # startnex repair operations
-    mtype_confirm_token = Column(Unicode(255))
-    mtype_email_date = Column(DateTime(), default=datetime(1970, 1, 1))
+    mtype_confirm_token = deferred(Column(Unicode(255)), group='application')
+    mtype_email_date = deferred(
+        Column(DateTime(), default=datetime(1970, 1, 1)), group='application')
 
     # legal entities
     is_legalentity = Column(Boolean, default=False)
@@ -316,165 +393,209 @@ class C3sMember(Base):
     certificate_email_date = Column(DateTime())
 
     # membership dues for 2015
-    dues15_invoice = Column(Boolean, default=False)  # sent?
-    dues15_invoice_date = Column(DateTime())  # when?
-    dues15_invoice_no = Column(Integer())  # lfd. nummer
-    dues15_token = Column(Unicode(10))  # access token
-    dues15_start = Column(Unicode(255))  # a string, 2015 quarter of membership
-    dues15_amount = Column(  # calculated amount member has to pay by default
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))
-    dues15_reduced = Column(Boolean, default=False)  # was reduced?
-    _dues15_amount_reduced = Column(
-        'dues15_amount_reduced',  # the amount reduced to
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))  # ..to xs
+    dues15_invoice = deferred(
+        Column(Boolean, default=False), group='dues15')  # sent?
+    dues15_invoice_date = deferred(Column(DateTime()), group='dues15')  # when?
+    dues15_invoice_no = deferred(
+        Column(Integer()), group='dues15')  # lfd. nummer
+    dues15_token = deferred(
+        Column(Unicode(10)), group='dues15')  # access token
+    dues15_start = deferred(  # a string, 2015 quarter of membership
+        Column(Unicode(255)), group='dues15')
+    dues15_amount = deferred(  # calculated amount member has to pay by default
+        Column(DatabaseDecimal(12, 2), default=Decimal('NaN')), group='dues15')
+    dues15_reduced = deferred(
+        Column(Boolean, default=False), group='dues15')  # was reduced?
+    _dues15_amount_reduced = deferred(
+        Column(
+            'dues15_amount_reduced',  # the amount reduced to
+            DatabaseDecimal(12, 2), default=Decimal('NaN')),  # ..to xs
+        group='dues15')
     # balance
-    _dues15_balance = Column(
-        'dues15_balance',  # the amount to be settled
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues15_balanced = Column(Boolean, default=True)  # was balanced?
+    _dues15_balance = deferred(
+        Column(
+            'dues15_balance',  # the amount to be settled
+            DatabaseDecimal(12, 2), default=Decimal('0')),
+        group='dues15')
+    dues15_balanced = deferred(
+        Column(Boolean, default=True), group='dues15')  # was balanced?
     # payment
-    dues15_paid = Column(Boolean, default=False)  # payment flag
-    dues15_amount_paid = Column(  # how much paid?
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues15_paid_date = Column(DateTime())  # paid when?
+    dues15_paid = deferred(
+        Column(Boolean, default=False), group='dues15')  # payment flag
+    dues15_amount_paid = deferred(  # how much paid?
+        Column(DatabaseDecimal(12, 2), default=Decimal('0')), group='dues15')
+    dues15_paid_date = deferred(
+        Column(DateTime()), group='dues15')  # paid when?
 
     # membership dues for 2016
-    dues16_invoice = Column(Boolean, default=False)  # sent?
-    dues16_invoice_date = Column(DateTime())  # when?
-    dues16_invoice_no = Column(Integer())  # lfd. nummer
-    dues16_token = Column(Unicode(10))  # access token
-    dues16_start = Column(Unicode(255))  # a string, 2016 quarter of membership
-    dues16_amount = Column(  # calculated amount member has to pay by default
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))
-    dues16_reduced = Column(Boolean, default=False)  # was reduced?
-    _dues16_amount_reduced = Column(
-        'dues16_amount_reduced',  # the amount reduced to
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))  # ..to xs
+    dues16_invoice = deferred(
+        Column(Boolean, default=False), group='dues16')  # sent?
+    dues16_invoice_date = deferred(Column(DateTime()), group='dues16')  # when?
+    dues16_invoice_no = deferred(
+        Column(Integer()), group='dues16')  # lfd. nummer
+    dues16_token = deferred(
+        Column(Unicode(10)), group='dues16')  # access token
+    dues16_start = deferred(  # a string, 2016 quarter of membership
+        Column(Unicode(255)), group='dues16')
+    dues16_amount = deferred(  # calculated amount member has to pay by default
+        Column(DatabaseDecimal(12, 2), default=Decimal('NaN')), group='dues16')
+    dues16_reduced = deferred(
+        Column(Boolean, default=False), group='dues16')  # was reduced?
+    _dues16_amount_reduced = deferred(
+        Column(
+            'dues16_amount_reduced',  # the amount reduced to
+            DatabaseDecimal(12, 2), default=Decimal('NaN')),  # ..to xs
+        group='dues16')
     # balance
-    _dues16_balance = Column(
-        'dues16_balance',  # the amount to be settled
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues16_balanced = Column(Boolean, default=True)  # was balanced?
+    _dues16_balance = deferred(
+        Column(
+            'dues16_balance',  # the amount to be settled
+            DatabaseDecimal(12, 2), default=Decimal('0')),
+        group='dues16')
+    dues16_balanced = deferred(
+        Column(Boolean, default=True), group='dues16')  # was balanced?
     # payment
-    dues16_paid = Column(Boolean, default=False)  # payment flag
-    dues16_amount_paid = Column(  # how much paid?
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues16_paid_date = Column(DateTime())  # paid when?
+    dues16_paid = deferred(
+        Column(Boolean, default=False), group='dues16')  # payment flag
+    dues16_amount_paid = deferred(  # how much paid?
+        Column(DatabaseDecimal(12, 2), default=Decimal('0')), group='dues16')
+    dues16_paid_date = deferred(
+        Column(DateTime()), group='dues16')  # paid when?
 
     # membership dues for 2017
-    dues17_invoice = Column(Boolean, default=False)  # sent?
-    dues17_invoice_date = Column(DateTime())  # when?
-    dues17_invoice_no = Column(Integer())  # lfd. nummer
-    dues17_token = Column(Unicode(10))  # access token
-    dues17_start = Column(Unicode(255))  # a string, 2017 quarter of membership
-    dues17_amount = Column(  # calculated amount member has to pay by default
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))
-    dues17_reduced = Column(Boolean, default=False)  # was reduced?
-    _dues17_amount_reduced = Column(
-        'dues17_amount_reduced',  # the amount reduced to
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))  # ..to xs
+    dues17_invoice = deferred(
+        Column(Boolean, default=False), group='dues17')  # sent?
+    dues17_invoice_date = deferred(Column(DateTime()), group='dues17')  # when?
+    dues17_invoice_no = deferred(
+        Column(Integer()), group='dues17')  # lfd. nummer
+    dues17_token = deferred(
+        Column(Unicode(10)), group='dues17')  # access token
+    dues17_start = deferred(  # a string, 2017 quarter of membership
+        Column(Unicode(255)), group='dues17')
+    dues17_amount = deferred(  # calculated amount member has to pay by default
+        Column(DatabaseDecimal(12, 2), default=Decimal('NaN')), group='dues17')
+    dues17_reduced = deferred(
+        Column(Boolean, default=False), group='dues17')  # was reduced?
+    _dues17_amount_reduced = deferred(
+        Column(
+            'dues17_amount_reduced',  # the amount reduced to
+            DatabaseDecimal(12, 2), default=Decimal('NaN')),  # ..to xs
+        group='dues17')
     # balance
-    _dues17_balance = Column(
-        'dues17_balance',  # the amount to be settled
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues17_balanced = Column(Boolean, default=True)  # was balanced?
+    _dues17_balance = deferred(
+        Column(
+            'dues17_balance',  # the amount to be settled
+            DatabaseDecimal(12, 2), default=Decimal('0')),
+        group='dues17')
+    dues17_balanced = deferred(
+        Column(Boolean, default=True), group='dues17')  # was balanced?
     # payment
-    dues17_paid = Column(Boolean, default=False)  # payment flag
-    dues17_amount_paid = Column(  # how much paid?
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues17_paid_date = Column(DateTime())  # paid when?
+    dues17_paid = deferred(
+        Column(Boolean, default=False), group='dues17')  # payment flag
+    dues17_amount_paid = deferred(  # how much paid?
+        Column(DatabaseDecimal(12, 2), default=Decimal('0')), group='dues17')
+    dues17_paid_date = deferred(
+        Column(DateTime()), group='dues17')  # paid when?
 
     # membership dues for 2018
-    dues18_invoice = Column(Boolean, default=False)
-    dues18_invoice_date = Column(DateTime())
-    dues18_invoice_no = Column(Integer())
-    dues18_token = Column(Unicode(10))
-    dues18_start = Column(Unicode(255))
-    dues18_amount = Column(
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))
-    dues18_reduced = Column(Boolean, default=False)
-    _dues18_amount_reduced = Column(
-        'dues18_amount_reduced',
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))
+    dues18_invoice = deferred(Column(Boolean, default=False), group='dues18')
+    dues18_invoice_date = deferred(Column(DateTime()), group='dues18')
+    dues18_invoice_no = deferred(Column(Integer()), group='dues18')
+    dues18_token = deferred(Column(Unicode(10)), group='dues18')
+    dues18_start = deferred(Column(Unicode(255)), group='dues18')
+    dues18_amount = deferred(
+        Column(DatabaseDecimal(12, 2), default=Decimal('NaN')), group='dues18')
+    dues18_reduced = deferred(Column(Boolean, default=False), group='dues18')
+    _dues18_amount_reduced = deferred(
+        Column(
+            'dues18_amount_reduced',
+            DatabaseDecimal(12, 2), default=Decimal('NaN')),
+        group='dues18')
     # balance
-    _dues18_balance = Column(
-        'dues18_balance',
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues18_balanced = Column(Boolean, default=True)
+    _dues18_balance = deferred(
+        Column('dues18_balance', DatabaseDecimal(12, 2), default=Decimal('0')),
+        group='dues18')
+    dues18_balanced = deferred(Column(Boolean, default=True), group='dues18')
     # payment
-    dues18_paid = Column(Boolean, default=False)
-    dues18_amount_paid = Column(
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues18_paid_date = Column(DateTime())
+    dues18_paid = deferred(Column(Boolean, default=False), group='dues18')
+    dues18_amount_paid = deferred(
+        Column(DatabaseDecimal(12, 2), default=Decimal('0')), group='dues18')
+    dues18_paid_date = deferred(Column(DateTime()), group='dues18')
 
     # membership dues for 2019
-    dues19_invoice = Column(Boolean, default=False)
-    dues19_invoice_date = Column(DateTime())
-    dues19_invoice_no = Column(Integer())
-    dues19_token = Column(Unicode(10))
-    dues19_start = Column(Unicode(255))
-    dues19_amount = Column(
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))
-    dues19_reduced = Column(Boolean, default=False)
-    _dues19_amount_reduced = Column(
-        'dues19_amount_reduced',
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))
+    dues19_invoice = deferred(Column(Boolean, default=False), group='dues19')
+    dues19_invoice_date = deferred(Column(DateTime()), group='dues19')
+    dues19_invoice_no = deferred(Column(Integer()), group='dues19')
+    dues19_token = deferred(Column(Unicode(10)), group='dues19')
+    dues19_start = deferred(Column(Unicode(255)), group='dues19')
+    dues19_amount = deferred(
+        Column(DatabaseDecimal(12, 2), default=Decimal('NaN')), group='dues19')
+    dues19_reduced = deferred(Column(Boolean, default=False), group='dues19')
+    _dues19_amount_reduced = deferred(
+        Column(
+            'dues19_amount_reduced',
+            DatabaseDecimal(12, 2), default=Decimal('NaN')),
+        group='dues19')
     # balance
-    _dues19_balance = Column(
-        'dues19_balance',
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues19_balanced = Column(Boolean, default=True)
+    _dues19_balance = deferred(
+        Column('dues19_balance', DatabaseDecimal(12, 2), default=Decimal('0')),
+        group='dues19')
+    dues19_balanced = deferred(Column(Boolean, default=True), group='dues19')
     # payment
-    dues19_paid = Column(Boolean, default=False)
-    dues19_amount_paid = Column(
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues19_paid_date = Column(DateTime())
+    dues19_paid = deferred(Column(Boolean, default=False), group='dues19')
+    dues19_amount_paid = deferred(
+        Column(DatabaseDecimal(12, 2), default=Decimal('0')), group='dues19')
+    dues19_paid_date = deferred(Column(DateTime()), group='dues19')
 
     # membership dues for 2020
-    dues20_invoice = Column(Boolean, default=False)
-    dues20_invoice_date = Column(DateTime())
-    dues20_invoice_no = Column(Integer())
-    dues20_token = Column(Unicode(10))
-    dues20_start = Column(Unicode(255))
-    dues20_amount = Column(
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))
-    dues20_reduced = Column(Boolean, default=False)
-    _dues20_amount_reduced = Column(
-        'dues20_amount_reduced',
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))
+    dues20_invoice = deferred(Column(Boolean, default=False), group='dues20')
+    dues20_invoice_date = deferred(Column(DateTime()), group='dues20')
+    dues20_invoice_no = deferred(Column(Integer()), group='dues20')
+    dues20_token = deferred(Column(Unicode(10)), group='dues20')
+    dues20_start = deferred(Column(Unicode(255)), group='dues20')
+    dues20_amount = deferred(
+        Column(DatabaseDecimal(12, 2), default=Decimal('NaN')), group='dues20')
+    dues20_reduced = deferred(Column(Boolean, default=False), group='dues20')
+    _dues20_amount_reduced = deferred(
+        Column(
+            'dues20_amount_reduced',
+            DatabaseDecimal(12, 2), default=Decimal('NaN')),
+        group='dues20')
     # balance
-    _dues20_balance = Column(
-        'dues20_balance',
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues20_balanced = Column(Boolean, default=True)
+    _dues20_balance = deferred(
+        Column('dues20_balance', DatabaseDecimal(12, 2), default=Decimal('0')),
+        group='dues20')
+    dues20_balanced = deferred(Column(Boolean, default=True), group='dues20')
     # payment
-    dues20_paid = Column(Boolean, default=False)
-    dues20_amount_paid = Column(
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues20_paid_date = Column(DateTime())
+    dues20_paid = deferred(Column(Boolean, default=False), group='dues20')
+    dues20_amount_paid = deferred(
+        Column(DatabaseDecimal(12, 2), default=Decimal('0')), group='dues20')
+    dues20_paid_date = deferred(Column(DateTime()), group='dues20')
 
     # membership dues for 2021
-    dues21_invoice = Column(Boolean, default=False)
-    dues21_invoice_date = Column(DateTime())
-    dues21_invoice_no = Column(Integer())
-    dues21_token = Column(Unicode(10))
-    dues21_start = Column(Unicode(255))
-    dues21_amount = Column(
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))
-    dues21_reduced = Column(Boolean, default=False)
-    _dues21_amount_reduced = Column(
-        'dues21_amount_reduced',
-        DatabaseDecimal(12, 2), default=Decimal('NaN'))
+    dues21_invoice = deferred(Column(Boolean, default=False), group='dues21')
+    dues21_invoice_date = deferred(Column(DateTime()), group='dues21')
+    dues21_invoice_no = deferred(Column(Integer()), group='dues21')
+    dues21_token = deferred(Column(Unicode(10)), group='dues21')
+    dues21_start = deferred(Column(Unicode(255)), group='dues21')
+    dues21_amount = deferred(
+        Column(DatabaseDecimal(12, 2), default=Decimal('NaN')), group='dues21')
+    dues21_reduced = deferred(Column(Boolean, default=False), group='dues21')
+    _dues21_amount_reduced = deferred(
+        Column(
+            'dues21_amount_reduced',
+            DatabaseDecimal(12, 2), default=Decimal('NaN')),
+        group='dues21')
     # balance
-    _dues21_balance = Column(
-        'dues21_balance',
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues21_balanced = Column(Boolean, default=True)
+    _dues21_balance = deferred(
+        Column('dues21_balance', DatabaseDecimal(12, 2), default=Decimal('0')),
+        group='dues21')
+    dues21_balanced = deferred(Column(Boolean, default=True), group='dues21')
     # payment
-    dues21_paid = Column(Boolean, default=False)
-    dues21_amount_paid = Column(
-        DatabaseDecimal(12, 2), default=Decimal('0'))
-    dues21_paid_date = Column(DateTime())
+    dues21_paid = deferred(Column(Boolean, default=False), group='dues21')
+    dues21_amount_paid = deferred(
+        Column(DatabaseDecimal(12, 2), default=Decimal('0')), group='dues21')
+    dues21_paid_date = deferred(Column(DateTime()), group='dues21')
 
     # privacy
     privacy_consent = Column(DateTime(), nullable=True)
@@ -821,7 +942,8 @@ class C3sMember(Base):
            object: C3sMember object
         """
         return DBSession.query(cls).filter(
-            cls.email_confirm_code == email_confirm_code).first()
+            cls.email_confirm_code == email_confirm_code) \
+            .options(undefer('*')).first()
 
     @classmethod
     def check_for_existing_confirm_code(cls, email_confirm_code):
@@ -841,12 +963,14 @@ class C3sMember(Base):
             * **C3sMember object**, if id exists.
             * **None**, if id does not exist.
         """
-        return DBSession.query(cls).filter(cls.id == member_id).first()
+        return DBSession.query(cls).filter(cls.id == member_id) \
+            .options(undefer('*')).first()
 
     @classmethod
     def get_by_email(cls, email):
         """return one or more members by email (a list!)"""
-        return DBSession.query(cls).filter(cls.email == email).all()
+        return DBSession.query(cls).filter(cls.email == email) \
+            .options(undefer('*')).all()
 
     @classmethod
     def get_all(cls):
@@ -873,7 +997,11 @@ class C3sMember(Base):
             and_(
                 cls.membership_accepted == 1,
                 cls.dues15_invoice == 0
-            )).slice(0, num).all()
+            )) \
+            .options(
+                undefer_group('dues15'),
+                undefer_group('address')) \
+            .slice(0, num).all()
 
     @classmethod
     def get_dues16_invoicees(cls, num):
@@ -897,7 +1025,11 @@ class C3sMember(Base):
                 cls.dues16_invoice == 0,
                 cls.membership_date < date(2017, 1, 1),
                 cls.membership_type.in_([u'normal', u'investing'])
-            )).slice(0, num).all()
+            )) \
+            .options(
+                undefer_group('dues16'),
+                undefer_group('address')) \
+            .slice(0, num).all()
 
     @classmethod
     def get_dues17_invoicees(cls, num):
@@ -929,7 +1061,11 @@ class C3sMember(Base):
                     cls.membership_loss_date == None,
                     cls.membership_loss_date >= date(2017, 1, 1),
                 ),
-            )).slice(0, num).all()
+            )) \
+            .options(
+                undefer_group('dues17'),
+                undefer_group('address')) \
+            .slice(0, num).all()
 
     @classmethod
     def get_dues18_invoicees(cls, num):
@@ -961,7 +1097,11 @@ class C3sMember(Base):
                     cls.membership_loss_date == None,
                     cls.membership_loss_date >= date(2018, 1, 1),
                 ),
-            )).slice(0, num).all()
+            )) \
+            .options(
+                undefer_group('dues18'),
+                undefer_group('address')) \
+            .slice(0, num).all()
 
     @classmethod
     def get_dues19_invoicees(cls, num):
@@ -994,7 +1134,11 @@ class C3sMember(Base):
                     cls.membership_loss_date == None,
                     cls.membership_loss_date >= date(invoice_year, 1, 1),
                 ),
-            )).slice(0, num).all()
+            )) \
+            .options(
+                undefer_group('dues19'),
+                undefer_group('address')) \
+            .slice(0, num).all()
 
     @classmethod
     def get_dues20_invoicees(cls, num):
@@ -1027,7 +1171,11 @@ class C3sMember(Base):
                     cls.membership_loss_date == None,
                     cls.membership_loss_date >= date(invoice_year, 1, 1),
                 ),
-            )).slice(0, num).all()
+            )) \
+            .options(
+                undefer_group('dues20'),
+                undefer_group('address')) \
+            .slice(0, num).all()
 
     @classmethod
     def get_dues21_invoicees(cls, num):
@@ -1060,7 +1208,11 @@ class C3sMember(Base):
                     cls.membership_loss_date == None,
                     cls.membership_loss_date >= date(invoice_year, 1, 1),
                 ),
-            )).slice(0, num).all()
+            )) \
+            .options(
+                undefer_group('dues21'),
+                undefer_group('address')) \
+            .slice(0, num).all()
 
     @classmethod
     def delete_by_id(cls, member_id):
@@ -1074,6 +1226,9 @@ class C3sMember(Base):
             * **1** on success
             * **0** else
         """
+        # The bulk delete does not cascade to the dues payment ledger.
+        DBSession.query(DuesPayment).filter(
+            DuesPayment.member_id == member_id).delete()
         return DBSession.query(cls).filter(cls.id == member_id).delete()
 
     # listings
@@ -1118,6 +1273,8 @@ class C3sMember(Base):
         offset = int(offset)
         query = DBSession.query(cls).filter(
             cls.membership_accepted == 1
+        ).options(
+            load_only(*cls.MEMBER_LISTING_COLUMNS)
         ).order_by(order_function()).slice(offset, count)
         return query
 
@@ -1129,7 +1286,7 @@ class C3sMember(Base):
 
         Returns:
             bag (list containing duplicates): postal codes in DE"""
-        rows = DBSession.query(cls).filter(
+        rows = DBSession.query(cls.postcode).filter(
             cls.country == 'DE'
         ).all()
         postal_codes_de = []
@@ -1308,6 +1465,7 @@ class C3sMember(Base):
         count = int(offset) + int(how_many)
         offset = int(offset)
         query = DBSession.query(cls).order_by(order_function())\
+            .options(undefer_group('address'))\
             .slice(offset, count)
         return query
 
@@ -1382,13 +1540,9 @@ class C3sMember(Base):
             raise InvalidSortDirection(
                 'Invalid sort direction: {0}'.format(sort_direction))
         query = DBSession.query(cls).filter(
-            or_(
-                cls.membership_accepted == 0,
-                cls.membership_accepted == '',
-                # pylint: disable=singleton-comparison
-                # noqa
-                cls.membership_accepted == None,
-            )
+            cls.nonmember_listing_filter()
+        ).options(
+            load_only(*cls.APPLICANT_LISTING_COLUMNS)
         ).order_by(
             order_function()
         ).slice(offset, offset + page_size)
@@ -1401,16 +1555,24 @@ class C3sMember(Base):
         yet.
         """
         query = DBSession.query(cls).filter(
-            or_(
-                cls.membership_accepted == 0,
-                cls.membership_accepted == '',
-                # pylint: disable=singleton-comparison
-                # noqa
-                cls.membership_accepted == None,
-            )
+            cls.nonmember_listing_filter()
         ).count()
         return query
 
+    @classmethod
+    def nonmember_listing_filter(cls):
+        """
+        Provides a SqlAlchemy filter only matching applicants which have not
+        been accepted as members yet.
+        """
+        return or_(
+            cls.membership_accepted == 0,
+            cls.membership_accepted == '',
+            # pylint: disable=singleton-comparison
+            # noqa
+            cls.membership_accepted == None,
+        )
+
     # count for statistics
     @classmethod
     def afm_num_shares_unpaid(cls):
@@ -1452,25 +1614,70 @@ class C3sMember(Base):
                 (cls.membership_accepted == 0),
                 (cls.signature_received),
                 (cls.payment_received),
-            )).all()
+            )).options(
+                load_only(
+                    'firstname',
+                    'lastname',
+                    'num_shares',
+                    'is_legalentity',
+                    'membership_type')).all()
 
     # autocomplete
     @classmethod
-    def get_matching_codes(cls, prefix):
+    def _get_prefix_filter(cls, column, prefix, case_sensitive):
+        """
+        Get the filter conditions for column values starting with the prefix.
+
+        The prefix match is expressed as a range condition instead of LIKE so
+        that the database can use the index on the column, or the index on
+        the lower case column for case-insensitive matching. As SQLite's
+        lower() only folds ASCII characters, the prefix is folded the same
+        way so that non-ASCII characters are matched case sensitive.
+
+        Args:
+            column: The column to be matched.
+            prefix: The prefix the column values must start with.
+            case_sensitive: Boolean indicating whether the match is case
+                sensitive.
+
+        Returns:
+            A list of filter conditions.
+        """
+        if not case_sensitive:
+            column = func.lower(column)
+            prefix = u''.join(
+                character.lower() if character < u'\x80' else character
+                for character in prefix)
+        if not prefix:
+            return [column.isnot(None)]
+        # All values starting with the prefix sort before the prefix with its
+        # last character incremented.
+        upper_bound = prefix[:-1] + unichr(ord(prefix[-1]) + 1)
+        return [column >= prefix, column < upper_bound]
+
+    @classmethod
+    def get_matching_codes(cls, prefix, limit=20, case_sensitive=True):
         """
         Return only codes matching the prefix.
 
         This is used in the autocomplete form to search for C3sMember entries.
 
+        Args:
+            prefix: The prefix the codes must start with.
+            limit: Optional. The maximum number of codes returned. Defaults to
+                20.
+            case_sensitive: Optional. Boolean indicating whether the prefix is
+                matched case sensitive. Defaults to True.
+
         Returns:
-            list of strings
+            list of strings sorted alphabetically
         """
-        rows = DBSession.query(cls).all()
-        codes = []
-        for row in rows:
-            if row.email_confirm_code.startswith(prefix):
-                codes.append(row.email_confirm_code)
-        return codes
+        rows = DBSession.query(cls.email_confirm_code) \
+            .filter(*cls._get_prefix_filter(
+                cls.email_confirm_code, prefix, case_sensitive)) \
+            .order_by(cls.email_confirm_code) \
+            .limit(limit)
+        return [row.email_confirm_code for row in rows]
 
     @classmethod
     def check_password(cls, member_id, password):
@@ -1510,7 +1717,8 @@ class C3sMember(Base):
     @classmethod
     def get_same_lastnames(cls, lastname):
         """return list of accepted members with same lastnames"""
-        return DBSession.query(cls).filter(
+        return DBSession.query(cls).options(
+            undefer_group('address')).filter(
             and_(
                 cls.membership_accepted == 1,
                 cls.lastname == lastname
@@ -1519,7 +1727,8 @@ class C3sMember(Base):
     @classmethod
     def get_same_firstnames(cls, firstname):
         """return list of accepted members with same fistnames"""
-        return DBSession.query(cls).filter(
+        return DBSession.query(cls).options(
+            undefer_group('address')).filter(
             and_(
                 cls.membership_accepted == 1,
                 cls.firstname == firstname
@@ -1528,7 +1737,8 @@ class C3sMember(Base):
     @classmethod
     def get_same_email(cls, email):
         """return list of accepted members with same email"""
-        return DBSession.query(cls).filter(
+        return DBSession.query(cls).options(
+            undefer_group('address')).filter(
             and_(
                 cls.membership_accepted == 1,
                 cls.email == email,
@@ -1537,7 +1747,8 @@ class C3sMember(Base):
     @classmethod
     def get_same_date_of_birth(cls, date_of_birth):
         """return list of accepted members with same date of birth"""
-        return DBSession.query(cls).filter(
+        return DBSession.query(cls).options(
+            undefer_group('address')).filter(
             and_(
                 cls.membership_accepted == 1,
                 cls.date_of_birth == date_of_birth,
@@ -1600,20 +1811,65 @@ class C3sMember(Base):
 
     # autocomplete
     @classmethod
-    def get_matching_people(cls, prefix):
-        """
-        return only entries matchint the prefix
+    def get_matching_people(cls, prefix, limit=20, case_sensitive=True):
         """
-        rows = DBSession.query(cls).all()
+        Return only entries of which the last name matches the prefix.
+
+        Args:
+            prefix: The prefix the last names must start with.
+            limit: Optional. The maximum number of entries returned. Defaults
+                to 20.
+            case_sensitive: Optional. Boolean indicating whether the prefix is
+                matched case sensitive. Defaults to True.
+
+        Returns:
+            dict mapping each entry of the form "code lastname, firstname" to
+            itself
+        """
+        rows = DBSession.query(
+            cls.email_confirm_code, cls.lastname, cls.firstname) \
+            .filter(*cls._get_prefix_filter(
+                cls.lastname, prefix, case_sensitive)) \
+            .order_by(cls.lastname, cls.firstname, cls.email_confirm_code) \
+            .limit(limit)
         names = {}
         for row in rows:
-            if row.lastname.startswith(prefix):
-                key = (
-                    row.email_confirm_code + ' ' +
-                    row.lastname + ', ' + row.firstname)
-                names[key] = key
+            key = (
+                row.email_confirm_code + ' ' +
+                row.lastname + ', ' + row.firstname)
+            names[key] = key
         return names
 
+    def _record_dues_payment(self, year, amount_paid, paid_date, reference):
+        """
+        Records the payment of the dues year in the dues payment ledger.
+
+        The ledger record of the year is created if it does not exist yet.
+        Otherwise, it is updated to the accumulated amount paid and the date
+        of the latest payment.
+
+        Args:
+            year: The dues year of the payment, e.g. 2021.
+            amount_paid: The accumulated amount paid for the year.
+            paid_date: The date or datetime of the latest payment.
+            reference: The payment reference, i.e. the dues token of the year.
+        """
+        if isinstance(paid_date, datetime):
+            paid_date = paid_date.date()
+        dues_payment = None
+        for payment in self.dues_payments:
+            if payment.year == year:
+                dues_payment = payment
+        if dues_payment is None:
+            dues_payment = DuesPayment(year=year)
+            self.dues_payments.append(dues_payment)
+        dues_payment.membership_number = self.membership_number
+        dues_payment.account = u'Membership dues {0}'.format(year)
+        dues_payment.reference = reference
+        dues_payment.date = paid_date
+        dues_payment.amount = amount_paid
+        dues_payment.paid = True
+
     def set_dues15_payment(self, paid_amount, paid_date):
         if math.isnan(self.dues15_amount_paid):
             dues15_amount_paid = Decimal('0')
@@ -1624,6 +1880,8 @@ class C3sMember(Base):
         self.dues15_amount_paid = dues15_amount_paid + paid_amount
         self.dues15_paid_date = paid_date
         self.dues15_balance = self.dues15_balance - paid_amount
+        self._record_dues_payment(
+            2015, self.dues15_amount_paid, paid_date, self.dues15_token)
 
     def set_dues15_amount(self, dues_amount):
         if math.isnan(self.dues15_amount):
@@ -1657,6 +1915,8 @@ class C3sMember(Base):
         self.dues16_amount_paid = dues16_amount_paid + paid_amount
         self.dues16_paid_date = paid_date
         self.dues16_balance = self.dues16_balance - paid_amount
+        self._record_dues_payment(
+            2016, self.dues16_amount_paid, paid_date, self.dues16_token)
 
     def set_dues16_amount(self, dues_amount):
         if math.isnan(self.dues16_amount):
@@ -1690,6 +1950,8 @@ class C3sMember(Base):
         self.dues17_amount_paid = dues17_amount_paid + paid_amount
         self.dues17_paid_date = paid_date
         self.dues17_balance = self.dues17_balance - paid_amount
+        self._record_dues_payment(
+            2017, self.dues17_amount_paid, paid_date, self.dues17_token)
 
     def set_dues17_amount(self, dues_amount):
         if math.isnan(self.dues17_amount):
@@ -1723,6 +1985,8 @@ class C3sMember(Base):
         self.dues18_amount_paid = dues18_amount_paid + paid_amount
         self.dues18_paid_date = paid_date
         self.dues18_balance = self.dues18_balance - paid_amount
+        self._record_dues_payment(
+            2018, self.dues18_amount_paid, paid_date, self.dues18_token)
 
     def set_dues18_amount(self, dues_amount):
         if math.isnan(self.dues18_amount) \
@@ -1757,6 +2021,8 @@ class C3sMember(Base):
         self.dues19_amount_paid = dues19_amount_paid + paid_amount
         self.dues19_paid_date = paid_date
         self.dues19_balance = self.dues19_balance - paid_amount
+        self._record_dues_payment(
+            2019, self.dues19_amount_paid, paid_date, self.dues19_token)
 
     def set_dues19_amount(self, dues_amount):
         if math.isnan(self.dues19_amount) \
@@ -1791,6 +2057,8 @@ class C3sMember(Base):
         self.dues20_amount_paid = dues20_amount_paid + paid_amount
         self.dues20_paid_date = paid_date
         self.dues20_balance = self.dues20_balance - paid_amount
+        self._record_dues_payment(
+            2020, self.dues20_amount_paid, paid_date, self.dues20_token)
 
     def set_dues20_amount(self, dues_amount):
         if math.isnan(self.dues20_amount) \
@@ -1825,6 +2093,8 @@ class C3sMember(Base):
         self.dues21_amount_paid = dues21_amount_paid + paid_amount
         self.dues21_paid_date = paid_date
         self.dues21_balance = self.dues21_balance - paid_amount
+        self._record_dues_payment(
+            2021, self.dues21_amount_paid, paid_date, self.dues21_token)
 
     def set_dues21_amount(self, dues_amount):
         if math.isnan(self.dues21_amount) \
@@ -1944,3 +2214,16 @@ class C3sMember(Base):
         return and_(
             cls.membership_accepted_filter(effective_date),
             not_(cls.membership_lost_filter(effective_date)))
+
+
+# Indexes supporting the case-insensitive prefix search of the autocomplete.
+Index('ix_members_email_confirm_code_lower',
+      func.lower(C3sMember.email_confirm_code))
+Index('ix_members_lastname_lower', func.lower(C3sMember.lastname))
+# Index supporting the membership filters which select accepted memberships by
+# their membership date.
+Index('ix_members_membership_accepted_date',
+      C3sMember.membership_accepted,
+      C3sMember.membership_date)
+# Index supporting the joins from shares to their members.
+Index('ix_members_shares_shares_id', members_shares.c.shares_id)
@@ -56,13 +56,13 @@ class Dues16Invoice(Base):
     is_altered = Column(Boolean, default=False)
     """flag: has the amount been reduced or increased?"""
     # person reference
-    member_id = Column(Integer())
+    member_id = Column(Integer(), index=True)
     """reference to C3sMember id"""
     membership_no = Column(Integer())
     """reference to C3sMember membership_number"""
     email = Column(Unicode(255))
     """C3sMembers email we sent this invoice to"""
-    token = Column(Unicode(255))
+    token = Column(Unicode(255), index=True)
     """used to limit access to this invoice"""
     # referrals
     preceding_invoice_no = Column(Integer(), default=None)
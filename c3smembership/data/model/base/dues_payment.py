@@ -0,0 +1,67 @@
+# -*- coding: utf-8  -*-
+"""
+Dues payment
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    ForeignKey,
+    Integer,
+    Unicode,
+    UniqueConstraint,
+)
+
+from c3smembership.data.model.base import (
+    Base,
+    DatabaseDecimal,
+)
+
+
+class DuesPayment(Base):
+    """
+    The payment ledger of membership dues.
+
+    The dues payments are primarily stored in the year specific payment fields
+    of C3sMember, e.g. dues15_paid_date and dues15_amount_paid. This table
+    holds one record per member and dues year with the same payment
+    information so that payments can be read from one narrow and indexed
+    table instead of fanning out across the payment fields of all years.
+
+    The records are maintained by the set_duesNN_payment methods of
+    C3sMember. Like the payment fields the record contains the accumulated
+    amount paid and the date of the latest payment.
+
+    Legacy payment fields may contain a payment date without the dues being
+    marked as paid. Such records are kept with paid set to False so that they
+    count in the monthly statistics like before but are not listed as
+    payments.
+    """
+    __tablename__ = 'dues_payments'
+    __table_args__ = (
+        UniqueConstraint('member_id', 'year'),
+    )
+    # pylint: disable=invalid-name
+    id = Column(Integer, primary_key=True)
+    """Technical primary key of the payment."""
+    member_id = Column(Integer, ForeignKey('members.id'), nullable=False)
+    """Reference to the C3sMember id."""
+    membership_number = Column(Integer(), index=True)
+    """The membership number of the member at the time of payment.
+
+    The number is a snapshot which is not updated if the membership number
+    of the member changes. Payment listings show the current membership
+    number of the member instead."""
+    year = Column(Integer(), nullable=False)
+    """The dues year to which the payment belongs, e.g. 2021."""
+    account = Column(Unicode(255), index=True)
+    """The account of the payment, e.g. "Membership dues 2021"."""
+    reference = Column(Unicode(255))
+    """The payment reference, i.e. the dues token of the year."""
+    date = Column(Date(), index=True)
+    """The date of the latest payment."""
+    amount = Column(DatabaseDecimal(12, 2))
+    """The accumulated amount paid."""
+    paid = Column(Boolean, nullable=False, default=True)
+    """Whether the dues of the year are marked as paid."""
@@ -8,6 +8,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Unicode,
 )
@@ -32,7 +33,7 @@ class GeneralAssembly(GeneralAssemblyBusinessEntity, Base):
     """The database primary key id of the general assembly record."""
 
     # foreign keys
-    number = Column(Integer())
+    number = Column(Integer(), index=True)
     """The business key number of the general assembly."""
     name = Column(Unicode(255))
     """The name of the general assembly."""
@@ -97,7 +98,7 @@ class GeneralAssemblyInvitation(GeneralAssemblyInvitationBE, Base):
 
     # foreign keys
     general_assembly_id = Column(Integer, ForeignKey('GeneralAssembly.id'))
-    member_id = Column(Integer, ForeignKey('members.id'))
+    member_id = Column(Integer, ForeignKey('members.id'), index=True)
 
     # relationships
     general_assembly = relationship('GeneralAssembly')
@@ -105,4 +106,11 @@ class GeneralAssemblyInvitation(GeneralAssemblyInvitationBE, Base):
 
     # properties
     sent = Column(DateTime(), nullable=False)
-    token = Column(Unicode(255))
+    token = Column(Unicode(255), index=True)
+
+
+# Index supporting the lookup of the invitation of a member to a general
+# assembly.
+Index('ix_GeneralAssemblyInvitation_general_assembly_id_member_id',
+      GeneralAssemblyInvitation.general_assembly_id,
+      GeneralAssemblyInvitation.member_id)
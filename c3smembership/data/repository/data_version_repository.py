@@ -0,0 +1,135 @@
+# -*- coding: utf-8  -*-
+"""
+Repository for the data version which identifies the state of the membership
+data.
+
+The data version is a counter which is incremented whenever members, shares,
+dues invoices, dues payments or staff accounts are changed. Derived data like statistics can
+be cached for a data version and must be recalculated once the data version
+changed.
+
+The counter is provided by the configured cache backend. The memory backend
+only reflects the changes made by the current process while shared backends
+reflect the changes of all processes using them.
+"""
+
+import itertools
+
+from sqlalchemy import event
+
+from c3smembership.cache import get_counter
+
+from c3smembership.data.model.base import DBSession
+from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.data.model.base.dues15invoice import Dues15Invoice
+from c3smembership.data.model.base.dues16invoice import Dues16Invoice
+from c3smembership.data.model.base.dues17invoice import Dues17Invoice
+from c3smembership.data.model.base.dues18invoice import Dues18Invoice
+from c3smembership.data.model.base.dues19invoice import Dues19Invoice
+from c3smembership.data.model.base.dues20invoice import Dues20Invoice
+from c3smembership.data.model.base.dues21invoice import Dues21Invoice
+from c3smembership.data.model.base.dues_payment import DuesPayment
+from c3smembership.data.model.base.shares import Shares
+from c3smembership.data.model.base.staff import Staff
+
+
+class DataVersionRepository(object):
+    """
+    Repository for the data version.
+    """
+
+    _VERSIONED_CLASSES = (
+        C3sMember,
+        Shares,
+        DuesPayment,
+        Dues15Invoice,
+        Dues16Invoice,
+        Dues17Invoice,
+        Dues18Invoice,
+        Dues19Invoice,
+        Dues20Invoice,
+        Dues21Invoice,
+        Staff,
+    )
+    _DATA_CHANGED = 'data_version_changed'
+    _COUNTER_NAME = 'data_version'
+
+    @classmethod
+    def get_data_version(cls):
+        """
+        Gets the current data version.
+
+        Returns:
+            A tuple of a string identifying the data version and the UTC
+            datetime.datetime of the last change. Before the first change the
+            creation of the counter is used as the last change.
+        """
+        return get_counter(cls._COUNTER_NAME).get()
+
+    @classmethod
+    def bump(cls):
+        """
+        Increments the data version.
+        """
+        get_counter(cls._COUNTER_NAME).increment()
+
+    @classmethod
+    def _after_flush(cls, session, flush_context):
+        """
+        Bumps the data version if versioned data was flushed.
+
+        The session is marked so that the data version is bumped again after
+        commit. Otherwise, data cached between flush and commit would be
+        calculated from the data before the change.
+        """
+        # pylint: disable=unused-argument
+        for instance in itertools.chain(
+                session.new, session.dirty, session.deleted):
+            if isinstance(instance, cls._VERSIONED_CLASSES):
+                session.info[cls._DATA_CHANGED] = True
+                cls.bump()
+                return
+
+    @classmethod
+    def _after_bulk_operation(cls, context):
+        """
+        Bumps the data version if a bulk update or delete affected versioned
+        data.
+        """
+        if issubclass(context.mapper.class_, cls._VERSIONED_CLASSES):
+            context.session.info[cls._DATA_CHANGED] = True
+            cls.bump()
+
+    @classmethod
+    def _after_commit(cls, session):
+        """
+        Bumps the data version if the committed transaction changed versioned
+        data.
+        """
+        if session.info.pop(cls._DATA_CHANGED, False):
+            cls.bump()
+
+    @classmethod
+    def _after_transaction_end(cls, session, session_transaction):
+        """
+        Discards the mark of a rolled back or closed transaction.
+
+        This event is emitted after after_commit so that the mark of a
+        committed transaction is already handled.
+        """
+        if session_transaction.parent is None:
+            session.info.pop(cls._DATA_CHANGED, None)
+
+
+# pylint: disable=protected-access
+event.listen(DBSession, 'after_flush', DataVersionRepository._after_flush)
+event.listen(
+    DBSession, 'after_bulk_update',
+    DataVersionRepository._after_bulk_operation)
+event.listen(
+    DBSession, 'after_bulk_delete',
+    DataVersionRepository._after_bulk_operation)
+event.listen(DBSession, 'after_commit', DataVersionRepository._after_commit)
+event.listen(
+    DBSession, 'after_transaction_end',
+    DataVersionRepository._after_transaction_end)
@@ -22,6 +22,7 @@ from c3smembership.data.model.base import (
     DatabaseDecimal,
 )
 from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.data.model.base.dues_payment import DuesPayment
 from c3smembership.data.model.base.dues15invoice import Dues15Invoice
 from c3smembership.data.model.base.dues16invoice import Dues16Invoice
 from c3smembership.data.model.base.dues17invoice import Dues17Invoice
@@ -35,9 +36,8 @@ class DuesInvoiceRepository(object):
     """
     Repository for operating with dues invoices
 
-    The constants _DUES_INVOICE_CLASS and _PAYMENT_FIELDS are workarounds until
-    the data model is cleaned up, agnostic to the year and does not contain any
-    payment information on the member record.
+    The constant _DUES_INVOICE_CLASS is a workaround until the data model is
+    cleaned up and agnostic to the year.
     """
     # pylint: disable=too-few-public-methods
 
@@ -50,37 +50,6 @@ class DuesInvoiceRepository(object):
         2020: Dues20Invoice,
         2021: Dues21Invoice,
     }
-    _PAYMENT_FIELDS = {
-        2015: {
-            'paid_date': C3sMember.dues15_paid_date,
-            'amount_paid': C3sMember.dues15_amount_paid,
-        },
-        2016: {
-            'paid_date': C3sMember.dues16_paid_date,
-            'amount_paid': C3sMember.dues16_amount_paid,
-        },
-        2017: {
-            'paid_date': C3sMember.dues17_paid_date,
-            'amount_paid': C3sMember.dues17_amount_paid,
-        },
-        2018: {
-            'paid_date': C3sMember.dues18_paid_date,
-            'amount_paid': C3sMember.dues18_amount_paid,
-        },
-        2019: {
-            'paid_date': C3sMember.dues19_paid_date,
-            'amount_paid': C3sMember.dues19_amount_paid,
-        },
-        2020: {
-            'paid_date': C3sMember.dues20_paid_date,
-            'amount_paid': C3sMember.dues20_amount_paid,
-        },
-        2021: {
-            'paid_date': C3sMember.dues21_paid_date,
-            'amount_paid': C3sMember.dues21_amount_paid,
-        },
-    }
-
     @classmethod
     def _get_year_classes(cls, years=None):
         """
@@ -401,71 +370,97 @@ class DuesInvoiceRepository(object):
             Sums of the normale and reversal invoices per calendar month based
             on the invoice date.
         """
-        year_class = cls._get_year_class(year)
-        if year_class is None:
+        if cls._get_year_class(year) is None:
             return None
+        return cls.get_monthly_stats_by_year([year])[year]
+
+    @classmethod
+    def get_monthly_stats_by_year(cls, years=None):
+        """
+        Gets monthly statistics for several years with one query
+
+        Args:
+            years (array): Defaults to None. An array of ints representing
+                years, e.g. 2019. If not specified then all available years
+                are returned.
+
+        Returns:
+            A dictionary mapping each available year to the sums of the normal
+            and reversal invoices and the payments per calendar month as
+            returned by get_monthly_stats.
+        """
+        if years is None:
+            years = sorted(cls._DUES_INVOICE_CLASS.keys())
+        years = [year for year in years if year in cls._DUES_INVOICE_CLASS]
+        result = dict((year, []) for year in years)
+        if not years:
+            return result
 
         db_session = DBSession()
-        result = []
+        zero = expression.literal_column('\'0.0\'', DatabaseDecimal)
 
         # SQLite specific: substring for SQLite as it does not support
         # date_trunc.
         # invoice_date_month = func.date_trunc(
         #     'month',
         #     invoice_date)
-        paid_date = cls._PAYMENT_FIELDS[year]['paid_date']
-        amount_paid = cls._PAYMENT_FIELDS[year]['amount_paid']
-        invoice_date_month = func.substr(year_class.invoice_date, 1, 7)
-        payment_date_month = func.substr(paid_date, 1, 7)
+        queries = []
 
         # collect the invoice amounts per month
-        invoice_amounts_query = db_session.query(
-            invoice_date_month.label('month'),
-            func.sum(
-                expression.case(
-                    [(expression.not_(
-                        year_class.is_reversal), year_class.invoice_amount)],
-                    else_=Decimal('0.0'))).label('amount_invoiced_normal'),
-            func.sum(
-                expression.case(
-                    [(year_class.is_reversal, year_class.invoice_amount)],
-                    else_=Decimal('0.0'))).label('amount_invoiced_reversal'),
-            expression.literal_column('\'0.0\'', DatabaseDecimal).label(
-                'amount_paid')).group_by(invoice_date_month)
+        for year in years:
+            year_class = cls._DUES_INVOICE_CLASS[year]
+            invoice_date_month = func.substr(year_class.invoice_date, 1, 7)
+            queries.append(db_session.query(
+                expression.literal(year).label('year'),
+                invoice_date_month.label('month'),
+                func.sum(
+                    expression.case(
+                        [(expression.not_(
+                            year_class.is_reversal),
+                          year_class.invoice_amount)],
+                        else_=Decimal('0.0'))).label('amount_invoiced_normal'),
+                func.sum(
+                    expression.case(
+                        [(year_class.is_reversal, year_class.invoice_amount)],
+                        else_=Decimal('0.0'))).label(
+                            'amount_invoiced_reversal'),
+                zero.label('amount_paid')).group_by(invoice_date_month))
 
         # collect the payments per month
-        member_payments_query = db_session.query(
+        payment_date_month = func.substr(DuesPayment.date, 1, 7)
+        queries.append(db_session.query(
+            DuesPayment.year.label('year'),
             payment_date_month.label('month'),
-            expression.literal_column(
-                '\'0.0\'', DatabaseDecimal).label('amount_invoiced_normal'),
-            expression.literal_column(
-                '\'0.0\'', DatabaseDecimal
-            ).label('amount_invoiced_reversal'),
-            func.sum(amount_paid).label('amount_paid')
-        ).filter(paid_date.isnot(None)) \
-            .group_by(payment_date_month)
+            zero.label('amount_invoiced_normal'),
+            zero.label('amount_invoiced_reversal'),
+            func.sum(DuesPayment.amount).label('amount_paid')
+        ).filter(expression.and_(
+            DuesPayment.year.in_(years),
+            DuesPayment.date.isnot(None))) \
+            .group_by(DuesPayment.year, payment_date_month))
 
         # union invoice amounts and payments
-        union_all_query = expression.union_all(member_payments_query,
-                                               invoice_amounts_query)
+        union_all_query = expression.union_all(*queries).alias()
 
-        # aggregate invoice amounts and payments by month
+        # aggregate invoice amounts and payments by year and month
         result_query = db_session.query(
-            union_all_query.c.month.label('month'),
+            union_all_query.c.year,
+            union_all_query.c.month,
             func.sum(union_all_query.c.amount_invoiced_normal).label(
                 'amount_invoiced_normal'),
             func.sum(union_all_query.c.amount_invoiced_reversal).label(
                 'amount_invoiced_reversal'),
             func.sum(union_all_query.c.amount_paid).label('amount_paid')
         ) \
-            .group_by(union_all_query.c.month) \
-            .order_by(union_all_query.c.month)
+            .group_by(union_all_query.c.year, union_all_query.c.month) \
+            .order_by(union_all_query.c.year, union_all_query.c.month)
         for month_stat in result_query.all():
-            result.append({
-                'month': datetime(int(month_stat[0][0:4]),
-                                  int(month_stat[0][5:7]), 1),
-                'amount_invoiced_normal': month_stat[1],
-                'amount_invoiced_reversal': month_stat[2],
-                'amount_paid': month_stat[3]
+            result[month_stat.year].append({
+                'month': datetime(int(month_stat.month[0:4]),
+                                  int(month_stat.month[5:7]), 1),
+                'amount_invoiced_normal': month_stat.amount_invoiced_normal,
+                'amount_invoiced_reversal':
+                    month_stat.amount_invoiced_reversal,
+                'amount_paid': month_stat.amount_paid
             })
         return result
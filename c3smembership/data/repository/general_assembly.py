@@ -23,6 +23,7 @@ class GeneralAssemblyRepository(object):
     """
 
     datetime = datetime
+    _MEMBERSHIP_NUMBER_BATCH_SIZE = 500
 
     @classmethod
     def add_general_assembly(cls, general_assembly):
@@ -107,7 +108,66 @@ class GeneralAssemblyRepository(object):
         DBSession.flush()
 
     @classmethod
-    def get_invitees(cls, general_assembly_number, invitees_count):
+    def invite_members(cls, general_assembly_number, invitations):
+        """
+        Store the invitations of many members for the general assembly
+
+        The invitations are inserted in bulk with the same sent timestamp.
+        The member IDs are retrieved in batches of
+        _MEMBERSHIP_NUMBER_BATCH_SIZE membership numbers.
+
+        The bulk insert bypasses the flush events of the session. Session
+        event listeners like the data version of DataVersionRepository and
+        the name change listeners of MemberRepository are therefore not
+        notified. Neither of them covers invitations. Invitations must be
+        added to those listeners explicitly once cached data depends on them.
+
+        Args:
+            general_assembly_number: Integer. The number of the general
+                assembly for which the invitations are stored.
+            invitations: A list of tuples of the membership number of the
+                member and the token set to verify the member for API access
+                by the ticketing application.
+
+        Raises:
+            ValueError: In case the general assembly or a member does not
+                exist.
+        """
+        assembly = cls.get_general_assembly(general_assembly_number)
+        if assembly is None:
+            raise ValueError(
+                'A general assembly with this number does not exist.')
+
+        membership_numbers = [
+            membership_number for membership_number, _ in invitations]
+        member_ids = {}
+        batch_size = cls._MEMBERSHIP_NUMBER_BATCH_SIZE
+        for index in range(0, len(membership_numbers), batch_size):
+            # pylint: disable=no-member
+            member_ids.update(
+                DBSession.query(C3sMember.membership_number, C3sMember.id)
+                .filter(C3sMember.membership_number.in_(
+                    membership_numbers[index:index + batch_size]))
+                .all())
+        if len(member_ids) < len(set(membership_numbers)):
+            raise ValueError('A member with this number does not exist.')
+
+        sent = cls.datetime.now()
+        # pylint: disable=no-member
+        DBSession.bulk_insert_mappings(
+            GeneralAssemblyInvitation,
+            [
+                {
+                    'general_assembly_id': assembly.id,
+                    'member_id': member_ids[membership_number],
+                    'sent': sent,
+                    'token': token,
+                }
+                for membership_number, token in invitations
+            ])
+
+    @classmethod
+    def get_invitees(cls, general_assembly_number, invitees_count=None):
         """
         Gets a number of members which have not yet been invited to the general
         assembly.
@@ -120,7 +180,8 @@ class GeneralAssemblyRepository(object):
         Args:
             general_assembly_number: Integer. The number of the general
                 assembly for which the invitees are returned.
-            invitees_count: Integer. Number of invitees returned at maximum.
+            invitees_count: Integer. Optional. Number of invitees returned at
+                maximum. If not specified, all invitees are returned.
 
         Returns:
             A list member objects.
@@ -129,7 +190,7 @@ class GeneralAssemblyRepository(object):
         # In SqlAlchemy the True comparison must be done as "a == True" and not
         # in the python default way "a is True". Therefore:
         # pylint: disable=singleton-comparison
-        return (
+        query = (
             # Get members
             DBSession.query(C3sMember)
             # combine with the general assembly requested as a cross join with
@@ -151,11 +212,12 @@ class GeneralAssemblyRepository(object):
                     GeneralAssemblyInvitation.id == None,
                     # and the member has membership at the assmebly date
                     C3sMember.is_member_filter(GeneralAssembly.date),
-                ))
+                )))
+        if invitees_count is not None:
             # get as many as requested
-            .slice(0, invitees_count)
-            # and get all of the actual records
-            .all())
+            query = query.slice(0, invitees_count)
+        # and get all of the actual records
+        return query.all()
 
     @classmethod
     def get_member_invitation(cls, membership_number, general_assembly_number):
@@ -172,11 +234,89 @@ class GeneralAssemblyRepository(object):
             A general assembly invitation as a dictionary with properties
             number, name, date, flag and sent.
         """
-        invitations = cls.get_member_invitations(membership_number)
-        for invitation in invitations:
-            if invitation['number'] == general_assembly_number:
-                return invitation
-        return None
+        # pylint: disable=no-member
+        invitation = (
+            # Get number, name and date of the general assembly with invitation
+            # sent date and token
+            DBSession.query(
+                GeneralAssembly.number, GeneralAssembly.name,
+                GeneralAssembly.date, GeneralAssemblyInvitation.sent,
+                GeneralAssemblyInvitation.token).select_from(GeneralAssembly)
+            # combine with the member as a cross join with the one member
+            # requested
+            .outerjoin(C3sMember,
+                       C3sMember.membership_number == membership_number)
+            # combine with the invitation for this member to the general
+            # assembly if any
+            .outerjoin(
+                GeneralAssemblyInvitation,
+                and_(
+                    GeneralAssemblyInvitation.member_id == C3sMember.id,
+                    GeneralAssemblyInvitation.general_assembly_id ==
+                    GeneralAssembly.id))
+            # but only for the general assembly requested
+            .filter(GeneralAssembly.number == general_assembly_number)
+            .first())
+        if invitation is None:
+            return None
+        return cls._create_invitation(invitation)
+
+    @classmethod
+    def get_members_invitation(cls, membership_numbers,
+                               general_assembly_number):
+        """
+        Get the invitations of the members for the general assembly
+
+        The invitations are retrieved in one query per batch of
+        _MEMBERSHIP_NUMBER_BATCH_SIZE membership numbers to stay within the
+        limit of bind parameters of the database.
+
+        Args:
+            membership_numbers: The membership numbers of the members for
+                which the invitations are returned.
+            general_assembly_number: Integer. The number of the general
+                assembly for which the members' invitations are returned.
+
+        Returns:
+            A dictionary mapping the membership numbers to the general
+            assembly invitation as a dictionary with properties number, name,
+            date, flag, sent and token. Membership numbers not belonging to a
+            member are omitted as well as all membership numbers if the
+            general assembly does not exist.
+        """
+        # pylint: disable=no-member
+        query = (
+            # Get the membership number with number, name and date of general
+            # assembly with invitation sent date and token
+            DBSession.query(
+                C3sMember.membership_number, GeneralAssembly.number,
+                GeneralAssembly.name, GeneralAssembly.date,
+                GeneralAssemblyInvitation.sent,
+                GeneralAssemblyInvitation.token).select_from(C3sMember)
+            # combine with the general assembly requested as a cross join with
+            # the one general assembly row
+            .join(GeneralAssembly,
+                  GeneralAssembly.number == general_assembly_number)
+            # combine them with invitations for this member to this general
+            # assembly if any
+            .outerjoin(
+                GeneralAssemblyInvitation,
+                and_(
+                    GeneralAssemblyInvitation.member_id == C3sMember.id,
+                    GeneralAssemblyInvitation.general_assembly_id ==
+                    GeneralAssembly.id)))
+
+        result = {}
+        membership_numbers = list(membership_numbers)
+        batch_size = cls._MEMBERSHIP_NUMBER_BATCH_SIZE
+        for index in range(0, len(membership_numbers), batch_size):
+            invitations = query.filter(
+                C3sMember.membership_number.in_(
+                    membership_numbers[index:index + batch_size])).all()
+            for invitation in invitations:
+                result[invitation.membership_number] = \
+                    cls._create_invitation(invitation)
+        return result
 
     @classmethod
     def get_member_invitations(cls,
@@ -233,16 +373,30 @@ class GeneralAssemblyRepository(object):
             .all())
 
         for assembly in assemblies:
-            result.append({
-                'number': assembly.number,
-                'name': assembly.name,
-                'date': assembly.date,
-                'flag': (assembly.sent is not None),
-                'sent': assembly.sent,
-                'token': assembly.token,
-            })
+            result.append(cls._create_invitation(assembly))
         return result
 
+    @classmethod
+    def _create_invitation(cls, row):
+        """
+        Create the invitation dictionary from a query result row
+
+        Args:
+            row: A query result row with number, name, date, sent and token.
+
+        Returns:
+            A general assembly invitation as a dictionary with properties
+            number, name, date, flag, sent and token.
+        """
+        return {
+            'number': row.number,
+            'name': row.name,
+            'date': row.date,
+            'flag': (row.sent is not None),
+            'sent': row.sent,
+            'token': row.token,
+        }
+
     @classmethod
     def get_latest_general_assembly(cls):
         """
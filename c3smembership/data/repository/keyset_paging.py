@@ -0,0 +1,111 @@
+# -*- coding: utf-8  -*-
+"""
+Helpers for retrieving pages of sorted entities by keyset.
+
+Retrieving a page by offset requires the database to read and skip all
+entities of the previous pages. Retrieving a page by keyset instead starts
+after the last entity of the previous page so that the cost of retrieving a
+page does not depend on the page number.
+
+The entities are sorted by the sort property and by their ID for entities
+having the same sort property value. The keyset of a page is the sort
+property value and ID of the last entity of the previous page. As the sort
+property value is looked up by the ID only the ID must be passed.
+
+Null values are expected to be sorted first in ascending order and last in
+descending order as SQLite does.
+"""
+
+from sqlalchemy import (
+    and_,
+    or_,
+)
+
+from c3smembership.data.model.base import DBSession
+from c3smembership.data.model.base.c3smember import (
+    InvalidPropertyException,
+    InvalidSortDirection,
+)
+
+
+# pylint: disable=too-many-arguments
+def get_page(query, entity_class, sort_property, sort_direction, page_size,
+             offset=0, last_id=None):
+    """
+    Gets a page of the sorted entities of the query.
+
+    If the ID of the last entity of the previous page is specified and the
+    entity exists the page is retrieved by keyset. Otherwise, the page is
+    retrieved by offset.
+
+    Args:
+        query: The SqlAlchemy query of the entities.
+        entity_class: The mapped class of the entities which must have an id
+            property.
+        sort_property: The name of the property of the entity class on which
+            the entities are sorted.
+        sort_direction: The sort direction, either "asc" or "desc".
+        page_size: The number of entities of the page.
+        offset: Optional. The number of entities on the previous pages.
+            Defaults to 0.
+        last_id: Optional. The ID of the last entity of the previous page.
+
+    Returns:
+        A list of the entities of the page.
+
+    Raises:
+        InvalidPropertyException: The sort property does not exist.
+        InvalidSortDirection: The sort direction is invalid.
+    """
+    sort_attribute = getattr(entity_class, sort_property, None)
+    if sort_attribute is None or not hasattr(sort_attribute, 'asc'):
+        raise InvalidPropertyException(
+            '{0} does not have a property named "{1}".'.format(
+                entity_class.__name__, sort_property))
+    if sort_direction not in ['asc', 'desc']:
+        raise InvalidSortDirection(
+            'Invalid sort direction: {0}'.format(sort_direction))
+    id_attribute = entity_class.id
+
+    query = query.order_by(
+        getattr(sort_attribute, sort_direction)(),
+        getattr(id_attribute, sort_direction)())
+    if last_id is not None:
+        # pylint: disable=no-member
+        last_entity = DBSession.query(sort_attribute) \
+            .filter(id_attribute == last_id) \
+            .first()
+        if last_entity is not None:
+            return query.filter(
+                _get_keyset_filter(
+                    sort_attribute,
+                    id_attribute,
+                    sort_direction,
+                    last_entity[0],
+                    last_id)) \
+                .limit(page_size) \
+                .all()
+    return query.slice(offset, offset + page_size).all()
+
+
+def _get_keyset_filter(sort_attribute, id_attribute, sort_direction,
+                       last_value, last_id):
+    """
+    Gets the filter for the entities following the last entity of the
+    previous page in sort order.
+    """
+    # pylint: disable=singleton-comparison
+    if sort_direction == 'asc':
+        if last_value is None:
+            return or_(
+                and_(sort_attribute == None, id_attribute > last_id),
+                sort_attribute != None)
+        return or_(
+            sort_attribute > last_value,
+            and_(sort_attribute == last_value, id_attribute > last_id))
+    if last_value is None:
+        return and_(sort_attribute == None, id_attribute < last_id)
+    return or_(
+        sort_attribute < last_value,
+        and_(sort_attribute == last_value, id_attribute < last_id),
+        sort_attribute == None)
@@ -6,12 +6,59 @@ Repository for accessing and operating with member data.
 from sqlalchemy.sql import func
 from sqlalchemy import (
     and_,
+    event,
+    inspect,
     not_,
 )
+from sqlalchemy.orm import (
+    load_only,
+    undefer,
+    undefer_group,
+)
 from datetime import date
+import threading
+import weakref
 
 from c3smembership.data.model.base import DBSession
 from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.data.repository.keyset_paging import get_page
+
+
+class _WeakListener(object):
+    """
+    Weak reference to a listener callable.
+
+    Bound methods are referenced through their instance so that the listener
+    stays valid as long as the instance is alive.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, listener):
+        if getattr(listener, '__self__', None) is not None and \
+                hasattr(listener, '__func__'):
+            self._instance = weakref.ref(listener.__self__)
+            self._function = listener.__func__
+        else:
+            self._instance = weakref.ref(listener)
+            self._function = None
+
+    def __call__(self):
+        """
+        Gets the listener or None if it was garbage collected.
+        """
+        instance = self._instance()
+        if instance is None or self._function is None:
+            return instance
+        return self._function.__get__(instance, type(instance))
+
+    def __eq__(self, other):
+        return isinstance(other, _WeakListener) and \
+            self._function is other._function and \
+            self._instance() is other._instance() and \
+            self._instance() is not None
+
+    def __ne__(self, other):
+        return not self == other
 
 
 class MemberRepository(object):
@@ -19,6 +66,11 @@ class MemberRepository(object):
     Repository for members.
     """
 
+    _NAME_ATTRIBUTES = ['email_confirm_code', 'lastname', 'firstname']
+    _MEMBER_NAMES_CHANGED = 'member_names_changed'
+    _name_change_listeners = []
+    _name_change_listeners_lock = threading.Lock()
+
     @classmethod
     def get_member(cls, membership_number):
         """
@@ -33,7 +85,8 @@ class MemberRepository(object):
         """
         # pylint: disable=no-member
         return DBSession.query(C3sMember).filter(
-            C3sMember.membership_number == membership_number).first()
+            C3sMember.membership_number == membership_number) \
+            .options(undefer('*')).first()
 
     @classmethod
     def get_member_by_id(cls, member_id):
@@ -52,7 +105,8 @@ class MemberRepository(object):
         """
         # pylint: disable=no-member
         return DBSession.query(C3sMember).filter(
-            C3sMember.id == member_id).first()
+            C3sMember.id == member_id) \
+            .options(undefer('*')).first()
 
     @classmethod
     def get_accepted_members(cls, effective_date=None):
@@ -88,9 +142,11 @@ class MemberRepository(object):
             specified effective date sorted by lastname ascending and firstname
             ascending.
         """
-        return cls._members_query(effective_date).order_by(
-            C3sMember.lastname.asc(),
-            C3sMember.firstname.asc()).all()
+        return cls._members_query(effective_date) \
+            .options(undefer_group('address')) \
+            .order_by(
+                C3sMember.lastname.asc(),
+                C3sMember.firstname.asc()).all()
 
     @classmethod
     def _members_query(cls, effective_date=None):
@@ -195,3 +251,179 @@ class MemberRepository(object):
         return and_(
             cls._membership_accepted_filter(effective_date),
             not_(cls._membership_lost_filter(effective_date)))
+
+    # pylint: disable=too-many-arguments
+    @classmethod
+    def get_members_page(cls, sort_property, sort_direction, page_size,
+                         offset=0, last_id=None):
+        """
+        Gets a page of the members sorted by the sort property.
+
+        Args:
+            sort_property: The name of the member property on which the
+                members are sorted.
+            sort_direction: The sort direction, either "asc" or "desc".
+            page_size: The number of members of the page.
+            offset: Optional. The number of members on the previous pages.
+            last_id: Optional. The ID of the last member of the previous page.
+                If specified the page is retrieved by keyset instead of
+                offset.
+
+        Returns:
+            A list of C3sMember objects with accepted membership.
+
+        Raises:
+            InvalidPropertyException: The sort property does not exist.
+            InvalidSortDirection: The sort direction is invalid.
+        """
+        # pylint: disable=no-member
+        return get_page(
+            DBSession.query(C3sMember).filter(
+                C3sMember.membership_accepted == 1).options(
+                    load_only(*C3sMember.MEMBER_LISTING_COLUMNS)),
+            C3sMember,
+            sort_property,
+            sort_direction,
+            page_size,
+            offset,
+            last_id)
+
+    # pylint: disable=too-many-arguments
+    @classmethod
+    def get_applicants_page(cls, sort_property, sort_direction, page_size,
+                            offset=0, last_id=None):
+        """
+        Gets a page of the membership applicants sorted by the sort property.
+
+        Args:
+            sort_property: The name of the member property on which the
+                applicants are sorted.
+            sort_direction: The sort direction, either "asc" or "desc".
+            page_size: The number of applicants of the page.
+            offset: Optional. The number of applicants on the previous pages.
+            last_id: Optional. The ID of the last applicant of the previous
+                page. If specified the page is retrieved by keyset instead of
+                offset.
+
+        Returns:
+            A list of C3sMember objects which have not been accepted as
+            members yet.
+
+        Raises:
+            InvalidPropertyException: The sort property does not exist.
+            InvalidSortDirection: The sort direction is invalid.
+        """
+        # pylint: disable=no-member
+        return get_page(
+            DBSession.query(C3sMember).filter(
+                C3sMember.nonmember_listing_filter()).options(
+                    load_only(*C3sMember.APPLICANT_LISTING_COLUMNS)),
+            C3sMember,
+            sort_property,
+            sort_direction,
+            page_size,
+            offset,
+            last_id)
+
+    @classmethod
+    def get_member_names(cls):
+        """
+        Gets the reference code, last name and first name of all members.
+
+        Returns:
+            A list of tuples of reference code, last name and first name.
+        """
+        # pylint: disable=no-member
+        return DBSession.query(
+            C3sMember.email_confirm_code,
+            C3sMember.lastname,
+            C3sMember.firstname).all()
+
+    @classmethod
+    def add_name_change_listener(cls, listener):
+        """
+        Adds a listener which is notified when the reference code or name of
+        a member changed.
+
+        The listener is called without arguments after a transaction was
+        committed in which members were inserted or deleted or their
+        reference code, last name or first name was updated.
+
+        The listener is only referenced weakly so that registering it does not
+        keep it, or the instance of a bound method, alive. Listeners which
+        are already registered are not added again.
+
+        Args:
+            listener: A callable without arguments.
+        """
+        weak_listener = _WeakListener(listener)
+        with cls._name_change_listeners_lock:
+            listeners = [
+                registered for registered in cls._name_change_listeners
+                if registered() is not None]
+            if weak_listener not in listeners:
+                listeners.append(weak_listener)
+            cls._name_change_listeners = listeners
+
+    @classmethod
+    def _has_name_changes(cls, session):
+        """
+        Checks whether the pending changes of the session affect the reference
+        codes or names of members.
+        """
+        for instance in session.new.union(session.deleted):
+            if isinstance(instance, C3sMember):
+                return True
+        for instance in session.dirty:
+            if isinstance(instance, C3sMember):
+                attributes = inspect(instance).attrs
+                for name in cls._NAME_ATTRIBUTES:
+                    if attributes[name].history.has_changes():
+                        return True
+        return False
+
+    @classmethod
+    def _after_flush(cls, session, flush_context):
+        """
+        Marks the session if the flush changed reference codes or names.
+        """
+        # pylint: disable=unused-argument
+        if cls._has_name_changes(session):
+            session.info[cls._MEMBER_NAMES_CHANGED] = True
+
+    @classmethod
+    def _after_bulk_operation(cls, context):
+        """
+        Marks the session if a bulk update or delete affected members.
+        """
+        if context.mapper.class_ is C3sMember:
+            context.session.info[cls._MEMBER_NAMES_CHANGED] = True
+
+    @classmethod
+    def _after_commit(cls, session):
+        """
+        Notifies the listeners if the committed transaction changed reference
+        codes or names.
+        """
+        if session.info.pop(cls._MEMBER_NAMES_CHANGED, False):
+            for weak_listener in cls._name_change_listeners:
+                listener = weak_listener()
+                if listener is not None:
+                    listener()
+
+    @classmethod
+    def _after_rollback(cls, session):
+        """
+        Discards the changes of the rolled back transaction.
+        """
+        session.info.pop(cls._MEMBER_NAMES_CHANGED, None)
+
+
+# pylint: disable=protected-access
+event.listen(DBSession, 'after_flush', MemberRepository._after_flush)
+event.listen(
+    DBSession, 'after_bulk_update', MemberRepository._after_bulk_operation)
+event.listen(
+    DBSession, 'after_bulk_delete', MemberRepository._after_bulk_operation)
+event.listen(DBSession, 'after_commit', MemberRepository._after_commit)
+event.listen(DBSession, 'after_rollback', MemberRepository._after_rollback)
@@ -1,12 +1,21 @@
 # -*- coding: utf-8  -*-
 """
 Repository for accessing payments
+
+The payments are read from the dues payment ledger which holds one record per
+member and dues year so that filtering, sorting and paging can be performed
+by the database on one narrow and indexed table. The member is joined for the
+name and the current membership number.
 """
 
-import datetime
-from decimal import Decimal
+from sqlalchemy import Numeric
+from sqlalchemy.sql import (
+    expression,
+    func,
+)
 
 from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.data.model.base.dues_payment import DuesPayment
 from c3smembership.data.model.base import DBSession
 
 
@@ -35,205 +44,74 @@ class PaymentRepository(object):
         }
 
     @classmethod
-    def _get_dues15_payments(cls, members):
-        """
-        Gets the dues payments for 2015 from the members.
-        """
-        payments = []
-        for member in members:
-            if member.dues15_paid:
-                payments.append(cls._create_payment(
-                    date=member.dues15_paid_date.date(),
-                    account=u'Membership dues 2015',
-                    reference=member.dues15_token,
-                    membership_number=member.membership_number,
-                    firstname=member.firstname,
-                    lastname=member.lastname,
-                    amount=Decimal(member.dues15_amount_paid)))
-        return payments
-
-    @classmethod
-    def _get_dues16_payments(cls, members):
-        """
-        Gets the dues payments for 2016 from the members.
-        """
-        payments = []
-        for member in members:
-            if member.dues16_paid:
-                payments.append(cls._create_payment(
-                    date=member.dues16_paid_date.date(),
-                    account=u'Membership dues 2016',
-                    reference=member.dues16_token,
-                    membership_number=member.membership_number,
-                    firstname=member.firstname,
-                    lastname=member.lastname,
-                    amount=Decimal(member.dues16_amount_paid)))
-        return payments
-
-    @classmethod
-    def _get_dues17_payments(cls, members):
-        """
-        Gets the dues payments for 2017 from the members.
-        """
-        payments = []
-        for member in members:
-            if member.dues17_paid:
-                payments.append(cls._create_payment(
-                    date=member.dues17_paid_date.date(),
-                    account=u'Membership dues 2017',
-                    reference=member.dues17_token,
-                    membership_number=member.membership_number,
-                    firstname=member.firstname,
-                    lastname=member.lastname,
-                    amount=Decimal(member.dues17_amount_paid)))
-        return payments
-
-    @classmethod
-    def _get_dues18_payments(cls, members):
-        """
-        Gets the dues payments for 2018 from the members.
+    def _get_payments_query(cls, from_date=None, to_date=None):
         """
-        payments = []
-        for member in members:
-            if member.dues18_paid:
-                payments.append(cls._create_payment(
-                    date=member.dues18_paid_date.date(),
-                    account=u'Membership dues 2018',
-                    reference=member.dues18_token,
-                    membership_number=member.membership_number,
-                    firstname=member.firstname,
-                    lastname=member.lastname,
-                    amount=Decimal(member.dues18_amount_paid)))
-        return payments
-
-    @classmethod
-    def _get_dues19_payments(cls, members):
-        """
-        Gets the dues payments for 2019 from the members.
-        """
-        payments = []
-        for member in members:
-            if member.dues19_paid:
-                payments.append(cls._create_payment(
-                    date=member.dues19_paid_date.date(),
-                    account=u'Membership dues 2019',
-                    reference=member.dues19_token,
-                    membership_number=member.membership_number,
-                    firstname=member.firstname,
-                    lastname=member.lastname,
-                    amount=Decimal(member.dues19_amount_paid)))
-        return payments
-
-    @classmethod
-    def _get_dues20_payments(cls, members):
-        """
-        Gets the dues payments for 2020 from the members.
-        """
-        payments = []
-        for member in members:
-            if member.dues20_paid:
-                payments.append(cls._create_payment(
-                    date=member.dues20_paid_date.date(),
-                    account=u'Membership dues 2020',
-                    reference=member.dues20_token,
-                    membership_number=member.membership_number,
-                    firstname=member.firstname,
-                    lastname=member.lastname,
-                    amount=Decimal(member.dues20_amount_paid)))
-        return payments
-
-    @classmethod
-    def _get_dues21_payments(cls, members):
-        """
-        Gets the dues payments for 2020 from the members.
-        """
-        payments = []
-        for member in members:
-            if member.dues21_paid:
-                payments.append(cls._create_payment(
-                    date=member.dues21_paid_date.date(),
-                    account=u'Membership dues 2021',
-                    reference=member.dues21_token,
-                    membership_number=member.membership_number,
-                    firstname=member.firstname,
-                    lastname=member.lastname,
-                    amount=Decimal(member.dues21_amount_paid)))
-        return payments
+        Gets the query of the payments filtered by dates.
 
-    @classmethod
-    def _get_first_index(cls, page_number, page_size):
-        """
-        Gets the first index for slicing on indices from page number and page
-        size.
-        """
-        return (page_number - 1) * page_size
+        Args:
+            from_date: Optional. The earliest payment date. All older payments
+                are filtered.
+            to_date: Optional. The latest payment date. All younger payments
+                are filtered.
 
-    @classmethod
-    def _get_last_index(cls, page_number, page_size):
-        """
-        Gets the last index for slicing on indices from page number and page
-        size.
+        Returns:
+            An aliased selectable with the columns year, member_id, date,
+            account, reference, membership_number, firstname, lastname and
+            amount.
         """
-        return page_number * page_size
+        conditions = [DuesPayment.paid == expression.true()]
+        if from_date is not None:
+            conditions.append(DuesPayment.date >= from_date)
+        if to_date is not None:
+            conditions.append(DuesPayment.date <= to_date)
+        return expression.select([
+            DuesPayment.year.label('year'),
+            DuesPayment.member_id.label('member_id'),
+            DuesPayment.date.label('date'),
+            DuesPayment.account.label('account'),
+            DuesPayment.reference.label('reference'),
+            C3sMember.membership_number.label('membership_number'),
+            C3sMember.firstname.label('firstname'),
+            C3sMember.lastname.label('lastname'),
+            DuesPayment.amount.label('amount'),
+        ]).select_from(
+            DuesPayment.__table__.join(
+                C3sMember.__table__,
+                C3sMember.id == DuesPayment.member_id)
+        ).where(expression.and_(*conditions)).alias('payments')
 
     @classmethod
-    def _filter_payments(cls, payments, from_date, to_date):
+    def _get_sort_order(cls, payments, sort_property, sort_direction):
         """
-        Filters the payments returning all payments occurred on or later than
-        the from date and earlier or the latest on to date.
-        """
-        if from_date is not None or to_date is not None:
-            if from_date is None:
-                from_date = datetime.date(1, 1, 1)
-            if to_date is None:
-                to_date = datetime.date(9999, 1, 1)
-            # pylint: disable=bad-builtin,deprecated-lambda
-            payments = filter(
-                lambda k: k['date'] >= from_date and k['date'] <= to_date,
-                payments)
-        return payments
+        Gets the order by clauses for the payments query.
 
-    @classmethod
-    def _sort_payments(cls, payments, sort_property, sort_direction):
-        """
-        Sorts the payments by sort property in sort direction.
+        The year and the member are used as additional sort criteria to keep
+        the order of payments with equal sort property deterministic.
 
         Args:
-            payments: The payment list to be sorted.
+            payments: The payments selectable as created by
+                _get_payments_query.
             sort_property: A string representing the payment property by which
                 the payment list is sorted.
             sort_direction: A string representing the sort direction, either
                 "asc" for ascending sorting or "desc" for descending sorting.
-        """
-        reverse = True if sort_direction.lower() == 'desc' else False
-        return sorted(
-            payments,
-            key=lambda k: k[sort_property],
-            reverse=reverse)
-
-    @classmethod
-    def _slice_payments(cls, payments, page_number=None, page_size=None):
-        """
-        Slices the payments to the given page number according to the page
-        size.
-
-        If page number or page size are not specified then all available items
-        are returned without any slicing applied.
-
-        Args:
-            page_number: Optional. Integer specifying the page to be displayed.
-            page_size: Optional. Integer specifying the size of a page in terms
-                of number of items displayed on the page.
 
         Returns:
-            An array of payments.
+            A list of order by clauses.
         """
-        if page_number is not None and page_size is not None:
-            first_index = cls._get_first_index(page_number, page_size)
-            last_index = cls._get_last_index(page_number, page_size)
-            return payments[first_index:last_index]
+        sort_column = payments.c[sort_property]
+        if sort_property == 'amount':
+            # The amount is stored as a string and must be sorted numerically.
+            sort_column = expression.cast(sort_column, Numeric(12, 2))
+        if sort_direction.lower() == 'desc':
+            sort_column = sort_column.desc()
         else:
-            return payments
+            sort_column = sort_column.asc()
+        return [
+            sort_column,
+            payments.c.year.asc(),
+            payments.c.member_id.asc(),
+        ]
 
     @classmethod
     def _is_valid_sort_property(cls, sort_property):
@@ -290,28 +168,184 @@ class PaymentRepository(object):
                 u'"{}"" is an invalid sort property.'.format(
                     unicode(sort_property)))
 
+        query = cls._get_sorted_page_query(
+            page_number, page_size, sort_property, sort_direction, from_date,
+            to_date)
+        return [cls._row_to_payment(row) for row in query]
+
+    # pylint: disable=too-many-arguments
+    @classmethod
+    def get_payments_page(
+            cls, page_number, page_size, sort_property='date',
+            sort_direction='asc', from_date=None, to_date=None):
+        """
+        Gets the payments for a page filtered by dates together with the total
+        number of payments matching the filter.
+
+        The total is calculated by the database as a window count over the
+        filtered payments so that page and total are retrieved in one
+        roundtrip. Only if the page is empty, e.g. because it is beyond the
+        last page, the total is counted separately.
+
+        Args:
+            page_number: The number of the page of payments to be returned.
+            page_size: The size of the pages of payments.
+            sort_property: Optional. A string representing the payment property
+                by which the payment list is sorted. See get_payments for valid
+                sort properties. The default sort property is "date".
+            sort_direction: Optional. A string representing the sort direction,
+                either "asc" for ascending sorting or "desc" for descending
+                sorting. The default sort direction is ascending.
+            from_date: Optional. The earliest payment date. All older payments
+                are filtered.
+            to_date: Optional. The latest payment date. All younger payments
+                are filtered.
+
+        Returns:
+            A tuple of the list of payments of the page and an integer
+            representing the total number of payments matching the filter.
+
+        Raises:
+            ValueError: In case sort_property is not valid.
+        """
+        if not cls._is_valid_sort_property(sort_property):
+            raise ValueError(
+                u'"{}"" is an invalid sort property.'.format(
+                    unicode(sort_property)))
+
+        query = cls._get_sorted_page_query(
+            page_number, page_size, sort_property, sort_direction, from_date,
+            to_date, with_total=True)
         payments = []
-        members = DBSession().query(C3sMember).all()
-
-        # Collect payments
-        payment_methods = [
-            cls._get_dues15_payments,
-            cls._get_dues16_payments,
-            cls._get_dues17_payments,
-            cls._get_dues18_payments,
-            cls._get_dues19_payments,
-            cls._get_dues20_payments,
-            cls._get_dues21_payments,
-        ]
-        for payment_method in payment_methods:
-            payments = payments + payment_method(members)
+        total = None
+        for row in query:
+            payments.append(cls._row_to_payment(row))
+            total = row.total
+        if total is None:
+            total = cls._count_payments(from_date, to_date)
+        return (payments, total)
+
+    @classmethod
+    def iterate_payments(
+            cls, sort_property='date', sort_direction='asc', from_date=None,
+            to_date=None, chunk_size=1000):
+        """
+        Iterates all payments filtered by dates without loading them into
+        memory at once.
 
-        # Arrange payments
-        payments = cls._filter_payments(payments, from_date, to_date)
-        payments = cls._sort_payments(payments, sort_property, sort_direction)
-        payments = cls._slice_payments(payments, page_number, page_size)
+        The payments are streamed from the database in chunks of chunk_size
+        rows. A separate database connection is used which is independent of
+        the request transaction. Therefore, the payments can still be iterated
+        after the request transaction has been finished, e.g. by a streamed
+        response body. The connection is closed when the iteration is finished
+        or the generator is closed.
+
+        Args:
+            sort_property: Optional. A string representing the payment property
+                by which the payments are sorted. See get_payments for valid
+                sort properties. The default sort property is "date".
+            sort_direction: Optional. A string representing the sort direction,
+                either "asc" for ascending sorting or "desc" for descending
+                sorting. The default sort direction is ascending.
+            from_date: Optional. The earliest payment date. All older payments
+                are filtered.
+            to_date: Optional. The latest payment date. All younger payments
+                are filtered.
+            chunk_size: Optional. The number of rows fetched from the database
+                at once. The default is 1000.
 
-        return payments
+        Returns:
+            A generator of payments.
+
+        Raises:
+            ValueError: In case sort_property is not valid.
+        """
+        # Validate before returning the generator so that an invalid sort
+        # property is reported to the caller and not on iteration.
+        if not cls._is_valid_sort_property(sort_property):
+            raise ValueError(
+                u'"{}"" is an invalid sort property.'.format(
+                    unicode(sort_property)))
+
+        payments = cls._get_payments_query(from_date, to_date)
+        query = expression.select([payments]).order_by(
+            *cls._get_sort_order(payments, sort_property, sort_direction))
+        # pylint: disable=no-member
+        engine = DBSession().get_bind()
+        return cls._iterate_rows(engine, query, chunk_size)
+
+    @classmethod
+    def _iterate_rows(cls, engine, query, chunk_size):
+        """
+        Executes the query on a separate connection and yields the payments
+        fetched in chunks.
+        """
+        connection = engine.connect()
+        try:
+            result = connection \
+                .execution_options(stream_results=True) \
+                .execute(query)
+            while True:
+                rows = result.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield cls._row_to_payment(row)
+        finally:
+            connection.close()
+
+    # pylint: disable=too-many-arguments
+    @classmethod
+    def _get_sorted_page_query(
+            cls, page_number, page_size, sort_property, sort_direction,
+            from_date, to_date, with_total=False):
+        """
+        Gets the query for the payments of a page filtered by dates and sorted.
+
+        Args:
+            with_total: Optional. Boolean indicating whether the column total
+                containing a window count of all payments matching the filter
+                is added.
+
+        Returns:
+            A query for the payments. See get_payments for the other
+            arguments.
+        """
+        payments = cls._get_payments_query(from_date, to_date)
+        columns = [payments]
+        if with_total:
+            columns.append(func.count().over().label('total'))
+        # pylint: disable=no-member
+        query = DBSession().query(*columns).order_by(
+            *cls._get_sort_order(payments, sort_property, sort_direction))
+        if page_number is not None and page_size is not None:
+            query = query \
+                .offset((page_number - 1) * page_size) \
+                .limit(page_size)
+        return query
+
+    @classmethod
+    def _row_to_payment(cls, row):
+        """
+        Creates a payment record from a row of the payments query.
+        """
+        return cls._create_payment(
+            date=row.date,
+            account=row.account,
+            reference=row.reference,
+            membership_number=row.membership_number,
+            firstname=row.firstname,
+            lastname=row.lastname,
+            amount=row.amount)
+
+    @classmethod
+    def _count_payments(cls, from_date=None, to_date=None):
+        """
+        Counts the payments matching the date filter by an aggregate query.
+        """
+        payments = cls._get_payments_query(from_date, to_date)
+        # pylint: disable=no-member
+        return DBSession().query(func.count()).select_from(payments).scalar()
 
     def get_payment_count(self, from_date=None, to_date=None):
         """
@@ -328,6 +362,4 @@ class PaymentRepository(object):
             An integer representing the count of payments available not older
             than from date and not younger than to date.
         """
-        return len(self.get_payments(
-            from_date=from_date,
-            to_date=to_date))
+        return self._count_payments(from_date, to_date)
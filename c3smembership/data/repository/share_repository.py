@@ -26,6 +26,8 @@ class ShareRepository(object):
     Repository class for shares.
     """
 
+    _MEMBERSHIP_NUMBER_BATCH_SIZE = 500
+
     @classmethod
     def create(cls, membership_number, shares_quantity,
                board_confirmation=None):
@@ -369,18 +371,22 @@ class ShareRepository(object):
                 is counted. If not specified the date is set to the system
                 date.
         """
-        # TODO: use single optimized query
-        share_count = 0
         if effective_date is None:
             effective_date = date.today()
-
-        member_repository = MemberRepository()
-        members = member_repository.get_accepted_members(effective_date)
-
-        for member in members:
-            for share in member.shares:
-                if share.date_of_acquisition <= effective_date:
-                    share_count += share.number
+        # pylint: disable=no-member,protected-access
+        share_count = DBSession \
+            .query(func.sum(Shares.number)) \
+            .select_from(C3sMember) \
+            .join(members_shares) \
+            .join(Shares) \
+            .filter(
+                expression.and_(
+                    MemberRepository._is_member_filter(effective_date),
+                    Shares.date_of_acquisition <= effective_date
+                )
+            ).scalar()
+        if share_count is None:
+            share_count = 0
         return share_count
 
     @classmethod
@@ -414,6 +420,60 @@ class ShareRepository(object):
             share_count = 0
         return share_count
 
+    @classmethod
+    def get_member_share_counts(
+            cls, effective_date=None, membership_numbers=None):
+        """
+        Gets the number of shares of members as of the effective_date.
+
+        The share counts of all members are aggregated in one grouped query.
+        If membership numbers are specified, they are queried in batches of
+        _MEMBERSHIP_NUMBER_BATCH_SIZE to stay within the limit of bind
+        parameters of the database.
+
+        Args:
+            effective_date: Optional. The effective date for which the number
+                of shares is calculated. If not specified the date is set to
+                the system date.
+            membership_numbers: Optional. The membership numbers of the
+                members for which the number of shares is calculated. If not
+                specified the number of shares is calculated for all members
+                having a membership number.
+
+        Returns:
+            A dictionary mapping membership numbers to the number of shares
+            of the member as of the effective_date. Specified membership
+            numbers of members without shares are mapped to 0 while members
+            without shares are omitted if no membership numbers are specified.
+        """
+        if effective_date is None:
+            effective_date = date.today()
+        # pylint: disable=no-member
+        query = DBSession \
+            .query(C3sMember.membership_number, func.sum(Shares.number)) \
+            .select_from(C3sMember) \
+            .join(members_shares) \
+            .join(Shares) \
+            .filter(Shares.date_of_acquisition <= effective_date) \
+            .group_by(C3sMember.membership_number)
+
+        if membership_numbers is None:
+            # "!= None" for SqlAlchemy instead of Python "is not None"
+            # pylint: disable=singleton-comparison
+            return dict(
+                query.filter(C3sMember.membership_number != None).all())
+
+        membership_numbers = list(membership_numbers)
+        share_counts = dict.fromkeys(membership_numbers, 0)
+        batch_size = cls._MEMBERSHIP_NUMBER_BATCH_SIZE
+        for index in range(0, len(membership_numbers), batch_size):
+            share_counts.update(
+                query.filter(
+                    C3sMember.membership_number.in_(
+                        membership_numbers[index:index + batch_size])
+                ).all())
+        return share_counts
+
     @classmethod
     def get(cls, shares_id):
         """
@@ -0,0 +1,166 @@
+# -*- coding: utf-8  -*-
+"""
+Repository for aggregating statistical figures of the membership data.
+"""
+
+from sqlalchemy import (
+    and_,
+    distinct,
+    not_,
+    or_,
+)
+from sqlalchemy.sql import (
+    expression,
+    func,
+)
+
+from c3smembership.data.model.base import DBSession
+from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.data.model.base.staff import Staff
+
+
+class StatisticsRepository(object):
+    """
+    Repository for aggregating statistical figures of the membership data.
+
+    The figures are calculated by the database with aggregate queries so that
+    no member rows need to be loaded.
+    """
+
+    # Placeholder membership number which is excluded from the highest
+    # membership number.
+    _MEMBERSHIP_NUMBER_PLACEHOLDER = 999999999
+
+    @classmethod
+    def _count_if(cls, condition):
+        """
+        Gets an aggregate counting the rows matching the condition.
+        """
+        return func.sum(expression.case([(condition, 1)], else_=0))
+
+    @classmethod
+    def _sum_if(cls, condition, value, else_=0):
+        """
+        Gets an aggregate summing the value of the rows matching the
+        condition.
+        """
+        return func.sum(expression.case([(condition, value)], else_=else_))
+
+    @classmethod
+    def get_member_counts(cls, effective_date=None):
+        """
+        Gets the member counters in one aggregate query.
+
+        The counters match the corresponding C3sMember class methods, e.g.
+        get_num_members_accepted.
+
+        Args:
+            effective_date: Optional. The date for which the membership status
+                is evaluated. If not specified the system date is used.
+
+        Returns:
+            A dictionary with the integer values:
+
+            - datasets: The number of C3sMember entries.
+            - afm_shares_unpaid: The number of shares of entries whose
+              payment has not been received.
+            - afm_shares_paid: The number of shares of entries whose payment
+              has been received.
+            - members_accepted: The number of members.
+            - non_accepted: The number of entries whose membership has not
+              been accepted.
+            - nonmember_listing: The number of entries not flagged as
+              accepted.
+            - duplicates: The number of entries flagged as duplicates.
+            - natural_persons: The number of members being natural persons.
+            - legal_entities: The number of members being legal entities.
+            - normal: The number of normal members.
+            - investing: The number of investing members.
+            - other_features: The number of members being neither normal nor
+              investing.
+            - membership_lost: The number of entries which lost membership.
+            - membership_numbers: The number of entries with a membership
+              number.
+            - highest_membership_number: The highest membership number except
+              the placeholder 999999999, 0 if there is none.
+            - countries: The number of distinct countries.
+        """
+        is_member = C3sMember.is_member_filter(effective_date)
+        is_normal = C3sMember.membership_type == u'normal'
+        is_investing = C3sMember.membership_type == u'investing'
+        # In SqlAlchemy the comparisons must be done with == and != and not
+        # the python default way using "is" and "is not". Therefore:
+        # pylint: disable=singleton-comparison
+        columns = [
+            func.count(C3sMember.id).label('datasets'),
+            cls._sum_if(
+                C3sMember.payment_received, 0,
+                C3sMember.num_shares).label('afm_shares_unpaid'),
+            cls._sum_if(
+                C3sMember.payment_received,
+                C3sMember.num_shares).label('afm_shares_paid'),
+            cls._count_if(is_member).label('members_accepted'),
+            cls._count_if(
+                not_(C3sMember.membership_accepted_filter(effective_date))
+            ).label('non_accepted'),
+            cls._count_if(or_(
+                C3sMember.membership_accepted == 0,
+                C3sMember.membership_accepted == '',
+                C3sMember.membership_accepted == None,
+            )).label('nonmember_listing'),
+            cls._count_if(C3sMember.is_duplicate == 1).label('duplicates'),
+            cls._count_if(and_(
+                C3sMember.is_legalentity == 0,
+                is_member)).label('natural_persons'),
+            cls._count_if(and_(
+                C3sMember.is_legalentity == 1,
+                is_member)).label('legal_entities'),
+            cls._count_if(and_(is_member, is_normal)).label('normal'),
+            cls._count_if(and_(is_member, is_investing)).label('investing'),
+            cls._count_if(and_(
+                is_member,
+                not_(is_normal),
+                not_(is_investing))).label('other_features'),
+            cls._count_if(
+                C3sMember.membership_lost_filter(effective_date)
+            ).label('membership_lost'),
+            cls._count_if(
+                C3sMember.membership_number).label('membership_numbers'),
+            func.max(expression.case([(
+                C3sMember.membership_number !=
+                cls._MEMBERSHIP_NUMBER_PLACEHOLDER,
+                C3sMember.membership_number)])).label(
+                    'highest_membership_number'),
+            func.count(distinct(C3sMember.country)).label('countries'),
+        ]
+        # pylint: disable=no-member
+        row = DBSession.query(*columns).one()
+        # Sums of empty tables are NULL.
+        return dict(
+            (column.name, int(getattr(row, column.name) or 0))
+            for column in columns)
+
+    @classmethod
+    def get_country_counts(cls):
+        """
+        Gets the number of C3sMember entries per country.
+
+        Returns:
+            A list of tuples of country and number of entries sorted
+            descending by number of entries.
+        """
+        count = func.count(C3sMember.id)
+        # pylint: disable=no-member
+        return [
+            (row[0], row[1])
+            for row in DBSession.query(C3sMember.country, count)
+            .group_by(C3sMember.country)
+            .order_by(count.desc(), C3sMember.country)]
+
+    @classmethod
+    def get_staff_count(cls):
+        """
+        Gets the number of staff accounts.
+        """
+        # pylint: disable=no-member
+        return DBSession.query(func.count(Staff.id)).scalar()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8  -*-
+"""
+Tests the c3smembership.data.repository.data_version_repository package.
+"""
+
+from datetime import date
+import unittest
+
+from sqlalchemy import engine_from_config
+import transaction
+
+from c3smembership.data.model.base import (
+    DBSession,
+    Base,
+)
+from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.data.model.base.group import Group
+from c3smembership.data.model.base.staff import Staff
+from c3smembership.data.repository.data_version_repository import \
+    DataVersionRepository
+
+
+class TestDataVersionRepository(unittest.TestCase):
+    """
+    Tests the DataVersionRepository class.
+    """
+
+    def setUp(self):
+        my_settings = {'sqlalchemy.url': 'sqlite:///:memory:', }
+        engine = engine_from_config(my_settings)
+        DBSession.configure(bind=engine)
+        Base.metadata.create_all(engine)
+
+    def tearDown(self):
+        # pylint: disable=no-member
+        DBSession.close()
+        # pylint: disable=no-member
+        DBSession.remove()
+
+    @classmethod
+    def _create_member(cls):
+        return C3sMember(
+            firstname=u'Firstname',
+            lastname=u'Lastname',
+            email=u'member@example.com',
+            address1=u'',
+            address2=u'',
+            postcode=u'',
+            city=u'',
+            country=u'DE',
+            locale=u'de',
+            date_of_birth=date(1980, 1, 1),
+            email_is_confirmed=False,
+            email_confirm_code=u'VERSION',
+            password=u'',
+            date_of_submission=date(2016, 1, 1),
+            membership_type=u'normal',
+            member_of_colsoc=False,
+            name_of_colsoc=u'',
+            num_shares=1,
+        )
+
+    def test_bump(self):
+        """
+        Tests the DataVersionRepository.bump method.
+        """
+        version, last_modified = DataVersionRepository.get_data_version()
+        DataVersionRepository.bump()
+        new_version, new_last_modified = \
+            DataVersionRepository.get_data_version()
+        self.assertNotEqual(version, new_version)
+        self.assertTrue(new_last_modified >= last_modified)
+
+    def test_versioned_data_changes(self):
+        """
+        Tests that changes of versioned data change the data version.
+
+        1. Add a member and verify that the data version changed on flush and
+           on commit.
+        2. Update the member in bulk and verify that the data version changed.
+        3. Roll back a change and verify that committing an unrelated change
+           afterwards does not change the data version.
+        """
+        # 1. Add a member
+        version_before = DataVersionRepository.get_data_version()[0]
+        transaction.begin()
+        # pylint: disable=no-member
+        DBSession.add(self._create_member())
+        DBSession.flush()
+        version_flushed = DataVersionRepository.get_data_version()[0]
+        self.assertNotEqual(version_before, version_flushed)
+        transaction.commit()
+        version_committed = DataVersionRepository.get_data_version()[0]
+        self.assertNotEqual(version_flushed, version_committed)
+
+        # 2. Update the member in bulk
+        with transaction.manager:
+            # pylint: disable=no-member
+            DBSession.query(C3sMember).update({'lastname': u'Changed'})
+        self.assertNotEqual(
+            version_committed, DataVersionRepository.get_data_version()[0])
+
+        # 3. Roll back a change
+        transaction.begin()
+        # pylint: disable=no-member
+        member = DBSession.query(C3sMember).first()
+        member.lastname = u'Rolled back'
+        DBSession.flush()
+        transaction.abort()
+        version = DataVersionRepository.get_data_version()[0]
+        with transaction.manager:
+            # pylint: disable=no-member
+            DBSession.add(Group(name=u'unversioned'))
+        self.assertEqual(version, DataVersionRepository.get_data_version()[0])
+
+    def test_staff_changes(self):
+        """
+        Tests that changes of staff accounts change the data version as the
+        statistics contain the number of staff accounts.
+        """
+        version = DataVersionRepository.get_data_version()[0]
+        with transaction.manager:
+            # pylint: disable=no-member
+            DBSession.add(Staff(
+                login=u'staff', password=u'staff', email=u'staff@example.com'))
+        self.assertNotEqual(
+            version, DataVersionRepository.get_data_version()[0])
+
+    def test_unversioned_data_changes(self):
+        """
+        Tests that changes of data which is not versioned do not change the
+        data version.
+        """
+        version = DataVersionRepository.get_data_version()[0]
+        with transaction.manager:
+            # pylint: disable=no-member
+            DBSession.add(Group(name=u'unversioned'))
+        self.assertEqual(version, DataVersionRepository.get_data_version()[0])
@@ -26,6 +26,7 @@ from c3smembership.data.model.base.dues18invoice import Dues18Invoice
 from c3smembership.data.model.base.dues19invoice import Dues19Invoice
 from c3smembership.data.model.base.dues20invoice import Dues20Invoice
 from c3smembership.data.model.base.dues21invoice import Dues21Invoice
+from c3smembership.data.model.base.dues_payment import DuesPayment
 from c3smembership.data.repository.dues_invoice_repository import \
     DuesInvoiceRepository
 
@@ -85,6 +86,15 @@ class TestDuesInvoiceRepository(unittest.TestCase):
             member1.dues20_amount_paid = Decimal('20.11')
             member1.dues21_paid_date = date(2021, 11, 21)
             member1.dues21_amount_paid = Decimal('21.11')
+            for year in range(2015, 2022):
+                member1.dues_payments.append(DuesPayment(
+                    membership_number=member1.membership_number,
+                    year=year,
+                    account=u'Membership dues {0}'.format(year),
+                    date=getattr(
+                        member1, 'dues{0}_paid_date'.format(year % 100)),
+                    amount=getattr(
+                        member1, 'dues{0}_amount_paid'.format(year % 100))))
             self.db_session.add(member1)
             self.db_session.flush()
             self.db_session.add(
@@ -489,6 +499,39 @@ class TestDuesInvoiceRepository(unittest.TestCase):
         stats = DuesInvoiceRepository.get_monthly_stats(2000)
         self.assertIsNone(stats)
 
+    def test_get_monthly_stats_unpaid(self):
+        """
+        Test that payments not marked as paid count in the statistics
+        """
+        with transaction.manager:
+            for payment in C3sMember.get_by_id(1).dues_payments:
+                payment.paid = False
+        stats = DuesInvoiceRepository.get_monthly_stats(2015)
+        self.assertAlmostEqual(stats[0]['amount_paid'], Decimal('15.11'))
+
+    def test_get_monthly_stats_by_year(self):
+        """
+        Test the get_monthly_stats_by_year method
+
+        1. Test all years are equal to the single year statistics
+        2. Test selected years ignoring not configured ones
+        """
+        # 1. Test all years are equal to the single year statistics
+        stats = DuesInvoiceRepository.get_monthly_stats_by_year()
+        self.assertEqual(
+            sorted(stats.keys()),
+            [2015, 2016, 2017, 2018, 2019, 2020, 2021])
+        for year in stats:
+            self.assertEqual(
+                stats[year], DuesInvoiceRepository.get_monthly_stats(year))
+
+        # 2. Test selected years ignoring not configured ones
+        stats = DuesInvoiceRepository.get_monthly_stats_by_year([2000, 2016])
+        self.assertEqual(stats.keys(), [2016])
+        self.assertEqual(len(stats[2016]), 2)
+        self.assertEqual(stats[2016][0]['month'], datetime(2016, 6, 1))
+        self.assertAlmostEqual(stats[2016][1]['amount_paid'], Decimal('16.11'))
+
     def test_create_dues_invoice(self):
         """
         Test the create_dues_invoice method
@@ -204,6 +204,16 @@ class TestGeneralAssemblyRepository(unittest.TestCase):
             GENERAL_ASSEMBLY_NUMBER_2018_2, 10)
         self.assertEqual(len(invitees), 1)
 
+        invitees = GeneralAssemblyRepository.get_invitees(
+            GENERAL_ASSEMBLY_NUMBER_2018_2)
+        self.assertEqual(len(invitees), 1)
+
+        invitees = GeneralAssemblyRepository.get_invitees(
+            GENERAL_ASSEMBLY_NUMBER_2018)
+        self.assertEqual(
+            sorted([invitee.membership_number for invitee in invitees]),
+            [u'member_1', u'member_2', u'member_3'])
+
     def test_get_member_by_token(self):
         """
         Test the get_member_by_token method
@@ -273,6 +283,154 @@ class TestGeneralAssemblyRepository(unittest.TestCase):
         self.assertEqual(invitation['number'], GENERAL_ASSEMBLY_NUMBER_2017)
         self.assertEqual(invitation['flag'], False)
 
+        invitation = GeneralAssemblyRepository.get_member_invitation(
+            'member_2', GENERAL_ASSEMBLY_NUMBER_2018_2)
+        self.assertEqual(
+            invitation['name'], u'Außerordentliche Generalversammlung')
+        self.assertEqual(invitation['date'], date(2018, 12, 1))
+        self.assertEqual(invitation['flag'], True)
+        self.assertEqual(invitation['token'], u'test_token_2')
+
+        # Not invited member
+        invitation = GeneralAssemblyRepository.get_member_invitation(
+            'member_3', GENERAL_ASSEMBLY_NUMBER_2018_2)
+        self.assertEqual(invitation['flag'], False)
+        self.assertEqual(invitation['sent'], None)
+        self.assertEqual(invitation['token'], None)
+
+        # Non-existing general assembly
+        invitation = GeneralAssemblyRepository.get_member_invitation(
+            'member_1', 123)
+        self.assertIsNone(invitation)
+
+        # The invitation equals the one of get_member_invitations
+        for invitation in GeneralAssemblyRepository.get_member_invitations(
+                'member_2'):
+            self.assertEqual(
+                GeneralAssemblyRepository.get_member_invitation(
+                    'member_2', invitation['number']),
+                invitation)
+
+    def test_get_members_invitation(self):
+        """
+        Test the get_members_invitation method
+
+        1. Test invited and not invited members
+        2. Test a different general assembly
+        3. Test non-existing members and general assembly
+        4. Test batches
+        """
+        # 1. Test invited and not invited members
+        invitations = GeneralAssemblyRepository.get_members_invitation(
+            [u'member_1', u'member_2', u'member_3'],
+            GENERAL_ASSEMBLY_NUMBER_2018_2)
+        self.assertEqual(
+            sorted(invitations.keys()),
+            [u'member_1', u'member_2', u'member_3'])
+        for membership_number, invitation in invitations.items():
+            self.assertEqual(
+                invitation,
+                GeneralAssemblyRepository.get_member_invitation(
+                    membership_number, GENERAL_ASSEMBLY_NUMBER_2018_2))
+        self.assertEqual(invitations[u'member_1']['flag'], True)
+        self.assertEqual(
+            invitations[u'member_1']['sent'], datetime(2018, 9, 1, 23, 5, 15))
+        self.assertEqual(invitations[u'member_1']['token'], u'test_token_1')
+        self.assertEqual(invitations[u'member_2']['flag'], True)
+        self.assertEqual(invitations[u'member_3']['flag'], False)
+        self.assertEqual(invitations[u'member_3']['sent'], None)
+        self.assertEqual(
+            invitations[u'member_3']['number'],
+            GENERAL_ASSEMBLY_NUMBER_2018_2)
+        self.assertEqual(invitations[u'member_3']['date'], date(2018, 12, 1))
+
+        # 2. Test a different general assembly
+        invitations = GeneralAssemblyRepository.get_members_invitation(
+            [u'member_1'], GENERAL_ASSEMBLY_NUMBER_2017)
+        self.assertEqual(invitations[u'member_1']['flag'], False)
+        self.assertEqual(
+            invitations[u'member_1']['number'], GENERAL_ASSEMBLY_NUMBER_2017)
+
+        # 3. Test non-existing members and general assembly
+        invitations = GeneralAssemblyRepository.get_members_invitation(
+            [u'member_1', u'non_existing'], GENERAL_ASSEMBLY_NUMBER_2017)
+        self.assertEqual(invitations.keys(), [u'member_1'])
+        invitations = GeneralAssemblyRepository.get_members_invitation(
+            [u'member_1'], 123)
+        self.assertEqual(invitations, {})
+        invitations = GeneralAssemblyRepository.get_members_invitation(
+            [], GENERAL_ASSEMBLY_NUMBER_2017)
+        self.assertEqual(invitations, {})
+
+        # 4. Test batches
+        with mock.patch.object(
+                GeneralAssemblyRepository,
+                '_MEMBERSHIP_NUMBER_BATCH_SIZE', 2):
+            invitations = GeneralAssemblyRepository.get_members_invitation(
+                [u'member_1', u'member_2', u'member_3'],
+                GENERAL_ASSEMBLY_NUMBER_2018_2)
+        self.assertEqual(len(invitations), 3)
+        self.assertEqual(invitations[u'member_3']['flag'], False)
+
+    def test_invite_members(self):
+        """
+        Test the invite_members method
+
+        1. Invite several members
+        2. Invite with non-existing general assembly
+        3. Invite non-existing member
+        4. Invite in batches
+        """
+        # 1. Invite several members
+        GeneralAssemblyRepository.datetime.now.side_effect = [
+            datetime(2018, 5, 1, 10, 11, 12)]
+        GeneralAssemblyRepository.invite_members(
+            GENERAL_ASSEMBLY_NUMBER_2018,
+            [(u'member_1', u'token_1'), (u'member_3', u'token_3')])
+        invitees = GeneralAssemblyRepository.get_invitees(
+            GENERAL_ASSEMBLY_NUMBER_2018)
+        self.assertEqual(
+            [invitee.membership_number for invitee in invitees],
+            [u'member_2'])
+        for membership_number, token in [
+                (u'member_1', u'token_1'), (u'member_3', u'token_3')]:
+            invitation = GeneralAssemblyRepository.get_member_invitation(
+                membership_number, GENERAL_ASSEMBLY_NUMBER_2018)
+            self.assertEqual(invitation['flag'], True)
+            self.assertEqual(
+                invitation['sent'], datetime(2018, 5, 1, 10, 11, 12))
+            self.assertEqual(invitation['token'], token)
+        member = GeneralAssemblyRepository.get_member_by_token(u'token_3')
+        self.assertEqual(member.membership_number, u'member_3')
+
+        # 2. Invite with non-existing general assembly
+        with self.assertRaises(ValueError):
+            GeneralAssemblyRepository.invite_members(
+                123, [(u'member_2', u'token_2')])
+
+        # 3. Invite non-existing member
+        with self.assertRaises(ValueError):
+            GeneralAssemblyRepository.invite_members(
+                GENERAL_ASSEMBLY_NUMBER_2018,
+                [(u'member_2', u'token_2'), (u'non_existing', u'token_x')])
+        invitation = GeneralAssemblyRepository.get_member_invitation(
+            u'member_2', GENERAL_ASSEMBLY_NUMBER_2018)
+        self.assertEqual(invitation['flag'], False)
+
+        # 4. Invite in batches
+        GeneralAssemblyRepository.datetime.now.side_effect = [
+            datetime(2018, 5, 2, 10, 11, 12)]
+        with mock.patch.object(
+                GeneralAssemblyRepository,
+                '_MEMBERSHIP_NUMBER_BATCH_SIZE', 1):
+            GeneralAssemblyRepository.invite_members(
+                GENERAL_ASSEMBLY_NUMBER_2017,
+                [(u'member_2', u'token_2'), (u'member_3', u'token_4')])
+        self.assertEqual(
+            GeneralAssemblyRepository.get_invitees(
+                GENERAL_ASSEMBLY_NUMBER_2017),
+            [])
+
     def test_invite_member(self):
         """
         Test the invite_member method
@@ -0,0 +1,163 @@
+# -*- coding: utf-8  -*-
+"""
+Tests the c3smembership.data.repository.keyset_paging package.
+"""
+
+from datetime import date
+import unittest
+
+from sqlalchemy import engine_from_config
+import transaction
+
+from c3smembership.data.model.base import (
+    DBSession,
+    Base,
+)
+from c3smembership.data.model.base.c3smember import (
+    C3sMember,
+    InvalidPropertyException,
+    InvalidSortDirection,
+)
+from c3smembership.data.repository.keyset_paging import get_page
+from c3smembership.data.repository.member_repository import MemberRepository
+
+
+class TestKeysetPaging(unittest.TestCase):
+    """
+    Tests the get_page function.
+    """
+
+    # Duplicate and null sort values test the ID tie breaker and the null
+    # handling.
+    _MEMBERSHIP_NUMBERS = [5, None, 3, 5, None, 1, 3, 8, None, 2, 5, 7, 1]
+
+    def setUp(self):
+        my_settings = {'sqlalchemy.url': 'sqlite:///:memory:', }
+        engine = engine_from_config(my_settings)
+        DBSession.configure(bind=engine)
+        Base.metadata.create_all(engine)
+        with transaction.manager:
+            for index, membership_number in enumerate(
+                    self._MEMBERSHIP_NUMBERS):
+                member = C3sMember(
+                    firstname=u'Firstname{0}'.format(index),
+                    lastname=u'Lastname{0}'.format(index),
+                    email=u'member{0}@example.com'.format(index),
+                    address1=u'Some Street 123',
+                    address2=u'',
+                    postcode=u'12345',
+                    city=u'Some City',
+                    country=u'Some Country',
+                    locale=u'DE',
+                    date_of_birth=date(1980, 1, 1),
+                    email_is_confirmed=False,
+                    email_confirm_code=u'CODE{0}'.format(index),
+                    password=u'arandompassword',
+                    date_of_submission=date(2020, 1, 1),
+                    membership_type=u'normal',
+                    member_of_colsoc=False,
+                    name_of_colsoc=u'',
+                    num_shares=1,
+                )
+                member.membership_number = membership_number
+                member.membership_accepted = index % 2 == 0
+                DBSession.add(member)
+
+    def tearDown(self):
+        # pylint: disable=no-member
+        DBSession.close()
+        DBSession.remove()
+
+    @classmethod
+    def _get_ids(cls, members):
+        return [member.id for member in members]
+
+    def _assert_keyset_pages(self, page_function, sort_property,
+                             sort_direction, page_size):
+        """
+        Asserts that paging by keyset retrieves the same pages as paging by
+        offset.
+        """
+        expected_ids = self._get_ids(
+            page_function(sort_property, sort_direction, 1000))
+        self.assertTrue(len(expected_ids) > page_size)
+
+        offset = 0
+        last_id = None
+        while offset < len(expected_ids):
+            offset_ids = self._get_ids(
+                page_function(
+                    sort_property, sort_direction, page_size, offset))
+            keyset_ids = self._get_ids(
+                page_function(
+                    sort_property, sort_direction, page_size, offset,
+                    last_id))
+            self.assertEqual(
+                offset_ids, expected_ids[offset:offset + page_size])
+            self.assertEqual(keyset_ids, offset_ids)
+            last_id = keyset_ids[-1]
+            offset += page_size
+
+        # Paging after the last entity results in an empty page.
+        self.assertEqual(
+            page_function(
+                sort_property, sort_direction, page_size, offset, last_id),
+            [])
+
+    def test_get_page(self):
+        """
+        Tests that keyset and offset paging retrieve the same pages.
+        """
+        for sort_property in ['membership_number', 'id', 'lastname']:
+            for sort_direction in ['asc', 'desc']:
+                for page_size in [1, 2, 4]:
+                    self._assert_keyset_pages(
+                        MemberRepository.get_members_page,
+                        sort_property,
+                        sort_direction,
+                        page_size)
+                    self._assert_keyset_pages(
+                        MemberRepository.get_applicants_page,
+                        sort_property,
+                        sort_direction,
+                        page_size)
+
+    def test_get_page_sorting(self):
+        """
+        Tests the sort order including null values.
+        """
+        members = MemberRepository.get_members_page(
+            'membership_number', 'asc', 1000)
+        membership_numbers = [
+            member.membership_number for member in members]
+        self.assertEqual(membership_numbers, sorted(membership_numbers))
+        self.assertEqual(membership_numbers[0], None)
+
+        members = MemberRepository.get_members_page(
+            'membership_number', 'desc', 1000)
+        self.assertEqual(
+            [member.membership_number for member in members],
+            list(reversed(membership_numbers)))
+
+    def test_get_page_missing_last_id(self):
+        """
+        Tests that the offset is used if the last entity does not exist.
+        """
+        offset_ids = self._get_ids(
+            MemberRepository.get_members_page('lastname', 'asc', 3, 3))
+        keyset_ids = self._get_ids(
+            MemberRepository.get_members_page('lastname', 'asc', 3, 3, 9999))
+        self.assertEqual(keyset_ids, offset_ids)
+
+    def test_get_page_exceptions(self):
+        """
+        Tests the validation of the sorting.
+        """
+        # pylint: disable=no-member
+        query = DBSession.query(C3sMember)
+        with self.assertRaises(InvalidPropertyException):
+            get_page(query, C3sMember, 'non_existing', 'asc', 10)
+        with self.assertRaises(InvalidPropertyException):
+            get_page(query, C3sMember, 'get_by_id', 'asc', 10)
+        with self.assertRaises(InvalidSortDirection):
+            get_page(query, C3sMember, 'lastname', 'up', 10)
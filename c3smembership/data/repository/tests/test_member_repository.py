@@ -6,7 +6,11 @@ Tests the c3smembership.data.repository.member_repository package.
 from datetime import date
 import unittest
 
-from sqlalchemy import engine_from_config
+import mock
+from sqlalchemy import (
+    engine_from_config,
+    inspect,
+)
 import transaction
 
 from c3smembership.data.model.base import (
@@ -155,6 +159,66 @@ class TestMemberRepository(unittest.TestCase):
         member2 = MemberRepository.get_member_by_id(2)
         self.assertEqual(member2.id, 2)
 
+    def test_column_loading(self):
+        """
+        Tests the columns loaded by single member lookups and listings.
+        """
+        # pylint: disable=no-member
+        DBSession.expunge_all()
+        deferred_columns = set([
+            'address1', 'accountant_comment', 'dues15_amount',
+            'dues21_invoice_date'])
+
+        # Single member lookups load all columns
+        member = MemberRepository.get_member_by_id(1)
+        self.assertEqual(inspect(member).unloaded & deferred_columns, set())
+        member = MemberRepository.get_member('member2')
+        self.assertEqual(inspect(member).unloaded & deferred_columns, set())
+        DBSession.expunge_all()
+
+        # Listings only load the columns they render
+        members = MemberRepository.get_members_page('id', 'asc', 10)
+        self.assertEqual(len(members), 3)
+        for member in members:
+            unloaded = inspect(member).unloaded
+            self.assertEqual(
+                unloaded & set(C3sMember.MEMBER_LISTING_COLUMNS), set())
+            self.assertEqual(
+                unloaded & deferred_columns,
+                set(['address1', 'accountant_comment', 'dues15_amount']))
+        # Deferred columns are loaded on access
+        self.assertEqual(members[0].address1, u'addr one')
+        DBSession.expunge_all()
+
+        members = MemberRepository.get_applicants_page('id', 'asc', 10)
+        self.assertEqual(len(members), 1)
+        unloaded = inspect(members[0]).unloaded
+        self.assertEqual(
+            unloaded & set(C3sMember.APPLICANT_LISTING_COLUMNS), set())
+        self.assertTrue('dues21_invoice_date' in unloaded)
+        DBSession.expunge_all()
+
+        # The sorted member list loads the address group
+        members = MemberRepository.get_accepted_members_sorted()
+        unloaded = inspect(members[0]).unloaded
+        self.assertFalse('address1' in unloaded)
+        self.assertFalse('city' in unloaded)
+        self.assertTrue('dues15_amount' in unloaded)
+        DBSession.expunge_all()
+
+        # The similar member lookups of the grant page load the address group
+        address_columns = set(['address1', 'address2', 'postcode', 'city'])
+        for members in [
+                C3sMember.get_same_lastnames(u'SomeLastnäme'),
+                C3sMember.get_same_firstnames(u'SomeFirstnäme'),
+                C3sMember.get_same_email(u'some@shri.de'),
+                C3sMember.get_same_date_of_birth(date.today())]:
+            self.assertTrue(len(members) > 0)
+            for member in members:
+                self.assertEqual(
+                    inspect(member).unloaded & address_columns, set())
+            DBSession.expunge_all()
+
     def test_get_accepted_members(self):
         """
         Tests the MemberRepository.get_accepted_members method.
@@ -281,3 +345,90 @@ class TestMemberRepository(unittest.TestCase):
         members_count = MemberRepository.get_accepted_members_count(
             date(2016, 4, 23))
         self.assertEqual(members_count, 2)
+
+    def test_get_member_names(self):
+        """
+        Tests the MemberRepository.get_member_names method.
+        """
+        member_names = sorted(MemberRepository.get_member_names())
+        self.assertEqual(member_names, [
+            (u'ABCDEFGBAR', u'XXXSomeLastnäme', u'AAASomeFirstnäme'),
+            (u'ABCDEFGFOO', u'SomeLastnäme', u'SomeFirstnäme'),
+            (u'MEMBERSHIP_LOST', u'Lost', u'Membership'),
+            (u'NOT_APPROVED_MEMBER', u'Member', u'Not Approved'),
+        ])
+
+    def test_add_name_change_listener(self):
+        """
+        Tests the MemberRepository.add_name_change_listener method.
+        """
+        listener = mock.Mock()
+        with mock.patch.object(
+                MemberRepository, '_name_change_listeners', []):
+            MemberRepository.add_name_change_listener(listener)
+
+            # Changes not affecting codes or names are not notified
+            with transaction.manager:
+                member = MemberRepository.get_member('member1')
+                member.city = u'Other City'
+            self.assertEqual(listener.call_count, 0)
+
+            # Rolled back changes are not notified
+            transaction.begin()
+            member = MemberRepository.get_member('member1')
+            member.lastname = u'Rolled Back'
+            # pylint: disable=no-member
+            DBSession.flush()
+            transaction.abort()
+            self.assertEqual(listener.call_count, 0)
+
+            # Name changes are notified after commit
+            with transaction.manager:
+                member = MemberRepository.get_member('member1')
+                member.lastname = u'Other Lastname'
+            self.assertEqual(listener.call_count, 1)
+
+            # Bulk deletes are notified after commit
+            with transaction.manager:
+                C3sMember.delete_by_id(
+                    MemberRepository.get_member('member2').id)
+            self.assertEqual(listener.call_count, 2)
+
+    def test_name_change_listener_references(self):
+        """
+        Tests that name change listeners are registered once and referenced
+        weakly.
+        """
+        class Listener(object):
+            """Listener counting its notifications"""
+            # pylint: disable=too-few-public-methods
+            def __init__(self):
+                self.count = 0
+
+            def invalidate(self):
+                """Count the notification"""
+                self.count += 1
+
+        listener = Listener()
+        with mock.patch.object(
+                MemberRepository, '_name_change_listeners', []):
+            MemberRepository.add_name_change_listener(listener.invalidate)
+            MemberRepository.add_name_change_listener(listener.invalidate)
+            # pylint: disable=protected-access
+            self.assertEqual(len(MemberRepository._name_change_listeners), 1)
+
+            with transaction.manager:
+                member = MemberRepository.get_member('member1')
+                member.lastname = u'Other Lastname'
+            self.assertEqual(listener.count, 1)
+
+            # Listeners of garbage collected instances are removed
+            del listener
+            other_listener = Listener()
+            MemberRepository.add_name_change_listener(
+                other_listener.invalidate)
+            self.assertEqual(len(MemberRepository._name_change_listeners), 1)
+            with transaction.manager:
+                member = MemberRepository.get_member('member1')
+                member.lastname = u'Another Lastname'
+            self.assertEqual(other_listener.count, 1)
@@ -15,6 +15,7 @@ from c3smembership.data.model.base import (
     Base,
 )
 from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.data.model.base.dues_payment import DuesPayment
 from c3smembership.data.repository.payment_repository import PaymentRepository
 
 
@@ -94,6 +95,21 @@ class TestPaymentRepository(unittest.TestCase):
         member.dues21_amount_paid = dues21_payment_amount
         member.dues21_paid_date = dues21_payment_date
         member.dues21_token = dues21_payment_token
+
+        for year in range(2015, 2022):
+            dues = year % 100
+            paid = getattr(member, 'dues{0}_paid'.format(dues))
+            paid_date = getattr(member, 'dues{0}_paid_date'.format(dues))
+            if paid_date is not None:
+                member.dues_payments.append(DuesPayment(
+                    paid=bool(paid),
+                    membership_number=membership_number,
+                    year=year,
+                    account=u'Membership dues {0}'.format(year),
+                    reference=getattr(member, 'dues{0}_token'.format(dues)),
+                    date=paid_date,
+                    amount=getattr(
+                        member, 'dues{0}_amount_paid'.format(dues))))
         return member
 
     def setUp(self):
@@ -114,6 +130,9 @@ class TestPaymentRepository(unittest.TestCase):
         2018-10-12 12.12  Cassandra Jones    CJ18      3
         2019-04-05 19.19  Jane      Smith    JS19      1
         2020-04-05 20.20  Jane      Smith    JS20      1
+
+        John Smith's 2015 payment of 15.12 on 2015-01-02 is recorded in the
+        ledger without being marked as paid and is therefore not listed.
         """
         my_settings = {'sqlalchemy.url': 'sqlite:///:memory:', }
         engine = engine_from_config(my_settings)
@@ -156,9 +175,9 @@ class TestPaymentRepository(unittest.TestCase):
                 firstname=u'John',
                 lastname=u'Smith',
                 dues15_paid=False,
-                dues15_payment_date=None,
-                dues15_payment_token=None,
-                dues15_payment_amount=None,
+                dues15_payment_date=date(2015, 1, 2),
+                dues15_payment_token=u'LEGACY',
+                dues15_payment_amount=Decimal('15.12'),
                 dues16_paid=True,
                 dues16_payment_date=date(2016, 2, 2),
                 dues16_payment_token=u'JOHN',
@@ -382,3 +401,193 @@ class TestPaymentRepository(unittest.TestCase):
         with self.assertRaises(ValueError):
             payments = PaymentRepository.get_payments(
                 1, 100, sort_property='some_not_existing_property')
+
+    def test_get_payments_sort_direction(self):
+        """
+        Tests the get payments method sorting descending.
+
+        Test:
+
+        1. Test descending sorting by date
+        2. Test descending sorting with paging
+        """
+
+        # 1. Test descending sorting by date
+        payments = PaymentRepository.get_payments(
+            1, 100, sort_property='date', sort_direction='desc')
+        self.assertEqual(len(payments), 11)
+        self.assertEqual(payments[0]['date'], date(2021, 4, 5))
+        self.assertEqual(payments[0]['reference'], u'JS21')
+        self.assertEqual(payments[10]['date'], date(2015, 1, 1))
+        self.assertEqual(payments[10]['reference'], u'JANE')
+
+        # 2. Test descending sorting with paging
+        payments = PaymentRepository.get_payments(
+            2, 2, sort_property='date', sort_direction='desc')
+        self.assertEqual(len(payments), 2)
+        self.assertEqual(payments[0]['reference'], u'JS19')
+        self.assertEqual(payments[1]['reference'], u'CJ18')
+
+    def test_get_payments_amount_sorting(self):
+        """
+        Tests that the get payments method sorts amounts numerically.
+
+        The amounts are persisted as strings so that a single digit amount
+        must be sorted before amounts with two digits.
+        """
+        with transaction.manager:
+            # pylint: disable=no-member
+            DBSession.add(self._create_member(
+                membership_number=4,
+                firstname=u'Peter',
+                lastname=u'Meier',
+                dues15_paid=False,
+                dues15_payment_date=None,
+                dues15_payment_token=None,
+                dues15_payment_amount=None,
+                dues16_paid=False,
+                dues16_payment_date=None,
+                dues16_payment_token=None,
+                dues16_payment_amount=None,
+                dues17_paid=True,
+                dues17_payment_date=date(2017, 5, 5),
+                dues17_payment_token=u'PM17',
+                dues17_payment_amount=Decimal('9.5'),
+            ))
+
+        payments = PaymentRepository.get_payments(
+            1, 3, sort_property='amount')
+        self.assertEqual(len(payments), 3)
+        for payment in payments:
+            self.assertIsInstance(payment['amount'], Decimal)
+        self.assertEqual(payments[0]['amount'], Decimal('9.5'))
+        self.assertEqual(payments[1]['amount'], Decimal('12.12'))
+        self.assertEqual(payments[2]['amount'], Decimal('15.11'))
+
+        payments = PaymentRepository.get_payments(
+            1, 1, sort_property='amount', sort_direction='desc')
+        self.assertEqual(payments[0]['amount'], Decimal('21.21'))
+
+    def test_get_payments_membership_number_change(self):
+        """
+        Tests that payments show the current membership number of the member.
+
+        The ledger keeps the membership number at the time of payment while
+        the payment listing shows the membership number of the member.
+        """
+        with transaction.manager:
+            # pylint: disable=no-member
+            member = DBSession.query(C3sMember).filter(
+                C3sMember.membership_number == 3).one()
+            member.membership_number = 42
+
+        payments = PaymentRepository.get_payments(
+            1, 100, sort_property='membership_number',
+            sort_direction='desc')
+        self.assertEqual(payments[0]['membership_number'], 42)
+        self.assertEqual(payments[0]['lastname'], u'Jones')
+        membership_numbers = [
+            payment['membership_number'] for payment in payments]
+        self.assertNotIn(3, membership_numbers)
+
+        # The ledger keeps the membership number at the time of payment.
+        # pylint: disable=no-member
+        self.assertEqual(
+            DBSession.query(DuesPayment).filter(
+                DuesPayment.membership_number == 3).count(),
+            membership_numbers.count(42))
+
+    def test_get_payment_count(self):
+        """
+        Tests the get payment count method.
+        """
+        payment_repository = PaymentRepository()
+        self.assertEqual(payment_repository.get_payment_count(), 11)
+        self.assertEqual(
+            payment_repository.get_payment_count(
+                from_date=date(2016, 1, 31), to_date=date(2017, 3, 1)),
+            4)
+        self.assertEqual(
+            payment_repository.get_payment_count(
+                from_date=date(2016, 2, 2)),
+            8)
+        self.assertEqual(
+            payment_repository.get_payment_count(to_date=date(2017, 3, 1)),
+            6)
+        self.assertEqual(
+            payment_repository.get_payment_count(
+                from_date=date(2030, 1, 1)),
+            0)
+
+    def test_get_payments_page(self):
+        """
+        Tests the get payments page method.
+
+        Test:
+
+        1. Test page and total without filter
+        2. Test page and total with filter
+        3. Test total for page beyond the last page
+        4. Test invalid sort property
+        """
+        # 1. Test page and total without filter
+        payments, total = PaymentRepository.get_payments_page(2, 3)
+        self.assertEqual(total, 11)
+        self.assertEqual(len(payments), 3)
+        self.assertEqual(payments[0]['reference'], u'JOHN')
+        self.assertEqual(payments[0]['date'], date(2016, 2, 2))
+        self.assertEqual(payments[0]['amount'], Decimal('16.22'))
+
+        # 2. Test page and total with filter
+        payments, total = PaymentRepository.get_payments_page(
+            1, 2, sort_property='date', sort_direction='desc',
+            from_date=date(2016, 2, 2), to_date=date(2017, 3, 5))
+        self.assertEqual(total, 4)
+        self.assertEqual(len(payments), 2)
+        self.assertEqual(payments[0]['reference'], u'SMITH')
+        self.assertEqual(payments[1]['reference'], u'TH')
+
+        # 3. Test total for page beyond the last page
+        payments, total = PaymentRepository.get_payments_page(5, 3)
+        self.assertEqual(total, 11)
+        self.assertEqual(len(payments), 0)
+
+        # 4. Test invalid sort property
+        with self.assertRaises(ValueError):
+            PaymentRepository.get_payments_page(
+                1, 10, sort_property='some_not_existing_property')
+
+    def test_iterate_payments(self):
+        """
+        Tests the iterate payments method.
+
+        Test:
+
+        1. Test all payments are iterated in chunks
+        2. Test filtering and sorting
+        3. Test invalid sort property
+        """
+        # 1. Test all payments are iterated in chunks
+        payments = PaymentRepository.iterate_payments(chunk_size=2)
+        self.assertFalse(isinstance(payments, list))
+        payments = list(payments)
+        self.assertEqual(len(payments), 11)
+        self.assertEqual(payments[0]['date'], date(2015, 1, 1))
+        self.assertEqual(payments[0]['reference'], u'JANE')
+        self.assertEqual(payments[0]['amount'], Decimal('15.11'))
+        self.assertEqual(payments[10]['reference'], u'JS21')
+
+        # 2. Test filtering and sorting
+        payments = list(PaymentRepository.iterate_payments(
+            sort_property='date',
+            sort_direction='desc',
+            from_date=date(2016, 2, 2),
+            to_date=date(2017, 3, 5)))
+        self.assertEqual(len(payments), 4)
+        self.assertEqual(payments[0]['reference'], u'SMITH')
+        self.assertEqual(payments[3]['reference'], u'JOHN')
+
+        # 3. Test invalid sort property
+        with self.assertRaises(ValueError):
+            PaymentRepository.iterate_payments(
+                sort_property='some_not_existing_property')
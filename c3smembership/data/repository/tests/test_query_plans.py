@@ -0,0 +1,171 @@
+# -*- coding: utf-8  -*-
+"""
+Tests that the frequent lookups of the repositories are supported by indexes.
+
+The queries are captured while executing the repository methods and analysed
+using SQLite's EXPLAIN QUERY PLAN. A query fails the test if SQLite has to
+scan a table instead of searching it using an index.
+"""
+
+from datetime import date
+import re
+import unittest
+
+from sqlalchemy import (
+    engine_from_config,
+    event,
+)
+import transaction
+
+from c3smembership.data.model.base import (
+    DBSession,
+    Base,
+)
+from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.data.repository.dues_invoice_repository import \
+    DuesInvoiceRepository
+from c3smembership.data.repository.general_assembly import \
+    GeneralAssemblyRepository
+from c3smembership.data.repository.member_repository import MemberRepository
+from c3smembership.data.repository.share_repository import ShareRepository
+
+
+class TestQueryPlans(unittest.TestCase):
+    """
+    Tests the query plans of the repository queries.
+    """
+
+    # Matches full table scans. Scans of covering indexes or scans using an
+    # index, e.g. for sorting, read the index instead of the table.
+    _TABLE_SCAN = re.compile(r'^SCAN (TABLE )?(?P<table>\S+)$')
+
+    def setUp(self):
+        my_settings = {'sqlalchemy.url': 'sqlite:///:memory:', }
+        self.engine = engine_from_config(my_settings)
+        DBSession.configure(bind=self.engine)
+        Base.metadata.create_all(self.engine)
+        self.statements = []
+        event.listen(
+            self.engine, 'before_cursor_execute', self._capture_statement)
+
+    def tearDown(self):
+        event.remove(
+            self.engine, 'before_cursor_execute', self._capture_statement)
+        # pylint: disable=no-member
+        DBSession.close()
+        # pylint: disable=no-member
+        DBSession.remove()
+
+    def _capture_statement(
+            self, connection, cursor, statement, parameters, context,
+            executemany):
+        """
+        Captures the select statements executed by the engine.
+        """
+        # pylint: disable=too-many-arguments,unused-argument
+        if statement.lstrip().upper().startswith('SELECT'):
+            self.statements.append((statement, parameters))
+
+    def _get_table_scans(self, function, *args, **kwargs):
+        """
+        Executes the function and returns the full table scans of the queries
+        it executed.
+
+        Returns:
+            A list of tuples of the table scanned and the statement scanning
+            it.
+        """
+        self.statements = []
+        with transaction.manager:
+            function(*args, **kwargs)
+        self.assertTrue(self.statements)
+
+        table_scans = []
+        connection = self.engine.raw_connection()
+        try:
+            for statement, parameters in self.statements:
+                plan = connection.execute(
+                    'EXPLAIN QUERY PLAN ' + statement, parameters)
+                for row in plan:
+                    match = self._TABLE_SCAN.match(row[-1])
+                    if match is not None:
+                        table_scans.append((match.group('table'), statement))
+        finally:
+            connection.close()
+        return table_scans
+
+    def _assert_indexed(self, function, *args, **kwargs):
+        """
+        Asserts that the queries executed by the function do not scan any
+        table.
+        """
+        table_scans = self._get_table_scans(function, *args, **kwargs)
+        self.assertEqual(
+            table_scans, [],
+            'Full table scans of {0}:\n{1}'.format(
+                function.__name__,
+                '\n'.join(
+                    '{0}: {1}'.format(table, statement)
+                    for table, statement in table_scans)))
+
+    def test_table_scan_detection(self):
+        """
+        Tests that full table scans are detected.
+        """
+        table_scans = self._get_table_scans(C3sMember.get_all)
+        self.assertEqual([table for table, _ in table_scans], ['members'])
+
+    def test_member_lookups(self):
+        """
+        Tests the lookups of members.
+        """
+        self._assert_indexed(MemberRepository.get_member, 1)
+        self._assert_indexed(MemberRepository.get_member_by_id, 1)
+        self._assert_indexed(C3sMember.get_by_code, u'ABCDEFGHIJ')
+        self._assert_indexed(C3sMember.get_by_email, u'member@example.com')
+        self._assert_indexed(C3sMember.get_matching_codes, u'ABC')
+        self._assert_indexed(
+            C3sMember.get_matching_codes, u'abc', case_sensitive=False)
+        self._assert_indexed(C3sMember.get_matching_people, u'Ab')
+        self._assert_indexed(
+            C3sMember.get_matching_people, u'ab', case_sensitive=False)
+        self._assert_indexed(C3sMember.get_same_lastnames, u'Smith')
+
+    def test_membership_filters(self):
+        """
+        Tests the queries filtering members by their membership dates.
+        """
+        self._assert_indexed(
+            MemberRepository.get_accepted_members_count, date(2020, 1, 1))
+        self._assert_indexed(
+            MemberRepository.get_accepted_members, date(2020, 1, 1))
+
+    def test_share_lookups(self):
+        """
+        Tests the lookups of shares by member.
+        """
+        self._assert_indexed(ShareRepository.get_member_shares, 1)
+        self._assert_indexed(
+            ShareRepository.get_member_share_count, 1, date(2020, 1, 1))
+        self._assert_indexed(
+            ShareRepository.get_member_share_counts, date(2020, 1, 1), [1, 2])
+
+    def test_dues_invoice_lookups(self):
+        """
+        Tests the lookups of dues invoices.
+        """
+        self._assert_indexed(DuesInvoiceRepository.get_by_membership_number, 1)
+        for year in range(2015, 2022):
+            self._assert_indexed(
+                DuesInvoiceRepository.token_exists, u'TOKEN', year)
+            self._assert_indexed(DuesInvoiceRepository.get_by_number, 1, year)
+
+    def test_general_assembly_lookups(self):
+        """
+        Tests the lookups of general assemblies and invitations.
+        """
+        self._assert_indexed(GeneralAssemblyRepository.get_general_assembly, 1)
+        self._assert_indexed(
+            GeneralAssemblyRepository.get_member_by_token, u'TOKEN')
+        self._assert_indexed(
+            GeneralAssemblyRepository.get_member_invitation, 1, 1)
@@ -6,7 +6,11 @@ Tests the c3smembership.data.repository.share_repository package.
 from datetime import date
 import unittest
 
-from sqlalchemy import engine_from_config
+import mock
+from sqlalchemy import (
+    engine_from_config,
+    event,
+)
 import transaction
 
 from c3smembership.data.model.base import (
@@ -506,6 +510,42 @@ class TestShareRepository(unittest.TestCase):
         share_count = ShareRepository.get_share_count()
         self.assertEqual(share_count, 114)
 
+        share_count = ShareRepository.get_share_count(date(2013, 1, 1))
+        self.assertEqual(share_count, 0)
+
+        share_count = ShareRepository.get_share_count(date(2014, 2, 3))
+        self.assertEqual(share_count, 12 + 23)
+
+        share_count = ShareRepository.get_share_count(date(2014, 3, 4))
+        self.assertEqual(share_count, 12 + 23 + 34)
+
+        # Shares of members who lost their membership are not counted.
+        # pylint: disable=no-member
+        member2 = DBSession.query(C3sMember).filter(
+            C3sMember.membership_number == u'member2').first()
+        member2.membership_loss_date = date(2015, 1, 1)
+        share_count = ShareRepository.get_share_count(date(2014, 12, 31))
+        self.assertEqual(share_count, 12 + 23 + 34)
+        share_count = ShareRepository.get_share_count(date(2015, 1, 2))
+        self.assertEqual(share_count, 12 + 23)
+
+        # The shares are counted in a single query.
+        statements = []
+
+        def capture_statement(
+                connection, cursor, statement, parameters, context,
+                executemany):
+            # pylint: disable=too-many-arguments,unused-argument
+            statements.append(statement)
+
+        engine = DBSession.get_bind()
+        event.listen(engine, 'before_cursor_execute', capture_statement)
+        try:
+            ShareRepository.get_share_count()
+        finally:
+            event.remove(engine, 'before_cursor_execute', capture_statement)
+        self.assertEqual(len(statements), 1)
+
     def test_get_member_share_count(self):
         """
         Tests the ShareRepository.get_member_share_count method.
@@ -533,6 +573,56 @@ class TestShareRepository(unittest.TestCase):
             date(2014, 2, 3))
         self.assertEqual(share_count, 12 + 23)
 
+    def test_get_member_share_counts(self):
+        """
+        Tests the ShareRepository.get_member_share_counts method.
+        """
+        share_counts = ShareRepository.get_member_share_counts()
+        self.assertEqual(
+            share_counts, {u'member1': 12 + 23, u'member2': 34 + 45})
+
+        share_counts = ShareRepository.get_member_share_counts(
+            date(2013, 1, 1))
+        self.assertEqual(share_counts, {})
+
+        share_counts = ShareRepository.get_member_share_counts(
+            date(2014, 3, 4))
+        self.assertEqual(
+            share_counts, {u'member1': 12 + 23, u'member2': 34})
+
+        share_counts = ShareRepository.get_member_share_counts(
+            date(2013, 1, 2), [u'member2', u'non_existing'])
+        self.assertEqual(share_counts, {u'member2': 0, u'non_existing': 0})
+
+        share_counts = ShareRepository.get_member_share_counts(
+            date(2014, 2, 3), [u'member1'])
+        self.assertEqual(share_counts, {u'member1': 12 + 23})
+
+        share_counts = ShareRepository.get_member_share_counts(
+            date(2014, 2, 3), [])
+        self.assertEqual(share_counts, {})
+
+        # Membership numbers exceeding a batch are queried in several batches
+        with mock.patch.object(
+                ShareRepository, '_MEMBERSHIP_NUMBER_BATCH_SIZE', 1):
+            share_counts = ShareRepository.get_member_share_counts(
+                None, [u'member1', u'member2', u'non_existing'])
+        self.assertEqual(
+            share_counts,
+            {u'member1': 12 + 23, u'member2': 34 + 45, u'non_existing': 0})
+
+        # The result equals the single member share counts
+        for effective_date in [
+                date(2013, 1, 1), date(2013, 1, 2), date(2014, 2, 3),
+                date(2014, 3, 4), date(2015, 4, 5)]:
+            share_counts = ShareRepository.get_member_share_counts(
+                effective_date)
+            for membership_number in [u'member1', u'member2']:
+                self.assertEqual(
+                    share_counts.get(membership_number, 0),
+                    ShareRepository.get_member_share_count(
+                        membership_number, effective_date))
+
     def test_get(self):
         """
         Tests the ShareRepository.get method.
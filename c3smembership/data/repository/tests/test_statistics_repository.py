@@ -0,0 +1,186 @@
+# -*- coding: utf-8  -*-
+"""
+Tests the c3smembership.data.repository.statistics_repository package.
+"""
+
+from datetime import date
+import unittest
+
+from sqlalchemy import engine_from_config
+import transaction
+
+from c3smembership.data.model.base import (
+    DBSession,
+    Base,
+)
+from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.data.model.base.staff import Staff
+from c3smembership.data.repository.statistics_repository import \
+    StatisticsRepository
+
+
+class TestStatisticsRepository(unittest.TestCase):
+    """
+    Tests the StatisticsRepository class.
+    """
+
+    # pylint: disable=too-many-arguments
+    @classmethod
+    def _create_member(
+            cls, code, country, num_shares, membership_type=u'normal',
+            payment_received=False, membership_number=None,
+            membership_date=None, membership_loss_date=None,
+            is_legalentity=False, is_duplicate=False):
+        member = C3sMember(
+            firstname=u'Firstname',
+            lastname=u'Lastname',
+            email=u'member@example.com',
+            address1=u'',
+            address2=u'',
+            postcode=u'',
+            city=u'',
+            country=country,
+            locale=u'de',
+            date_of_birth=date(1980, 1, 1),
+            email_is_confirmed=False,
+            email_confirm_code=code,
+            password=u'',
+            date_of_submission=date(2016, 1, 1),
+            membership_type=membership_type,
+            member_of_colsoc=False,
+            name_of_colsoc=u'',
+            num_shares=num_shares,
+        )
+        member.payment_received = payment_received
+        member.membership_number = membership_number
+        member.membership_accepted = membership_date is not None
+        member.membership_date = membership_date
+        member.membership_loss_date = membership_loss_date
+        member.is_legalentity = is_legalentity
+        member.is_duplicate = is_duplicate
+        return member
+
+    def setUp(self):
+        my_settings = {'sqlalchemy.url': 'sqlite:///:memory:', }
+        engine = engine_from_config(my_settings)
+        DBSession.configure(bind=engine)
+        Base.metadata.create_all(engine)
+
+    def tearDown(self):
+        # pylint: disable=no-member
+        DBSession.close()
+        # pylint: disable=no-member
+        DBSession.remove()
+
+    def _add_members(self):
+        with transaction.manager:
+            # pylint: disable=no-member
+            DBSession.add(self._create_member(
+                u'NORMAL', u'DE', 3, payment_received=True,
+                membership_number=1, membership_date=date(2016, 2, 1)))
+            DBSession.add(self._create_member(
+                u'INVESTING', u'DE', 5, membership_type=u'investing',
+                payment_received=True, membership_number=2,
+                membership_date=date(2016, 2, 1), is_legalentity=True))
+            DBSession.add(self._create_member(
+                u'OTHER', u'AT', 1, membership_type=u'other',
+                payment_received=True, membership_number=5,
+                membership_date=date(2016, 2, 1)))
+            DBSession.add(self._create_member(
+                u'LOST', u'AT', 2, payment_received=True,
+                membership_number=3, membership_date=date(2016, 2, 1),
+                membership_loss_date=date(2017, 12, 31)))
+            DBSession.add(self._create_member(
+                u'PLACEHOLDER', u'FR', 1, payment_received=True,
+                membership_number=999999999,
+                membership_date=date(2016, 2, 1)))
+            DBSession.add(self._create_member(u'APPLICANT', u'DE', 7))
+            DBSession.add(self._create_member(
+                u'DUPLICATE', u'DE', 7, is_duplicate=True))
+            DBSession.add(Staff(
+                login=u'staff', password=u'staff', email=u'staff@example.com'))
+
+    def test_get_member_counts(self):
+        """
+        Tests the StatisticsRepository.get_member_counts method against the
+        individual C3sMember counters.
+        """
+        self._add_members()
+        counts = StatisticsRepository.get_member_counts()
+
+        self.assertEqual(counts['datasets'], C3sMember.get_number())
+        self.assertEqual(
+            counts['afm_shares_unpaid'], C3sMember.afm_num_shares_unpaid())
+        self.assertEqual(
+            counts['afm_shares_paid'], C3sMember.afm_num_shares_paid())
+        self.assertEqual(
+            counts['members_accepted'], C3sMember.get_num_members_accepted())
+        self.assertEqual(
+            counts['non_accepted'], C3sMember.get_num_non_accepted())
+        self.assertEqual(
+            counts['nonmember_listing'], C3sMember.nonmember_listing_count())
+        self.assertEqual(
+            counts['duplicates'], len(C3sMember.get_duplicates()))
+        self.assertEqual(
+            counts['natural_persons'], C3sMember.get_num_mem_nat_acc())
+        self.assertEqual(
+            counts['legal_entities'], C3sMember.get_num_mem_jur_acc())
+        self.assertEqual(counts['normal'], C3sMember.get_num_mem_norm())
+        self.assertEqual(counts['investing'], C3sMember.get_num_mem_invest())
+        self.assertEqual(
+            counts['other_features'],
+            C3sMember.get_num_mem_other_features())
+        self.assertEqual(
+            counts['membership_lost'], C3sMember.get_num_membership_lost())
+        self.assertEqual(
+            counts['membership_numbers'],
+            C3sMember.get_num_membership_numbers())
+        self.assertEqual(
+            counts['highest_membership_number'],
+            C3sMember.get_highest_membership_number())
+        self.assertEqual(counts['countries'], C3sMember.get_num_countries())
+
+        self.assertEqual(counts, {
+            'datasets': 7,
+            'afm_shares_unpaid': 14,
+            'afm_shares_paid': 12,
+            'members_accepted': 4,
+            'non_accepted': 2,
+            'nonmember_listing': 2,
+            'duplicates': 1,
+            'natural_persons': 3,
+            'legal_entities': 1,
+            'normal': 2,
+            'investing': 1,
+            'other_features': 1,
+            'membership_lost': 1,
+            'membership_numbers': 5,
+            'highest_membership_number': 5,
+            'countries': 3,
+        })
+
+    def test_get_member_counts_empty(self):
+        """
+        Tests the StatisticsRepository.get_member_counts method without data.
+        """
+        counts = StatisticsRepository.get_member_counts()
+        self.assertEqual(counts['datasets'], 0)
+        self.assertEqual(counts['afm_shares_paid'], 0)
+        self.assertEqual(counts['highest_membership_number'], 0)
+
+    def test_get_country_counts(self):
+        """
+        Tests the StatisticsRepository.get_country_counts method.
+        """
+        self._add_members()
+        self.assertEqual(
+            StatisticsRepository.get_country_counts(),
+            [(u'DE', 4), (u'AT', 2), (u'FR', 1)])
+
+    def test_get_staff_count(self):
+        """
+        Tests the StatisticsRepository.get_staff_count method.
+        """
+        self.assertEqual(StatisticsRepository.get_staff_count(), 0)
+        self._add_members()
+        self.assertEqual(StatisticsRepository.get_staff_count(), 1)
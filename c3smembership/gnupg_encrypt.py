@@ -7,51 +7,31 @@ GnuPG is used to encrypt email to staff
 
 * when new applications for membership arrive
 * for data export (e.g. CSV)
+
+The public key of the membership staff is imported once into a keyring which
+is reused by all encryptions of the process. By default, the keyring is
+created in a temporary directory which only the user running the process can
+access and which is removed when the process exits. A persistent keyring
+directory can be configured in the settings:
+
+    c3smembership.gnupg.home = %(here)s/gnupg
 """
 #
 # you need python-gnupg, so
 # bin/pip install python-gnupg
 
-import gnupg
-import tempfile
+import atexit
+import os
 import shutil
+import stat
+import subprocess
+import tempfile
+import threading
 
-DEBUG = False
-# DEBUG = True
-
+import gnupg
 
-def encrypt_with_gnupg(data):
-    """
-    this function encrypts "data" with gnupg.
 
-    returns strings:
-    -----BEGIN PGP MESSAGE-----\n
-    Version: GnuPG v1.4.11 (GNU/Linux)\n
-    ...
-    -----END PGP MESSAGE-----\n
-    """
-    keyfolder = tempfile.mkdtemp()
-
-    # TODO: check for a better way to do this:
-    # do we really need to create a new tempdir for every run? no!
-    # but hey as long as we need to run both as 'normal' user (while testing
-    # on port 6544) and as www-data (apache) we do need separate folders,
-    # because only the creator may access it.
-    # however: as long as this is reasonably fast,
-    # we can live with it. for now...
-
-    gpg = gnupg.GPG(gnupghome=keyfolder)
-    gpg.encoding = 'utf-8'
-
-    # check if we have the membership key
-    list_of_keys = gpg.list_keys()
-    if DEBUG:  # pragma: no cover
-        print("=== the list of keys: " + repr(list_of_keys))
-
-    if 'C3S-Yes!' not in str(list_of_keys):
-        # open and read key file
-        # reading public key
-        pubkey_content = """
+PUBLIC_KEY = """
 -----BEGIN PGP PUBLIC KEY BLOCK-----
 Version: GnuPG v2.0.22 (GNU/Linux)
 
@@ -81,46 +61,300 @@ nZafeM6jnC2zs0duXsA9dSYV5jTQfeSYNbQEd7C4Mrl3Ix6mzCU5zQjS+3opUfbl
 puHkdLPxW5Lv3YKaSTQZGMlIjwv1lK87+GYGWu3qU6ORn605xZizzDc1boKmGeGw
 rzAF6HkMRirQuUkswGmDf46h5ecU+brT4BU8/JDVsiqX8mb94friQw==
 =hLA3
------END PGP PUBLIC KEY BLOCK-----"""
-        # import public key
-        gpg.import_keys(pubkey_content)
-    else:
-        if DEBUG:  # pragma: no cover
-            print("=== not imported: key already known")
-        pass
-
-    if DEBUG:  # pragma: no cover
-        print("list_keys(): " + str(gpg.list_keys()))
-
-    # prepare
-    to_encode = data
-
-    if isinstance(to_encode, unicode):
-        to_encrypt = to_encode.encode(gpg.encoding)
-    else:
-        to_encrypt = to_encode
-
-    if DEBUG:  # pragma: no cover
-        print("len(to_encrypt): " + str(len(str(to_encrypt))))
-        print("encrypt_with_gnupg: type(to_encrypt): %s") % type(to_encrypt)
-
-    # encrypt
-    encrypted = gpg.encrypt(
-        to_encrypt,
-        '89FC70ECCAD4487972D8924D71F6BA91CDD28110',  # key fingerprint
-        # 'ED6CAAC657A45BCF55EAE6EFE83C7CFC7CB6F90F',  # key fingerprint
-        always_trust=True)
-
-    if DEBUG:  # pragma: no cover
-        print("encrypt_with_gnupg: type(encrypted): %s") % type(encrypted)
-        print(
-            "encrypt_with_gnupg: type(encrypted.data): %s"
-        ) % type(
-            encrypted.data)
-        print("========================================== GNUPG END")
-    shutil.rmtree(keyfolder)
-
-    return encrypted.data
+-----END PGP PUBLIC KEY BLOCK-----
+"""
+"""
+The public key of the membership staff used for encryption.
+"""
+
+KEY_FINGERPRINT = '89FC70ECCAD4487972D8924D71F6BA91CDD28110'
+"""
+The fingerprint of the public key of the membership staff.
+"""
+
+
+class GnupgEncryptor(object):
+    """
+    Encrypts data for the membership staff with a keyring which is set up once
+
+    The keyring is set up with the first encryption. The encryptor can be
+    used by several threads at the same time.
+    """
+
+    def __init__(self, gnupghome=None, public_key=PUBLIC_KEY,
+                 fingerprint=KEY_FINGERPRINT):
+        """
+        Initialises the GnupgEncryptor object.
+
+        Args:
+            gnupghome: Optional. The path of the keyring directory which is
+                kept after use. If not specified, a temporary keyring
+                directory is created and removed by the close method.
+            public_key: Optional. The public key used for encryption.
+            fingerprint: Optional. The fingerprint of the public key.
+        """
+        self._gnupghome = gnupghome
+        self._public_key = public_key
+        self._fingerprint = fingerprint
+        self._gpg = None
+        self._temporary_home = None
+        self._lock = threading.Lock()
+
+    @property
+    def gnupghome(self):
+        """
+        The path of the persistent keyring directory or None for a temporary
+        keyring directory.
+        """
+        return self._gnupghome
+
+    def encrypt(self, data):
+        """
+        Encrypts the data.
+
+        Args:
+            data: The unicode or byte string to be encrypted.
+
+        Returns:
+            The ASCII armored encrypted data like:
+
+            -----BEGIN PGP MESSAGE-----\n
+            Version: GnuPG v1.4.11 (GNU/Linux)\n
+            ...
+            -----END PGP MESSAGE-----\n
+        """
+        return self._encrypt(self._get_gpg(), data)
+
+    def encrypt_many(self, payloads):
+        """
+        Encrypts many payloads with the same keyring.
+
+        Args:
+            payloads: An iterable of unicode or byte strings to be encrypted.
+
+        Returns:
+            The list of the ASCII armored encrypted payloads in the order of
+            the payloads.
+        """
+        gpg = self._get_gpg()
+        return [self._encrypt(gpg, payload) for payload in payloads]
+
+    def encrypt_to_file(self, chunks):
+        """
+        Encrypts the data of the chunks while they are generated.
+
+        The chunks are generated in the calling thread and written to the
+        standard input of a gpg process which writes the encrypted data to a
+        temporary file. Neither the plain text nor the encrypted data is kept
+        in memory completely. As the file is only returned once gpg succeeded,
+        failures are raised before any encrypted data is used.
+
+        Args:
+            chunks: An iterable of unicode or byte strings to be encrypted.
+
+        Returns:
+            The temporary file of the ASCII armored encrypted data positioned
+            at its beginning. The file is removed when it is closed.
+
+        Raises:
+            RuntimeError: If gpg failed. The message contains the error
+                output of gpg.
+        """
+        gpg = self._get_gpg()
+        encrypted = tempfile.TemporaryFile()
+        errors = tempfile.TemporaryFile()
+        try:
+            process = subprocess.Popen(
+                [
+                    gpg.gpgbinary,
+                    '--homedir', gpg.gnupghome,
+                    '--batch',
+                    '--no-tty',
+                    '--armor',
+                    '--trust-model', 'always',
+                    '--recipient', self._fingerprint,
+                    '--encrypt',
+                ],
+                stdin=subprocess.PIPE,
+                stdout=encrypted,
+                stderr=errors)
+            try:
+                self._feed(process.stdin, chunks, gpg.encoding)
+            except:  # pylint: disable=bare-except
+                process.kill()
+                process.wait()
+                raise
+            if process.wait() != 0:
+                errors.seek(0)
+                raise RuntimeError(
+                    'GnuPG encryption failed with exit code {0}: {1}'.format(
+                        process.returncode,
+                        errors.read().decode('utf-8', 'replace').strip()))
+        except:  # pylint: disable=bare-except
+            encrypted.close()
+            raise
+        finally:
+            errors.close()
+        encrypted.seek(0)
+        return encrypted
+
+    @classmethod
+    def _feed(cls, stdin, chunks, encoding):
+        """
+        Writes the chunks to the standard input of the gpg process.
+        """
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, unicode):
+                    chunk = chunk.encode(encoding)
+                try:
+                    stdin.write(chunk)
+                except IOError:
+                    # gpg exited before reading all chunks and reports the
+                    # failure by its exit code.
+                    break
+        finally:
+            try:
+                stdin.close()
+            except IOError:
+                pass
+
+    def setup(self):
+        """
+        Sets up the keyring and imports the public key if it is missing.
+        """
+        self._get_gpg()
+
+    def close(self):
+        """
+        Removes the temporary keyring directory.
+
+        The keyring is set up again by the next encryption.
+        """
+        with self._lock:
+            if self._temporary_home is not None:
+                shutil.rmtree(self._temporary_home, ignore_errors=True)
+            self._gpg = None
+            self._temporary_home = None
+
+    def _encrypt(self, gpg, data):
+        """
+        Encrypts the data for the public key.
+        """
+        if isinstance(data, unicode):
+            data = data.encode(gpg.encoding)
+        return gpg.encrypt(data, self._fingerprint, always_trust=True).data
+
+    def _get_gpg(self):
+        """
+        Gets the GPG object of the keyring and sets up the keyring on first
+        use.
+        """
+        gpg = self._gpg
+        if gpg is not None:
+            return gpg
+        with self._lock:
+            if self._gpg is None:
+                if self._gnupghome is None:
+                    # mkdtemp creates the directory only accessible by the
+                    # user running the process as GnuPG requires.
+                    self._temporary_home = tempfile.mkdtemp(
+                        prefix='c3smembership-gnupg-')
+                    gnupghome = self._temporary_home
+                else:
+                    gnupghome = self._gnupghome
+                    self._prepare_home(gnupghome)
+                gpg = gnupg.GPG(gnupghome=gnupghome)
+                gpg.encoding = 'utf-8'
+                if self._fingerprint not in gpg.list_keys().fingerprints:
+                    gpg.import_keys(self._public_key)
+                self._gpg = gpg
+            return self._gpg
+
+    @classmethod
+    def _prepare_home(cls, gnupghome):
+        """
+        Creates the keyring directory and restricts its permissions to the
+        user running the process.
+
+        Raises:
+            ValueError: If the keyring directory belongs to another user.
+        """
+        if not os.path.isdir(gnupghome):
+            os.makedirs(gnupghome, 0o700)
+        if os.stat(gnupghome).st_uid != os.getuid():
+            raise ValueError(
+                'The GnuPG home directory {0} belongs to another '
+                'user.'.format(gnupghome))
+        if stat.S_IMODE(os.stat(gnupghome).st_mode) != 0o700:
+            os.chmod(gnupghome, 0o700)
+
+
+_encryptor = GnupgEncryptor()
+
+
+@atexit.register
+def _close_encryptor():
+    """
+    Removes the temporary keyring directory when the process exits.
+    """
+    _encryptor.close()
+
+
+def configure_gnupg(settings):
+    """
+    Configures the keyring from the settings and sets it up.
+
+    The settings are:
+
+    - c3smembership.gnupg.home: Optional. The path of the persistent keyring
+      directory. If not specified, a temporary keyring directory is used.
+
+    Args:
+        settings: The application settings dictionary.
+    """
+    # pylint: disable=global-statement
+    global _encryptor
+    gnupghome = settings.get('c3smembership.gnupg.home', '').strip()
+    gnupghome = os.path.abspath(gnupghome) if gnupghome else None
+    if gnupghome != _encryptor.gnupghome:
+        encryptor = GnupgEncryptor(gnupghome)
+        _encryptor.close()
+        _encryptor = encryptor
+    _encryptor.setup()
+
+
+def get_encryptor():
+    """
+    Gets the GnupgEncryptor of the process.
+    """
+    return _encryptor
+
+
+def encrypt_with_gnupg(data):
+    """
+    this function encrypts "data" with gnupg.
+
+    returns strings:
+    -----BEGIN PGP MESSAGE-----\n
+    Version: GnuPG v1.4.11 (GNU/Linux)\n
+    ...
+    -----END PGP MESSAGE-----\n
+    """
+    return _encryptor.encrypt(data)
+
+
+def encrypt_many_with_gnupg(payloads):
+    """
+    Encrypts many payloads with gnupg.
+
+    Args:
+        payloads: An iterable of unicode or byte strings to be encrypted.
+
+    Returns:
+        The list of the ASCII armored encrypted payloads.
+    """
+    return _encryptor.encrypt_many(payloads)
 
 
 if __name__ == '__main__':  # pragma: no coverage
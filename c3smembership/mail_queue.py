@@ -0,0 +1,714 @@
+# -*- coding: utf-8 -*-
+"""
+Provide a durable queue for outbound emails
+
+Sending emails via SMTP within the web request makes the request wait for the
+mail server and loses the email if the mail server is not available. Instead,
+the emails can be stored in a queue in an SQLite file once the transaction of
+the request is committed. A pool of worker threads sends the queued emails and
+retries failed deliveries with an exponential backoff.
+
+The queue is enabled by configuring the path of the SQLite file in the
+settings:
+
+    c3smembership.mail_queue.path = %(here)s/mail_queue.sqlite
+    c3smembership.mail_queue.workers = 2
+    c3smembership.mail_queue.max_attempts = 5
+    c3smembership.mail_queue.retry_delay = 60
+
+If enabled, the mailer registered by pyramid_mailer is replaced by a
+QueuedMailer so that all code sending emails through the mailer uses the
+queue. Several processes can share the same queue file. The queue can also be
+delivered by a separate process using the console script:
+
+    env/bin/deliver_c3sMembership_mail_queue production.ini
+
+Notifications which could not even be created, e.g. because the encryption
+failed, are recorded as failures in the same file and can be listed with:
+
+    env/bin/deliver_c3sMembership_mail_queue production.ini --failures
+"""
+
+import atexit
+from collections import namedtuple
+import email
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from pyramid_mailer.interfaces import IMailer
+import transaction
+
+
+LOG = logging.getLogger(__name__)
+
+STOP_TIMEOUT = 30
+"""
+The number of seconds to wait for each worker thread to finish its current
+delivery when the process exits.
+"""
+
+
+QueuedMail = namedtuple('QueuedMail', [
+    'mail_id',
+    'sender',
+    'recipients',
+    'message',
+    'attempts',
+])
+"""
+An email claimed from the queue for delivery.
+
+- mail_id: The id of the email in the queue.
+- sender: The email address of the sender.
+- recipients: The list of email addresses of the recipients.
+- message: The string of the MIME message.
+- attempts: The number of delivery attempts including the current one.
+"""
+
+
+MailStatus = namedtuple('MailStatus', [
+    'status',
+    'attempts',
+    'last_error',
+    'created',
+    'modified',
+])
+"""
+The delivery status of a queued email.
+
+- status: The status, one of "queued", "sending", "sent" and "failed".
+- attempts: The number of delivery attempts.
+- last_error: The error message of the last failed delivery attempt or None.
+- created: The timestamp of enqueueing the email.
+- modified: The timestamp of the last status change.
+"""
+
+
+NotificationFailure = namedtuple('NotificationFailure', [
+    'notification',
+    'error',
+    'failed',
+])
+"""
+A notification which could not be enqueued.
+
+- notification: The name of the notification.
+- error: The error message of the failure.
+- failed: The timestamp of the failure.
+"""
+
+
+class MailQueue(object):
+    """
+    Durable queue of outbound emails in an SQLite file
+
+    Each email has a status:
+
+    - queued: The email waits for its next delivery attempt.
+    - sending: The email was claimed by a worker which is delivering it.
+    - sent: The email was delivered to the mail server.
+    - failed: The delivery failed permanently.
+    """
+
+    STATUS_QUEUED = 'queued'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+
+    def __init__(self, path):
+        """
+        Initialize the MailQueue object
+
+        Args:
+            path: The path of the SQLite file.
+        """
+        self._path = path
+        self._connections = threading.local()
+        self._all_connections = []
+        self._lock = threading.Lock()
+
+    def _get_connection(self):
+        """
+        Get the connection of the current thread and create the table if
+        necessary
+        """
+        connection = getattr(self._connections, 'connection', None)
+        if connection is None:
+            # The connection is only used by the current thread but closed
+            # by the thread closing the queue.
+            connection = sqlite3.connect(
+                self._path, timeout=30, isolation_level=None,
+                check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS outbound_mail ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'sender TEXT NOT NULL, '
+                'recipients TEXT NOT NULL, '
+                'message BLOB NOT NULL, '
+                'status TEXT NOT NULL, '
+                'attempts INTEGER NOT NULL, '
+                'next_attempt REAL NOT NULL, '
+                'last_error TEXT, '
+                'created REAL NOT NULL, '
+                'modified REAL NOT NULL)')
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS ix_outbound_mail_status '
+                'ON outbound_mail (status, next_attempt)')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS notification_failure ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'notification TEXT NOT NULL, '
+                'error TEXT NOT NULL, '
+                'failed REAL NOT NULL)')
+            self._connections.connection = connection
+            with self._lock:
+                self._all_connections.append(connection)
+        return connection
+
+    def close(self):
+        """
+        Close the connections of all threads
+
+        The queue can still be used afterwards and opens new connections.
+        Connections must not be in use by other threads while closing.
+        """
+        with self._lock:
+            connections = self._all_connections
+            self._all_connections = []
+            self._connections = threading.local()
+        for connection in connections:
+            connection.close()
+
+    def enqueue(self, mails):
+        """
+        Enqueue emails for delivery in one transaction
+
+        Args:
+            mails: A list of tuples of the sender email address, the list of
+                recipient email addresses and the string of the MIME message.
+
+        Returns:
+            The list of the ids of the enqueued emails.
+        """
+        now = time.time()
+        connection = self._get_connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            mail_ids = [
+                connection.execute(
+                    'INSERT INTO outbound_mail (sender, recipients, message, '
+                    'status, attempts, next_attempt, created, modified) '
+                    'VALUES (?, ?, ?, ?, 0, ?, ?, ?)',
+                    (
+                        sender,
+                        json.dumps(list(recipients)),
+                        sqlite3.Binary(message),
+                        self.STATUS_QUEUED,
+                        now,
+                        now,
+                        now,
+                    )).lastrowid
+                for sender, recipients, message in mails]
+            connection.execute('COMMIT')
+        except:
+            connection.execute('ROLLBACK')
+            raise
+        return mail_ids
+
+    def claim(self):
+        """
+        Claim the next email due for delivery
+
+        The email is set to status "sending" so that no other worker claims
+        it.
+
+        Returns:
+            The QueuedMail or None if no email is due.
+        """
+        now = time.time()
+        connection = self._get_connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT id, sender, recipients, message, attempts '
+                'FROM outbound_mail WHERE status = ? AND next_attempt <= ? '
+                'ORDER BY next_attempt, id LIMIT 1',
+                (self.STATUS_QUEUED, now)).fetchone()
+            if row is not None:
+                connection.execute(
+                    'UPDATE outbound_mail SET status = ?, '
+                    'attempts = attempts + 1, modified = ? WHERE id = ?',
+                    (self.STATUS_SENDING, now, row[0]))
+            connection.execute('COMMIT')
+        except:
+            connection.execute('ROLLBACK')
+            raise
+        if row is None:
+            return None
+        mail_id, sender, recipients, message, attempts = row
+        return QueuedMail(
+            mail_id, sender, json.loads(recipients), str(message),
+            attempts + 1)
+
+    def mark_sent(self, mail_id):
+        """
+        Set the status of the email to "sent"
+        """
+        self._set_status(mail_id, self.STATUS_SENT)
+
+    def mark_retry(self, mail_id, error, next_attempt):
+        """
+        Queue the email again after a failed delivery attempt
+
+        Args:
+            mail_id: The id of the email.
+            error: The error message of the failed delivery attempt.
+            next_attempt: The timestamp of the next delivery attempt.
+        """
+        self._set_status(mail_id, self.STATUS_QUEUED, error, next_attempt)
+
+    def mark_failed(self, mail_id, error):
+        """
+        Set the status of the email to "failed" after the last failed delivery
+        attempt
+
+        Args:
+            mail_id: The id of the email.
+            error: The error message of the failed delivery attempt.
+        """
+        self._set_status(mail_id, self.STATUS_FAILED, error)
+
+    def _set_status(self, mail_id, status, error=None, next_attempt=None):
+        """
+        Set the status of the email
+        """
+        now = time.time()
+        self._get_connection().execute(
+            'UPDATE outbound_mail SET status = ?, last_error = ?, '
+            'next_attempt = COALESCE(?, next_attempt), modified = ? '
+            'WHERE id = ?',
+            (status, error, next_attempt, now, mail_id))
+
+    def release_stale(self, timeout):
+        """
+        Queue emails again which are in status "sending" for too long
+
+        Emails remain in status "sending" if the worker delivering them was
+        terminated.
+
+        Args:
+            timeout: The number of seconds after which an email in status
+                "sending" is considered stale.
+
+        Returns:
+            The number of emails queued again.
+        """
+        now = time.time()
+        return self._get_connection().execute(
+            'UPDATE outbound_mail SET status = ?, next_attempt = ?, '
+            'modified = ? WHERE status = ? AND modified < ?',
+            (
+                self.STATUS_QUEUED,
+                now,
+                now,
+                self.STATUS_SENDING,
+                now - timeout,
+            )).rowcount
+
+    def get_status(self, mail_id):
+        """
+        Get the delivery status of the email
+
+        Returns:
+            The MailStatus of the email or None if it does not exist.
+        """
+        row = self._get_connection().execute(
+            'SELECT status, attempts, last_error, created, modified '
+            'FROM outbound_mail WHERE id = ?',
+            (mail_id,)).fetchone()
+        if row is None:
+            return None
+        return MailStatus(*row)
+
+    def get_status_counts(self):
+        """
+        Get the number of emails per status
+
+        Returns:
+            A dictionary mapping the status to the number of emails.
+        """
+        return dict(self._get_connection().execute(
+            'SELECT status, COUNT(*) FROM outbound_mail GROUP BY status'))
+
+    def record_failure(self, notification, error):
+        """
+        Record that a notification could not be enqueued
+
+        Args:
+            notification: The name of the notification.
+            error: The error message of the failure.
+        """
+        self._get_connection().execute(
+            'INSERT INTO notification_failure (notification, error, failed) '
+            'VALUES (?, ?, ?)',
+            (notification, error, time.time()))
+
+    def get_failures(self, limit=100):
+        """
+        Get the most recent notification failures
+
+        Args:
+            limit: Integer. Optional. The maximum number of failures.
+                Defaults to 100.
+
+        Returns:
+            The list of NotificationFailure tuples ordered from old to new.
+        """
+        rows = self._get_connection().execute(
+            'SELECT notification, error, failed FROM notification_failure '
+            'ORDER BY id DESC LIMIT ?',
+            (limit,)).fetchall()
+        return [NotificationFailure(*row) for row in reversed(rows)]
+
+
+class QueuedMailer(object):
+    """
+    Mailer enqueueing the emails instead of sending them
+
+    The QueuedMailer provides the sending methods of the pyramid_mailer
+    Mailer used by the application.
+    """
+
+    def __init__(self, mail_queue, default_sender=None):
+        """
+        Initialize the QueuedMailer object
+
+        Args:
+            mail_queue: The MailQueue in which the emails are enqueued.
+            default_sender: Optional. The sender email address used for
+                messages without sender.
+        """
+        self._mail_queue = mail_queue
+        self._default_sender = default_sender
+
+    def send(self, message):
+        """
+        Enqueue the message once the current transaction is committed
+
+        The messages of a transaction are enqueued together. If the
+        transaction is aborted, the messages are dropped.
+
+        Args:
+            message: The pyramid_mailer.message.Message to be sent.
+        """
+        current_transaction = transaction.get()
+        try:
+            pending = current_transaction.data(self)
+        except KeyError:
+            pending = []
+            current_transaction.set_data(self, pending)
+            current_transaction.addAfterCommitHook(
+                self._enqueue_after_commit, args=(pending,))
+        pending.append(self._get_mail(message))
+
+    def send_immediately(self, message, fail_silently=False):
+        """
+        Enqueue the message independent of the current transaction
+
+        Args:
+            message: The pyramid_mailer.message.Message to be sent.
+            fail_silently: Boolean. Optional. Whether errors enqueueing the
+                message are logged instead of raised. Defaults to False.
+
+        Returns:
+            The id of the enqueued email or None if enqueueing failed
+            silently.
+        """
+        try:
+            return self._mail_queue.enqueue([self._get_mail(message)])[0]
+        except Exception:  # pylint: disable=broad-except
+            if not fail_silently:
+                raise
+            LOG.exception('Enqueueing the email failed.')
+            return None
+
+    def _get_mail(self, message):
+        """
+        Get the sender, recipients and MIME string of the message
+        """
+        message.sender = message.sender or self._default_sender
+        return (
+            message.sender,
+            message.send_to,
+            message.to_message().as_string())
+
+    def _enqueue_after_commit(self, committed, pending):
+        """
+        Enqueue the pending messages if the transaction was committed
+        """
+        if not committed or not pending:
+            return
+        try:
+            self._mail_queue.enqueue(pending)
+        except Exception:  # pylint: disable=broad-except
+            # The transaction is already committed and cannot fail anymore.
+            LOG.exception(
+                'Enqueueing %s emails after commit failed.', len(pending))
+
+
+class SmtpDelivery(object):
+    """
+    Deliver queued emails via SMTP
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, mailer):
+        """
+        Initialize the SmtpDelivery object
+
+        Args:
+            mailer: The pyramid_mailer Mailer providing the SMTP mailer.
+        """
+        self._smtp_mailer = mailer.smtp_mailer
+
+    def __call__(self, sender, recipients, message):
+        """
+        Send the email
+
+        Args:
+            sender: The email address of the sender.
+            recipients: The list of email addresses of the recipients.
+            message: The string of the MIME message.
+        """
+        self._smtp_mailer.send(
+            sender, recipients, email.message_from_string(message))
+
+
+class MailQueueWorkers(object):
+    """
+    Pool of worker threads delivering the queued emails
+
+    Failed delivery attempts are retried after a delay which doubles with each
+    attempt. After the maximum number of attempts the email is set to status
+    "failed".
+    """
+
+    def __init__(self, mail_queue, deliver, workers=2, max_attempts=5,
+                 retry_delay=60, poll_interval=1, sending_timeout=600):
+        """
+        Initialize the MailQueueWorkers object
+
+        Args:
+            mail_queue: The MailQueue from which the emails are delivered.
+            deliver: A callable accepting the sender, the list of recipients
+                and the string of the MIME message and sending the email.
+            workers: Integer. Optional. The number of worker threads.
+                Defaults to 2.
+            max_attempts: Integer. Optional. The number of delivery attempts
+                before an email fails permanently. Defaults to 5.
+            retry_delay: Number. Optional. The delay in seconds before the
+                first retry. Defaults to 60.
+            poll_interval: Number. Optional. The interval in seconds in which
+                idle workers check the queue. Defaults to 1.
+            sending_timeout: Number. Optional. The number of seconds after
+                which emails which are still in status "sending" are queued
+                again. Defaults to 600.
+        """
+        self._mail_queue = mail_queue
+        self._deliver = deliver
+        self._workers = workers
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._poll_interval = poll_interval
+        self._sending_timeout = sending_timeout
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """
+        Start the worker threads
+        """
+        self._stopping.clear()
+        self._mail_queue.release_stale(self._sending_timeout)
+        for number in range(self._workers - len(self._threads)):
+            thread = threading.Thread(
+                target=self._run,
+                name='mail-queue-worker-{0}'.format(number))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """
+        Stop the worker threads after their current delivery
+
+        Args:
+            timeout: Number. Optional. The number of seconds to wait for each
+                worker thread.
+
+        Returns:
+            True if all worker threads stopped, False if a worker thread was
+            still delivering after the timeout.
+        """
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+            if thread.is_alive():
+                LOG.warning('Mail queue worker %s did not stop.', thread.name)
+        # Threads still delivering are kept so that they can be joined again.
+        self._threads = [
+            thread for thread in self._threads if thread.is_alive()]
+        return not self._threads
+
+    def process(self):
+        """
+        Deliver the next email due for delivery
+
+        Returns:
+            True if an email was processed, False if no email was due.
+        """
+        mail = self._mail_queue.claim()
+        if mail is None:
+            return False
+        try:
+            self._deliver(mail.sender, mail.recipients, mail.message)
+        except Exception as exception:  # pylint: disable=broad-except
+            error = u'{0}: {1}'.format(
+                type(exception).__name__, exception)
+            if mail.attempts >= self._max_attempts:
+                LOG.error(
+                    'Delivering email %s failed permanently: %s',
+                    mail.mail_id, error)
+                self._mail_queue.mark_failed(mail.mail_id, error)
+            else:
+                self._mail_queue.mark_retry(
+                    mail.mail_id,
+                    error,
+                    time.time() + self._get_retry_delay(mail.attempts))
+        else:
+            self._mail_queue.mark_sent(mail.mail_id)
+        return True
+
+    def drain(self):
+        """
+        Deliver all emails due for delivery in the current thread
+
+        Stale emails in status "sending" are queued again before.
+
+        Returns:
+            The number of processed emails.
+        """
+        self._mail_queue.release_stale(self._sending_timeout)
+        processed = 0
+        while self.process():
+            processed += 1
+        return processed
+
+    def _get_retry_delay(self, attempts):
+        """
+        Get the delay before the next attempt doubling with each attempt
+        """
+        return self._retry_delay * 2 ** (attempts - 1)
+
+    def _run(self):
+        """
+        Deliver emails until the workers are stopped
+        """
+        while not self._stopping.is_set():
+            try:
+                if self.process():
+                    continue
+                self._mail_queue.release_stale(self._sending_timeout)
+            except Exception:  # pylint: disable=broad-except
+                LOG.exception('Processing the mail queue failed.')
+            self._stopping.wait(self._poll_interval)
+
+
+def create_workers(settings, mailer, workers=None):
+    """
+    Create the mail queue and its workers from the settings
+
+    Args:
+        settings: The application settings.
+        mailer: The pyramid_mailer Mailer providing the SMTP mailer for the
+            delivery.
+        workers: Integer. Optional. The number of worker threads overriding
+            the settings.
+
+    Returns:
+        The tuple of the MailQueue and the MailQueueWorkers or None if no
+        queue path is configured.
+    """
+    path = settings.get('c3smembership.mail_queue.path', '').strip()
+    if not path:
+        return None
+    if workers is None:
+        workers = int(settings.get('c3smembership.mail_queue.workers', 2))
+    mail_queue = MailQueue(os.path.abspath(path))
+    return mail_queue, MailQueueWorkers(
+        mail_queue,
+        SmtpDelivery(mailer),
+        workers=workers,
+        max_attempts=int(
+            settings.get('c3smembership.mail_queue.max_attempts', 5)),
+        retry_delay=float(
+            settings.get('c3smembership.mail_queue.retry_delay', 60)))
+
+
+def shutdown(mail_queue, workers, timeout=STOP_TIMEOUT):
+    """
+    Stop the workers after their current delivery and close the queue
+
+    Emails whose delivery is interrupted remain in status "sending" until
+    they are queued again after the sending timeout.
+
+    Args:
+        mail_queue: The MailQueue.
+        workers: The MailQueueWorkers delivering from the queue.
+        timeout: Number. Optional. The number of seconds to wait for each
+            worker thread. Defaults to STOP_TIMEOUT.
+    """
+    if workers.stop(timeout):
+        mail_queue.close()
+
+
+def includeme(config):
+    """
+    Configure the mail queue from the settings
+
+    The settings are:
+
+    - c3smembership.mail_queue.path: Optional. The path of the SQLite file of
+      the queue. If not specified, emails are sent directly.
+    - c3smembership.mail_queue.workers: Optional, defaults to 2. The number of
+      worker threads delivering the queued emails. With 0 workers the emails
+      are only enqueued and must be delivered by the console script
+      deliver_c3sMembership_mail_queue.
+    - c3smembership.mail_queue.max_attempts: Optional, defaults to 5. The
+      number of delivery attempts before an email fails permanently.
+    - c3smembership.mail_queue.retry_delay: Optional, defaults to 60. The
+      delay in seconds before the first retry which doubles with each retry.
+
+    The queued emails are delivered by the SMTP mailer of the mailer
+    registered before, e.g. by pyramid_mailer or c3smembership.smtp_pool. The
+    workers are stopped when the process exits.
+
+    Args:
+        config: The pyramid.config.Configurator.
+    """
+    settings = config.registry.settings
+    if not settings.get('c3smembership.mail_queue.path', '').strip():
+        return
+    mailer = config.registry.getUtility(IMailer)
+    mail_queue, workers = create_workers(settings, mailer)
+    config.registry.registerUtility(
+        QueuedMailer(mail_queue, mailer.default_sender), IMailer)
+    config.registry.mail_queue = mail_queue
+    config.registry.mail_queue_workers = workers
+    workers.start()
+    atexit.register(shutdown, mail_queue, workers)
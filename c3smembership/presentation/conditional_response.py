@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Support for conditional GET requests
+
+Views which can identify the state of their content by an ETag and optionally
+a last modification date can answer repeated requests of browsers with
+304 Not Modified without calculating the content again.
+
+Example:
+
+    >>> not_modified = check_not_modified(request, etag, last_modified)
+    >>> if not_modified is not None:
+    ...     return not_modified
+    >>> # calculate and return the content
+"""
+
+from pyramid.httpexceptions import HTTPNotModified
+from webob.datetime_utils import UTC
+
+
+def check_not_modified(request, etag, last_modified=None):
+    """
+    Set the validators of the response and check whether the browser already
+    has the current content.
+
+    The ETag and Last-Modified headers are set on request.response.
+    Cache-Control is set to "private, no-cache" so that browsers keep the
+    content but revalidate it on each use.
+
+    If the request contains If-None-Match then only the ETag is compared.
+    Otherwise, If-Modified-Since is compared to the last modification date.
+
+    Args:
+        request: The pyramid.request.Request.
+        etag: A string identifying the state of the content.
+        last_modified: Optional. The datetime.datetime in UTC of the last
+            modification of the content.
+
+    Returns:
+        HTTPNotModified if the browser's content is current, None otherwise.
+    """
+    response = request.response
+    response.etag = etag
+    response.cache_control = 'private, no-cache'
+    if last_modified is not None:
+        # HTTP dates only have a resolution of seconds.
+        last_modified = last_modified.replace(microsecond=0)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=UTC)
+        response.last_modified = last_modified
+
+    if request.if_none_match:
+        is_current = etag in request.if_none_match
+    else:
+        is_current = last_modified is not None \
+            and request.if_modified_since is not None \
+            and last_modified <= request.if_modified_since
+
+    if not is_current:
+        return None
+    headers = {}
+    for header in ['ETag', 'Last-Modified', 'Cache-Control']:
+        if header in response.headers:
+            headers[header] = response.headers[header]
+    return HTTPNotModified(headers=headers)
@@ -31,6 +31,8 @@ class BaseConfig(Configuration):
         """
         includes = [
             'pyramid_mailer',
+            'c3smembership.smtp_pool',
+            'c3smembership.mail_queue',
             'pyramid_chameleon',
             'cornice',
             'c3smembership.presentation.pagination',
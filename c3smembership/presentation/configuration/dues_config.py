@@ -44,8 +44,9 @@ from c3smembership.presentation.views.dues_2021 import (
     make_invoice_pdf_pdflatex as make_invoice_2021,
     make_reversal_pdf_pdflatex as make_reversal_2021,
 )
-from c3smembership.presentation.views.payment_list import \
-    payment_content_size_provider
+from c3smembership.presentation.views.payment_list import (
+    payment_page_content_provider,
+)
 
 
 class DuesConfig(Configuration):
@@ -107,9 +108,10 @@ class DuesConfig(Configuration):
             PaymentRepository())
         self.config.make_pagination_route(
             'payment_list',
-            payment_content_size_provider,
+            None,
             sort_property_default='date',
-            page_size_default=30)
+            page_size_default=30,
+            page_content_provider=payment_page_content_provider)
 
     def configure_routes(self):
         """
@@ -310,5 +312,6 @@ class DuesConfig(Configuration):
 
             # Payments
             ('payment_list', '/payments'),
+            ('payment_export', '/payments/export'),
         ]
         self._add_routes(routes)
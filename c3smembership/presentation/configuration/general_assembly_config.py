@@ -7,6 +7,8 @@ from c3smembership.data.repository.general_assembly import \
     GeneralAssemblyRepository
 
 from c3smembership.business.general_assembly import GeneralAssemblyInvitation
+from c3smembership.business.general_assembly.invitation_campaign import \
+    InvitationCampaign
 
 from c3smembership.presentation.configuration import Configuration
 
@@ -29,6 +31,10 @@ class GeneralAssemblyConfig(Configuration):
         """
         self.config.registry.general_assembly_invitation = \
             GeneralAssemblyInvitation(GeneralAssemblyRepository())
+        self.config.registry.general_assembly_invitation_campaign = \
+            InvitationCampaign(
+                self.config.registry.general_assembly_invitation,
+                GeneralAssemblyRepository())
 
     def configure_routes(self):
         """
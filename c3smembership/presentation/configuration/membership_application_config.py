@@ -6,7 +6,8 @@ Pyramid application configuration for membership application.
 from c3smembership.data.repository.member_repository import MemberRepository
 from c3smembership.business.membership_application import MembershipApplication
 from c3smembership.presentation.views.membership_acquisition import (
-    dashboard_content_size_provider
+    dashboard_content_size_provider,
+    dashboard_content_version_provider,
 )
 
 from c3smembership.presentation.configuration import Configuration
@@ -39,7 +40,9 @@ class MembershipApplicationConfig(Configuration):
             sort_property_default='id',
             page_size_default=int(
                 self.config.get_settings()
-                .get('c3smembership.dashboard_number', 30)))
+                .get('c3smembership.dashboard_number', 30)),
+            keyset_paging=True,
+            content_version_provider=dashboard_content_version_provider)
 
     def configure_routes(self):
         """
@@ -6,9 +6,11 @@ Pyramid application configuration for membership.
 from c3smembership.data.repository.member_repository import (
     MemberRepository
 )
+from c3smembership.business.member_autocomplete import MemberAutocomplete
 from c3smembership.business.member_information import MemberInformation
 from c3smembership.presentation.views.membership_listing import (
-    membership_content_size_provider
+    membership_content_size_provider,
+    membership_content_version_provider,
 )
 
 from c3smembership.presentation.configuration import Configuration
@@ -34,13 +36,20 @@ class MembershipConfig(Configuration):
         self.config.registry.member_information = MemberInformation(
             MemberRepository)
 
+        member_autocomplete = MemberAutocomplete(MemberRepository)
+        MemberRepository.add_name_change_listener(
+            member_autocomplete.invalidate)
+        self.config.registry.member_autocomplete = member_autocomplete
+
         self.config.make_pagination_route(
             'membership_listing_backend',
             membership_content_size_provider,
             sort_property_default='id',
             page_size_default=int(
                 self.config.get_settings().get(
-                    'c3smembership.membership_number', 30)))
+                    'c3smembership.membership_number', 30)),
+            keyset_paging=True,
+            content_version_provider=membership_content_version_provider)
 
     def configure_routes(self):
         """
@@ -3,6 +3,15 @@
 Pyramid application configuration for statistics.
 """
 
+from c3smembership.business.statistics import StatisticsInformation
+from c3smembership.data.repository.data_version_repository import \
+    DataVersionRepository
+from c3smembership.data.repository.dues_invoice_repository import \
+    DuesInvoiceRepository
+from c3smembership.data.repository.share_repository import ShareRepository
+from c3smembership.data.repository.statistics_repository import \
+    StatisticsRepository
+
 from c3smembership.presentation.configuration import Configuration
 
 
@@ -16,6 +25,17 @@ class StatisticsConfig(Configuration):
         Add the configuration of the module to the Pyramid configuration.
         """
         self.configure_routes()
+        self.configure_registry()
+
+    def configure_registry(self):
+        """
+        Configure the registry to contain the statistics business layer.
+        """
+        self.config.registry.statistics_information = StatisticsInformation(
+            StatisticsRepository,
+            DuesInvoiceRepository,
+            ShareRepository,
+            DataVersionRepository)
 
     def configure_routes(self):
         """
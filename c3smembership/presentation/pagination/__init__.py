@@ -121,6 +121,7 @@ Example::
 #   template (configuring what to show: sorting, no sorting, etc.).
 # - Offer easy ways to indicate which column is sorted on in which direction.
 
+from .content_size import CachedContentSizeProvider
 from .exceptions import PageNotFoundException
 from .property_naming import PropertyNaming
 from .reading import (
@@ -195,6 +196,54 @@ class IContentSizeProvider(object):
         raise NotImplementedError()
 
 
+class IPageContentProvider(object):
+    # pylint: disable=too-few-public-methods
+    """
+    Provides the content of a page together with the content size for
+    pagination.
+
+    The page content provider is a ``python callable`` which accepts the
+    request and the pagination request and returns a tuple of the content of
+    the requested page and the content size. Both can then be retrieved from
+    the data source at once instead of determining the content size
+    separately.
+
+    The content of the page is provided to the pyramid view callable via the
+    ``request.pagination_content`` attribute.
+
+    Example:
+        ::
+
+            my_data = range(1000)
+
+            def some_page_content_provider(request, pagination_request):
+                paging_request = pagination_request.paging_request
+                offset = paging_request.content_offset
+                return (
+                    my_data[offset:offset + paging_request.page_size],
+                    len(my_data))
+    """
+
+    def __call__(self, request, pagination_request):
+        """
+        Returns the content of the requested page and the content size for
+        pagination.
+
+        Args:
+            request: The pyramid.request.Request object of the current request.
+            pagination_request: The ``PaginationRequest`` object specifying
+                the requested page and sorting.
+
+        Returns:
+            A tuple of the content of the page and the content size.
+
+        Throws:
+            PageNotFoundException: In case the requested page cannot be
+                provided.
+        """
+        raise NotImplementedError()
+
+
 def is_pagination_route(request):
     """
     Returns whether the ``request.matched_route`` is configured as a
@@ -212,7 +261,9 @@ class PaginationContextFoundSubscriber(object):
     information to the pyramid view callable handling the route.
 
     Pagination information is provided to the pyramid view callable via the
-    ``request.pagination`` attribute as a ``Pagination`` object.
+    ``request.pagination`` attribute as a ``Pagination`` object. If the route
+    has a page content provider then the content of the page is provided via
+    the ``request.pagination_content`` attribute.
     """
 
     def __call__(self, event):
@@ -223,12 +274,18 @@ class PaginationContextFoundSubscriber(object):
         request = event.request
         if is_pagination_route(request):
             settings = request.registry.pagination[request.matched_route.name]
-            content_size_provider = settings['content_size_provider']
             pagination_reader = settings['pagination_reader']
+            page_content_provider = settings.get('page_content_provider')
             try:
-                request.pagination = pagination_reader(
-                    request,
-                    content_size_provider(request))
+                if page_content_provider is None:
+                    content_size_provider = settings['content_size_provider']
+                    content_size = content_size_provider(request)
+                else:
+                    request.pagination_content, content_size = \
+                        page_content_provider(
+                            request,
+                            pagination_reader.read_request(request))
+                request.pagination = pagination_reader(request, content_size)
             except PageNotFoundException:
                 raise ParameterValidationException(
                     'Page does not exist.',
@@ -279,8 +336,11 @@ def make_pagination_route(
         page_size_default=10,
         sort_property_default='',
         sort_direction_default='asc',
-        url_creator_factory=None):
-    # pylint: disable=too-many-arguments
+        url_creator_factory=None,
+        keyset_paging=False,
+        content_version_provider=None,
+        page_content_provider=None):
+    # pylint: disable=too-many-arguments,too-many-locals
     """
     Makes a route into a pagination route.
 
@@ -291,14 +351,38 @@ def make_pagination_route(
         config (pyramid.config.Configurator): The object to which the route
             belongs.
         route_name (str): The name of the route.
-        content_size_provider (IContentSizeProvider): A python callable.
+        content_size_provider (IContentSizeProvider): A python callable. Can
+            be None if a page content provider is specified.
         sort_property_default (str): The name of the default sort property which is
             used in case nothing else is specified.
         page_size_default (int): The default page size in case nothing else is
             specified.
+        keyset_paging (bool): Optional. Whether the route uses keyset paging.
+            The view then receives a ``KeysetPaging`` object and must set the
+            ID of the last content item of the page in order to provide the
+            next page by keyset. Defaults to False.
+        content_version_provider: Optional. A python callable accepting the
+            request and returning a hashable value identifying the state of
+            the content. If specified, the content size is cached per content
+            version. See ``CachedContentSizeProvider``.
+        page_content_provider (IPageContentProvider): Optional. A python
+            callable providing the content of the page together with the
+            content size. If specified, it is used instead of the content
+            size provider and the content of the page is provided to the view
+            via ``request.pagination_content``.
     """
     if route_name in config.registry.pagination:
         raise ValueError('Route already registered.')
+    if content_size_provider is None and page_content_provider is None:
+        raise ValueError(
+            'Either a content size provider or a page content provider must '
+            'be specified.')
+    if content_size_provider is not None \
+            and content_version_provider is not None:
+        content_size_provider = CachedContentSizeProvider(
+            route_name,
+            content_size_provider,
+            content_version_provider)
     post_property_naming = PropertyNaming(
         'page_number',
         'page_size',
@@ -309,7 +393,8 @@ def make_pagination_route(
         'page-number',
         'page-size',
         'sort-property',
-        'sort-direction'
+        'sort-direction',
+        last_id_name='page-after'
     )
     cookie_property_naming = PropertyNaming(
         'page_number',
@@ -340,6 +425,8 @@ def make_pagination_route(
         'sort_direction_default': sort_direction_default,
         'param_property_naming': param_property_naming,
         'url_creator_factory': url_creator_factory,
+        'keyset_paging': keyset_paging,
+        'page_content_provider': page_content_provider,
     }
 
 
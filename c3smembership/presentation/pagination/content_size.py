@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Provides content size providers caching the content size.
+"""
+
+from c3smembership.cache import cached
+
+
+class CachedContentSizeProvider(object):
+    # pylint: disable=too-few-public-methods
+    """
+    Content size provider caching the content size of another content size
+    provider per content version.
+
+    The content version is provided by a ``python callable`` which accepts the
+    request and returns a hashable value identifying the state of the content.
+    The content size is only determined again once the content version
+    changed. If the content version is None, the content size is not cached.
+
+    Example:
+        ::
+
+            def content_version_provider(request):
+                return DataVersionRepository.get_data_version()[0]
+
+            content_size_provider = CachedContentSizeProvider(
+                'some_route',
+                some_content_size_provider,
+                content_version_provider)
+    """
+
+    def __init__(
+            self, route_name, content_size_provider, content_version_provider,
+            max_size=4):
+        """
+        Initialises the ``CachedContentSizeProvider``.
+
+        Args:
+            route_name (str): The name of the route which identifies the
+                cached values in a shared cache backend.
+            content_size_provider (IContentSizeProvider): The content size
+                provider which determines the content size if it is not
+                cached.
+            content_version_provider: A python callable accepting the request
+                and returning the content version.
+            max_size (int): Optional. The number of content versions for which
+                the content size is cached. Defaults to 4.
+        """
+        self._content_size_provider = content_size_provider
+        self._content_version_provider = content_version_provider
+        self._cached_content_size = cached(
+            max_size=max_size,
+            name='pagination.content_size.{0}'.format(route_name),
+            key_provider=self._get_cache_key)(self._get_content_size)
+
+    def __call__(self, request):
+        """
+        Returns the content size for pagination.
+
+        Args:
+            request: The pyramid.request.Request object of the current request.
+        """
+        content_version = self._content_version_provider(request)
+        if content_version is None:
+            return self._content_size_provider(request)
+        return self._cached_content_size(content_version, request)
+
+    def _get_content_size(self, content_version, request):
+        """
+        Determines the content size for the content version.
+        """
+        # pylint: disable=unused-argument
+        return self._content_size_provider(request)
+
+    @classmethod
+    def _get_cache_key(cls, content_version, request):
+        """
+        Gets the cache key which only depends on the content version.
+        """
+        # pylint: disable=unused-argument
+        return content_version
+
+    def expire_cache(self):
+        """
+        Drops the cached content sizes.
+        """
+        self._cached_content_size.expire_cache()
@@ -80,6 +80,59 @@ class PagingRequest(object):
         return self.content_offset < max(content_size, 1)
 
 
+class KeysetPagingRequest(PagingRequest):
+    """
+    Provides information about a paging request which can be served by keyset
+    paging.
+
+    In addition to page number and page size, a keyset paging request can
+    carry the ID of the last content item of the previous page. Content
+    sorted by a sort property and the ID can then be retrieved starting after
+    this item instead of skipping the items of all previous pages. The cost
+    of retrieving a page is thereby independent of the page number.
+
+    If the ID of the last item of the previous page is not known, the content
+    offset must be used as for a ``PagingRequest``.
+    """
+
+    def __init__(self, page_number, page_size, last_id=None):
+        """
+        Initializes the KeysetPagingRequest object.
+
+        Args:
+            page_number: The number of the requested page. Must be a positive
+                integer of type int.
+            page_size: The size of the requested page. Must be a positive
+                integer of type int.
+            last_id: Optional. The ID of the last content item of the
+                previous page. Must be of type int. Only allowed if the page
+                number is larger than one.
+
+        Raises:
+            TypeError: In case page_number, page_size or last_id are not of
+                type int.
+            ValueError: In case page_number or page_size are not larger than
+                zero or in case last_id is specified for the first page.
+        """
+        PagingRequest.__init__(self, page_number, page_size)
+        if last_id is not None:
+            if not isinstance(last_id, int):
+                raise TypeError('Parameter last_id must be of type int.')
+            if not page_number > 1:
+                raise ValueError(
+                    'Parameter last_id must not be specified for the first '
+                    'page.')
+        self.__last_id = last_id
+
+    @property
+    def last_id(self):
+        """
+        The ID of the last content item of the previous page or None if it is
+        not known.
+        """
+        return self.__last_id
+
+
 class Paging(PagingRequest):
     """
     Provides paging functionality.
@@ -265,6 +318,110 @@ class Paging(PagingRequest):
         return self.has_page(self.page_number - 1)
 
 
+class KeysetPaging(KeysetPagingRequest, Paging):
+    """
+    Provides paging functionality for keyset paging.
+
+    After retrieving the content of the page, the ID of its last content item
+    must be set using ``set_page_last_id`` so that the next page can be
+    requested by keyset. All other pages are requested by page number.
+    """
+
+    def __init__(self, content_size, paging_request):
+        """
+        Initializes the KeysetPaging object.
+
+        Args:
+            content_size: The size of the content which is paged. Must be of
+                type int.
+            paging_request: A ``PagingRequest`` object providing the page number
+                and page size. If it is a ``KeysetPagingRequest`` its last ID
+                is kept.
+
+        Raises:
+            TypeError: In case content_size is not of type int.
+            ValueError: In case content_size is not equal to or larger than
+                zero.
+            PageNotFoundException: In case the page number of paging_request
+                does not exist with the given content_size and page size of
+                paging_request.
+        """
+        KeysetPagingRequest.__init__(
+            self,
+            paging_request.page_number,
+            paging_request.page_size,
+            getattr(paging_request, 'last_id', None))
+        Paging.__init__(self, content_size, paging_request)
+        self.__page_last_id = None
+
+    @property
+    def page_last_id(self):
+        """
+        The ID of the last content item of this page or None if it is not
+        known.
+        """
+        return self.__page_last_id
+
+    def set_page_last_id(self, page_last_id):
+        """
+        Sets the ID of the last content item of this page.
+
+        Args:
+            page_last_id: The ID of the last content item of this page. Must
+                be of type int.
+
+        Raises:
+            TypeError: In case page_last_id is not of type int.
+        """
+        if not isinstance(page_last_id, int):
+            raise TypeError('Parameter page_last_id must be of type int.')
+        self.__page_last_id = page_last_id
+
+    @property
+    def next_page(self):
+        """
+        Returns a ``KeysetPaging`` object representing the next page of the
+        current page number.
+
+        The next page carries the ID of the last content item of this page if
+        it is known.
+
+        Raises:
+            PageNotFoundException: In case the content does not have a next
+                page. Use the property ``has_next_page`` in order to determine
+                whether a next page exists.
+        """
+        if not self.has_next_page:
+            raise PageNotFoundException('A next page does not exist.')
+        return KeysetPaging(
+            self.content_size,
+            KeysetPagingRequest(
+                self.page_number + 1,
+                self.page_size,
+                self.page_last_id))
+
+    def page(self, page_number):
+        """
+        Gets the ``KeysetPaging`` object of a specific page number.
+
+        Args:
+            page_number: The page number of the page to be returned.
+
+        Raises:
+            PageNotFoundException: In case the content does not have a
+                page with the specified page number. Use the method ``has_page``
+                in order to determine whether a page with this page number is
+                exists.
+        """
+        if not self.has_page(page_number):
+            raise PageNotFoundException(
+                'Page {page_number} does not exist.'.format(
+                    page_number=page_number))
+        return KeysetPaging(
+            self.content_size,
+            PagingRequest(page_number, self.page_size))
+
+
 class PagingIterator(Paging):
     """
     An iterator to scroll through pages of a content.
@@ -24,6 +24,16 @@ class IPagingPropertyNaming(object):
         """
         raise NotImplementedError()
 
+    @property
+    def last_id_name(self):
+        """
+        The name of the property carrying the ID of the last content item of
+        the previous page for keyset paging.
+
+        Namings returning None do not support keyset paging.
+        """
+        return None
+
 
 class ISortingPropertyNaming(object):
     """
@@ -64,7 +74,8 @@ class PropertyNaming(IPropertyNaming):
             page_size_name,
             sort_property_name,
             sort_direction_name,
-            name_format='{property_name}'):
+            name_format='{property_name}',
+            last_id_name=None):
         # pylint: disable=too-many-arguments
         """
         Initializes the property naming.
@@ -80,12 +91,18 @@ class PropertyNaming(IPropertyNaming):
                 using the string.format formatting pattern. The the format
                 string must contain '{property_name}'. E.g. all property names
                 can be prefixed using 'prefix.{property_name}'.
+            last_id_name: Optional. The name of the property carrying the ID
+                of the last content item of the previous page for keyset
+                paging. If not specified keyset paging is not supported.
         """
         self._name_format = name_format
         self._page_number_name = self._format(page_number_name)
         self._page_size_name = self._format(page_size_name)
         self._sort_property_name = self._format(sort_property_name)
         self._sort_direction_name = self._format(sort_direction_name)
+        self._last_id_name = None
+        if last_id_name is not None:
+            self._last_id_name = self._format(last_id_name)
 
     def _format(self, value):
         """
@@ -113,6 +130,14 @@ class PropertyNaming(IPropertyNaming):
         """
         return self._page_size_name
 
+    @property
+    def last_id_name(self):
+        """
+        The name of the property carrying the ID of the last content item of
+        the previous page for keyset paging.
+        """
+        return self._last_id_name
+
     @property
     def sort_property_name(self):
         """
@@ -7,7 +7,10 @@ from .exceptions import (
     PageNotFoundException
 )
 from .pagination import (
+    KeysetPaging,
+    KeysetPagingRequest,
     Pagination,
+    PaginationRequest,
     Paging,
     PagingRequest,
     Sorting,
@@ -231,6 +234,26 @@ class IPaginationReader(object):
         """
         raise NotImplementedError()
 
+    def read_request(self, request):
+        """
+        Reads a pagination request from a request.
+
+        The pagination request is required by page content providers which
+        determine the content size together with the content of the page.
+
+        Args:
+            request: The Pyramid request from which the pagination request is
+                read.
+
+        Returns:
+            The pagination request read from the request.
+
+        Throws:
+            PageNotFoundException: In case the a valid pagination request
+                cannot be read.
+        """
+        raise NotImplementedError()
+
 
 class RequestPaginationReader(IPaginationReader):
     # pylint: disable=too-few-public-methods
@@ -250,6 +273,11 @@ class RequestPaginationReader(IPaginationReader):
 
     Naming property settings can be passed to the constructor using the
     ``IPropertyNaming`` interface.
+
+    For routes using keyset paging, the ID of the last content item of the
+    previous page is only read from the URL parameters. It is ignored if the
+    paging is changed via POST parameters as it then refers to a different
+    page.
     """
 
     def __init__(self, post_property_naming, param_property_naming,
@@ -284,16 +312,33 @@ class RequestPaginationReader(IPaginationReader):
             PageNotFoundException: In case the a valid pagination cannot be
                 read.
         """
-        self._settings = self._get_route_settings(request)
-        sorting = self._create_sorting(request)
-        paging_request = self._create_page_request(request)
+        pagination_request = self.read_request(request)
+        paging_class = Paging
+        if self._settings.get('keyset_paging', False):
+            paging_class = KeysetPaging
         try:
             return Pagination(
-                Paging(content_size, paging_request),
-                sorting)
+                paging_class(content_size, pagination_request.paging_request),
+                pagination_request.sorting)
         except (ValueError, TypeError):
             raise PageNotFoundException('Page not found.')
 
+    def read_request(self, request):
+        """
+        Reads the pagination request from the request.
+
+        Args:
+            request: The Pyramid request from which the pagination request is
+                read.
+
+        Returns:
+            The pagination request read from the request.
+        """
+        self._settings = self._get_route_settings(request)
+        sorting = self._create_sorting(request)
+        paging_request = self._create_page_request(request)
+        return PaginationRequest(paging_request, sorting)
+
     @classmethod
     def _get_route_settings(cls, request):
         """
@@ -405,6 +450,28 @@ class RequestPaginationReader(IPaginationReader):
         """
         page_size_reader = self._create_page_size_reader(request)
         page_number_reader = self._create_page_number_reader(request)
-        return PagingRequest(
-            int(page_number_reader()),
-            int(page_size_reader()))
+        page_number = int(page_number_reader())
+        page_size = int(page_size_reader())
+        if self._settings.get('keyset_paging', False):
+            last_id = self._read_last_id(request)
+            if page_number > 1 and last_id is not None:
+                return KeysetPagingRequest(
+                    page_number, page_size, int(last_id))
+        return PagingRequest(page_number, page_size)
+
+    def _read_last_id(self, request):
+        """
+        Reads the ID of the last content item of the previous page for keyset
+        paging.
+        """
+        last_id_name = self._param_property_naming.last_id_name
+        if last_id_name is None:
+            return None
+        for post_name in [
+                self._post_property_naming.page_number_name,
+                self._post_property_naming.page_size_name]:
+            if RequestPostReader(request, post_name)() is not None:
+                return None
+        return StrategyReader(
+            [RequestParamReader(request, last_id_name)],
+            IntegerValidator())()
@@ -137,7 +137,7 @@ class CallCallCounter(CallCounter):
 
     def __call__(self, *args, **kwargs):
         self._count_call()
-        self._call(*args, **kwargs)
+        return self._call(*args, **kwargs)
 
     def _call(self, *args, **kwargs):
         raise NotImplementedError()
@@ -232,14 +232,24 @@ class BeforeRenderEventMock(dict):
 class PaginationReaderMock(IPaginationReader):
     # pylint: disable=too-few-public-methods
 
-    def __init__(self, pagination):
+    def __init__(self, pagination, pagination_request=None):
         self._pagination = pagination
+        self._pagination_request = pagination_request
         self._call_count = 0
+        self._content_size = None
 
     def __call__(self, request, content_size):
         self._call_count += 1
+        self._content_size = content_size
         return self._pagination
 
+    def read_request(self, request):
+        return self._pagination_request
+
+    @property
+    def content_size(self):
+        return self._content_size
+
     @property
     def call_count(self):
         return self._call_count
@@ -290,11 +300,14 @@ class PropertyNamingMock(IPropertyNaming):
             page_number_name,
             page_size_name,
             sort_property_name,
-            sort_direction_name):
+            sort_direction_name,
+            last_id_name=None):
+        # pylint: disable=too-many-arguments
         self._page_number_name = page_number_name
         self._page_size_name = page_size_name
         self._sort_property_name = sort_property_name
         self._sort_direction_name = sort_direction_name
+        self._last_id_name = last_id_name
 
     @property
     def page_number_name(self):
@@ -311,3 +324,7 @@ class PropertyNamingMock(IPropertyNaming):
     @property
     def sort_direction_name(self):
         return self._sort_direction_name
+
+    @property
+    def last_id_name(self):
+        return self._last_id_name
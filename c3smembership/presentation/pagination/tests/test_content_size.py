@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+"""
+
+from unittest import TestCase
+
+from c3smembership.presentation.pagination.content_size import (
+    CachedContentSizeProvider,
+)
+from mocking import ContentSizeProviderMock
+
+
+class CachedContentSizeProviderTest(TestCase):
+
+    def setUp(self):
+        self.content_size_provider = ContentSizeProviderMock(100)
+        self.content_version = 'version 1'
+        self.cached_content_size_provider = CachedContentSizeProvider(
+            'some_route',
+            self.content_size_provider,
+            lambda request: self.content_version)
+        self.cached_content_size_provider.expire_cache()
+
+    def test_call(self):
+        # The content size is determined once per content version
+        self.assertEqual(self.cached_content_size_provider('request 1'), 100)
+        self.assertEqual(self.cached_content_size_provider('request 2'), 100)
+        self.assertEqual(self.content_size_provider.call_count, 1)
+        self.assertEqual(self.content_size_provider.get_request(), 'request 1')
+
+        # A new content version determines the content size again
+        self.content_version = 'version 2'
+        self.assertEqual(self.cached_content_size_provider('request 3'), 100)
+        self.assertEqual(self.content_size_provider.call_count, 2)
+        self.assertEqual(self.content_size_provider.get_request(), 'request 3')
+
+    def test_call_without_version(self):
+        self.content_version = None
+        self.assertEqual(self.cached_content_size_provider('request 1'), 100)
+        self.assertEqual(self.cached_content_size_provider('request 2'), 100)
+        self.assertEqual(self.content_size_provider.call_count, 2)
+
+    def test_expire_cache(self):
+        self.assertEqual(self.cached_content_size_provider('request 1'), 100)
+        self.cached_content_size_provider.expire_cache()
+        self.assertEqual(self.cached_content_size_provider('request 2'), 100)
+        self.assertEqual(self.content_size_provider.call_count, 2)
@@ -5,12 +5,16 @@
 from unittest import TestCase
 from c3smembership.presentation.pagination import (
     IContentSizeProvider,
+    IPageContentProvider,
     includeme,
     is_pagination_route,
     make_pagination_route,
     PaginationBeforeRenderSubscriber,
     PaginationContextFoundSubscriber,
 )
+from c3smembership.presentation.pagination.content_size import (
+    CachedContentSizeProvider,
+)
 from c3smembership.presentation.pagination.exceptions import (
     PageNotFoundException
 )
@@ -56,6 +60,14 @@ class IContentSizeProviderTest(TestCase):
             content_size_provider('request')
 
 
+class IPageContentProviderTest(TestCase):
+
+    def test_call(self):
+        page_content_provider = IPageContentProvider()
+        with self.assertRaises(NotImplementedError):
+            page_content_provider('request', 'pagination request')
+
+
 class FunctionsTest(TestCase):
 
     def test_is_pagination_route(self):
@@ -70,7 +82,7 @@ class FunctionsTest(TestCase):
         self.assertFalse(is_pagination_route(request))
 
     def test_make_pagination_route(self):
-        settings_counter = 9
+        settings_counter = 11
 
         # test defaults
         config = ConfigurationMock()
@@ -97,6 +109,8 @@ class FunctionsTest(TestCase):
         self.assertEqual(
             pagination['sort_property_default'],
             '')
+        self.assertFalse(pagination['keyset_paging'])
+        self.assertIsNone(pagination['page_content_provider'])
 
         # test everything
         config = ConfigurationMock()
@@ -109,7 +123,8 @@ class FunctionsTest(TestCase):
             sort_property_default='some sort property default',
             sort_direction_default='desc',
             page_size_default=123,
-            page_number_default=9)
+            page_number_default=9,
+            keyset_paging=True)
         self.assertTrue('some_route' in config.registry.pagination)
         pagination = config.registry.pagination['some_route']
         self.assertEqual(len(pagination), settings_counter)
@@ -134,6 +149,37 @@ class FunctionsTest(TestCase):
         self.assertEqual(
             pagination['page_number_default'],
             9)
+        self.assertTrue(pagination['keyset_paging'])
+
+        # test cached content size
+        config = ConfigurationMock()
+        make_pagination_route(
+            config,
+            'some_route',
+            'some content size provider',
+            content_version_provider='some content version provider')
+        pagination = config.registry.pagination['some_route']
+        self.assertEqual(
+            type(pagination['content_size_provider']),
+            CachedContentSizeProvider)
+
+        # test page content provider
+        config = ConfigurationMock()
+        make_pagination_route(
+            config,
+            'some_route',
+            None,
+            page_content_provider='some page content provider')
+        pagination = config.registry.pagination['some_route']
+        self.assertIsNone(pagination['content_size_provider'])
+        self.assertEqual(
+            pagination['page_content_provider'],
+            'some page content provider')
+
+        # test missing providers fail
+        config = ConfigurationMock()
+        with self.assertRaises(ValueError):
+            make_pagination_route(config, 'some_route', None)
 
         # test duplicate configuration fails
         config = ConfigurationMock()
@@ -186,6 +232,36 @@ class PaginationContextFoundSubscriberTest(TestCase):
         self.assertEqual(content_size_provider_mock.call_count, 1)
         self.assertEqual(content_size_provider_mock.get_request(), request)
 
+    def test_call_page_content_provider(self):
+        pagination_reader = PaginationReaderMock(
+            'some pagination', 'some pagination request')
+        content_size_provider_mock = ContentSizeProviderMock(100)
+        page_content_provider_calls = []
+
+        def page_content_provider(request, pagination_request):
+            page_content_provider_calls.append((request, pagination_request))
+            return ('some page content', 123)
+
+        request = DummyRequest()
+        request.registry.pagination = {
+            'some_route': {
+                'content_size_provider': content_size_provider_mock,
+                'pagination_reader': pagination_reader,
+                'page_content_provider': page_content_provider,
+            }
+        }
+        request.matched_route = RouteMock('some_route')
+
+        event = ContextFoundEventMock(request)
+        subscriber = PaginationContextFoundSubscriber()
+        subscriber(event)
+        self.assertEqual(request.pagination, 'some pagination')
+        self.assertEqual(request.pagination_content, 'some page content')
+        self.assertEqual(pagination_reader.content_size, 123)
+        self.assertEqual(
+            page_content_provider_calls,
+            [(request, 'some pagination request')])
+        self.assertEqual(content_size_provider_mock.call_count, 0)
 
     def test_call_exception(self):
 
@@ -7,6 +7,8 @@ from c3smembership.presentation.pagination.exceptions import (
     PageNotFoundException,
 )
 from c3smembership.presentation.pagination.pagination import (
+    KeysetPaging,
+    KeysetPagingRequest,
     Pagination,
     PaginationRequest,
     Paging,
@@ -71,6 +73,73 @@ class PagingRequestTest(TestCase):
         self.assertTrue(pagination.is_valid_content_size_page(71))
 
 
+class KeysetPagingRequestTest(TestCase):
+
+    def test_constructor(self):
+        # last id must be of type int
+        with self.assertRaises(TypeError):
+            KeysetPagingRequest(2, 10, '5')
+        # last id must not be specified for the first page
+        with self.assertRaises(ValueError):
+            KeysetPagingRequest(1, 10, 5)
+        paging_request = KeysetPagingRequest(1, 10)
+        self.assertEqual(paging_request.last_id, None)
+
+    def test_last_id(self):
+        paging_request = KeysetPagingRequest(3, 10, 42)
+        self.assertEqual(paging_request.last_id, 42)
+        self.assertEqual(paging_request.content_offset, 20)
+
+
+class KeysetPagingTest(TestCase):
+
+    def test_constructor(self):
+        paging = KeysetPaging(30, KeysetPagingRequest(3, 10, 42))
+        self.assertEqual(paging.last_id, 42)
+        self.assertEqual(paging.page_last_id, None)
+        paging = KeysetPaging(30, PagingRequest(3, 10))
+        self.assertEqual(paging.last_id, None)
+        with self.assertRaises(PageNotFoundException):
+            KeysetPaging(30, KeysetPagingRequest(4, 10, 42))
+
+    def test_set_page_last_id(self):
+        paging = KeysetPaging(30, PagingRequest(2, 10))
+        with self.assertRaises(TypeError):
+            paging.set_page_last_id('52')
+        paging.set_page_last_id(52)
+        self.assertEqual(paging.page_last_id, 52)
+
+    def test_next_page(self):
+        paging = KeysetPaging(30, KeysetPagingRequest(2, 10, 42))
+        next_page = paging.next_page
+        self.assertEqual(next_page.page_number, 3)
+        self.assertEqual(next_page.last_id, None)
+
+        paging.set_page_last_id(52)
+        next_page = paging.next_page
+        self.assertTrue(isinstance(next_page, KeysetPaging))
+        self.assertEqual(next_page.page_number, 3)
+        self.assertEqual(next_page.page_size, 10)
+        self.assertEqual(next_page.content_size, 30)
+        self.assertEqual(next_page.last_id, 52)
+
+        with self.assertRaises(PageNotFoundException):
+            next_page = next_page.next_page
+
+    def test_page(self):
+        paging = KeysetPaging(30, KeysetPagingRequest(2, 10, 42))
+        paging.set_page_last_id(52)
+        for page in [
+                paging.page(2),
+                paging.first_page,
+                paging.previous_page,
+                paging.last_page]:
+            self.assertTrue(isinstance(page, KeysetPaging))
+            self.assertEqual(page.last_id, None)
+        with self.assertRaises(PageNotFoundException):
+            paging.page(4)
+
+
 class PagingTest(TestCase):
 
     def test_constructor(self):
@@ -40,6 +40,9 @@ class TestIPagingPropertyNaming(TestCase):
             page_size_name = self._property_naming.page_size_name
             del(page_size_name)
 
+    def test_last_id_name(self):
+        self.assertEqual(self._property_naming.last_id_name, None)
+
 
 class TestIPropertyNaming(TestCase):
 
@@ -80,7 +83,8 @@ class TestPropertyNaming(TestCase):
             'page_size',
             'sort_property',
             'sort_direction',
-            'prefix.{property_name}')
+            'prefix.{property_name}',
+            'last_id')
 
     def test_page_number_name(self):
         self.assertEquals(
@@ -121,3 +125,13 @@ class TestPropertyNaming(TestCase):
             self._prefix_property_naming.sort_direction_name,
             'prefix.sort_direction'
         )
+
+    def test_last_id_name(self):
+        self.assertEqual(
+            self._default_format_property_naming.last_id_name,
+            None
+        )
+        self.assertEquals(
+            self._prefix_property_naming.last_id_name,
+            'prefix.last_id'
+        )
@@ -125,6 +125,14 @@ class IPaginationReaderTest(TestCase):
             reader('request', 'content_size')
 
 
+class IPaginationReaderReadRequestTest(TestCase):
+
+    def test_read_request(self):
+        pagination_reader = IPaginationReader()
+        with self.assertRaises(NotImplementedError):
+            pagination_reader.read_request(None)
+
+
 class RequestPaginationReaderTest(TestCase):
 
     def setUp(self):
@@ -225,7 +233,109 @@ class RequestPaginationReaderTest(TestCase):
             'some_cookie_property')
         self.assertEqual(pagination.sorting.sort_direction, 'desc')
 
+    def test_read_request(self):
+        request = self.make_request()
+        self.set_dict(request.params, 'param_', 2, 21, 'some_other_property',
+                      'desc')
+        pagination_request = self.reader.read_request(request)
+        self.assertEqual(pagination_request.paging_request.page_number, 2)
+        self.assertEqual(pagination_request.paging_request.page_size, 21)
+        self.assertEqual(
+            pagination_request.paging_request.content_offset, 21)
+        self.assertEqual(
+            pagination_request.sorting.sort_property,
+            'some_other_property')
+        self.assertEqual(pagination_request.sorting.sort_direction, 'desc')
+
     def test_call_exceptions(self):
         request = self.make_request()
         with self.assertRaises(PageNotFoundException):
             self.reader(request, 'asdf')
+
+
+class RequestPaginationReaderKeysetTest(TestCase):
+
+    def setUp(self):
+        self.reader = RequestPaginationReader(
+            PropertyNamingMock(
+                'post_page_number',
+                'post_page_size',
+                'post_sort_property',
+                'post_sort_direction'
+            ),
+            PropertyNamingMock(
+                'param_page_number',
+                'param_page_size',
+                'param_sort_property',
+                'param_sort_direction',
+                'param_last_id'
+            ),
+            PropertyNamingMock(
+                'cookie_page_number',
+                'cookie_page_size',
+                'cookie_sort_property',
+                'cookie_sort_direction'
+            )
+        )
+
+    @classmethod
+    def make_request(cls, post=None, keyset_paging=True):
+        request = testing.DummyRequest(post=post)
+        request.matched_route = RouteMock('dummy_route')
+        request.registry.pagination = {
+            'dummy_route': {
+                'sort_property_default': 'some_property',
+                'page_size_default': 10,
+                'sort_direction_default': 'asc',
+                'page_number_default': 1,
+                'keyset_paging': keyset_paging,
+            }
+        }
+        return request
+
+    def test_call_last_id(self):
+        request = self.make_request()
+        request.params['param_page_number'] = 3
+        request.params['param_last_id'] = '42'
+        pagination = self.reader(request, 50)
+        self.assertEqual(pagination.paging.page_number, 3)
+        self.assertEqual(pagination.paging.last_id, 42)
+
+    def test_call_without_last_id(self):
+        request = self.make_request()
+        request.params['param_page_number'] = 3
+        pagination = self.reader(request, 50)
+        self.assertEqual(pagination.paging.page_number, 3)
+        self.assertEqual(pagination.paging.last_id, None)
+
+    def test_call_first_page(self):
+        request = self.make_request()
+        request.params['param_page_number'] = 1
+        request.params['param_last_id'] = '42'
+        pagination = self.reader(request, 50)
+        self.assertEqual(pagination.paging.page_number, 1)
+        self.assertEqual(pagination.paging.last_id, None)
+
+    def test_call_post(self):
+        request = self.make_request({'post_page_number': 4})
+        request.params['param_page_number'] = 3
+        request.params['param_last_id'] = '42'
+        pagination = self.reader(request, 50)
+        self.assertEqual(pagination.paging.page_number, 4)
+        self.assertEqual(pagination.paging.last_id, None)
+
+    def test_call_invalid_last_id(self):
+        request = self.make_request()
+        request.params['param_page_number'] = 3
+        request.params['param_last_id'] = 'abc'
+        pagination = self.reader(request, 50)
+        self.assertEqual(pagination.paging.page_number, 3)
+        self.assertEqual(pagination.paging.last_id, None)
+
+    def test_call_keyset_disabled(self):
+        request = self.make_request(keyset_paging=False)
+        request.params['param_page_number'] = 3
+        request.params['param_last_id'] = '42'
+        pagination = self.reader(request, 50)
+        self.assertEqual(pagination.paging.page_number, 3)
+        self.assertFalse(hasattr(pagination.paging, 'last_id'))
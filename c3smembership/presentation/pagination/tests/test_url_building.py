@@ -4,6 +4,8 @@
 
 from unittest import TestCase
 from c3smembership.presentation.pagination.pagination import (
+    KeysetPaging,
+    KeysetPagingRequest,
     Pagination,
     Paging,
     PagingRequest,
@@ -76,6 +78,45 @@ class RequestUrlCreatorTest(TestCase):
         self.assertTrue(url.find('match_route/some_page') > 0)
         self.assertTrue(url.find('test=some_value') > 0)
 
+    def test_create_url_last_id(self):
+        config = testing.setUp()
+        config.add_route('route_name', 'route_name')
+        property_naming = PropertyNamingMock(
+            'page-number',
+            'page-size',
+            'sort-property',
+            'sort-direction',
+            'page-after')
+
+        # The last ID is set for keyset paging requests
+        request = DummyRequest()
+        pagination_url_creator = RequestUrlCreator(
+            request,
+            'route_name',
+            property_naming,
+        )
+        url = pagination_url_creator(
+            PaginationRequest(
+                KeysetPagingRequest(3, 10, 42),
+                Sorting('id', 'desc')))
+        self.assertTrue(url.find('page-number=3') > 0)
+        self.assertTrue(url.find('page-after=42') > 0)
+
+        # The last ID of the current request is removed for other pages
+        request = DummyRequest()
+        request.params['page-after'] = '42'
+        pagination_url_creator = RequestUrlCreator(
+            request,
+            'route_name',
+            property_naming,
+        )
+        url = pagination_url_creator(
+            PaginationRequest(
+                PagingRequest(1, 10),
+                Sorting('id', 'desc')))
+        self.assertTrue(url.find('page-number=1') > 0)
+        self.assertEqual(url.find('page-after'), -1)
+
 
 class IUrlCreatorFactoryTest(TestCase):
 
@@ -247,3 +288,37 @@ class UrlBuilderTest(TestCase):
     def test_str(self):
         provider = self.get_response_provider(123, 3, 21)
         self.assertEqual(str(provider), 'http://example.com/test/url')
+
+
+class UrlBuilderKeysetTest(TestCase):
+
+    def test_sorting(self):
+        config = testing.setUp()
+        config.add_route('route_name', 'route_name')
+        url_creator = RequestUrlCreator(
+            DummyRequest(),
+            'route_name',
+            PropertyNamingMock(
+                'page-number',
+                'page-size',
+                'sort-property',
+                'sort-direction',
+                'page-after'))
+        paging = KeysetPaging(100, KeysetPagingRequest(3, 10, 42))
+        paging.set_page_last_id(52)
+        url_builder = UrlBuilder(
+            url_creator,
+            Pagination(paging, Sorting('id', 'asc')))
+
+        url = str(url_builder.next_page)
+        self.assertTrue(url.find('page-number=4') > 0)
+        self.assertTrue(url.find('page-after=52') > 0)
+
+        url = str(url_builder.invert_sort_direction)
+        self.assertTrue(url.find('page-number=3') > 0)
+        self.assertTrue(url.find('sort-direction=desc') > 0)
+        self.assertEqual(url.find('page-after'), -1)
+
+        url = str(url_builder.first_page)
+        self.assertTrue(url.find('page-number=1') > 0)
+        self.assertEqual(url.find('page-after'), -1)
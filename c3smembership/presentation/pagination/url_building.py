@@ -66,6 +66,14 @@ class RequestUrlCreator(IUrlCreator):
         route_url_kwargs['_query'][sort_property_name] = sorting.sort_property
         route_url_kwargs['_query'][sort_direction_name] = sorting.sort_direction
 
+        last_id_name = self._param_property_naming.last_id_name
+        if last_id_name is not None:
+            last_id = getattr(paging_request, 'last_id', None)
+            if last_id is None:
+                route_url_kwargs['_query'].pop(last_id_name, None)
+            else:
+                route_url_kwargs['_query'][last_id_name] = last_id
+
         return self._request.route_url(self._route_name, **route_url_kwargs)
 
 
@@ -158,11 +166,17 @@ class UrlBuilder(object):
     def _change_sorting(self, sorting):
         """
         Returns a ``UrlBuilder`` object with given sorting information.
+
+        The page is requested by page number as the keyset of the current
+        paging only applies to the current sorting.
         """
+        paging = self.__pagination.paging
+        if getattr(paging, 'last_id', None) is not None:
+            paging = paging.page(paging.page_number)
         return UrlBuilder(
             self.__url_creator,
             Pagination(
-                self.__pagination.paging,
+                paging,
                 sorting
             )
         )
@@ -120,12 +120,16 @@ class BatchInvitePost(colander.MappingSchema):
     Schema for validating batch invite POST data
 
     The POST data contains a count integer with a minimum of 1 and a default
-    value of 5.
+    value of 5 as well as an optional all flag indicating that all members
+    which have not been invited yet are invited.
     """
     count = colander.SchemaNode(
         colander.Int(),
         missing=5,
         pre_processor=colander.Range(min=1))
+    all = colander.SchemaNode(
+        colander.Boolean(),
+        missing=False)
 
 
 class GeneralAssemblyFormFactory(object):
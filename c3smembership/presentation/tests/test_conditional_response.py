@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Tests the c3smembership.presentation.conditional_response module.
+"""
+
+from datetime import datetime
+from unittest import TestCase
+
+from pyramid import testing
+from pyramid.request import Request
+
+from c3smembership.presentation.conditional_response import \
+    check_not_modified
+
+
+class CheckNotModifiedTest(TestCase):
+    """
+    Tests the check_not_modified function.
+    """
+
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _create_request(self, headers=None):
+        request = Request.blank('/', headers=headers)
+        request.registry = self.config.registry
+        return request
+
+    def test_without_validators(self):
+        """
+        Test that requests without validators get the content.
+        """
+        request = self._create_request()
+        result = check_not_modified(
+            request, 'abc', datetime(2021, 3, 4, 5, 6, 7, 8))
+        self.assertTrue(result is None)
+        self.assertEqual(request.response.etag, 'abc')
+        self.assertEqual(
+            request.response.headers['Last-Modified'],
+            'Thu, 04 Mar 2021 05:06:07 GMT')
+        self.assertEqual(
+            request.response.headers['Cache-Control'], 'private, no-cache')
+
+    def test_if_none_match(self):
+        """
+        Test that If-None-Match is compared to the ETag and takes precedence
+        over If-Modified-Since.
+        """
+        request = self._create_request({
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Thu, 04 Mar 2021 05:06:07 GMT'})
+        result = check_not_modified(request, 'abc')
+        self.assertEqual(result.status_code, 304)
+        self.assertEqual(result.headers['ETag'], '"abc"')
+
+        request = self._create_request({
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Thu, 04 Mar 2021 05:06:07 GMT'})
+        result = check_not_modified(
+            request, 'def', datetime(2021, 3, 4, 5, 6, 7))
+        self.assertTrue(result is None)
+
+    def test_if_modified_since(self):
+        """
+        Test that If-Modified-Since is compared to the last modification.
+        """
+        request = self._create_request({
+            'If-Modified-Since': 'Thu, 04 Mar 2021 05:06:07 GMT'})
+        result = check_not_modified(
+            request, 'abc', datetime(2021, 3, 4, 5, 6, 7, 8))
+        self.assertEqual(result.status_code, 304)
+        self.assertEqual(
+            result.headers['Last-Modified'], 'Thu, 04 Mar 2021 05:06:07 GMT')
+
+        request = self._create_request({
+            'If-Modified-Since': 'Thu, 04 Mar 2021 05:06:07 GMT'})
+        result = check_not_modified(
+            request, 'abc', datetime(2021, 3, 4, 5, 6, 8))
+        self.assertTrue(result is None)
+
+        request = self._create_request({
+            'If-Modified-Since': 'Thu, 04 Mar 2021 05:06:07 GMT'})
+        result = check_not_modified(request, 'abc')
+        self.assertTrue(result is None)
@@ -28,6 +28,8 @@ from pyramid.view import view_config
 
 from c3smembership.data.model.base.c3smember import C3sMember
 from c3smembership.presentation.i18n import _
+from c3smembership.presentation.views.statistics import \
+    check_statistics_not_modified
 
 
 @view_config(
@@ -104,6 +106,11 @@ def annual_report(request):  # pragma: no cover
             }
 
     else:  # if form not submitted, preload values
+        # The default period only depends on the data version and the date.
+        not_modified = check_statistics_not_modified(
+            request, request.registry.statistics_information)
+        if not_modified is not None:
+            return not_modified
         form.set_appstruct(appstruct)
 
     # prepare: get information from the database
@@ -270,25 +270,23 @@ def flash_message(request, generated_invoices, count):
 def background_archiving(dues_invoice_archiving, background_archiving_control):
     """
     Archive all remaining invoices in background
+
+    The invoices are generated in parallel by the dues invoice archiving and
+    each archived invoice is counted by the background archiving control.
     """
     # All exceptions have to be collected and written to the log.
     # pylint: disable=bare-except
     logger = background_archiving.logger
+
+    def progress(invoice_no_string):
+        """
+        Report the progress of the archiving
+        """
+        logger.info('Generated %d invoice: %s', 1, str(invoice_no_string))
+        background_archiving_control.increment_count()
+
     try:
-        stats = dues_invoice_archiving.get_archiving_stats()
-        for stat in stats:
-            generated_invoices = []
-            while True:
-                generated_invoices = dues_invoice_archiving \
-                    .generate_missing_invoice_pdfs(stat['year'], 1)
-                if len(generated_invoices) == 1:
-                    logger.info(
-                        'Generated %d invoice: %s',
-                        len(generated_invoices),
-                        str(generated_invoices[0]))
-                    background_archiving_control.increment_count()
-                else:
-                    break
+        dues_invoice_archiving.archive_missing_invoices(progress=progress)
         logger.info('Finished background invoice archiving')
     except:
         logger.exception(
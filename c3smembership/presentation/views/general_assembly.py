@@ -37,6 +37,7 @@ module.
 """
 # pylint: disable=superfluous-parens
 
+import functools
 import logging
 
 import deform
@@ -73,6 +74,9 @@ LOG = logging.getLogger(__name__)
 URL_PATTERN = '{ticketing_url}/lu/{token}/{email}'
 INVITATION_TEXT_PREVIEW_LENGTH = 250
 TRUNCATE_CHARACTERS = [' ', '\r', '\n']
+# The number of membership numbers listed in the batch invite notification so
+# that the session cookie does not overflow for large batches.
+BATCH_INVITE_FLASH_MEMBERSHIP_NUMBERS = 20
 
 
 @view_config(
@@ -235,10 +239,10 @@ def send_invitation(request, member, general_assembly_number):
             member,
             assembly,
             token)
-        url = URL_PATTERN.format(
-            ticketing_url=request.registry.settings['ticketing.url'],
-            token=token,
-            email=member.email)
+        url = make_invitation_url(
+            request.registry.settings['ticketing.url'],
+            token,
+            member.email)
         LOG.info("mailing event invitation to to member id %s", member.id)
 
         email_subject = assembly.invitation_subject_de if \
@@ -261,6 +265,37 @@ def send_invitation(request, member, general_assembly_number):
         send_message(request, message)
 
 
+def make_invitation_url(ticketing_url, token, email):
+    """
+    Make the URL of the invitation to the ticketing application.
+    """
+    return URL_PATTERN.format(
+        ticketing_url=ticketing_url,
+        token=token,
+        email=email)
+
+
+def deliver_invitations(request, invitation_messages):
+    """
+    Sends the invitation emails rendered by an invitation campaign.
+
+    Args:
+        request: The Pyramid request used to access configuration and get the
+            mailer.
+        invitation_messages: The InvitationMessage objects to be sent.
+    """
+    sender = request.registry.settings['c3smembership.notification_sender']
+    for invitation_message in invitation_messages:
+        send_message(
+            request,
+            Message(
+                subject=invitation_message.subject,
+                sender=sender,
+                recipients=[invitation_message.recipient],
+                body=invitation_message.body,
+            ))
+
+
 def post_error_handler(request, schema, errors):
     """
     Redirect to specific general assembly on POST data validation error
@@ -293,39 +328,49 @@ def post_error_handler(request, schema, errors):
 )
 def batch_invite(request):
     """
-    Batch invite n members at the same time.
+    Batch invite n members or all members at the same time.
+
+    The invitations are stored and rendered at once by the invitation campaign
+    and then delivered.
     """
     general_assembly = request.validated_matchdict['general_assembly']
     count = request.validated_post['count']
+    if request.validated_post.get('all', False):
+        count = None
+
+    try:
+        invitation_messages = request.registry \
+            .general_assembly_invitation_campaign.invite_members(
+                general_assembly.number,
+                functools.partial(
+                    make_invitation_url,
+                    request.registry.settings['ticketing.url']),
+                functools.partial(deliver_invitations, request),
+                count)
+    except ValueError as value_error:
+        request.session.flash(
+            unicode(value_error.message),
+            'danger')
+        return HTTPFound(request.route_url(
+            'general_assembly', number=general_assembly.number))
 
-    invitees = GeneralAssemblyRepository.get_invitees(
-        general_assembly.number, count)
-
-    if len(invitees) == 0:
+    if len(invitation_messages) == 0:
         request.session.flash('no invitees left. all done!',
                               'success')
         return HTTPFound(request.route_url(
             'general_assembly', number=general_assembly.number))
 
-    num_sent = 0
-    membership_numbers_sent = []
-
-    for member in invitees:
-        try:
-            send_invitation(request, member, general_assembly.number)
-        except ValueError as value_error:
-            request.session.flash(
-                unicode(value_error.message),
-                'danger')
-            return HTTPFound(request.route_url(
-                'general_assembly', number=general_assembly.number))
-
-        num_sent += 1
-        membership_numbers_sent.append(member.membership_number)
-
+    LOG.info(
+        "mailed event invitations to %s members", len(invitation_messages))
+    membership_numbers_sent = [
+        invitation_message.membership_number
+        for invitation_message in invitation_messages[
+            :BATCH_INVITE_FLASH_MEMBERSHIP_NUMBERS]]
+    if len(invitation_messages) > BATCH_INVITE_FLASH_MEMBERSHIP_NUMBERS:
+        membership_numbers_sent.append('...')
     request.session.flash(
         "sent out {} mails (to members with membership numbers {})".format(
-            num_sent, membership_numbers_sent),
+            len(invitation_messages), membership_numbers_sent),
         'success')
 
     return HTTPFound(request.route_url(
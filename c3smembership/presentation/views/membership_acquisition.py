@@ -36,6 +36,10 @@ from c3smembership.data.model.base.c3smember import (
     InvalidPropertyException,
     InvalidSortDirection,
 )
+from c3smembership.data.repository.data_version_repository import (
+    DataVersionRepository,
+)
+from c3smembership.data.repository.member_repository import MemberRepository
 from c3smembership.presentation.parameter_validation import (
     ParameterValidationException,
 )
@@ -77,15 +81,18 @@ def dashboard(request):
 
     pagination = request.pagination
     try:
-        members = C3sMember.nonmember_listing(
-            pagination.paging.content_offset,
-            pagination.paging.page_size,
+        members = MemberRepository.get_applicants_page(
             pagination.sorting.sort_property,
-            pagination.sorting.sort_direction)
+            pagination.sorting.sort_direction,
+            pagination.paging.page_size,
+            pagination.paging.content_offset,
+            pagination.paging.last_id)
     except (InvalidPropertyException, InvalidSortDirection):
         raise ParameterValidationException(
             'Page does not exist.',
             request.route_url(request.matched_route.name))
+    if members:
+        pagination.paging.set_page_last_id(members[-1].id)
     return {
         'members': members,
     }
@@ -102,6 +109,15 @@ def dashboard_content_size_provider(request):
     return C3sMember.nonmember_listing_count()
 
 
+def dashboard_content_version_provider(request):
+    """
+    Provide the data version as the content version of the non-member listing
+    so that the non-member count is only determined once it changed.
+    """
+    # pylint: disable=unused-argument
+    return DataVersionRepository.get_data_version()[0]
+
+
 def get_dashboard_redirect(request, member_id=''):
     """Get the redirect for the dashboard.
 
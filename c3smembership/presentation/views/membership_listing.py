@@ -1,9 +1,22 @@
 # -*- coding: utf-8 -*-
 
+from datetime import date
+
 from pyramid.view import view_config
 from pyramid.httpexceptions import HTTPFound
 
-from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.data.model.base.c3smember import (
+    C3sMember,
+    InvalidPropertyException,
+    InvalidSortDirection,
+)
+from c3smembership.data.repository.data_version_repository import (
+    DataVersionRepository,
+)
+from c3smembership.data.repository.member_repository import MemberRepository
+from c3smembership.presentation.parameter_validation import (
+    ParameterValidationException,
+)
 
 
 @view_config(
@@ -18,11 +31,20 @@ def membership_listing_backend(request):
     the list is HTML with clickable links,
     not good for printout.
     """
-    memberships = C3sMember.get_members(
-        request.pagination.sorting.sort_property,
-        how_many=request.pagination.paging.page_size,
-        offset=request.pagination.paging.content_offset,
-        order=request.pagination.sorting.sort_direction)
+    pagination = request.pagination
+    try:
+        memberships = MemberRepository.get_members_page(
+            pagination.sorting.sort_property,
+            pagination.sorting.sort_direction,
+            pagination.paging.page_size,
+            pagination.paging.content_offset,
+            pagination.paging.last_id)
+    except (InvalidPropertyException, InvalidSortDirection):
+        raise ParameterValidationException(
+            'Page does not exist.',
+            request.route_url(request.matched_route.name))
+    if memberships:
+        pagination.paging.set_page_last_id(memberships[-1].id)
 
     general_assembly_invitation = request.registry.general_assembly_invitation
 
@@ -31,12 +53,9 @@ def membership_listing_backend(request):
 
     invitations = None
     if latest_general_assembly is not None:
-        invitations = {}
-        for membership in memberships:
-            invitations[membership.membership_number] = \
-                general_assembly_invitation.get_member_invitation(
-                    membership,
-                    latest_general_assembly.number)
+        invitations = general_assembly_invitation.get_members_invitation(
+            memberships,
+            latest_general_assembly.number)
 
     return {
         'members': memberships,
@@ -49,6 +68,19 @@ def membership_content_size_provider(request):
     return C3sMember.get_num_members_accepted()
 
 
+def membership_content_version_provider(request):
+    """
+    Provides the data version and the current date as the content version of
+    the membership listing so that the member count is only determined once
+    it changed.
+
+    The date is part of the version as the count only includes memberships
+    which have not ended as of today.
+    """
+    # pylint: disable=unused-argument
+    return (DataVersionRepository.get_data_version()[0], date.today())
+
+
 def get_memberhip_listing_redirect(request, member_id=''):
     """Get the redirect for the dashboard.
 
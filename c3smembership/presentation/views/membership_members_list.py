@@ -203,6 +203,8 @@ def member_list_date_pdf_view(request):
     # be accessed by this view via the request.
     members = request.registry.member_information.get_accepted_members_sorted(
         effective_date)
+    share_counts = request.registry.share_information.get_member_share_counts(
+        effective_date)
 
     membership_list_entries = []
     for member in members:
@@ -219,10 +221,7 @@ def member_list_date_pdf_view(request):
             'membership_loss_date': member.membership_loss_date,
             'membership_loss_type': member.membership_loss_type,
             'membership_number': member.membership_number,
-            'shares_count': request.registry.share_information \
-                .get_member_share_count(
-                        member.membership_number,
-                        effective_date)
+            'shares_count': share_counts.get(member.membership_number, 0)
         })
 
     response = Response(content_type='application/pdf')
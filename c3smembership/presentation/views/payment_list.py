@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """
-Payment list view and payment content size provider for pagination.
+Payment list view and payment content providers for pagination.
 """
 
 
@@ -9,6 +9,7 @@ import datetime
 import deform
 from pyramid.view import view_config
 
+from c3smembership.presentation.pagination import PageNotFoundException
 from c3smembership.presentation.schemas.payment_list_filters import \
     create_payment_filter_form
 
@@ -207,6 +208,36 @@ def get_filtering(request, filter_settings, cookie_parsers):
     return filtering
 
 
+def get_request_filtering(
+        request, filter_form, filter_settings, cookie_parsers):
+    """
+    Gets the filter information of the request without rendering the filter
+    form or setting cookies.
+
+    The filtering is read from cookies unless the request resets the filters
+    or submits valid filters.
+
+    Args:
+        request: The pyramid.request.Request object from which cookies and form
+            data is retrieved.
+        filter_form: The form which is validated for filter settings.
+        filter_settings: A dictionary providing the filter settings.
+        cookie_parsers: A dictionary providing cookie parsers per type.
+
+    Returns:
+        A dictionary containing the filter values.
+    """
+    filtering = get_filtering(request, filter_settings, cookie_parsers)
+    if 'reset' in request.POST:
+        filtering = reset_filtering(filtering, filter_settings)
+    elif 'submit' in request.POST:
+        try:
+            filtering = filter_form.validate(request.POST.items())
+        except deform.ValidationFailure:
+            pass
+    return filtering
+
+
 def handle_filtering(
         request, filter_form, filter_settings, cookie_formatters,
         cookie_parsers):
@@ -254,6 +285,10 @@ def payment_list(request):
     Provides the payments according to sorting and filtering as well as a form
     for setting filters.
 
+    The payments of the page are provided by payment_page_content_provider
+    via request.pagination_content. Only the view handles the filter form
+    so that it is rendered and the filter cookies are set once.
+
     Args:
         request: The pyramid.request.Request object from which form data and
             cookies are read.
@@ -262,33 +297,64 @@ def payment_list(request):
         A dictionary containing the list of payments as well as the rendered
         filter form.
     """
-    filter_form, filtering = handle_filtering(
+    filter_form = handle_filtering(
         request,
         FILTER_FORM,
         FILTER_SETTINGS,
         COOKIE_FORMATTERS,
         COOKIE_PARSERS,
-    )
-
-    payments = request.registry.payment_information.get_payments(
-        request.pagination.paging.page_number,
-        request.pagination.paging.page_size,
-        request.pagination.sorting.sort_property,
-        request.pagination.sorting.sort_direction,
-        filtering['from_date'],
-        filtering['to_date'],
-    )
+    )[0]
     return {
-        'payments': payments,
+        'payments': request.pagination_content,
         'filter_form': filter_form
     }
 
 
+def payment_page_content_provider(request, pagination_request):
+    """
+    Provides the payments of the requested page together with the payment
+    content size, i.e. the number of payments available to be displayed.
+
+    Both are retrieved from the database by a single query. The provider
+    only reads the filter values while the payment_list view handles the
+    filter form.
+
+    Args:
+        request: The pyramid.request.Request object from which form data and
+            cookie information is retrieved.
+        pagination_request: The PaginationRequest specifying the requested
+            page and sorting.
+
+    Returns:
+        A tuple of the list of payments of the page and an integer
+        representing the number of payments available for the current
+        filters.
+
+    Raises:
+        PageNotFoundException: In case the sort property is invalid.
+    """
+    filtering = get_request_filtering(
+        request, FILTER_FORM, FILTER_SETTINGS, COOKIE_PARSERS)
+    try:
+        return request.registry.payment_information.get_payments_page(
+            pagination_request.paging_request.page_number,
+            pagination_request.paging_request.page_size,
+            pagination_request.sorting.sort_property,
+            pagination_request.sorting.sort_direction,
+            filtering['from_date'],
+            filtering['to_date'])
+    except ValueError:
+        raise PageNotFoundException('Page not found.')
+
+
 def payment_content_size_provider(request):
     """
     Provides the payment content size, i.e. the number of payments available
     to be displayed.
 
+    The payment_list route uses payment_page_content_provider instead which
+    retrieves the content size together with the payments of the page.
+
     Args:
         request: The pyramid.request.Request object from which form data and
             cookie information is retrieved.
@@ -297,13 +363,74 @@ def payment_content_size_provider(request):
         An integer representing the number of payments available for the
         current filters.
     """
-    filtering = handle_filtering(
-        request,
-        FILTER_FORM,
-        FILTER_SETTINGS,
-        COOKIE_FORMATTERS,
-        COOKIE_PARSERS,
-    )[1]
+    filtering = get_request_filtering(
+        request, FILTER_FORM, FILTER_SETTINGS, COOKIE_PARSERS)
     return request.registry.payment_information.get_payment_count(
         filtering['from_date'],
         filtering['to_date'])
+
+
+PAYMENT_EXPORT_HEADER = [
+    u'Date',
+    u'Account',
+    u'Reference',
+    u'Membership number',
+    u'Firstname',
+    u'Lastname',
+    u'Amount',
+]
+
+
+def payment_export_rows(payments):
+    """
+    Converts payments to CSV rows.
+
+    Args:
+        payments: An iterable of payments.
+
+    Returns:
+        A generator of lists representing the CSV rows of the payments.
+    """
+    for payment in payments:
+        yield [
+            payment['date'].isoformat(),
+            payment['account'],
+            payment['reference'],
+            payment['membership_number'],
+            payment['firstname'],
+            payment['lastname'],
+            unicode(payment['amount']),
+        ]
+
+
+@view_config(
+    renderer='csv',
+    permission='manage',
+    route_name='payment_export')
+def payment_export(request):
+    """
+    Exports the payments according to the current filters as CSV.
+
+    The payments are streamed from the database and rendered as a streamed
+    response so that the memory used does not depend on the number of
+    payments.
+
+    Args:
+        request: The pyramid.request.Request object from which cookie
+            information is retrieved.
+
+    Returns:
+        A dictionary containing the CSV header and the generator of CSV rows.
+    """
+    filtering = get_filtering(request, FILTER_SETTINGS, COOKIE_PARSERS)
+    payments = request.registry.payment_information.iterate_payments(
+        'date',
+        'asc',
+        filtering['from_date'],
+        filtering['to_date'],
+    )
+    return {
+        'header': PAYMENT_EXPORT_HEADER,
+        'rows': payment_export_rows(payments),
+        'filename': 'payments.csv',
+    }
@@ -7,6 +7,8 @@ This module holds some search functionality:
 
 Buttons with links to the search views are placed in the toolbox.
 """
+import hashlib
+
 import colander
 import deform
 
@@ -14,6 +16,12 @@ from pyramid.httpexceptions import HTTPFound
 from pyramid.view import view_config
 
 from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.presentation.conditional_response import \
+    check_not_modified
+
+
+AUTOCOMPLETE_LIMIT_DEFAULT = 20
+AUTOCOMPLETE_LIMIT_MAX = 100
 
 
 @view_config(
@@ -123,6 +131,54 @@ def search_codes(request):
     }
 
 
+def _get_autocomplete_parameters(request):
+    """
+    Get the autocomplete parameters from the request.
+
+    The parameters are:
+
+    - term: The prefix to be matched.
+    - limit: Optional. The maximum number of results, defaults to
+      AUTOCOMPLETE_LIMIT_DEFAULT and is capped at AUTOCOMPLETE_LIMIT_MAX.
+    - ignore_case: Optional. If "1" or "true" the term is matched case
+      insensitive.
+
+    Returns:
+        A tuple of term, limit and case_sensitive.
+    """
+    text = request.params.get('term', '')
+    try:
+        limit = int(request.params.get('limit', AUTOCOMPLETE_LIMIT_DEFAULT))
+    except ValueError:
+        limit = AUTOCOMPLETE_LIMIT_DEFAULT
+    limit = max(1, min(limit, AUTOCOMPLETE_LIMIT_MAX))
+    ignore_case = request.params.get('ignore_case', '').lower() in [
+        '1', 'true']
+    return (text, limit, not ignore_case)
+
+
+def _check_not_modified(request, text, limit, case_sensitive):
+    """
+    Set the ETag of the autocomplete response and check whether the browser
+    already has the current answer.
+
+    The ETag is derived from the version of the member autocomplete index and
+    the request parameters so that browsers can revalidate their cached
+    answers.
+
+    Returns:
+        HTTPNotModified if the browser's cached answer is current, None
+        otherwise.
+    """
+    etag = hashlib.sha1(repr((
+        request.registry.member_autocomplete.get_version(),
+        request.matched_route.name,
+        text,
+        limit,
+        case_sensitive))).hexdigest()
+    return check_not_modified(request, etag)
+
+
 @view_config(renderer='json',
              permission='manage',
              route_name='autocomplete_input_values')
@@ -132,10 +188,15 @@ def autocomplete_input_values(request):
     returns the matching set of values for autocomplete/quicksearch
 
     this function and view expects a parameter 'term' (?term=foo) containing a
-    string to find matching entries (e.g. starting with 'foo') in the database
+    string to find matching entries (e.g. starting with 'foo') in the database.
+    See _get_autocomplete_parameters for the optional parameters.
     '''
-    text = request.params.get('term', '')
-    return C3sMember.get_matching_codes(text)
+    text, limit, case_sensitive = _get_autocomplete_parameters(request)
+    not_modified = _check_not_modified(request, text, limit, case_sensitive)
+    if not_modified is not None:
+        return not_modified
+    return request.registry.member_autocomplete.get_matching_codes(
+        text, limit, case_sensitive)
 
 
 @view_config(renderer='json',
@@ -147,7 +208,12 @@ def autocomplete_people_search(request):
     returns the matching set of values for autocomplete/quicksearch
 
     this function and view expects a parameter 'term' (?term=foo) containing a
-    string to find matching entries (e.g. starting with 'foo') in the database
+    string to find matching entries (e.g. starting with 'foo') in the database.
+    See _get_autocomplete_parameters for the optional parameters.
     '''
-    text = request.params.get('term', '')
-    return C3sMember.get_matching_people(text)
+    text, limit, case_sensitive = _get_autocomplete_parameters(request)
+    not_modified = _check_not_modified(request, text, limit, case_sensitive)
+    if not_modified is not None:
+        return not_modified
+    return request.registry.member_autocomplete.get_matching_people(
+        text, limit, case_sensitive)
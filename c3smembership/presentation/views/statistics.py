@@ -3,12 +3,51 @@
 Prepares statistics.
 """
 
+from datetime import (
+    date,
+    datetime,
+    time,
+)
+import hashlib
+from time import mktime
+
 from pyramid.view import view_config
 
-from c3smembership.data.model.base.c3smember import C3sMember
-from c3smembership.data.model.base.staff import Staff
-from c3smembership.data.repository.dues_invoice_repository import \
-    DuesInvoiceRepository
+from c3smembership.presentation.conditional_response import \
+    check_not_modified
+
+
+def check_statistics_not_modified(request, statistics_information):
+    """
+    Check whether the browser already has the current version of a page
+    depending on the statistics data version.
+
+    The ETag identifies the data version, the current date, the locale and the
+    user as the page content depends on them. The last modification is the
+    later of the last data change and the beginning of the local day, both in
+    UTC.
+
+    Args:
+        request: The pyramid.request.Request.
+        statistics_information: The StatisticsInformation providing the data
+            version.
+
+    Returns:
+        HTTPNotModified if the browser's page is current, None otherwise.
+    """
+    data_version, last_modified = statistics_information.get_data_version()
+    today = date.today()
+    etag = hashlib.sha1(repr((
+        data_version,
+        today,
+        request.locale_name,
+        request.authenticated_userid))).hexdigest()
+    start_of_day = datetime.utcfromtimestamp(
+        mktime(datetime.combine(today, time.min).timetuple()))
+    return check_not_modified(
+        request,
+        etag,
+        max(last_modified, start_of_day))
 
 
 @view_config(
@@ -20,54 +59,51 @@ def stats_view(request):
     This view lets accountants view statistics:
     how many membership applications, real members, shares, etc.
     """
-    # countries_dict = C3sMember.get_countries_list()
-    _cl = C3sMember.get_countries_list()
-    _cl_sorted = _cl.items()
-    import operator
-    _cl_sorted.sort(key=operator.itemgetter(1), reverse=True)
-    share_information = request.registry.share_information
+    statistics_information = request.registry.statistics_information
+    not_modified = check_statistics_not_modified(
+        request, statistics_information)
+    if not_modified is not None:
+        return not_modified
+    statistics = statistics_information.get_cached_statistics()
     return {
         # form submissions
-        '_number_of_datasets': C3sMember.get_number(),
-        'afm_shares_unpaid': C3sMember.afm_num_shares_unpaid(),
-        'afm_shares_paid': C3sMember.afm_num_shares_paid(),
+        '_number_of_datasets': statistics.datasets,
+        'afm_shares_unpaid': statistics.afm_shares_unpaid,
+        'afm_shares_paid': statistics.afm_shares_paid,
         # shares
-        'num_shares_members': share_information.get_share_count(),
-        # 'num_shares_mem_norm': Shares.get_sum_norm(),
-        # 'num_shares_mem_inv': Shares.get_sum_inv(),
+        'num_shares_members': statistics.share_count,
 
         # memberships
-        'num_members_accepted': C3sMember.get_num_members_accepted(),
-        'num_non_accepted': C3sMember.get_num_non_accepted(),
-        'num_nonmember_listing': C3sMember.nonmember_listing_count(),
-        'num_duplicates': len(C3sMember.get_duplicates()),
-        # 'num_empty_slots': C3sMember.get_num_empty_slots(),
+        'num_members_accepted': statistics.members_accepted,
+        'num_non_accepted': statistics.non_accepted,
+        'num_nonmember_listing': statistics.nonmember_listing,
+        'num_duplicates': statistics.duplicates,
         # normal persons vs. legal entities
-        'num_ms_nat_acc': C3sMember.get_num_mem_nat_acc(),
-        'num_ms_jur_acc': C3sMember.get_num_mem_jur_acc(),
+        'num_ms_nat_acc': statistics.natural_persons,
+        'num_ms_jur_acc': statistics.legal_entities,
         # normal vs. investing memberships
-        'num_ms_norm': C3sMember.get_num_mem_norm(),
-        'num_ms_inves': C3sMember.get_num_mem_invest(),
-        'num_ms_features': C3sMember.get_num_mem_other_features(),
-        'num_membership_lost': C3sMember.get_num_membership_lost(),
+        'num_ms_norm': statistics.normal,
+        'num_ms_inves': statistics.investing,
+        'num_ms_features': statistics.other_features,
+        'num_membership_lost': statistics.membership_lost,
         # membership_numbers
-        'num_memnums': C3sMember.get_num_membership_numbers(),
-        'max_memnum': C3sMember.get_highest_membership_number(),
-        'next_memnum': C3sMember.get_next_free_membership_number(),
+        'num_memnums': statistics.membership_numbers,
+        'max_memnum': statistics.highest_membership_number,
+        'next_memnum': statistics.next_membership_number,
 
         # countries
-        'num_countries': C3sMember.get_num_countries(),
-        'countries_list': _cl_sorted,
+        'num_countries': statistics.countries,
+        'countries_list': statistics.country_counts,
 
         # dues stats
-        'dues15_stats': DuesInvoiceRepository.get_monthly_stats(2015),
-        'dues16_stats': DuesInvoiceRepository.get_monthly_stats(2016),
-        'dues17_stats': DuesInvoiceRepository.get_monthly_stats(2017),
-        'dues18_stats': DuesInvoiceRepository.get_monthly_stats(2018),
-        'dues19_stats': DuesInvoiceRepository.get_monthly_stats(2019),
-        'dues20_stats': DuesInvoiceRepository.get_monthly_stats(2020),
-        'dues21_stats': DuesInvoiceRepository.get_monthly_stats(2021),
+        'dues15_stats': statistics.dues_stats[2015],
+        'dues16_stats': statistics.dues_stats[2016],
+        'dues17_stats': statistics.dues_stats[2017],
+        'dues18_stats': statistics.dues_stats[2018],
+        'dues19_stats': statistics.dues_stats[2019],
+        'dues20_stats': statistics.dues_stats[2020],
+        'dues21_stats': statistics.dues_stats[2021],
 
         # staff figures
-        'num_staff': len(Staff.get_all())
+        'num_staff': statistics.staff_count,
     }
@@ -296,25 +296,38 @@ class TestBackgroundArchiving(unittest.TestCase):
         # 1. Normal call
         background_archiving.logger = mock.Mock()
 
+        def archive_missing_invoices(progress):
+            progress('test.pdf')
+            progress('test2.pdf')
+            return ['test.pdf', 'test2.pdf']
+
+        self.dues_invoice_archiving.archive_missing_invoices.side_effect = \
+            archive_missing_invoices
+
         background_archiving(
             self.dues_invoice_archiving, self.background_archiving_control)
 
-        self.dues_invoice_archiving.get_archiving_stats.assert_called_with()
-        self.dues_invoice_archiving.generate_missing_invoice_pdfs \
-            .assert_called_with(2015, 1)
-        self.background_archiving_control.increment_count.assert_called_with()
+        self.assertEqual(
+            self.dues_invoice_archiving.archive_missing_invoices.call_count, 1)
+        self.assertEqual(
+            self.background_archiving_control.increment_count.call_count, 2)
         background_archiving.logger.info.assert_has_calls([
             mock.call('Generated %d invoice: %s', 1, 'test.pdf'),
+            mock.call('Generated %d invoice: %s', 1, 'test2.pdf'),
             mock.call('Finished background invoice archiving')])
+        self.background_archiving_control.stop.assert_called_with()
+        self.assertFalse(self.background_archiving_control.set_error.called)
 
         # 2. Exception handling
-        self.dues_invoice_archiving.get_archiving_stats.side_effect = [Exception()]
+        self.dues_invoice_archiving.archive_missing_invoices.side_effect = [
+            Exception()]
 
         background_archiving(
             self.dues_invoice_archiving, self.background_archiving_control)
 
         background_archiving.logger.exception.assert_called_with(
             'An error occured during background invoice archiving')
+        self.background_archiving_control.set_error.assert_called_with()
 
 
 class TestBackgroundArchivingControl(unittest.TestCase):
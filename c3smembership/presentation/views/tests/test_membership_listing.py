@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Tests the c3smembership.presentation.views.membership_listing module.
+"""
+
+from datetime import date
+from unittest import TestCase
+
+import mock
+
+from c3smembership.presentation.views.membership_listing import \
+    membership_content_version_provider
+
+
+class MembershipContentVersionProviderTest(TestCase):
+    """
+    Tests the membership_content_version_provider function.
+    """
+
+    @mock.patch(
+        'c3smembership.presentation.views.membership_listing.date')
+    @mock.patch(
+        'c3smembership.presentation.views.membership_listing.'
+        'DataVersionRepository')
+    def test_content_version(self, repository_mock, date_mock):
+        """
+        Test that the content version changes with the data version and the
+        date as memberships end at midnight.
+        """
+        repository_mock.get_data_version.return_value = ('version', None)
+        date_mock.today.return_value = date(2021, 3, 15)
+        version = membership_content_version_provider(None)
+        self.assertEqual(version, membership_content_version_provider(None))
+
+        date_mock.today.return_value = date(2021, 3, 16)
+        self.assertNotEqual(
+            version, membership_content_version_provider(None))
+
+        date_mock.today.return_value = date(2021, 3, 15)
+        repository_mock.get_data_version.return_value = ('other', None)
+        self.assertNotEqual(
+            version, membership_content_version_provider(None))
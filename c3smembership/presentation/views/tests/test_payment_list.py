@@ -4,12 +4,14 @@ Tests the c3smembership.presentation.views.payment_list package.
 """
 
 import datetime
+from decimal import Decimal
 import unittest
 
 import deform
 from mock import Mock
 from pyramid import testing
 
+from c3smembership.presentation.pagination import PageNotFoundException
 import c3smembership.presentation.views.payment_list as payment_list_package
 from c3smembership.presentation.views.payment_list import (
     date_cookie_formatter,
@@ -19,13 +21,15 @@ from c3smembership.presentation.views.payment_list import (
     reset_filtering,
     payment_list,
     payment_content_size_provider,
+    payment_export,
+    payment_page_content_provider,
     set_filters_to_cookies,
 )
 
 
 class TestPaymentList(unittest.TestCase):
     """
-    Tests the payment_list and payment_content_size_provider functions
+    Tests the payment_list and payment content provider functions
     from the c3smembership.presentation.views.payment_list package.
     """
 
@@ -301,28 +305,12 @@ class TestPaymentList(unittest.TestCase):
         payment_list_package.FILTER_FORM = Mock()
 
         # Test member found
-        payment_information_dummy = Mock()
-        payment_information_dummy.get_payments.side_effect = ['payment list']
-        payment_information_dummy.get_payment_count.side_effect = [1]
         request_dummy = testing.DummyRequest()
-        request_dummy.registry.payment_information = payment_information_dummy
-        request_dummy.pagination = Mock()
-        request_dummy.pagination.paging.page_number = 12
-        request_dummy.pagination.paging.page_size = 23
-        request_dummy.pagination.sorting.sort_property = 'sort property'
-        request_dummy.pagination.sorting.sort_direction = 'sort direction'
+        request_dummy.pagination_content = 'payment list'
 
         result = payment_list(request_dummy)
 
         self.assertEqual(result['payments'], 'payment list')
-        payment_information_dummy.get_payments.assert_called_with(
-            12,
-            23,
-            'sort property',
-            'sort direction',
-            None,
-            None
-        )
 
         # TODO: Cleanup dirty dependency injection. It's working but indicates
         # a design issue. Refactoring is required.
@@ -355,3 +343,113 @@ class TestPaymentList(unittest.TestCase):
         # a design issue. Refactoring is required.
         payment_list_package.FILTER_FORM = \
             original_filter_form
+
+    # pylint: disable=invalid-name
+    def test_payment_page_content_provider(self):
+        """
+        Tests the payment_page_content_provider function.
+        """
+        # TODO: Dependency injection the dirty way. It's working but indicates
+        # a design issue. Refactoring is required.
+        original_filter_form = \
+            payment_list_package.FILTER_FORM
+        payment_list_package.FILTER_FORM = Mock()
+
+        # Prepare
+        payment_information_dummy = Mock()
+        payment_information_dummy.get_payments_page.side_effect = [
+            ('payment list', 42)]
+        request_dummy = testing.DummyRequest()
+        request_dummy.registry.payment_information = payment_information_dummy
+        request_dummy.localizer = Mock()
+        pagination_request = Mock()
+        pagination_request.paging_request.page_number = 12
+        pagination_request.paging_request.page_size = 23
+        pagination_request.sorting.sort_property = 'sort property'
+        pagination_request.sorting.sort_direction = 'sort direction'
+
+        # Test
+        result = payment_page_content_provider(
+            request_dummy, pagination_request)
+        self.assertEqual(result, ('payment list', 42))
+        payment_information_dummy.get_payments_page.assert_called_with(
+            12,
+            23,
+            'sort property',
+            'sort direction',
+            None,
+            None
+        )
+
+        # Test invalid sort property
+        payment_information_dummy.get_payments_page.side_effect = \
+            ValueError()
+        with self.assertRaises(PageNotFoundException):
+            payment_page_content_provider(request_dummy, pagination_request)
+
+        # Test submitted filters are used without rendering the form or
+        # setting cookies
+        payment_list_package.FILTER_FORM.validate.side_effect = [{
+            'from_date': datetime.date(2018, 1, 1),
+            'to_date': datetime.date(2018, 12, 31),
+        }]
+        payment_information_dummy.get_payments_page.side_effect = [
+            ('payment list', 42)]
+        request_dummy = testing.DummyRequest(post={'submit': 'submit'})
+        request_dummy.registry.payment_information = payment_information_dummy
+        payment_page_content_provider(request_dummy, pagination_request)
+        payment_information_dummy.get_payments_page.assert_called_with(
+            12,
+            23,
+            'sort property',
+            'sort direction',
+            datetime.date(2018, 1, 1),
+            datetime.date(2018, 12, 31),
+        )
+        payment_list_package.FILTER_FORM.render.assert_not_called()
+        self.assertFalse('Set-Cookie' in request_dummy.response.headers)
+
+        # TODO: Cleanup dirty dependency injection. It's working but indicates
+        # a design issue. Refactoring is required.
+        payment_list_package.FILTER_FORM = \
+            original_filter_form
+
+    def test_payment_export(self):
+        """
+        Tests the payment_export function.
+        """
+        payment_information_dummy = Mock()
+        payment_information_dummy.iterate_payments.side_effect = [iter([
+            {
+                'date': datetime.date(2018, 6, 14),
+                'account': u'Membership dues 2018',
+                'reference': u'REF',
+                'membership_number': 123,
+                'firstname': u'Jane',
+                'lastname': u'Smith',
+                'amount': Decimal('12.34'),
+            },
+        ])]
+        request_dummy = testing.DummyRequest()
+        request_dummy.registry.payment_information = payment_information_dummy
+        request_dummy.cookies['payment_list.from_date'] = '2018-01-01'
+
+        result = payment_export(request_dummy)
+
+        payment_information_dummy.iterate_payments.assert_called_with(
+            'date',
+            'asc',
+            datetime.date(2018, 1, 1),
+            None)
+        self.assertEqual(result['header'][0], u'Date')
+        self.assertEqual(
+            list(result['rows']),
+            [[
+                '2018-06-14',
+                u'Membership dues 2018',
+                u'REF',
+                123,
+                u'Jane',
+                u'Smith',
+                u'12.34',
+            ]])
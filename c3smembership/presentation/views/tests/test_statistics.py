@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Tests the c3smembership.presentation.views.statistics module.
+"""
+
+from datetime import (
+    date,
+    datetime,
+)
+import os
+import time
+from unittest import TestCase
+
+import mock
+from pyramid import testing
+from pyramid.request import Request
+
+from c3smembership.presentation.views.statistics import \
+    check_statistics_not_modified
+
+
+class CheckStatisticsNotModifiedTest(TestCase):
+    """
+    Tests the check_statistics_not_modified function.
+    """
+
+    def setUp(self):
+        self.config = testing.setUp()
+        self._timezone = os.environ.get('TZ')
+        os.environ['TZ'] = 'Europe/Berlin'
+        time.tzset()
+
+    def tearDown(self):
+        if self._timezone is None:
+            del os.environ['TZ']
+        else:
+            os.environ['TZ'] = self._timezone
+        time.tzset()
+        testing.tearDown()
+
+    def _check(self, last_modified):
+        request = Request.blank('/')
+        request.registry = self.config.registry
+        statistics_information = mock.Mock()
+        statistics_information.get_data_version.return_value = (
+            'version', last_modified)
+        with mock.patch(
+                'c3smembership.presentation.views.statistics.date') \
+                as date_mock:
+            date_mock.today.return_value = date(2021, 3, 15)
+            check_statistics_not_modified(request, statistics_information)
+        return request.response.headers['Last-Modified']
+
+    def test_last_modified(self):
+        """
+        Test that the Last-Modified header is the later of the last data
+        change and the beginning of the local day in UTC.
+        """
+        self.assertEqual(
+            self._check(datetime(2021, 3, 1, 12, 0)),
+            'Sun, 14 Mar 2021 23:00:00 GMT')
+        self.assertEqual(
+            self._check(datetime(2021, 3, 15, 8, 30)),
+            'Mon, 15 Mar 2021 08:30:00 GMT')
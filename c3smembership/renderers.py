@@ -1,26 +1,70 @@
 import StringIO
 import unicodecsv
-from gnupg_encrypt import encrypt_with_gnupg
+from pyramid.response import FileIter
+from gnupg_encrypt import get_encryptor
 
 
 class CSVRenderer(object):
+    """
+    Renders a dictionary containing a header and rows as CSV.
+
+    If the rows are provided as a list the CSV is rendered at once. Otherwise,
+    e.g. for a generator, the CSV is streamed as the response body so that the
+    rows do not have to be kept in memory.
+
+    In prod mode the CSV is always streamed through gpg into a temporary file
+    which is streamed as the response body once the encryption succeeded.
+    The rows are generated in the request thread and a failing encryption
+    results in an error response instead of a truncated download.
+    """
+
+    STREAM_CHUNK_SIZE = 64 * 1024
+
     def __init__(self, info):
         pass
 
     def __call__(self, value, system):
+        resp = system['request'].response
+        resp.content_type = 'text/csv'
+        resp.content_disposition = 'attachment;filename="{0}"'.format(
+            value.get('filename', 'yes.csv'))
+        runmode = system['request'].registry.settings[
+            'c3smembership.runmode']
+
+        if runmode == 'prod':
+            return FileIter(
+                get_encryptor().encrypt_to_file(
+                    self._iterate_csv(value['header'], value['rows'])),
+                self.STREAM_CHUNK_SIZE)
+
+        if isinstance(value['rows'], (list, tuple)):
+            fout = StringIO.StringIO()
+            writer = unicodecsv.writer(
+                fout, delimiter=';', quoting=unicodecsv.QUOTE_ALL)
+
+            writer.writerow(value['header'])
+            writer.writerows(value['rows'])
+            csv = fout.getvalue()
+        else:
+            csv = self._iterate_csv(value['header'], value['rows'])
+
+        if runmode == 'dev':
+            return csv
+
+    @classmethod
+    def _iterate_csv(cls, header, rows):
+        """
+        Generates the CSV in chunks of about STREAM_CHUNK_SIZE bytes.
+        """
         fout = StringIO.StringIO()
         writer = unicodecsv.writer(
             fout, delimiter=';', quoting=unicodecsv.QUOTE_ALL)
-
-        writer.writerow(value['header'])
-        writer.writerows(value['rows'])
-
-        resp = system['request'].response
-        resp.content_type = 'text/csv'
-        resp.content_disposition = 'attachment;filename="yes.csv"'
-        if system['request'].registry.settings[
-                'c3smembership.runmode'] == 'dev':
-            return fout.getvalue()
-        if system['request'].registry.settings[
-                'c3smembership.runmode'] == 'prod':
-            return encrypt_with_gnupg(fout.getvalue())
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            if fout.tell() >= cls.STREAM_CHUNK_SIZE:
+                yield fout.getvalue()
+                fout.seek(0)
+                fout.truncate()
+        if fout.tell() > 0:
+            yield fout.getvalue()
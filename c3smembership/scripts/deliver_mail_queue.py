@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Deliver the emails of the durable mail queue
+
+If the web application is configured with 0 mail queue workers, the emails are
+only enqueued and must be delivered by a separate process. In setup.py the
+section 'console_scripts' under 'entry_points' creates the console script:
+
+  env/bin/deliver_c3sMembership_mail_queue development.ini
+
+The script runs the configured number of worker threads, at least one, until
+it is terminated. With the option --once it delivers all emails which are due
+and exits. With the option --failures it lists the recently recorded
+notification failures and exits.
+"""
+
+import os
+import signal
+import sys
+import datetime
+import time
+
+from pyramid.config import Configurator
+from pyramid.paster import (
+    get_appsettings,
+    setup_logging,
+)
+from pyramid_mailer.interfaces import IMailer
+
+from c3smembership.mail_queue import (
+    create_workers,
+    shutdown,
+)
+
+
+def usage(argv):
+    """
+    Print usage information if the script was called with bad arguments
+    """
+    cmd = os.path.basename(argv[0])
+    print('usage: %s <config_uri> [--once|--failures]\n'
+          '(example: "%s production.ini")' % (cmd, cmd))
+    sys.exit(1)
+
+
+def _terminate(signum, frame):
+    """
+    Exit on SIGTERM so that the workers are stopped
+    """
+    # pylint: disable=unused-argument
+    sys.exit(0)
+
+
+def main(argv=sys.argv):
+    """
+    Deliver the emails of the mail queue configured in the config file
+    """
+    if len(argv) not in (2, 3) or \
+            argv[2:] not in ([], ['--once'], ['--failures']):
+        usage(argv)
+    config_uri = argv[1]
+    setup_logging(config_uri)
+    settings = get_appsettings(config_uri)
+
+    config = Configurator(settings=settings)
+    config.include('pyramid_mailer')
+    config.include('c3smembership.smtp_pool')
+    workers = max(
+        1, int(settings.get('c3smembership.mail_queue.workers', 2)))
+    queue_workers = create_workers(
+        settings, config.registry.getUtility(IMailer), workers)
+    if queue_workers is None:
+        print('The mail queue path is not configured.')
+        sys.exit(1)
+    mail_queue, workers = queue_workers
+
+    if '--failures' in argv:
+        try:
+            for failure in mail_queue.get_failures():
+                print('%s %s: %s' % (
+                    datetime.datetime.fromtimestamp(failure.failed).strftime(
+                        '%Y-%m-%d %H:%M:%S'),
+                    failure.notification,
+                    failure.error))
+        finally:
+            mail_queue.close()
+        return
+
+    if '--once' in argv:
+        try:
+            print('Delivered %s emails.' % workers.drain())
+        finally:
+            mail_queue.close()
+        return
+
+    signal.signal(signal.SIGTERM, _terminate)
+    workers.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown(mail_queue, workers)
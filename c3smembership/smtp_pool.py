@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+Provide pooled SMTP delivery of emails
+
+The pyramid_mailer SMTP mailer opens a new connection including the TLS
+handshake and the login for each email. When sending many emails like dues
+invoices or general assembly invitations the connection setup dominates the
+cost. Instead, a pool keeps a few SMTP sessions open and sends several emails
+per session at a configurable maximum rate.
+
+The pool is enabled by configuring its size in the settings:
+
+    c3smembership.smtp_pool.size = 2
+    c3smembership.smtp_pool.max_messages = 100
+    c3smembership.smtp_pool.idle_timeout = 30
+    c3smembership.smtp_pool.rate_limit = 10
+
+For testing, the mail settings can point to a local debugging SMTP server
+printing the emails to the console:
+
+    python -m smtpd -n -c DebuggingServer localhost:1025
+"""
+
+from email.message import Message as EmailMessage
+import logging
+import smtplib
+import socket
+import threading
+import time
+
+from pyramid_mailer.interfaces import IMailer
+from repoze.sendmail.delivery import DirectMailDelivery
+from repoze.sendmail.encoding import encode_message
+
+
+LOG = logging.getLogger(__name__)
+
+
+class RateLimiter(object):
+    """
+    Limit the rate of operations across threads
+
+    The rate limiter implements a token bucket. Operations can be executed at
+    once as long as tokens are available. Otherwise, the operations wait until
+    the bucket is refilled.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, rate, burst=1, clock=time.time, sleep=time.sleep):
+        """
+        Initialize the RateLimiter object
+
+        Args:
+            rate: Number. The number of operations per second.
+            burst: Integer. Optional. The number of operations which can be
+                executed at once after being idle. Defaults to 1.
+            clock: Optional. The callable returning the current time in
+                seconds.
+            sleep: Optional. The callable waiting for a number of seconds.
+        """
+        self._rate = float(rate)
+        self._burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Wait until the operation may be executed
+
+        Returns:
+            The number of seconds waited.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self._burst,
+                self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class _SmtpSession(object):
+    """
+    An open SMTP connection and the number of emails sent through it
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, connection, now):
+        self.connection = connection
+        self.messages = 0
+        self.used = now
+
+    def close(self):
+        """
+        Close the connection ignoring errors of already broken connections
+        """
+        try:
+            self.connection.quit()
+        except (smtplib.SMTPException, socket.error):
+            self.connection.close()
+
+
+class PooledSmtpMailer(object):
+    """
+    SMTP mailer sending emails through a pool of persistent SMTP sessions
+
+    The PooledSmtpMailer provides the send method of the repoze.sendmail
+    SMTPMailer and uses its connection settings.
+    """
+
+    def __init__(self, smtp_mailer, size=2, max_messages=100, idle_timeout=30,
+                 rate_limiter=None):
+        """
+        Initialize the PooledSmtpMailer object
+
+        Args:
+            smtp_mailer: The repoze.sendmail SMTPMailer providing the
+                connection settings and the SMTP connection factory.
+            size: Integer. Optional. The maximum number of SMTP sessions open
+                at the same time. Defaults to 2.
+            max_messages: Integer. Optional. The number of emails after which
+                a session is closed. Defaults to 100.
+            idle_timeout: Number. Optional. The number of seconds after which
+                an unused session is closed. Defaults to 30.
+            rate_limiter: Optional. The RateLimiter limiting the number of
+                emails sent per second.
+        """
+        self._smtp_mailer = smtp_mailer
+        self._max_messages = max_messages
+        self._idle_timeout = idle_timeout
+        self._rate_limiter = rate_limiter
+        self._available = threading.BoundedSemaphore(size)
+        self._idle_sessions = []
+        self._lock = threading.Lock()
+
+    def send(self, fromaddr, toaddrs, message):
+        """
+        Send the email through a pooled SMTP session
+
+        An email sent through a session which was reused is retried once on
+        a new session if the mail server closed the connection in the
+        meantime.
+
+        Args:
+            fromaddr: The email address of the sender.
+            toaddrs: The list of email addresses of the recipients.
+            message: The email.message.Message to be sent.
+        """
+        if not isinstance(message, EmailMessage):
+            raise ValueError(
+                'Message must be instance of email.message.Message')
+        message = encode_message(message)
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+        with self._available:
+            session = self._get_session()
+            try:
+                self._send(session, fromaddr, toaddrs, message)
+            except (smtplib.SMTPServerDisconnected, socket.error):
+                if session.messages == 0:
+                    raise
+                LOG.info('Reconnecting the closed SMTP session.')
+                session = self._connect()
+                self._send(session, fromaddr, toaddrs, message)
+            self._release_session(session)
+
+    def close(self):
+        """
+        Close all idle SMTP sessions
+        """
+        with self._lock:
+            sessions = self._idle_sessions
+            self._idle_sessions = []
+        for session in sessions:
+            session.close()
+
+    def _send(self, session, fromaddr, toaddrs, message):
+        """
+        Send the email and keep the session open if the mail server only
+        rejected the email
+        """
+        try:
+            session.connection.sendmail(fromaddr, toaddrs, message)
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused,
+                smtplib.SMTPDataError):
+            try:
+                session.connection.rset()
+            except (smtplib.SMTPException, socket.error):
+                session.close()
+            else:
+                self._release_session(session)
+            raise
+        except:
+            session.close()
+            raise
+        session.messages += 1
+
+    def _get_session(self):
+        """
+        Get the most recently used idle session or connect a new one
+        """
+        now = time.time()
+        expired = []
+        session = None
+        with self._lock:
+            while self._idle_sessions:
+                candidate = self._idle_sessions.pop()
+                if now - candidate.used > self._idle_timeout:
+                    expired.append(candidate)
+                else:
+                    session = candidate
+                    break
+        for expired_session in expired:
+            expired_session.close()
+        if session is None:
+            session = self._connect()
+        return session
+
+    def _release_session(self, session):
+        """
+        Return the session to the pool or close it if it sent the maximum
+        number of emails
+        """
+        if session.messages >= self._max_messages:
+            session.close()
+            return
+        session.used = time.time()
+        with self._lock:
+            self._idle_sessions.append(session)
+
+    def _connect(self):
+        """
+        Open an SMTP session like the repoze.sendmail SMTPMailer does
+        """
+        connection = self._smtp_mailer.smtp_factory()
+        try:
+            code, response = connection.ehlo()
+            if code < 200 or code >= 300:
+                code, response = connection.helo()
+                if code < 200 or code >= 300:
+                    raise RuntimeError(
+                        'Error sending HELO to the SMTP server '
+                        '(code={0}, response={1})'.format(code, response))
+
+            have_tls = connection.has_extn('starttls')
+            if not have_tls and self._smtp_mailer.force_tls:
+                raise RuntimeError(
+                    'TLS is not available but TLS is required')
+            if have_tls and not self._smtp_mailer.no_tls:
+                connection.starttls()
+                connection.ehlo()
+
+            if connection.does_esmtp:
+                if self._smtp_mailer.username is not None and \
+                        self._smtp_mailer.password is not None:
+                    connection.login(
+                        self._smtp_mailer.username,
+                        self._smtp_mailer.password)
+            elif self._smtp_mailer.username:
+                raise RuntimeError(
+                    'Mailhost does not support ESMTP but a username is '
+                    'configured')
+        except:
+            connection.close()
+            raise
+        return _SmtpSession(connection, time.time())
+
+
+class PooledMailer(object):
+    """
+    Mailer wrapping the pyramid_mailer Mailer to send via a PooledSmtpMailer
+
+    The sending methods using SMTP are provided with the same semantics as the
+    pyramid_mailer Mailer. All other attributes are taken from the wrapped
+    mailer.
+    """
+
+    def __init__(self, mailer, smtp_mailer):
+        """
+        Initialize the PooledMailer object
+
+        Args:
+            mailer: The pyramid_mailer Mailer.
+            smtp_mailer: The PooledSmtpMailer sending the emails.
+        """
+        self._mailer = mailer
+        self.smtp_mailer = smtp_mailer
+        self.direct_delivery = DirectMailDelivery(smtp_mailer)
+
+    def __getattr__(self, name):
+        return getattr(self._mailer, name)
+
+    def send(self, message):
+        """
+        Send the message when the current transaction is committed
+
+        Args:
+            message: The pyramid_mailer.message.Message to be sent.
+        """
+        return self.direct_delivery.send(*self._get_message_args(message))
+
+    def send_immediately(self, message, fail_silently=False):
+        """
+        Send the message independent of the current transaction
+
+        Args:
+            message: The pyramid_mailer.message.Message to be sent.
+            fail_silently: Boolean. Optional. Whether errors sending the
+                message are ignored. Defaults to False.
+        """
+        try:
+            return self.smtp_mailer.send(*self._get_message_args(message))
+        except smtplib.socket.error:
+            if not fail_silently:
+                raise
+
+    def _get_message_args(self, message):
+        """
+        Get the sender, recipients and email message of the message
+        """
+        message.sender = message.sender or self._mailer.default_sender
+        return (message.sender, message.send_to, message.to_message())
+
+
+def includeme(config):
+    """
+    Configure the pooled SMTP delivery from the settings
+
+    The settings are:
+
+    - c3smembership.smtp_pool.size: Optional, defaults to 0. The maximum
+      number of SMTP sessions open at the same time. The pool is disabled with
+      0 sessions.
+    - c3smembership.smtp_pool.max_messages: Optional, defaults to 100. The
+      number of emails after which a session is closed.
+    - c3smembership.smtp_pool.idle_timeout: Optional, defaults to 30. The
+      number of seconds after which an unused session is closed.
+    - c3smembership.smtp_pool.rate_limit: Optional, defaults to 0. The maximum
+      number of emails sent per second. There is no limit with 0.
+
+    The mailer registered by pyramid_mailer is wrapped and must therefore be
+    included before.
+
+    Args:
+        config: The pyramid.config.Configurator.
+    """
+    settings = config.registry.settings
+    size = int(settings.get('c3smembership.smtp_pool.size', 0))
+    if size <= 0:
+        return
+    rate_limit = float(settings.get('c3smembership.smtp_pool.rate_limit', 0))
+    smtp_mailer = PooledSmtpMailer(
+        config.registry.getUtility(IMailer).smtp_mailer,
+        size=size,
+        max_messages=int(
+            settings.get('c3smembership.smtp_pool.max_messages', 100)),
+        idle_timeout=float(
+            settings.get('c3smembership.smtp_pool.idle_timeout', 30)),
+        rate_limiter=RateLimiter(rate_limit) if rate_limit > 0 else None)
+    config.registry.registerUtility(
+        PooledMailer(config.registry.getUtility(IMailer), smtp_mailer),
+        IMailer)
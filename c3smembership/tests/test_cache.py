@@ -7,14 +7,26 @@ from datetime import (
     datetime,
     timedelta,
 )
+import os
+import shutil
+import tempfile
+import threading
 from unittest import TestCase
 
 from mock import Mock
 
 from c3smembership.cache import (
     Cache,
+    CacheMetrics,
+    MemoryCacheBackend,
+    MemoryCounter,
+    SqliteCacheBackend,
+    SqliteCounter,
     cached,
+    close_connections,
+    configure_cache,
     default_duration_provider,
+    get_counter,
 )
 
 
@@ -224,3 +236,376 @@ class CacheTest(TestCase):
         Test the default_duration_provider method"
         """
         self.assertEqual(default_duration_provider(), timedelta(hours=4))
+
+    def test_cache_key_expiration(self):
+        """
+        Test that the cache duration applies to each value separately
+
+        1. Call 1 is executed
+        2. Call 2 is executed later
+        3. Call 1 expired is executed
+        4. Call 2 not expired gets from cache
+        """
+        # 1. Call 1 is executed
+        self._init(
+            datetime(2019, 5, 21, 20, 6, 10),
+            timedelta(minutes=1),
+            'function result 1')
+        self.cached_function(1)
+
+        # 2. Call 2 is executed later
+        self._init(
+            datetime(2019, 5, 21, 20, 6, 50),
+            timedelta(minutes=1),
+            'function result 2')
+        self.cached_function(2)
+
+        # 3. Call 1 expired is executed
+        self._init(
+            datetime(2019, 5, 21, 20, 7, 20),
+            timedelta(minutes=1),
+            'function result 3')
+        result = self.cached_function(1)
+
+        self.assertEqual(len(self.function_mock.mock_calls), 3)
+        self.assertEqual(result, 'function result 3')
+
+        # 4. Call 2 not expired gets from cache
+        self._init(
+            datetime(2019, 5, 21, 20, 7, 30),
+            timedelta(minutes=1),
+            'whatever')
+        result = self.cached_function(2)
+
+        self.assertEqual(len(self.function_mock.mock_calls), 3)
+        self.assertEqual(result, 'function result 2')
+
+    def test_cache_eviction(self):
+        """
+        Test the eviction of the least recently used values
+
+        1. Call 1, 3 and 2 are executed with a maximum size of 2 evicting 1
+        2. Call 3 gets from cache
+        3. Call 1 is executed again evicting 2
+        """
+        self.cache = Cache(
+            duration_provider=self.dummy_duration_provider, max_size=2)
+        self.cache.datetime = Mock()
+        self.cached_function = self.cache(self.function_mock)
+        now = datetime(2019, 5, 21, 20, 6, 10)
+
+        # 1. Call 1, 3 and 2 are executed with a maximum size of 2
+        for value in [1, 3, 2]:
+            self._init(now, timedelta(minutes=1), value)
+            self.cached_function(value)
+        self.assertEqual(
+            self.cached_function.get_metrics(),
+            CacheMetrics(hits=0, misses=3, evictions=1, size=2, max_size=2))
+
+        # 2. Call 3 gets from cache
+        self._init(now, timedelta(minutes=1), 'whatever')
+        self.assertEqual(self.cached_function(3), 3)
+
+        # 3. Call 1 is executed again evicting 2
+        self._init(now, timedelta(minutes=1), 'new 1')
+        self.assertEqual(self.cached_function(1), 'new 1')
+        self._init(now, timedelta(minutes=1), 'whatever')
+        self.assertEqual(self.cached_function(3), 3)
+        self.assertEqual(
+            self.cached_function.get_metrics(),
+            CacheMetrics(hits=2, misses=4, evictions=2, size=2, max_size=2))
+
+    def test_cache_unhashable_arguments(self):
+        """
+        Test the caching of calls with unhashable arguments
+        """
+        now = datetime(2019, 5, 21, 20, 6, 10)
+        self._init(now, timedelta(minutes=1), 'list result')
+        result = self.cached_function([1, 2], a={'b': 'c'})
+        self.assertEqual(result, 'list result')
+
+        self._init(now, timedelta(minutes=1), 'whatever')
+        result = self.cached_function([1, 2], a={'b': 'c'})
+        self.assertEqual(result, 'list result')
+        self.assertEqual(len(self.function_mock.mock_calls), 1)
+
+    def test_cache_key_provider(self):
+        """
+        Test the caching with a key provider
+
+        1. Call with key 1 is executed
+        2. Call with the same key but different arguments gets from cache
+        3. Call with key 2 is executed
+        """
+        key_provider = Mock()
+        self.cache = Cache(
+            duration_provider=self.dummy_duration_provider,
+            key_provider=key_provider)
+        self.cache.datetime = Mock()
+        self.cached_function = self.cache(self.function_mock)
+        now = datetime(2019, 5, 21, 20, 6, 10)
+
+        # 1. Call with key 1 is executed
+        key_provider.side_effect = [1]
+        self._init(now, timedelta(minutes=1), 'result 1')
+        self.assertEqual(self.cached_function('a', b='c'), 'result 1')
+        key_provider.assert_called_with('a', b='c')
+
+        # 2. Call with the same key but different arguments gets from cache
+        key_provider.side_effect = [1]
+        self._init(now, timedelta(minutes=1), 'whatever')
+        self.assertEqual(self.cached_function('d', b='e'), 'result 1')
+        self.function_mock.assert_called_once_with('a', b='c')
+
+        # 3. Call with key 2 is executed
+        key_provider.side_effect = [2]
+        self._init(now, timedelta(minutes=1), 'result 2')
+        self.assertEqual(self.cached_function('d', b='e'), 'result 2')
+        self.function_mock.assert_called_with('d', b='e')
+
+    def test_cache_concurrent_fill(self):
+        """
+        Test that concurrent calls with the same arguments execute the wrapped
+        function only once
+        """
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_function(value):
+            calls.append(value)
+            started.set()
+            release.wait(5)
+            return value * 2
+
+        cache = Cache(duration_provider=lambda: timedelta(minutes=1))
+        cached_function = cache(slow_function)
+        results = []
+
+        def call():
+            results.append(cached_function(21))
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(calls, [21])
+        self.assertEqual(results, [42] * 5)
+        metrics = cached_function.get_metrics()
+        self.assertEqual(metrics.misses, 1)
+        self.assertEqual(metrics.hits, 4)
+
+
+    def test_backend_access_unlocked(self):
+        """
+        Test that slow backend access does not block other calls
+        """
+        entered = threading.Event()
+        release = threading.Event()
+        backend = MemoryCacheBackend('test', 10)
+        original_get = backend.get
+
+        def get(cache_key):
+            if cache_key == (1,):
+                entered.set()
+                release.wait(5)
+            return original_get(cache_key)
+
+        backend.get = get
+        cache = Cache(duration_provider=lambda: timedelta(minutes=1))
+        # pylint: disable=protected-access
+        cache._backend = backend
+        cached_function = cache(lambda value: value * 2)
+
+        thread = threading.Thread(target=cached_function, args=(1,))
+        thread.start()
+        self.assertTrue(entered.wait(5))
+        results = []
+        other_thread = threading.Thread(
+            target=lambda: results.append(cached_function(2)))
+        other_thread.start()
+        other_thread.join(2)
+        self.assertFalse(other_thread.is_alive())
+        release.set()
+        thread.join(5)
+        self.assertEqual(results, [4])
+
+
+class SqliteCacheBackendTest(TestCase):
+    """
+    Test the SqliteCacheBackend class
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite')
+
+    def tearDown(self):
+        close_connections()
+        shutil.rmtree(self.directory)
+
+    def test_get_set(self):
+        """
+        Test getting and setting values shared between backend instances
+        """
+        backend = SqliteCacheBackend('test', 10, self.path)
+        other_backend = SqliteCacheBackend('test', 10, self.path)
+        other_name_backend = SqliteCacheBackend('other', 10, self.path)
+        cached_at = datetime(2019, 5, 21, 20, 6, 10)
+
+        self.assertEqual(backend.get((1, 'a')), None)
+        self.assertEqual(backend.set((1, 'a'), {'b': [2]}, cached_at), 0)
+        self.assertEqual(other_backend.get((1, 'a')), ({'b': [2]}, cached_at))
+        self.assertEqual(other_name_backend.get((1, 'a')), None)
+        self.assertEqual(other_backend.get_size(), 1)
+
+        other_backend.clear()
+        self.assertEqual(backend.get((1, 'a')), None)
+        self.assertEqual(backend.get_size(), 0)
+
+    def test_key_serialisation(self):
+        """
+        Test that keys including keyword arguments are identified by the same
+        hash in all processes
+        """
+        # pylint: disable=protected-access
+        cache_key = Cache._build_key((1, u'a'), {'b': 2})
+        self.assertEqual(
+            SqliteCacheBackend._hash_key(cache_key),
+            '263dc225d58b705390ee645a86dbc2b2d92785e2')
+        self.assertNotEqual(
+            SqliteCacheBackend._hash_key(cache_key),
+            SqliteCacheBackend._hash_key((1, 'a', '<kwargs>', ('b', 2))))
+
+        backend = SqliteCacheBackend('test', 10, self.path)
+        backend.set(cache_key, 'value', datetime(2019, 5, 21, 20, 6, 10))
+        self.assertEqual(
+            SqliteCacheBackend('test', 10, self.path).get(
+                Cache._build_key((1, u'a'), {'b': 2}))[0],
+            'value')
+
+    def test_close_connections(self):
+        """
+        Test that closed connections are reopened on next use
+        """
+        backend = SqliteCacheBackend('test', 10, self.path)
+        cached_at = datetime(2019, 5, 21, 20, 6, 10)
+        backend.set(1, 'one', cached_at)
+        close_connections()
+        self.assertEqual(backend.get(1), ('one', cached_at))
+
+    def test_eviction(self):
+        """
+        Test the eviction of the least recently used values
+        """
+        backend = SqliteCacheBackend('test', 2, self.path)
+        cached_at = datetime(2019, 5, 21, 20, 6, 10)
+        self.assertEqual(backend.set(1, 'one', cached_at), 0)
+        self.assertEqual(backend.set(2, 'two', cached_at), 0)
+        self.assertEqual(backend.set(3, 'three', cached_at), 1)
+        self.assertEqual(backend.get_size(), 2)
+        self.assertEqual(backend.get(1), None)
+        self.assertEqual(backend.get(3), ('three', cached_at))
+
+
+class CounterTest(TestCase):
+    """
+    Test the MemoryCounter and SqliteCounter classes
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite')
+
+    def tearDown(self):
+        close_connections()
+        shutil.rmtree(self.directory)
+
+    def _test_increment(self, counter):
+        version, modified = counter.get()
+        counter.increment()
+        new_version, new_modified = counter.get()
+        self.assertNotEqual(new_version, version)
+        self.assertTrue(new_modified >= modified)
+        return new_version
+
+    def test_memory_counter(self):
+        """
+        Test that memory counters are independent of each other
+        """
+        counter = MemoryCounter('test')
+        version = self._test_increment(counter)
+        self.assertNotEqual(MemoryCounter('test').get()[0], version)
+
+    def test_sqlite_counter(self):
+        """
+        Test that SQLite counters of the same name are shared
+        """
+        counter = SqliteCounter('test', self.path)
+        version = self._test_increment(counter)
+        self.assertEqual(SqliteCounter('test', self.path).get()[0], version)
+        self.assertNotEqual(
+            SqliteCounter('other', self.path).get()[0], version)
+
+
+class ConfigureCacheTest(TestCase):
+    """
+    Test the configure_cache function
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite')
+
+    def tearDown(self):
+        configure_cache({})
+        shutil.rmtree(self.directory)
+
+    def test_memory(self):
+        """
+        Test the memory backend
+        """
+        configure_cache({'c3smembership.cache.backend': 'memory'})
+        self.assertTrue(isinstance(get_counter('test'), MemoryCounter))
+        cache = Cache(lambda: timedelta(minutes=1))
+        # pylint: disable=protected-access
+        self.assertTrue(
+            isinstance(cache._get_backend(), MemoryCacheBackend))
+
+    def test_sqlite(self):
+        """
+        Test that caches of the same name share their values using the
+        sqlite backend
+        """
+        configure_cache({
+            'c3smembership.cache.backend': 'sqlite',
+            'c3smembership.cache.path': self.path,
+        })
+        self.assertTrue(isinstance(get_counter('test'), SqliteCounter))
+        function_mock = Mock()
+        function_mock.side_effect = ['result', 'other result']
+        cached_function = Cache(
+            lambda: timedelta(minutes=1), name='test')(function_mock)
+        other_cached_function = Cache(
+            lambda: timedelta(minutes=1), name='test')(function_mock)
+
+        self.assertEqual(cached_function(1, a=2), 'result')
+        self.assertEqual(other_cached_function(1, a=2), 'result')
+        self.assertEqual(len(function_mock.mock_calls), 1)
+
+        other_cached_function.expire_cache()
+        self.assertEqual(cached_function(1, a=2), 'other result')
+
+    def test_invalid(self):
+        """
+        Test invalid settings
+        """
+        with self.assertRaises(ValueError):
+            configure_cache({'c3smembership.cache.backend': 'unknown'})
+        with self.assertRaises(ValueError):
+            configure_cache({'c3smembership.cache.backend': 'sqlite'})
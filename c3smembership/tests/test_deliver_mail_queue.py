@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Test the c3smembership.scripts.deliver_mail_queue module
+"""
+
+import os
+import shutil
+from StringIO import StringIO
+import tempfile
+from unittest import TestCase
+
+from mock import (
+    Mock,
+    patch,
+)
+
+from c3smembership.mail_queue import MailQueue
+from c3smembership.scripts.deliver_mail_queue import main
+
+
+class DeliverMailQueueTest(TestCase):
+    """
+    Test the deliver_c3sMembership_mail_queue console script
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'mail_queue.sqlite')
+        self.settings = {
+            'c3smembership.mail_queue.path': self.path,
+            'c3smembership.mail_queue.workers': '0',
+        }
+        self.patchers = [
+            patch(
+                'c3smembership.scripts.deliver_mail_queue.setup_logging'),
+            patch(
+                'c3smembership.scripts.deliver_mail_queue.get_appsettings',
+                return_value=self.settings),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        shutil.rmtree(self.directory)
+
+    def test_usage(self):
+        """
+        Test that bad arguments print the usage
+        """
+        for argv in [
+                ['deliver'],
+                ['deliver', 'production.ini', '--forever'],
+                ['deliver', 'production.ini', '--once', '--once'],
+                ['deliver', 'production.ini', '--once', '--failures']]:
+            with self.assertRaises(SystemExit):
+                main(argv)
+
+    def test_not_configured(self):
+        """
+        Test that the script fails without queue path
+        """
+        del self.settings['c3smembership.mail_queue.path']
+        with self.assertRaises(SystemExit):
+            main(['deliver', 'production.ini', '--once'])
+
+    @patch('c3smembership.mail_queue.SmtpDelivery')
+    def test_once(self, mock_smtp_delivery):
+        """
+        Test that the queued emails are delivered with --once
+        """
+        deliver = Mock()
+        mock_smtp_delivery.return_value = deliver
+        mail_queue = MailQueue(self.path)
+        mail_queue.enqueue([
+            ('a@example.com', ['b@example.com'], 'message')] * 2)
+
+        main(['deliver', 'production.ini', '--once'])
+
+        self.assertEqual(deliver.call_count, 2)
+        self.assertEqual(mail_queue.get_status_counts(), {'sent': 2})
+        mail_queue.close()
+
+    @patch('c3smembership.mail_queue.SmtpDelivery')
+    def test_failures(self, mock_smtp_delivery):
+        """
+        Test that the recorded notification failures are listed with
+        --failures without delivering emails
+        """
+        deliver = Mock()
+        mock_smtp_delivery.return_value = deliver
+        mail_queue = MailQueue(self.path)
+        mail_queue.enqueue([('a@example.com', ['b@example.com'], 'message')])
+        mail_queue.record_failure('notification', u'OSError: gpg not found')
+
+        with patch('sys.stdout', new_callable=StringIO) as stdout:
+            main(['deliver', 'production.ini', '--failures'])
+
+        self.assertTrue(
+            'notification: OSError: gpg not found' in stdout.getvalue())
+        self.assertEqual(deliver.call_count, 0)
+        self.assertEqual(mail_queue.get_status_counts(), {'queued': 1})
+        mail_queue.close()
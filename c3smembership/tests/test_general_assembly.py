@@ -25,6 +25,8 @@ from c3smembership.data.repository.general_assembly import \
 from c3smembership.data.repository.member_repository import MemberRepository
 from c3smembership.business.member_information import MemberInformation
 from c3smembership.business.general_assembly import GeneralAssemblyInvitation
+from c3smembership.business.general_assembly.invitation_campaign import \
+    InvitationCampaign
 from c3smembership.presentation.views.general_assembly import (
     batch_invite,
     general_assembly_invitation,
@@ -230,6 +232,10 @@ class TestInvitation(unittest.TestCase):
         self.config.registry.general_assembly_invitation = \
             GeneralAssemblyInvitation(GeneralAssemblyRepository())
         self.config.registry.general_assembly_invitation.date = mock.Mock()
+        self.config.registry.general_assembly_invitation_campaign = \
+            InvitationCampaign(
+                self.config.registry.general_assembly_invitation,
+                GeneralAssemblyRepository())
         self.config.registry.member_information = MemberInformation(
             MemberRepository)
         self.session = init_db()
@@ -431,3 +437,60 @@ class TestInvitation(unittest.TestCase):
 
         mailer = get_mailer(req)
         self.assertEqual(len(mailer.outbox), 4)
+
+    def test_invitation_batch_all(self):
+        """
+        Test the batch invitation of all members which have not been invited
+        yet.
+        """
+        req = testing.DummyRequest()
+        general_assembly = mock.Mock()
+        general_assembly.number = CURRENT_GENERAL_ASSEMBLY
+        req.validated_matchdict = {'general_assembly': general_assembly}
+        req.validated_post = {'count': 1, 'all': True}
+
+        res = batch_invite(req)
+
+        self.assertEqual(res.status_code, 302)
+        _messages = req.session.peek_flash('success')
+        self.assertTrue(
+            'sent out 4 mails (to members with membership numbers'
+            in _messages[0])
+        invitees = GeneralAssemblyRepository.get_invitees(
+            CURRENT_GENERAL_ASSEMBLY)
+        self.assertEqual(len(invitees), 0)
+
+        mailer = get_mailer(req)
+        self.assertEqual(len(mailer.outbox), 4)
+        for member in C3sMember.get_all():
+            invitation = GeneralAssemblyRepository.get_member_invitation(
+                member.membership_number, CURRENT_GENERAL_ASSEMBLY)
+            self.assertEqual(invitation['flag'], True)
+            messages = [
+                message for message in mailer.outbox
+                if message.recipients == [member.email] and
+                member.firstname in message.body]
+            self.assertEqual(len(messages), 1)
+            self.assertEqual(messages[0].sender, 'test@example.com')
+            if member.locale == 'de':
+                self.assertTrue(u'Versammlung' in messages[0].subject)
+            else:
+                self.assertTrue(u'Assembly' in messages[0].subject)
+
+    def test_invitation_batch_error(self):
+        """
+        Test the batch invitation for an invalid general assembly.
+        """
+        req = testing.DummyRequest()
+        general_assembly = mock.Mock()
+        general_assembly.number = 123
+        req.validated_matchdict = {'general_assembly': general_assembly}
+        req.validated_post = {'count': 5}
+
+        res = batch_invite(req)
+
+        self.assertEqual(res.status_code, 302)
+        self.assertEqual(
+            req.session.peek_flash('danger'),
+            [u'The general assembly does not exist.'])
+        self.assertEqual(len(get_mailer(req).outbox), 0)
@@ -1,8 +1,16 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+import threading
 import unittest
-# import shutil
+
+import gnupg
+import mock
 from pyramid import testing
 
 from c3smembership.data.model.base import DBSession
@@ -47,3 +55,181 @@ class TestGnuPG(unittest.TestCase):
         result = encrypt_with_gnupg('foo')
         self.assertTrue('-----BEGIN PGP MESSAGE-----' in str(result))
         self.assertTrue('-----END PGP MESSAGE-----' in str(result))
+
+
+class TestGnupgEncryptor(unittest.TestCase):
+    """
+    Test the GnupgEncryptor class.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _assert_encrypted(self, result):
+        self.assertTrue('-----BEGIN PGP MESSAGE-----' in str(result))
+        self.assertTrue('-----END PGP MESSAGE-----' in str(result))
+
+    def test_temporary_keyring(self):
+        """
+        Test that the temporary keyring is set up once and removed on close
+        """
+        from c3smembership.gnupg_encrypt import GnupgEncryptor
+        encryptor = GnupgEncryptor()
+        with mock.patch('gnupg.GPG', wraps=gnupg.GPG) as gpg_mock:
+            self._assert_encrypted(encryptor.encrypt(u'umläuts'))
+            self._assert_encrypted(encryptor.encrypt('foo'))
+        self.assertEqual(gpg_mock.call_count, 1)
+        gnupghome = gpg_mock.call_args[1]['gnupghome']
+        self.assertEqual(stat.S_IMODE(os.stat(gnupghome).st_mode), 0o700)
+
+        encryptor.close()
+        self.assertFalse(os.path.exists(gnupghome))
+        # The keyring is set up again after closing
+        self._assert_encrypted(encryptor.encrypt('foo'))
+        encryptor.close()
+
+    def test_persistent_keyring(self):
+        """
+        Test that the persistent keyring is created safely and the key is
+        imported once
+
+        1. The keyring directory is created and the key imported
+        2. The key is not imported again into an existing keyring
+        3. Unsafe permissions are restricted
+        """
+        from c3smembership.gnupg_encrypt import GnupgEncryptor
+        gnupghome = os.path.join(self.directory, 'gnupg')
+
+        # 1. The keyring directory is created and the key imported
+        encryptor = GnupgEncryptor(gnupghome)
+        self._assert_encrypted(encryptor.encrypt('foo'))
+        self.assertEqual(stat.S_IMODE(os.stat(gnupghome).st_mode), 0o700)
+        encryptor.close()
+        self.assertTrue(os.path.isdir(gnupghome))
+
+        # 2. The key is not imported again into an existing keyring
+        encryptor = GnupgEncryptor(gnupghome)
+        with mock.patch.object(gnupg.GPG, 'import_keys') as import_keys:
+            self._assert_encrypted(encryptor.encrypt('foo'))
+        self.assertFalse(import_keys.called)
+
+        # 3. Unsafe permissions are restricted
+        os.chmod(gnupghome, 0o755)
+        GnupgEncryptor(gnupghome).setup()
+        self.assertEqual(stat.S_IMODE(os.stat(gnupghome).st_mode), 0o700)
+
+    def test_encrypt_many(self):
+        """
+        Test that many payloads are encrypted in order
+        """
+        from c3smembership.gnupg_encrypt import GnupgEncryptor
+        encryptor = GnupgEncryptor()
+        results = encryptor.encrypt_many([u'ä', 'b', 'c'])
+        encryptor.close()
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self._assert_encrypted(result)
+        self.assertEqual(len(set(results)), 3)
+        self.assertEqual(encryptor.encrypt_many([]), [])
+
+    def test_threads(self):
+        """
+        Test that several threads can encrypt at the same time
+        """
+        from c3smembership.gnupg_encrypt import GnupgEncryptor
+        encryptor = GnupgEncryptor()
+        results = []
+
+        def encrypt():
+            results.append(encryptor.encrypt('foo'))
+
+        threads = [threading.Thread(target=encrypt) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        encryptor.close()
+        self.assertEqual(len(results), 4)
+        for result in results:
+            self._assert_encrypted(result)
+
+    def test_configure_gnupg(self):
+        """
+        Test that configure_gnupg sets up the keyring of the process
+        """
+        from c3smembership import gnupg_encrypt
+        gnupghome = os.path.join(self.directory, 'gnupg')
+        original_encryptor = gnupg_encrypt.get_encryptor()
+        try:
+            gnupg_encrypt.configure_gnupg(
+                {'c3smembership.gnupg.home': gnupghome})
+            encryptor = gnupg_encrypt.get_encryptor()
+            self.assertEqual(encryptor.gnupghome, gnupghome)
+            self.assertTrue(os.path.isdir(gnupghome))
+            self._assert_encrypted(gnupg_encrypt.encrypt_with_gnupg('foo'))
+            self.assertEqual(
+                len(gnupg_encrypt.encrypt_many_with_gnupg(['a', 'b'])), 2)
+
+            # The same configuration keeps the encryptor
+            gnupg_encrypt.configure_gnupg(
+                {'c3smembership.gnupg.home': gnupghome})
+            self.assertIs(gnupg_encrypt.get_encryptor(), encryptor)
+        finally:
+            gnupg_encrypt.configure_gnupg({})
+        self.assertIsNone(gnupg_encrypt.get_encryptor().gnupghome)
+        self.assertIsNot(gnupg_encrypt.get_encryptor(), original_encryptor)
+
+    def test_encrypt_to_file(self):
+        """
+        Test the encryption of chunks into a temporary file
+
+        1. The chunks are encrypted as one message in the calling thread
+        2. Errors of gpg are raised with the error output of gpg
+        3. Errors of the chunks are raised and terminate gpg
+        """
+        from c3smembership.gnupg_encrypt import GnupgEncryptor
+        encryptor = GnupgEncryptor()
+
+        # 1. The chunks are encrypted as one message in the calling thread
+        threads = []
+
+        def chunks():
+            for chunk in [u'ä' * 1000, os.urandom(100000), 'end']:
+                threads.append(threading.current_thread())
+                yield chunk
+
+        encrypted_file = encryptor.encrypt_to_file(chunks())
+        encrypted = encrypted_file.read()
+        encrypted_file.close()
+        self.assertEqual(encrypted.count('-----BEGIN PGP MESSAGE-----'), 1)
+        self._assert_encrypted(encrypted)
+        self.assertEqual(threads, [threading.current_thread()] * 3)
+
+        # 2. Errors of gpg are raised with the error output of gpg
+        unknown_key_encryptor = GnupgEncryptor(fingerprint='0' * 40)
+        with self.assertRaises(RuntimeError) as context:
+            unknown_key_encryptor.encrypt_to_file(['foo'])
+        self.assertTrue('gpg: ' in str(context.exception))
+        unknown_key_encryptor.close()
+
+        # 3. Errors of the chunks are raised and terminate gpg
+        def failing_chunks():
+            yield 'foo'
+            raise ValueError('Database gone')
+
+        processes = []
+        original_popen = subprocess.Popen
+
+        def popen(*args, **kwargs):
+            processes.append(original_popen(*args, **kwargs))
+            return processes[-1]
+
+        with mock.patch('subprocess.Popen', side_effect=popen):
+            with self.assertRaises(ValueError):
+                encryptor.encrypt_to_file(failing_chunks())
+        self.assertEqual(len(processes), 1)
+        self.assertIsNotNone(processes[0].returncode)
+        encryptor.close()
@@ -126,6 +126,15 @@ class TestViews(unittest.TestCase):
         DBSession.remove()
         testing.tearDown()
 
+    @classmethod
+    def _commit_accountant_mail(cls):
+        """
+        Run the after commit hooks without committing the test data
+        """
+        for hook, args, kwargs in transaction.get().getAfterCommitHooks():
+            hook(True, *args, **kwargs)
+        transaction.abort()
+
     def test_show_success(self):
         """
         test the success page
@@ -202,25 +211,28 @@ class TestViews(unittest.TestCase):
 
         result = success_check_email(request)
 
+        # expect email to applicant for email address confirmation and the
+        # email to the accountant only after commit
+        self.assertEqual(len(mailer.outbox), 1)
+        self._commit_accountant_mail()
+
         # Undo dependency injection
         utils.encrypt_with_gnupg = original_encrypt_with_gnupg
 
         self.assertEqual(result['lastname'], 'bar')
         self.assertEqual(result['firstname'], 'foo')
 
-        # expect email to accountant and email to applicant for email address
-        # confirmation
         self.assertEqual(len(mailer.outbox), 2)
         self.assertEqual(
             mailer.outbox[0].subject,
-            '[C3S] Yes! a new member')
+            u'C3S: E-Mail-Adresse bestätigen und Formular abrufen')
         self.assertEqual(
             mailer.outbox[1].subject,
-            u'C3S: E-Mail-Adresse bestätigen und Formular abrufen')
+            '[C3S] Yes! a new member')
 
         verif_link = "https://yes.c3s.cc/verify/bar@shri.de/"
-        self.assertTrue("Hallo foo bar!" in mailer.outbox[1].body)
-        self.assertTrue(verif_link in mailer.outbox[1].body)
+        self.assertTrue("Hallo foo bar!" in mailer.outbox[0].body)
+        self.assertTrue(verif_link in mailer.outbox[0].body)
 
     def test_success_check_email_en(self):
         """
@@ -267,23 +279,24 @@ class TestViews(unittest.TestCase):
         result = success_check_email(request)
         self.assertEqual(result['lastname'], 'bar')
         self.assertEqual(result['firstname'], 'foo')
+        self._commit_accountant_mail()
 
         # Undo dependency injection
         utils.encrypt_with_gnupg = original_encrypt_with_gnupg
 
-        # expect email to accountant and email to applicant for email address
-        # confirmation
+        # expect email to applicant for email address confirmation and email
+        # to accountant after commit
         self.assertEqual(len(mailer.outbox), 2)
         self.assertEqual(
             mailer.outbox[0].subject,
-            '[C3S] Yes! a new member')
+            'C3S: confirm your email address and load your PDF')
         self.assertEqual(
             mailer.outbox[1].subject,
-            'C3S: confirm your email address and load your PDF')
+            '[C3S] Yes! a new member')
 
         verif_link = "https://yes.c3s.cc/verify/bar@shri.de/"
-        self.assertTrue("Hello foo bar!" in mailer.outbox[1].body)
-        self.assertTrue(verif_link in mailer.outbox[1].body)
+        self.assertTrue("Hello foo bar!" in mailer.outbox[0].body)
+        self.assertTrue(verif_link in mailer.outbox[0].body)
 
     def test_success_check_email_re(self):
         """
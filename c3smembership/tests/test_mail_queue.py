@@ -0,0 +1,469 @@
+# -*- coding: utf-8 -*-
+"""
+Test the c3smembership.mail_queue module
+"""
+
+import email
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from unittest import TestCase
+
+from mock import (
+    Mock,
+    patch,
+)
+from pyramid import testing
+from pyramid_mailer import get_mailer
+from pyramid_mailer.interfaces import IMailer
+from pyramid_mailer.message import Message
+import transaction
+
+from c3smembership.mail_queue import (
+    MailQueue,
+    MailQueueWorkers,
+    QueuedMailer,
+    SmtpDelivery,
+    shutdown,
+)
+
+
+class MailQueueTestBase(TestCase):
+    """
+    Provide a mail queue in a temporary directory
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.mail_queue = MailQueue(
+            os.path.join(self.directory, 'mail_queue.sqlite'))
+
+    def tearDown(self):
+        self.mail_queue.close()
+        shutil.rmtree(self.directory)
+
+    @classmethod
+    def _create_message(cls, subject=u'Subject'):
+        return Message(
+            subject=subject,
+            sender=u'sender@example.com',
+            recipients=[u'recipient@example.com'],
+            body=u'Hällo')
+
+
+class MailQueueTest(MailQueueTestBase):
+    """
+    Test the MailQueue class
+    """
+
+    def test_enqueue_claim(self):
+        """
+        Test the enqueue and claim methods
+
+        1. Enqueue two emails
+        2. Claim them in order
+        3. No email left
+        """
+        # 1. Enqueue two emails
+        mail_ids = self.mail_queue.enqueue([
+            ('a@example.com', ['b@example.com', 'c@example.com'], 'first'),
+            ('a@example.com', ['d@example.com'], 'second'),
+        ])
+        self.assertEqual(len(mail_ids), 2)
+        self.assertEqual(self.mail_queue.get_status(mail_ids[0]).status,
+                         'queued')
+
+        # 2. Claim them in order
+        mail = self.mail_queue.claim()
+        self.assertEqual(mail.mail_id, mail_ids[0])
+        self.assertEqual(mail.sender, 'a@example.com')
+        self.assertEqual(mail.recipients, ['b@example.com', 'c@example.com'])
+        self.assertEqual(mail.message, 'first')
+        self.assertEqual(mail.attempts, 1)
+        status = self.mail_queue.get_status(mail_ids[0])
+        self.assertEqual(status.status, 'sending')
+        self.assertEqual(status.attempts, 1)
+        self.assertEqual(self.mail_queue.claim().message, 'second')
+
+        # 3. No email left
+        self.assertIsNone(self.mail_queue.claim())
+        self.assertEqual(self.mail_queue.get_status_counts(), {'sending': 2})
+        self.assertIsNone(self.mail_queue.get_status(12345))
+
+    def test_status(self):
+        """
+        Test the mark_sent, mark_retry and mark_failed methods
+        """
+        mail_ids = self.mail_queue.enqueue([
+            ('a@example.com', ['b@example.com'], 'message')] * 3)
+        for _ in mail_ids:
+            self.mail_queue.claim()
+
+        self.mail_queue.mark_sent(mail_ids[0])
+        self.mail_queue.mark_retry(mail_ids[1], u'Timeout', time.time() + 60)
+        self.mail_queue.mark_failed(mail_ids[2], u'Rejected')
+
+        self.assertEqual(
+            self.mail_queue.get_status_counts(),
+            {'sent': 1, 'queued': 1, 'failed': 1})
+        self.assertEqual(
+            self.mail_queue.get_status(mail_ids[1]).last_error, u'Timeout')
+        # The retried email is not due yet
+        self.assertIsNone(self.mail_queue.claim())
+
+    def test_failures(self):
+        """
+        Test the record_failure and get_failures methods
+
+        1. No failures recorded
+        2. Record three failures
+        3. The failures survive reopening the queue
+        """
+        # 1. No failures recorded
+        self.assertEqual(self.mail_queue.get_failures(), [])
+
+        # 2. Record three failures
+        for number in range(3):
+            self.mail_queue.record_failure(
+                'notification', u'Error {0}'.format(number))
+        failures = self.mail_queue.get_failures(limit=2)
+        self.assertEqual(
+            [failure.error for failure in failures], [u'Error 1', u'Error 2'])
+        self.assertEqual(failures[0].notification, 'notification')
+        self.assertTrue(failures[0].failed <= time.time())
+
+        # 3. The failures survive reopening the queue
+        self.mail_queue.close()
+        mail_queue = MailQueue(
+            os.path.join(self.directory, 'mail_queue.sqlite'))
+        self.assertEqual(len(mail_queue.get_failures()), 3)
+        mail_queue.close()
+
+    def test_release_stale(self):
+        """
+        Test the release_stale method
+        """
+        mail_id = self.mail_queue.enqueue([
+            ('a@example.com', ['b@example.com'], 'message')])[0]
+        self.mail_queue.claim()
+
+        self.assertEqual(self.mail_queue.release_stale(60), 0)
+        self.assertEqual(self.mail_queue.release_stale(-1), 1)
+        self.assertEqual(self.mail_queue.get_status(mail_id).status, 'queued')
+        self.assertEqual(self.mail_queue.claim().attempts, 2)
+
+    def test_shared_file(self):
+        """
+        Test that several queue objects share the emails of the file
+        """
+        other_queue = MailQueue(
+            os.path.join(self.directory, 'mail_queue.sqlite'))
+        self.mail_queue.enqueue([
+            ('a@example.com', ['b@example.com'], 'message')])
+        self.assertEqual(other_queue.claim().message, 'message')
+        self.assertIsNone(self.mail_queue.claim())
+        other_queue.close()
+
+    def test_close(self):
+        """
+        Test that closing the queue closes the connections of all threads
+        """
+        connections = []
+
+        def enqueue():
+            self.mail_queue.enqueue([
+                ('a@example.com', ['b@example.com'], 'message')])
+            # pylint: disable=protected-access
+            connections.append(self.mail_queue._get_connection())
+
+        thread = threading.Thread(target=enqueue)
+        thread.start()
+        thread.join()
+        enqueue()
+        self.assertEqual(len(connections), 2)
+        self.assertIsNot(connections[0], connections[1])
+
+        self.mail_queue.close()
+        for connection in connections:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                connection.execute('SELECT 1')
+
+        # The queue opens a new connection after closing
+        self.assertEqual(self.mail_queue.get_status_counts(), {'queued': 2})
+
+
+class QueuedMailerTest(MailQueueTestBase):
+    """
+    Test the QueuedMailer class
+    """
+
+    def setUp(self):
+        super(QueuedMailerTest, self).setUp()
+        self.mailer = QueuedMailer(self.mail_queue, u'default@example.com')
+        transaction.abort()
+
+    def tearDown(self):
+        transaction.abort()
+        super(QueuedMailerTest, self).tearDown()
+
+    def test_send(self):
+        """
+        Test the send method
+
+        1. Messages are not enqueued before commit
+        2. Messages are enqueued on commit
+        3. Messages of aborted transactions are dropped
+        """
+        # 1. Messages are not enqueued before commit
+        self.mailer.send(self._create_message(u'First'))
+        self.mailer.send(self._create_message(u'Second'))
+        self.assertEqual(self.mail_queue.get_status_counts(), {})
+
+        # 2. Messages are enqueued on commit
+        transaction.commit()
+        self.assertEqual(self.mail_queue.get_status_counts(), {'queued': 2})
+        mail = self.mail_queue.claim()
+        self.assertEqual(mail.sender, u'sender@example.com')
+        self.assertEqual(mail.recipients, [u'recipient@example.com'])
+        message = email.message_from_string(mail.message)
+        self.assertEqual(message['Subject'], 'First')
+        self.assertEqual(
+            message.get_payload(decode=True).decode(
+                message.get_content_charset()),
+            u'Hällo')
+        self.assertEqual(
+            email.message_from_string(self.mail_queue.claim().message)[
+                'Subject'],
+            'Second')
+
+        # 3. Messages of aborted transactions are dropped
+        self.mailer.send(self._create_message())
+        transaction.abort()
+        transaction.commit()
+        self.assertEqual(self.mail_queue.get_status_counts(), {'sending': 2})
+
+    def test_send_enqueue_error(self):
+        """
+        Test that errors enqueueing after commit do not raise
+        """
+        mail_queue = Mock()
+        mail_queue.enqueue.side_effect = Exception('Disk full')
+        mailer = QueuedMailer(mail_queue)
+        mailer.send(self._create_message())
+        transaction.commit()
+        self.assertEqual(mail_queue.enqueue.call_count, 1)
+
+    def test_send_immediately(self):
+        """
+        Test the send_immediately method
+        """
+        message = self._create_message()
+        message.sender = None
+        mail_id = self.mailer.send_immediately(message)
+        self.assertEqual(
+            self.mail_queue.claim().sender, u'default@example.com')
+        self.assertEqual(
+            self.mail_queue.get_status(mail_id).status, 'sending')
+
+        mail_queue = Mock()
+        mail_queue.enqueue.side_effect = Exception('Disk full')
+        mailer = QueuedMailer(mail_queue)
+        self.assertIsNone(mailer.send_immediately(message, True))
+        with self.assertRaises(Exception):
+            mailer.send_immediately(message)
+
+
+class SmtpDeliveryTest(TestCase):
+    """
+    Test the SmtpDelivery class
+    """
+
+    def test_call(self):
+        """
+        Test that the message is sent via the SMTP mailer
+        """
+        mailer = Mock()
+        delivery = SmtpDelivery(mailer)
+        delivery('a@example.com', ['b@example.com'], 'Subject: Test\n\nBody')
+        sender, recipients, message = mailer.smtp_mailer.send.call_args[0]
+        self.assertEqual(sender, 'a@example.com')
+        self.assertEqual(recipients, ['b@example.com'])
+        self.assertEqual(message['Subject'], 'Test')
+        self.assertEqual(message.get_payload(), 'Body')
+
+
+class MailQueueWorkersTest(MailQueueTestBase):
+    """
+    Test the MailQueueWorkers class
+    """
+
+    def setUp(self):
+        super(MailQueueWorkersTest, self).setUp()
+        self.deliver = Mock()
+        self.workers = MailQueueWorkers(
+            self.mail_queue, self.deliver, workers=2, max_attempts=3,
+            retry_delay=10, poll_interval=0.01)
+
+    def test_drain(self):
+        """
+        Test the drain method delivering all due emails
+        """
+        mail_ids = self.mail_queue.enqueue([
+            ('a@example.com', ['b@example.com'], 'message')] * 3)
+        self.assertEqual(self.workers.drain(), 3)
+        self.assertEqual(self.deliver.call_count, 3)
+        self.deliver.assert_called_with(
+            'a@example.com', ['b@example.com'], 'message')
+        self.assertEqual(self.mail_queue.get_status_counts(), {'sent': 3})
+        self.assertEqual(self.mail_queue.get_status(mail_ids[0]).attempts, 1)
+        self.assertEqual(self.workers.drain(), 0)
+
+    def test_retry(self):
+        """
+        Test the retry with exponential backoff
+
+        1. Failed attempts are retried with doubling delay
+        2. The email fails after the maximum number of attempts
+        """
+        self.deliver.side_effect = IOError('Connection refused')
+        self.mail_queue.mark_retry = Mock(wraps=self.mail_queue.mark_retry)
+        mail_id = self.mail_queue.enqueue([
+            ('a@example.com', ['b@example.com'], 'message')])[0]
+
+        # 1. Failed attempts are retried with doubling delay
+        for attempt in range(2):
+            before = time.time()
+            self.assertTrue(self.workers.process())
+            status = self.mail_queue.get_status(mail_id)
+            self.assertEqual(status.status, 'queued')
+            self.assertEqual(
+                status.last_error, u'IOError: Connection refused')
+            next_attempt = self.mail_queue.mark_retry.call_args[0][2]
+            self.assertGreaterEqual(next_attempt, before + 10 * 2 ** attempt)
+            self.assertLess(next_attempt, time.time() + 10 * 2 ** attempt)
+            # The email is not due yet
+            self.assertFalse(self.workers.process())
+            # pylint: disable=protected-access
+            self.mail_queue._get_connection().execute(
+                'UPDATE outbound_mail SET next_attempt = 0')
+
+        # 2. The email fails after the maximum number of attempts
+        self.assertTrue(self.workers.process())
+        status = self.mail_queue.get_status(mail_id)
+        self.assertEqual(status.status, 'failed')
+        self.assertEqual(status.attempts, 3)
+        self.assertFalse(self.workers.process())
+
+    def test_start_stop(self):
+        """
+        Test that the worker threads deliver the queued emails
+        """
+        self.workers.start()
+        try:
+            self.mail_queue.enqueue([
+                ('a@example.com', ['b@example.com'], 'message')] * 5)
+            deadline = time.time() + 10
+            while self.mail_queue.get_status_counts() != {'sent': 5} and \
+                    time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            self.assertTrue(self.workers.stop(10))
+        self.assertEqual(self.mail_queue.get_status_counts(), {'sent': 5})
+        self.assertEqual(self.deliver.call_count, 5)
+
+    def test_shutdown(self):
+        """
+        Test that shutting down finishes the current delivery
+
+        1. The delivery is finished before the queue is closed
+        2. The queue is not closed while a worker is still delivering
+        """
+        delivering = threading.Event()
+        release = threading.Event()
+
+        def deliver(sender, recipients, message):
+            # pylint: disable=unused-argument
+            delivering.set()
+            release.wait(10)
+
+        self.workers = MailQueueWorkers(
+            self.mail_queue, deliver, workers=1, poll_interval=0.01)
+        self.mail_queue.close = Mock(wraps=self.mail_queue.close)
+        self.mail_queue.enqueue([
+            ('a@example.com', ['b@example.com'], 'message')] * 2)
+
+        # 1. The delivery is finished before the queue is closed
+        self.workers.start()
+        self.assertTrue(delivering.wait(10))
+        stopper = threading.Timer(0.1, release.set)
+        stopper.start()
+        shutdown(self.mail_queue, self.workers, 10)
+        self.assertEqual(
+            self.mail_queue.get_status_counts(), {'sent': 1, 'queued': 1})
+        self.assertEqual(self.mail_queue.close.call_count, 1)
+
+        # 2. The queue is not closed while a worker is still delivering
+        delivering.clear()
+        release.clear()
+        self.workers.start()
+        self.assertTrue(delivering.wait(10))
+        shutdown(self.mail_queue, self.workers, 0.01)
+        self.assertEqual(self.mail_queue.close.call_count, 1)
+        release.set()
+        self.assertTrue(self.workers.stop(10))
+
+
+class IncludemeTest(TestCase):
+    """
+    Test the configuration of the mail queue
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        testing.tearDown()
+        shutil.rmtree(self.directory)
+
+    def test_not_configured(self):
+        """
+        Test that the pyramid_mailer mailer is kept without queue path
+        """
+        config = testing.setUp(settings={})
+        config.include('pyramid_mailer')
+        config.include('c3smembership.mail_queue')
+        self.assertNotIsInstance(get_mailer(config.registry), QueuedMailer)
+        self.assertFalse(hasattr(config.registry, 'mail_queue'))
+
+    def test_configured(self):
+        """
+        Test that the queued mailer is registered with the queue path
+        """
+        config = testing.setUp(settings={
+            'mail.default_sender': 'default@example.com',
+            'c3smembership.mail_queue.path': os.path.join(
+                self.directory, 'mail_queue.sqlite'),
+            'c3smembership.mail_queue.workers': '0',
+        })
+        config.include('pyramid_mailer')
+        with patch('c3smembership.mail_queue.atexit') as mock_atexit:
+            config.include('c3smembership.mail_queue')
+        mock_atexit.register.assert_called_once_with(
+            shutdown,
+            config.registry.mail_queue,
+            config.registry.mail_queue_workers)
+        mailer = config.registry.getUtility(IMailer)
+        self.assertIsInstance(mailer, QueuedMailer)
+        message = Message(
+            subject=u'Subject',
+            recipients=[u'recipient@example.com'],
+            body=u'Body')
+        mailer.send_immediately(message)
+        self.assertEqual(
+            config.registry.mail_queue.claim().sender,
+            'default@example.com')
+        shutdown(
+            config.registry.mail_queue, config.registry.mail_queue_workers)
@@ -25,6 +25,7 @@ from c3smembership.data.model.base.c3smember import C3sMember
 from c3smembership.data.model.base.group import Group
 from c3smembership.data.model.base.shares import Shares
 from c3smembership.data.model.base.staff import Staff
+from c3smembership.data.model.general_assembly import GeneralAssembly
 
 
 DEBUG = False
@@ -486,3 +487,19 @@ class MembershipListTests(MemberTestsBase):
 
         self.assertTrue('Page 1 of 1' in res.body)
         self.assertTrue(u'SomeFirstnäme' in res.body.decode('utf-8'))
+        self.assertFalse('invitation to general assembly' in res.body)
+
+        # With a general assembly the invitation status is shown
+        with transaction.manager:
+            C3sMember.get_by_id(1).membership_number = 1
+            # pylint: disable=no-member
+            DBSession.add(GeneralAssembly(
+                1, u'1. ordentliche Generalversammlung',
+                date.today() + timedelta(days=30), u'Assembly',
+                u'Hello {salutation}!', u'Versammlung',
+                u'Hallo {salutation}!'))
+        res = self.testapp.get('/memberships', status=200)
+        self.assertTrue(
+            'An invitation to general assembly 1 &quot;1. ordentliche '
+            'Generalversammlung&quot;' in res.body)
+        self.assertTrue('was not sent yet. Click to send.' in res.body)
@@ -25,6 +25,7 @@ from c3smembership.data.model.base.dues18invoice import Dues18Invoice
 from c3smembership.data.model.base.dues19invoice import Dues19Invoice
 from c3smembership.data.model.base.dues20invoice import Dues20Invoice
 from c3smembership.data.model.base.dues21invoice import Dues21Invoice
+from c3smembership.data.model.base.dues_payment import DuesPayment
 from c3smembership.data.model.base.group import Group
 from c3smembership.data.model.base.staff import Staff
 from c3smembership.data.repository.dues_invoice_repository import \
@@ -662,6 +663,92 @@ class C3sMembershipModelTests(C3sMembershipModelTestBase):
         instance_from_db = my_membership_signee_class.get_by_id('1')
         self.assertEqual(None, instance_from_db)
 
+    def test_dues_payment_ledger(self):
+        """
+        test: set_dues21_payment keeps the dues payment ledger in sync
+        """
+        instance = self._make_one()
+        instance.membership_number = 42
+        instance.dues21_token = u'TOKEN21'
+        self.session.add(instance)
+        self.session.flush()
+
+        instance.set_dues21_payment(D('10'), datetime(2021, 3, 4, 12, 13))
+        instance.set_dues21_payment(D('5.5'), datetime(2021, 4, 5, 14, 15))
+        self.session.flush()
+
+        payments = self.session.query(DuesPayment).all()
+        self.assertEqual(len(payments), 1)
+        self.assertEqual(payments[0].member_id, instance.id)
+        self.assertEqual(payments[0].membership_number, 42)
+        self.assertEqual(payments[0].year, 2021)
+        self.assertEqual(payments[0].account, u'Membership dues 2021')
+        self.assertEqual(payments[0].reference, u'TOKEN21')
+        self.assertEqual(payments[0].date, date(2021, 4, 5))
+        self.assertEqual(payments[0].amount, D('15.5'))
+
+        C3sMember.delete_by_id(instance.id)
+        self.assertEqual(self.session.query(DuesPayment).count(), 0)
+
+    def test_get_matching_codes(self):
+        """
+        test: get_matching_codes with limit and case sensitivity
+        """
+        self.session.add(self._make_one(email_confirm_code=u'ABCXYZ0001'))
+        self.session.add(self._make_one(email_confirm_code=u'ABD0000001'))
+        self.session.add(self._make_one(email_confirm_code=u'abc0000001'))
+        self.session.flush()
+
+        self.assertEqual(
+            C3sMember.get_matching_codes(u'ABC'),
+            [u'ABCDEFGFOO', u'ABCXYZ0001'])
+        self.assertEqual(
+            C3sMember.get_matching_codes(u'ABC', limit=1), [u'ABCDEFGFOO'])
+        self.assertEqual(
+            C3sMember.get_matching_codes(u'abc', case_sensitive=False),
+            [u'ABCDEFGFOO', u'ABCXYZ0001', u'abc0000001'])
+        self.assertEqual(C3sMember.get_matching_codes(u'XYZ'), [])
+        self.assertEqual(len(C3sMember.get_matching_codes(u'')), 4)
+
+    def test_get_matching_people(self):
+        """
+        test: get_matching_people with limit and case sensitivity
+        """
+        self.session.add(self._make_one(
+            firstname=u'Jane', lastname=u'Smith',
+            email_confirm_code=u'SMITHJANE1'))
+        self.session.add(self._make_one(
+            firstname=u'John', lastname=u'smithers',
+            email_confirm_code=u'SMITHJOHN1'))
+        self.session.flush()
+
+        self.assertEqual(
+            C3sMember.get_matching_people(u'Smi'),
+            {u'SMITHJANE1 Smith, Jane': u'SMITHJANE1 Smith, Jane'})
+        self.assertEqual(
+            sorted(C3sMember.get_matching_people(
+                u'smi', case_sensitive=False).keys()),
+            [u'SMITHJANE1 Smith, Jane', u'SMITHJOHN1 smithers, John'])
+        self.assertEqual(
+            len(C3sMember.get_matching_people(
+                u'smi', limit=1, case_sensitive=False)),
+            1)
+
+    def test_get_matching_people_non_ascii(self):
+        """
+        test: get_matching_people folds only ASCII characters like SQLite
+        """
+        self.session.add(self._make_one(
+            firstname=u'Jane', lastname=u'Ölmann',
+            email_confirm_code=u'OELMANNJA1'))
+        self.session.flush()
+
+        self.assertEqual(
+            C3sMember.get_matching_people(u'ÖLM', case_sensitive=False),
+            {u'OELMANNJA1 Ölmann, Jane': u'OELMANNJA1 Ölmann, Jane'})
+        self.assertEqual(
+            C3sMember.get_matching_people(u'ölm', case_sensitive=False), {})
+
     def test_check_user_or_none(self):
         """
         XXX TODO
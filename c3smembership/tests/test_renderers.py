@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Test the c3smembership.renderers module
+"""
+
+import os
+import StringIO
+from unittest import TestCase
+
+from mock import patch
+from pyramid import testing
+
+from c3smembership.renderers import CSVRenderer
+
+
+class CSVRendererTest(TestCase):
+    """
+    Test the CSVRenderer class
+    """
+
+    def setUp(self):
+        self.request = testing.DummyRequest()
+        self.request.registry.settings = {'c3smembership.runmode': 'dev'}
+        self.renderer = CSVRenderer(None)
+
+    def _render(self, value):
+        return self.renderer(value, {'request': self.request})
+
+    def test_list_rows(self):
+        """
+        Test rendering rows provided as a list
+        """
+        result = self._render({
+            'header': [u'a', u'b'],
+            'rows': [[u'1', u'ä'], [u'3', u'4']],
+        })
+        self.assertEqual(
+            result,
+            '"a";"b"\r\n"1";"\xc3\xa4"\r\n"3";"4"\r\n')
+        self.assertEqual(self.request.response.content_type, 'text/csv')
+        self.assertEqual(
+            self.request.response.content_disposition,
+            'attachment;filename="yes.csv"')
+
+    def test_streamed_rows(self):
+        """
+        Test rendering rows provided as a generator
+
+        1. The result is streamed in chunks
+        2. The rows are only consumed when the result is iterated
+        3. The filename can be specified
+        """
+        consumed = []
+
+        def rows():
+            for number in range(1000):
+                consumed.append(number)
+                yield [unicode(number), u'x' * 100]
+
+        result = self._render({
+            'header': [u'number', u'text'],
+            'rows': rows(),
+            'filename': 'export.csv',
+        })
+
+        # 2. The rows are only consumed when the result is iterated
+        self.assertEqual(len(consumed), 0)
+
+        # 1. The result is streamed in chunks
+        chunks = list(result)
+        self.assertTrue(len(chunks) > 1)
+        csv = ''.join(chunks)
+        self.assertTrue(csv.startswith('"number";"text"\r\n"0";"x'))
+        self.assertEqual(len(csv.splitlines()), 1001)
+        self.assertEqual(len(consumed), 1000)
+
+        # 3. The filename can be specified
+        self.assertEqual(
+            self.request.response.content_disposition,
+            'attachment;filename="export.csv"')
+
+    @patch('c3smembership.renderers.get_encryptor')
+    def test_streamed_rows_prod(self, get_encryptor_mock):
+        """
+        Test that streamed rows are encrypted before rendering in prod mode
+
+        1. The rows are encrypted when rendering
+        2. Encryption errors are raised when rendering
+        """
+        self.request.registry.settings = {'c3smembership.runmode': 'prod'}
+        encrypt_to_file = get_encryptor_mock.return_value.encrypt_to_file
+        encrypt_to_file.side_effect = lambda chunks: StringIO.StringIO(
+            'encrypted:' + ''.join(chunks))
+
+        # 1. The rows are encrypted when rendering
+        result = self._render({
+            'header': [u'a'],
+            'rows': iter([[u'1'], [u'2']]),
+        })
+        encrypt_to_file.assert_called_once()
+        self.assertEqual(list(result), ['encrypted:"a"\r\n"1"\r\n"2"\r\n'])
+
+        # 2. Encryption errors are raised when rendering
+        encrypt_to_file.side_effect = RuntimeError('gpg failed')
+        with self.assertRaises(RuntimeError):
+            self._render({
+                'header': [u'a'],
+                'rows': iter([[u'1'], [u'2']]),
+            })
+
+    def test_list_rows_prod(self):
+        """
+        Test that rows are encrypted by gpg in chunks in prod mode
+
+        The rows contain random data so that the compressed and encrypted
+        CSV still spans several chunks.
+        """
+        self.request.registry.settings = {'c3smembership.runmode': 'prod'}
+
+        result = self._render({
+            'header': [u'a', u'b'],
+            'rows': [
+                [unicode(number), os.urandom(50).encode('hex')]
+                for number in range(4000)],
+        })
+
+        chunks = list(result)
+        self.assertTrue(len(chunks) > 1)
+        for chunk in chunks:
+            self.assertTrue(len(chunk) <= CSVRenderer.STREAM_CHUNK_SIZE)
+        encrypted = ''.join(chunks)
+        self.assertTrue(encrypted.startswith('-----BEGIN PGP MESSAGE-----'))
+        self.assertTrue(
+            encrypted.rstrip().endswith('-----END PGP MESSAGE-----'))
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+Test the c3smembership.smtp_pool module
+"""
+
+import asyncore
+from email.mime.text import MIMEText
+import smtpd
+import smtplib
+import threading
+from unittest import TestCase
+
+from mock import (
+    Mock,
+    call,
+)
+from pyramid import testing
+from pyramid_mailer.interfaces import IMailer
+from pyramid_mailer.mailer import Mailer
+from pyramid_mailer.message import Message
+from repoze.sendmail.mailer import SMTPMailer
+import transaction
+
+from c3smembership.smtp_pool import (
+    PooledMailer,
+    PooledSmtpMailer,
+    RateLimiter,
+)
+
+
+class RecordingSmtpServer(smtpd.SMTPServer):
+    """
+    Local debugging SMTP server recording the connections and emails
+    """
+
+    def __init__(self):
+        smtpd.SMTPServer.__init__(self, ('localhost', 0), None)
+        self.port = self.socket.getsockname()[1]
+        self.connections = 0
+        self.messages = []
+        self._thread = threading.Thread(
+            target=asyncore.loop, kwargs={'timeout': 0.01})
+        self._thread.daemon = True
+        self._thread.start()
+
+    def handle_accept(self):
+        self.connections += 1
+        smtpd.SMTPServer.handle_accept(self)
+
+    def process_message(self, peer, mailfrom, rcpttos, data):
+        self.messages.append((mailfrom, rcpttos, data))
+
+    def stop(self):
+        """
+        Close the server and its connections
+        """
+        asyncore.close_all()
+        self._thread.join(5)
+
+
+class PooledSmtpMailerServerTest(TestCase):
+    """
+    Test the PooledSmtpMailer class against a local SMTP server
+    """
+
+    def setUp(self):
+        self.server = RecordingSmtpServer()
+        self.smtp_mailer = SMTPMailer(port=self.server.port, no_tls=True)
+
+    def tearDown(self):
+        self.server.stop()
+
+    @classmethod
+    def _create_message(cls, number):
+        message = MIMEText('Body {0}'.format(number))
+        message['Subject'] = 'Subject {0}'.format(number)
+        return message
+
+    def _send(self, mailer, count):
+        for number in range(count):
+            mailer.send(
+                'a@example.com', ['b@example.com'],
+                self._create_message(number))
+        mailer.close()
+
+    def test_session_reuse(self):
+        """
+        Test that all emails are sent through one session
+        """
+        self._send(PooledSmtpMailer(self.smtp_mailer, size=1), 5)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(len(self.server.messages), 5)
+        mailfrom, rcpttos, data = self.server.messages[4]
+        self.assertEqual(mailfrom, 'a@example.com')
+        self.assertEqual(rcpttos, ['b@example.com'])
+        self.assertIn('Subject: Subject 4', data)
+
+    def test_max_messages(self):
+        """
+        Test that sessions are closed after the maximum number of emails
+        """
+        self._send(
+            PooledSmtpMailer(self.smtp_mailer, size=1, max_messages=2), 5)
+        self.assertEqual(self.server.connections, 3)
+        self.assertEqual(len(self.server.messages), 5)
+
+    def test_idle_timeout(self):
+        """
+        Test that idle sessions are closed after the idle timeout
+        """
+        self._send(
+            PooledSmtpMailer(self.smtp_mailer, size=1, idle_timeout=-1), 3)
+        self.assertEqual(self.server.connections, 3)
+        self.assertEqual(len(self.server.messages), 3)
+
+    def test_concurrent(self):
+        """
+        Test that concurrent threads do not open more sessions than the pool
+        size
+        """
+        mailer = PooledSmtpMailer(self.smtp_mailer, size=2)
+        threads = [
+            threading.Thread(target=self._send, args=(mailer, 5))
+            for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        self.assertEqual(len(self.server.messages), 20)
+        self.assertLessEqual(self.server.connections, 8)
+
+    def test_pooled_mailer(self):
+        """
+        Test the PooledMailer sending through the pool
+
+        1. Send immediately
+        2. Send on commit of the transaction
+        """
+        mailer = PooledMailer(
+            Mailer(port=self.server.port, default_sender='a@example.com'),
+            PooledSmtpMailer(self.smtp_mailer, size=1))
+        message = Message(
+            subject=u'Subject', recipients=[u'b@example.com'], body=u'Body')
+
+        # 1. Send immediately
+        mailer.send_immediately(message)
+        self.assertEqual(len(self.server.messages), 1)
+        self.assertEqual(self.server.messages[0][0], 'a@example.com')
+
+        # 2. Send on commit of the transaction
+        transaction.abort()
+        mailer.send(message)
+        self.assertEqual(len(self.server.messages), 1)
+        transaction.commit()
+        self.assertEqual(len(self.server.messages), 2)
+        self.assertEqual(self.server.connections, 1)
+        mailer.smtp_mailer.close()
+
+
+class PooledSmtpMailerTest(TestCase):
+    """
+    Test the PooledSmtpMailer class error handling
+    """
+
+    def setUp(self):
+        self.smtp_mailer = Mock()
+        self.smtp_mailer.username = None
+        self.smtp_mailer.force_tls = False
+        self.smtp_mailer.no_tls = True
+        self.connections = []
+        self.smtp_mailer.smtp_factory.side_effect = self._create_connection
+        self.mailer = PooledSmtpMailer(self.smtp_mailer, size=1)
+        self.message = MIMEText('Body')
+
+    def _create_connection(self):
+        connection = Mock()
+        connection.ehlo.return_value = (250, 'OK')
+        connection.has_extn.return_value = False
+        connection.does_esmtp = True
+        self.connections.append(connection)
+        return connection
+
+    def test_invalid_message(self):
+        """
+        Test that only email messages are accepted
+        """
+        with self.assertRaises(ValueError):
+            self.mailer.send('a@example.com', ['b@example.com'], 'Body')
+
+    def test_reconnect(self):
+        """
+        Test that a reused session closed by the server is reconnected
+        """
+        self.mailer.send('a@example.com', ['b@example.com'], self.message)
+        self.connections[0].sendmail.side_effect = \
+            smtplib.SMTPServerDisconnected()
+        self.mailer.send('a@example.com', ['b@example.com'], self.message)
+        self.assertEqual(len(self.connections), 2)
+        self.assertEqual(self.connections[1].sendmail.call_count, 1)
+        self.assertTrue(
+            self.connections[0].quit.called or
+            self.connections[0].close.called)
+
+    def test_new_session_disconnected(self):
+        """
+        Test that errors of new sessions are raised
+        """
+        self.smtp_mailer.smtp_factory.side_effect = None
+        connection = self._create_connection()
+        connection.sendmail.side_effect = smtplib.SMTPServerDisconnected()
+        self.smtp_mailer.smtp_factory.return_value = connection
+        with self.assertRaises(smtplib.SMTPServerDisconnected):
+            self.mailer.send('a@example.com', ['b@example.com'], self.message)
+        self.assertEqual(self.smtp_mailer.smtp_factory.call_count, 1)
+
+    def test_rejected(self):
+        """
+        Test that the session is kept if the server rejects an email
+        """
+        self.mailer.send('a@example.com', ['b@example.com'], self.message)
+        self.connections[0].sendmail.side_effect = \
+            smtplib.SMTPRecipientsRefused({})
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            self.mailer.send('a@example.com', ['c@example.com'], self.message)
+        self.assertEqual(self.connections[0].rset.call_count, 1)
+
+        self.connections[0].sendmail.side_effect = None
+        self.mailer.send('a@example.com', ['b@example.com'], self.message)
+        self.assertEqual(len(self.connections), 1)
+
+    def test_login(self):
+        """
+        Test that the session is set up like the SMTPMailer does
+        """
+        self.smtp_mailer.username = 'user'
+        self.smtp_mailer.password = 'password'
+        self.smtp_mailer.no_tls = False
+        self.smtp_mailer.smtp_factory.side_effect = None
+        connection = self._create_connection()
+        connection.has_extn.return_value = True
+        self.smtp_mailer.smtp_factory.return_value = connection
+        self.mailer.send('a@example.com', ['b@example.com'], self.message)
+        self.assertEqual(connection.starttls.call_count, 1)
+        connection.login.assert_called_with('user', 'password')
+
+        # TLS required but not available
+        self.smtp_mailer.force_tls = True
+        connection.has_extn.return_value = False
+        mailer = PooledSmtpMailer(self.smtp_mailer, size=1)
+        with self.assertRaises(RuntimeError):
+            mailer.send('a@example.com', ['b@example.com'], self.message)
+        self.assertTrue(connection.close.called)
+
+
+class RateLimiterTest(TestCase):
+    """
+    Test the RateLimiter class
+    """
+
+    def test_acquire(self):
+        """
+        Test the acquire method
+
+        1. The burst is available at once
+        2. Further operations wait for the rate
+        3. The bucket is refilled while idle
+        """
+        now = [100.0]
+        sleep = Mock()
+        limiter = RateLimiter(2, burst=2, clock=lambda: now[0], sleep=sleep)
+
+        # 1. The burst is available at once
+        self.assertEqual(limiter.acquire(), 0)
+        self.assertEqual(limiter.acquire(), 0)
+        self.assertFalse(sleep.called)
+
+        # 2. Further operations wait for the rate
+        self.assertEqual(limiter.acquire(), 0.5)
+        self.assertEqual(limiter.acquire(), 1.0)
+        self.assertEqual(sleep.call_args_list, [call(0.5), call(1.0)])
+
+        # 3. The bucket is refilled while idle
+        now[0] += 10
+        self.assertEqual(limiter.acquire(), 0)
+
+
+class IncludemeTest(TestCase):
+    """
+    Test the configuration of the SMTP pool
+    """
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def test_not_configured(self):
+        """
+        Test that the pyramid_mailer mailer is kept without pool size
+        """
+        config = testing.setUp(settings={})
+        config.include('pyramid_mailer')
+        config.include('c3smembership.smtp_pool')
+        self.assertIsInstance(config.registry.getUtility(IMailer), Mailer)
+
+    def test_configured(self):
+        """
+        Test that the pooled mailer wraps the pyramid_mailer mailer
+        """
+        config = testing.setUp(settings={
+            'mail.default_sender': 'default@example.com',
+            'c3smembership.smtp_pool.size': '3',
+            'c3smembership.smtp_pool.rate_limit': '5',
+        })
+        config.include('pyramid_mailer')
+        config.include('c3smembership.smtp_pool')
+        mailer = config.registry.getUtility(IMailer)
+        self.assertIsInstance(mailer, PooledMailer)
+        self.assertIsInstance(mailer.smtp_mailer, PooledSmtpMailer)
+        self.assertEqual(mailer.default_sender, 'default@example.com')
@@ -6,6 +6,7 @@ from pyramid import testing
 from sqlalchemy import create_engine
 import transaction
 
+from c3smembership.business.statistics import StatisticsInformation
 from c3smembership.data.model.base import (
     Base,
     DBSession,
@@ -13,6 +14,12 @@ from c3smembership.data.model.base import (
 from c3smembership.data.model.base.c3smember import C3sMember
 from c3smembership.data.model.base.group import Group
 from c3smembership.data.model.base.staff import Staff
+from c3smembership.data.repository.data_version_repository import \
+    DataVersionRepository
+from c3smembership.data.repository.dues_invoice_repository import \
+    DuesInvoiceRepository
+from c3smembership.data.repository.statistics_repository import \
+    StatisticsRepository
 
 
 class TestViews(unittest.TestCase):
@@ -123,17 +130,22 @@ class TestViews(unittest.TestCase):
         """
         from c3smembership.presentation.views.statistics import stats_view
         self.config.add_route('join', '/')
-        request = testing.DummyRequest()
+        request = testing.DummyRequest(
+            if_none_match=None, if_modified_since=None)
 
-        class ShareInformationDummy(object):
+        class ShareRepositoryDummy(object):
 
             def __init__(self, share_count):
                 self.share_count = share_count
 
-            def get_share_count(self):
+            def get_share_count(self, effective_date=None):
                 return self.share_count
 
-        request.registry.share_information = ShareInformationDummy(123)
+        request.registry.statistics_information = StatisticsInformation(
+            StatisticsRepository,
+            DuesInvoiceRepository,
+            ShareRepositoryDummy(123),
+            DataVersionRepository)
         result = stats_view(request)
         self.assertTrue(result['num_shares_members'] == 123)
         self.assertTrue(result['num_staff'] == 1)
@@ -142,6 +154,29 @@ class TestViews(unittest.TestCase):
         self.assertTrue(result['num_memnums'] == 0)
         self.assertTrue(result['next_memnum'] == 1)
         self.assertTrue(result['num_countries'] == 1)
+        self.assertEqual(result['countries_list'], [(u'Foocountry', 3)])
+        self.assertEqual(result['dues15_stats'], [])
+        etag = request.response.etag
+        self.assertTrue(etag is not None)
+        self.assertEqual(request.response.cache_control.no_cache, '*')
+
+        # The browser's page is current
+        request = testing.DummyRequest(
+            if_none_match=[etag], if_modified_since=None)
+        request.registry.statistics_information = StatisticsInformation(
+            StatisticsRepository,
+            DuesInvoiceRepository,
+            ShareRepositoryDummy(123),
+            DataVersionRepository)
+        result = stats_view(request)
+        self.assertEqual(result.status_code, 304)
+        self.assertEqual(result.headers['ETag'], '"{0}"'.format(etag))
+
+        # The data changed
+        DataVersionRepository.bump()
+        result = stats_view(request)
+        self.assertTrue(isinstance(result, dict))
+        self.assertNotEqual(request.response.etag, etag)
         # self.assertTrue(result['num_staff'] == 1)
         # self.assertTrue(result['firstname'] is 'foo')
         #
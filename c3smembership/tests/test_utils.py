@@ -5,9 +5,13 @@ Tests the utils package.
 
 import datetime
 import os
+import shutil
+import tempfile
 import unittest
 
+import mock
 from pyramid import testing
+from pyramid_mailer import get_mailer
 from pyramid_mailer.message import Message
 from sqlalchemy import create_engine
 import subprocess
@@ -18,10 +22,16 @@ from c3smembership.data.model.base import (
     Base,
 )
 from c3smembership.data.model.base.c3smember import C3sMember
+from c3smembership.mail_queue import (
+    MailQueue,
+    QueuedMailer,
+)
+import c3smembership.utils as utils
 from c3smembership.utils import (
     generate_pdf,
     create_accountant_mail,
     make_mail_body,
+    send_accountant_mail,
 )
 
 
@@ -228,3 +238,105 @@ class TestUtilities(unittest.TestCase):
             'something missing in the mail subject!')
         self.assertEqual('yes@example.com', result.sender,
                          'something missing in the mail body!')
+
+    def _send_accountant_mail(self, mail_queue=None, commit=True):
+        """
+        Send the accountant mail for the first member and commit or abort the
+        transaction
+        """
+        self.config.registry.settings.update({
+            'c3smembership.notification_sender': 'sender@example.com',
+            'c3smembership.status_receiver': 'status@example.com',
+            'c3smembership.url': 'https://membership.example.com',
+            'testing.mail_to_console': 'false',
+        })
+        self.config.registry.get_mailer = get_mailer
+        self.config.registry.mail_queue = mail_queue
+        if mail_queue is not None:
+            mailer = QueuedMailer(mail_queue)
+            self.config.registry.get_mailer = lambda request: mailer
+        request = testing.DummyRequest()
+        member = C3sMember.get_by_id(1)
+        send_accountant_mail(request, member)
+        # Nothing is sent before commit
+        self.assertEqual(get_mailer(request).outbox, [])
+        if commit:
+            transaction.commit()
+        else:
+            transaction.abort()
+        return get_mailer(request).outbox
+
+    def _create_mail_queue(self):
+        """
+        Create a mail queue in a temporary directory which is removed after
+        the test
+        """
+        directory = tempfile.mkdtemp()
+        mail_queue = MailQueue(os.path.join(directory, 'mail_queue.sqlite'))
+        self.addCleanup(shutil.rmtree, directory)
+        self.addCleanup(mail_queue.close)
+        return mail_queue
+
+    def test_send_accountant_mail(self):
+        """
+        Test that the accountant mail is sent after commit
+        """
+        outbox = self._send_accountant_mail()
+        self.assertEqual(len(outbox), 1)
+        self.assertEqual(outbox[0].subject, '[C3S] Yes! a new member')
+        self.assertEqual(outbox[0].recipients, ['status@example.com'])
+        self.assertTrue('-BEGIN PGP MESSAGE-' in outbox[0].body)
+
+    def test_send_accountant_mail_abort(self):
+        """
+        Test that the accountant mail is not sent if the transaction is
+        aborted
+        """
+        outbox = self._send_accountant_mail(commit=False)
+        self.assertEqual(outbox, [])
+
+    def test_send_accountant_mail_failure(self):
+        """
+        Test that an alert mail is sent if the encryption fails
+        """
+        with mock.patch.object(
+                utils, 'encrypt_with_gnupg',
+                side_effect=OSError('gpg not found')):
+            outbox = self._send_accountant_mail()
+        self.assertEqual(len(outbox), 1)
+        self.assertEqual(
+            outbox[0].subject, '[yes][ALERT] check the logs!')
+        self.assertTrue(
+            'https://membership.example.com' in outbox[0].body)
+
+    def test_send_accountant_mail_queued(self):
+        """
+        Test that the accountant mail is stored in the durable mail queue on
+        commit
+        """
+        mail_queue = self._create_mail_queue()
+        self._send_accountant_mail(mail_queue)
+        self.assertEqual(mail_queue.get_status_counts(), {'queued': 1})
+        self.assertTrue(
+            'Subject: [C3S] Yes! a new member' in
+            mail_queue.claim().message)
+        self.assertEqual(mail_queue.get_failures(), [])
+
+    def test_send_accountant_mail_queued_failure(self):
+        """
+        Test that the failure is recorded and the alert mail is stored in the
+        durable mail queue if the encryption fails
+        """
+        mail_queue = self._create_mail_queue()
+        with mock.patch.object(
+                utils, 'encrypt_with_gnupg',
+                side_effect=OSError('gpg not found')):
+            self._send_accountant_mail(mail_queue)
+        self.assertEqual(mail_queue.get_status_counts(), {'queued': 1})
+        self.assertTrue(
+            'Subject: [yes][ALERT] check the logs!' in
+            mail_queue.claim().message)
+        failures = mail_queue.get_failures()
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0].notification, 'accountant-notification')
+        self.assertEqual(failures[0].error, u'OSError: gpg not found')
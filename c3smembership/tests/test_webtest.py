@@ -425,6 +425,44 @@ class AccountantsFunctionalTests(unittest.TestCase):
         form['code_to_show'] = u'XXXSomeLastnäme'
         res = form.submit()
 
+    def test_autocomplete(self):
+        """
+        Test the autocomplete views and their ETag handling
+        """
+        self._login()
+        res = self.testapp.get('/aiv/?term=ABCDEFGF', status=200)
+        self.assertEqual(res.json, [u'ABCDEFGFOO'])
+        etag = res.headers['ETag']
+
+        res = self.testapp.get('/aiv/?term=ABCDEFG&limit=2', status=200)
+        self.assertEqual(res.json, [u'ABCDEFGBAR', u'ABCDEFGBAZ'])
+        self.assertNotEqual(res.headers['ETag'], etag)
+
+        res = self.testapp.get('/aiv/?term=abcdefgf&ignore_case=1', status=200)
+        self.assertEqual(res.json, [u'ABCDEFGFOO'])
+
+        res = self.testapp.get('/aps/?term=XXX', status=200)
+        self.assertEqual(res.json, {
+            u'ABCDEFGBAR XXXSomeLastnäme, AAASomeFirstnäme':
+            u'ABCDEFGBAR XXXSomeLastnäme, AAASomeFirstnäme'})
+
+        # The browser's answer is still current
+        res = self.testapp.get(
+            '/aiv/?term=ABCDEFGF',
+            headers={'If-None-Match': etag},
+            status=304)
+        self.assertEqual(res.headers['ETag'], etag)
+
+        # Changing a code invalidates the answer
+        with transaction.manager:
+            member = C3sMember.get_by_code(u'ABCDEFGFOO')
+            member.email_confirm_code = u'ABCDEFGFXY'
+        res = self.testapp.get(
+            '/aiv/?term=ABCDEFGF',
+            headers={'If-None-Match': etag},
+            status=200)
+        self.assertEqual(res.json, [u'ABCDEFGFXY'])
+
 
 class FunctionalTests(unittest.TestCase):
     """
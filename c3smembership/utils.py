@@ -3,6 +3,7 @@
 Utilities for generating PDF and CSV files as well as sending emails.
 """
 
+import logging
 import subprocess
 import tempfile
 import time
@@ -12,11 +13,15 @@ from pyramid_mailer.message import (
     Message,
     Attachment,
 )
+import transaction
 
 from c3smembership.gnupg_encrypt import encrypt_with_gnupg
 from c3smembership.presentation.i18n import _
 
 
+LOG = logging.getLogger(__name__)
+
+
 country_codes = sorted(
     [
         ('AT', _(u'Austria')),
@@ -221,8 +226,16 @@ def create_accountant_mail(member, sender, recipients):
     Create an email message information the accountant about the new
     membership application.
     """
-    unencrypted = make_mail_body(member)
-    encrypted = encrypt_with_gnupg(unencrypted)
+    return _create_accountant_message(
+        make_mail_body(member), generate_csv(member), sender, recipients)
+
+
+def _create_accountant_message(mail_body, csv_payload, sender, recipients):
+    """
+    Create the email message to the accountant encrypting the mail body and
+    the CSV payload.
+    """
+    encrypted = encrypt_with_gnupg(mail_body)
 
     message = Message(
         subject="[C3S] Yes! a new member",
@@ -230,7 +243,7 @@ def create_accountant_mail(member, sender, recipients):
         recipients=recipients,
         body=encrypted
     )
-    csv_payload_encd = encrypt_with_gnupg(generate_csv(member))
+    csv_payload_encd = encrypt_with_gnupg(csv_payload)
 
     attachment = Attachment(
         "C3S-SCE-AFM.csv.gpg",
@@ -240,31 +253,70 @@ def create_accountant_mail(member, sender, recipients):
     return message
 
 
+ACCOUNTANT_NOTIFICATION = 'accountant-notification'
+"""
+The name of the accountant notification for recording its failures.
+"""
+
+
 def send_accountant_mail(request, member):
     """
     Send an GPG encrypted email to the accountant informing about the new
     membership application.
+
+    The member data is taken from the request but the email is only encrypted
+    and sent once the transaction of the request is committed.
+
+    The encrypted email is sent immediately which enqueues it in the durable
+    mail queue if configured. Failures are then also recorded in the mail
+    queue.
+    """
+    settings = request.registry.settings
+    transaction.get().addAfterCommitHook(
+        _send_accountant_message,
+        args=(
+            request.registry.get_mailer(request),
+            getattr(request.registry, 'mail_queue', None),
+            make_mail_body(member),
+            generate_csv(member),
+            settings['c3smembership.notification_sender'],
+            [settings['c3smembership.status_receiver']],
+            settings['c3smembership.url'],
+            'true' in settings['testing.mail_to_console']))
+
+
+def _send_accountant_message(committed, mailer, mail_queue, mail_body,
+                             csv_payload, sender, recipients, url,
+                             mail_to_console):
+    """
+    Encrypt and send the email to the accountant if the transaction was
+    committed or record the failure and send an alert email to the recipients
+    in case of failure.
     """
-    mailer = request.registry.get_mailer(request)
+    # pylint: disable=too-many-arguments
+    if not committed:
+        return
     try:
-        the_mail = create_accountant_mail(
-            member,
-            request.registry.settings['c3smembership.notification_sender'],
-            [request.registry.settings['c3smembership.status_receiver']])
-        if 'true' in request.registry.settings['testing.mail_to_console']:
+        the_mail = _create_accountant_message(
+            mail_body, csv_payload, sender, recipients)
+        if mail_to_console:
             # pylint: disable=superfluous-parens
             print(the_mail.body)
         else:
-            mailer.send(the_mail)
-    except:
+            mailer.send_immediately(the_mail)
+    except Exception as exception:  # pylint: disable=broad-except
+        # The transaction is already committed and cannot fail anymore.
+        LOG.exception('Sending the accountant notification failed.')
+        if mail_queue is not None:
+            mail_queue.record_failure(
+                ACCOUNTANT_NOTIFICATION,
+                u'{0}: {1}'.format(type(exception).__name__, exception))
         mail = Message(
             subject=_("[yes][ALERT] check the logs!"),
-            sender=request.registry.settings[
-                'c3smembership.notification_sender'],
-            recipients=[request.registry.settings[
-                'c3smembership.status_receiver']],
+            sender=sender,
+            recipients=recipients,
             body="""
 A failure occurred at {}. A notification email could not be sent.
 Maybe gnupg failed and a key might be expired.
-            """.format(request.registry.settings['c3smembership.url']))
-        mailer.send(mail)
+            """.format(url))
+        mailer.send_immediately(mail)
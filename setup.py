@@ -86,6 +86,7 @@ setup(
         main = c3smembership:main
         [console_scripts]
         initialize_c3sMembership_db = c3smembership.scripts.initialize_db:main
+        deliver_c3sMembership_mail_queue = c3smembership.scripts.deliver_mail_queue:main
     """,
     # http://opkode.com/media/blog/
     #        using-extract_messages-in-your-python-egg-with-a-src-directory